@@ -2,14 +2,31 @@
 API Routes - Clean CRUD Operations
 """
 
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from backend.db import get_session
+from backend.constants.link_rules import (
+    CONTAINER_DEVICE_TYPES,
+    CUSTOMER_DEVICE_TYPES,
+    LINK_RULES,
+    PASSIVE_DEVICE_TYPES,
+    PEER_TO_PEER_ALLOWED,
+    LinkType,
+)
+from backend.db import get_session, get_session_factory
 from backend.models.core import (
     Device,
     DeviceCreate,
@@ -18,12 +35,58 @@ from backend.models.core import (
     Interface,
     InterfaceCreate,
     InterfaceResponse,
+    InterfaceType,
     Link,
     LinkCreate,
     LinkResponse,
+    MaintenanceState,
+    MaintenanceWindow,
+    MaintenanceWindowDevice,
+    Status,
+)
+from backend.services.alarm_correlation import alarm_correlator
+from backend.services.bulk_operations import BulkDeleteResult, apply_overrides, chunked, delete_devices
+from backend.services.changelog import (
+    DEFAULT_CHANGES_LIMIT,
+    changes_since,
+    current_seq,
+    entity_version,
+    record_changes,
+)
+from backend.services.entity_cache import entity_cache
+from backend.services.fast_json import (
+    FastJSONResponse,
+    UnknownFieldError,
+    fast_list_response,
+    fetch_rows,
+    parse_fields,
 )
-from backend.services.provisioning_service import ProvisioningError, ProvisioningService
+from backend.services.graph_analysis import component_tracker, spof_analyzer
+from backend.services.jobs import JobContext, JobError, job_manager
+from backend.services.layout_engine import LayoutService
+from backend.services.link_validation import LinkErrorKind, LinkValidationError, LinkValidator, claim_endpoints
+from backend.services.maintenance import MAINTENANCE_EVENT, apply_boundaries, maintenance_scheduler, utc
+from backend.services.path_finding import MAX_DISJOINT_PATHS, PathWeight, path_finder
+from backend.services.provisioning_service import ProvisioningError, ProvisioningService, UpstreamValidation
 from backend.services.seed import clear_all_data, seed_demo_topology
+from backend.services.single_flight import read_coalescer
+from backend.services.sla import DEFAULT_SLA_TARGET, SLA_DEVICE_TYPES, month_period, sla_engine
+from backend.services.status_history import HistoryBucket, bucket_count, rollup, status_at, status_changes
+from backend.services.topology_aggregation import (
+    AggregationLevel,
+    level_for_zoom,
+    topology_aggregator,
+)
+from backend.services.topology_import import DEFAULT_BATCH_SIZE, TopologyImporter
+from backend.services.topology_index import LinkEdge, get_topology_index, stage_changes
+from backend.services.topology_snapshot import (
+    SNAPSHOT_MEDIA_TYPE,
+    SnapshotError,
+    check_snapshot_file,
+    decompress_to_file,
+    export_snapshot,
+    import_snapshot,
+)
 
 api_router = APIRouter()
 
@@ -34,6 +97,127 @@ def get_emit_function():
     return emit_to_all
 
 
+# ==========================================
+# CONDITIONAL REQUESTS (ETag / If-None-Match)
+# ==========================================
+
+# Clients may reuse a cached copy only after revalidating it
+REVALIDATE = "no-cache"
+# Reference data changes only with a deployment
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = REVALIDATE,
+) -> Optional[Response]:
+    """
+    Tag `response` with `etag`; return a bare 304 when the client already has it.
+
+    ETags come from change-log sequence numbers (`entity_version`), so no
+    body is serialized to decide. Usage:
+
+        etag = f'"devices-{await entity_version(session, "device")}"'
+        if (not_modified := conditional_response(request, response, etag)) is not None:
+            return not_modified
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+# ==========================================
+# SPARSE FIELDSETS (?fields=)
+# ==========================================
+
+FIELDS_QUERY_DESCRIPTION = (
+    "Comma-separated response fields, e.g. `id,device_type,status,x,y`; "
+    "`id` is always included. Omit for all fields."
+)
+
+
+def sparse_fields(response_model: type, fields: Optional[str]) -> tuple[list[str], str]:
+    """
+    Parse `?fields=` for `response_model`.
+
+    Returns:
+        (field names, ETag suffix) - the suffix is empty for the full field
+        set so full and sparse representations never share an ETag.
+
+    Raises:
+        HTTPException 400: When an unknown field is requested.
+    """
+    try:
+        names = parse_fields(response_model, fields)
+    except UnknownFieldError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    suffix = "" if len(names) == len(response_model.model_fields) else ";" + ",".join(names)
+    return names, suffix
+
+
+# ==========================================
+# BATCH GET (many ids, one query)
+# ==========================================
+
+MAX_BATCH_IDS = 10_000
+
+
+class BatchGetRequest(BaseModel):
+    """Request model for fetching many rows by id in one round trip"""
+
+    ids: list[int] = Field(..., max_length=MAX_BATCH_IDS, description="Ids to fetch (duplicates ignored)")
+    fields: Optional[str] = Field(None, description=FIELDS_QUERY_DESCRIPTION)
+
+
+async def batch_get_response(
+    session: AsyncSession,
+    model: type,
+    response_model: type,
+    data: BatchGetRequest,
+) -> FastJSONResponse:
+    """
+    One `WHERE id IN (...)` query for all requested ids.
+
+    Response: {"items": [...sorted by id], "missing": [ids not found]}
+
+    Raises:
+        HTTPException 400: When `fields` names an unknown field.
+    """
+    names, _ = sparse_fields(response_model, data.fields)
+    ids = sorted(set(data.ids))
+    items = await fetch_rows(session, model, response_model, model.id.in_(ids), fields=names) if ids else []
+    found = {item["id"] for item in items}
+    return FastJSONResponse({"items": items, "missing": [i for i in ids if i not in found]})
+
+
+def parse_id_list(raw: str, parameter: str) -> list[int]:
+    """
+    Parse a comma-separated id list from a query parameter (duplicates dropped, sorted).
+
+    Raises:
+        HTTPException 400: On non-integer entries or more than `MAX_BATCH_IDS` ids.
+    """
+    try:
+        ids = sorted({int(part) for part in raw.split(",") if part.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"'{parameter}' must be a comma-separated list of integers")
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    return ids
+
+
 # ==========================================
 # PYDANTIC MODELS - PROVISIONING
 # ==========================================
@@ -46,6 +230,12 @@ class ProvisionDeviceRequest(BaseModel):
     device_type: DeviceType = Field(..., description="Type of device to provision")
     parent_container_id: Optional[int] = Field(None, description="Optional parent container (POP, CORE_SITE)")
     validate_upstream: bool = Field(True, description="Validate upstream dependency (default: True)")
+    upstream_validation: UpstreamValidation = Field(
+        UpstreamValidation.EXISTS,
+        description="exists: a required upstream type exists anywhere; "
+                    "reachable: the upstream device (or one in the parent container) reaches a BACKBONE_GATEWAY",
+    )
+    upstream_device_id: Optional[int] = Field(None, description="Upstream device checked in `reachable` mode")
     x: float = Field(0.0, description="X coordinate for layout")
     y: float = Field(0.0, description="Y coordinate for layout")
     
@@ -62,6 +252,12 @@ class UpdateDevicePositionRequest(BaseModel):
     y: int = Field(..., description="Y coordinate")
 
 
+class UpdateDeviceParentRequest(BaseModel):
+    """Request model for moving a device into (or out of) a container"""
+    
+    parent_container_id: Optional[int] = Field(None, description="New POP/CORE_SITE container, or null to detach")
+
+
 class SetStatusOverrideRequest(BaseModel):
     """Request model for setting manual status override"""
     
@@ -95,27 +291,92 @@ class ProvisionDeviceResponse(BaseModel):
 
 
 @api_router.get("/devices", response_model=list[DeviceResponse])
-async def list_devices(session: AsyncSession = Depends(get_session)):
+async def list_devices(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    session: AsyncSession = Depends(get_session),
+    session_factory=Depends(get_session_factory),
+):
     """
     Return every device currently stored in the topology.
 
-    Response: 200 OK with `DeviceResponse` entries sorted by primary key.
+    Response: 200 OK with `DeviceResponse` entries sorted by primary key, or
+    304 Not Modified when `If-None-Match` carries the current ETag. Served on
+    the fast path (column tuples, no per-row validation, orjson); `fields`
+    restricts the SELECT to the requested columns. Identical concurrent
+    requests share one query (single-flight, keyed by the ETag).
+
+    Raises:
+        HTTPException 400: When `fields` names an unknown field.
+    """
+    names, etag_suffix = sparse_fields(DeviceResponse, fields)
+    etag = f'"devices-{await entity_version(session, "device")}{etag_suffix}"'
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    return await fast_list_response(session_factory, Device, DeviceResponse, etag, response, names)
+
+
+@api_router.post("/devices/batch-get")
+async def batch_get_devices(data: BatchGetRequest, session: AsyncSession = Depends(get_session)):
+    """
+    Fetch many devices by id in a single query (replaces N x `GET /devices/{id}`).
+
+    Response: 200 OK with {"items": [DeviceResponse...], "missing": [int]}.
+
+    Raises:
+        HTTPException 400: When `fields` names an unknown field.
+    """
+    return await batch_get_response(session, Device, DeviceResponse, data)
+
+
+@api_router.get("/devices/interfaces")
+async def get_interfaces_for_devices(
+    device_ids: str = Query(..., description="Comma-separated device ids, e.g. `1,2,3`"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Interfaces of many devices in one query (batched `GET /devices/{id}/interfaces`).
+
+    Response: 200 OK with {"items": {device_id: [InterfaceResponse...]},
+    "missing": [device ids that do not exist]}. Devices without interfaces
+    map to an empty list.
+
+    Raises:
+        HTTPException 400: On a malformed id list or an unknown field.
     """
-    result = await session.execute(select(Device))
-    devices = result.scalars().all()
-    return devices
+    ids = parse_id_list(device_ids, "device_ids")
+    names, _ = sparse_fields(InterfaceResponse, fields)
+    if "device_id" not in names:
+        names = names + ["device_id"]
+    existing = set((await session.execute(select(Device.id).where(Device.id.in_(ids)))).scalars()) if ids else set()
+    grouped: dict[int, list[dict]] = {device_id: [] for device_id in ids if device_id in existing}
+    if existing:
+        rows = await fetch_rows(session, Interface, InterfaceResponse, Interface.device_id.in_(existing), fields=names)
+        for row in rows:
+            grouped[row["device_id"]].append(row)
+    return FastJSONResponse({"items": grouped, "missing": [i for i in ids if i not in existing]})
 
 
 @api_router.get("/devices/{device_id}", response_model=DeviceResponse)
-async def get_device(device_id: int, session: AsyncSession = Depends(get_session)):
+async def get_device(
+    device_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+):
     """
-    Fetch a single device by ID.
+    Fetch a single device by ID (304 Not Modified on a matching ETag).
 
     Raises:
         HTTPException 404: When the device is not found.
     """
-    device = await session.get(Device, device_id)
-    if not device:
+    etag = f'"device-{device_id}-{await entity_version(session, "device", device_id)}"'
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    device = await entity_cache.get(session, "device", device_id)
+    if device is None:
         raise HTTPException(status_code=404, detail="Device not found")
     return device
 
@@ -131,7 +392,9 @@ async def provision_device(
     Workflow
     --------
     1. Validate that the name is unique via `ProvisioningService._check_name_exists`.
-    2. When `validate_upstream` is true, enforce upstream dependency rules.
+    2. When `validate_upstream` is true, enforce upstream dependency rules
+       (`upstream_validation=reachable`: the upstream device or parent
+       container must actually have a path to a BACKBONE_GATEWAY).
     3. Persist the `Device` including optional optical attributes.
     4. Auto-create the default interface layout for the device type.
     5. Emit Socket.IO event `device_created` containing id, name, type, interface count.
@@ -152,6 +415,8 @@ async def provision_device(
             device_type=request.device_type,
             parent_container_id=request.parent_container_id,
             validate_upstream=request.validate_upstream,
+            upstream_validation=request.upstream_validation,
+            upstream_device_id=request.upstream_device_id,
             x=request.x,
             y=request.y,
             tx_power_dbm=request.tx_power_dbm,
@@ -243,6 +508,53 @@ async def update_device_position(
     return {"message": f"Device position updated to ({data.x}, {data.y})"}
 
 
+@api_router.patch("/devices/{device_id}/parent")
+async def update_device_parent(
+    device_id: int,
+    data: UpdateDeviceParentRequest,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Re-parent a device (and implicitly its whole subtree) to another container.
+
+    Broadcasts `device:updated`. The in-memory container index moves the
+    subtree on commit, so `GET /containers/{id}/contents` reflects it at once.
+
+    Raises:
+        HTTPException 400: When the target is not a POP/CORE_SITE, or the move
+            would nest a container inside itself.
+        HTTPException 404: When the device or the target container is not found.
+    """
+    device = await session.get(Device, device_id)
+    if not device:
+        raise HTTPException(status_code=404, detail="Device not found")
+    
+    parent_id = data.parent_container_id
+    if parent_id is not None:
+        parent = await session.get(Device, parent_id)
+        if not parent:
+            raise HTTPException(status_code=404, detail="Container not found")
+        if parent.device_type not in CONTAINER_DEVICE_TYPES:
+            raise HTTPException(status_code=400, detail=f"Device {parent_id} is not a container")
+        index = await get_topology_index(session)
+        if parent_id == device_id or parent_id in index.contents(device_id, recursive=True):
+            raise HTTPException(status_code=400, detail="Cannot move a container into itself")
+    
+    device.parent_container_id = parent_id
+    
+    await session.commit()
+    await session.refresh(device)
+    
+    # Emit WebSocket event
+    emit = get_emit_function()
+    await emit("device:updated", device.model_dump(mode='json'))
+    
+    return {
+        "message": f"Device parent set to {parent_id}",
+        "device": device.model_dump()
+    }
+
+
 @api_router.patch("/devices/{device_id}/override")
 async def set_device_status_override(
     device_id: int,
@@ -273,9 +585,8 @@ async def set_device_status_override(
     await session.commit()
     await session.refresh(device)
     
-    # Emit WebSocket event
-    emit = get_emit_function()
-    await emit("device:updated", device.model_dump(mode='json'))
+    # Emit WebSocket event (held by the alarm correlator while the device may be suppressed)
+    await alarm_correlator.publish("device:updated", device.model_dump(mode='json'), [device.id])
     
     return {
         "message": f"Status override set to {data.status_override}",
@@ -306,9 +617,8 @@ async def clear_device_status_override(
     await session.commit()
     await session.refresh(device)
     
-    # Emit WebSocket event
-    emit = get_emit_function()
-    await emit("device:updated", device.model_dump(mode='json'))
+    # Emit WebSocket event (held by the alarm correlator while the device may be suppressed)
+    await alarm_correlator.publish("device:updated", device.model_dump(mode='json'), [device.id])
     
     return {
         "message": "Status override cleared",
@@ -329,8 +639,7 @@ async def get_device_interfaces(
     Raises:
         HTTPException 404: When the device is not found.
     """
-    device = await session.get(Device, device_id)
-    if not device:
+    if await entity_cache.get(session, "device", device_id) is None:
         raise HTTPException(status_code=404, detail="Device not found")
     
     result = await session.execute(
@@ -372,9 +681,8 @@ async def override_device_status_legacy(
     await session.commit()
     await session.refresh(device)
     
-    # Emit WebSocket event
-    emit = get_emit_function()
-    await emit("device:updated", device.model_dump(mode='json'))
+    # Emit WebSocket event (held by the alarm correlator while the device may be suppressed)
+    await alarm_correlator.publish("device:updated", device.model_dump(mode='json'), [device.id])
     
     return {
         "message": f"Status override set to {data.status}",
@@ -404,9 +712,8 @@ async def clear_device_status_override_legacy(
     await session.commit()
     await session.refresh(device)
     
-    # Emit WebSocket event
-    emit = get_emit_function()
-    await emit("device:updated", device.model_dump(mode='json'))
+    # Emit WebSocket event (held by the alarm correlator while the device may be suppressed)
+    await alarm_correlator.publish("device:updated", device.model_dump(mode='json'), [device.id])
     
     return {
         "message": "Status override cleared",
@@ -414,6 +721,136 @@ async def clear_device_status_override_legacy(
     }
 
 
+# Rollup buckets per request (~83 days by hour, ~5 years by day)
+MAX_HISTORY_BUCKETS = 2000
+
+
+class StatusTransitionResponse(BaseModel):
+    """Effective status from `changed_at` until the next transition"""
+    
+    changed_at: datetime
+    status: Status
+
+
+class StatusRollupResponse(BaseModel):
+    """Minutes spent per status in one bucket (time before the first record is not counted)"""
+    
+    start: datetime
+    minutes_up: float
+    minutes_degraded: float
+    minutes_down: float
+
+
+class StatusHistoryResponse(BaseModel):
+    """Status transitions of one device in a time range, with rollups"""
+    
+    device_id: int
+    start: datetime
+    end: datetime
+    bucket: HistoryBucket
+    initial_status: Optional[Status] = Field(None, description="Effective status at `start` (null if unknown)")
+    transitions: list[StatusTransitionResponse]
+    rollup: list[StatusRollupResponse]
+
+
+@api_router.get("/devices/{device_id}/status-history", response_model=StatusHistoryResponse)
+async def get_device_status_history(
+    device_id: int,
+    start: Optional[datetime] = Query(None, description="Range start (default: `end` minus 24 hours)"),
+    end: Optional[datetime] = Query(None, description="Range end (default: now)"),
+    bucket: HistoryBucket = Query(HistoryBucket.HOUR, description="Rollup granularity"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Effective-status transitions of a device and time spent per status.
+    
+    Answers questions like "how long was OLT-17 down last week" from the
+    append-only status history (`backend/services/status_history.py`): the
+    status at `start` plus the transitions inside the range are read through
+    the (device_id, changed_at) index and rolled up into UTC hour or day
+    buckets. Times without a timezone are UTC.
+    
+    Raises:
+        HTTPException 400: When `end` is not after `start` or the range
+            needs more than `MAX_HISTORY_BUCKETS` buckets.
+        HTTPException 404: When the device is not found.
+    """
+    if await entity_cache.get(session, "device", device_id) is None:
+        raise HTTPException(status_code=404, detail="Device not found")
+    end = utc(end) if end else datetime.now(timezone.utc)
+    start = utc(start) if start else end - timedelta(days=1)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if bucket_count(start, end, bucket) > MAX_HISTORY_BUCKETS:
+        raise HTTPException(
+            status_code=400, detail=f"Range too long for {bucket.value} buckets (max {MAX_HISTORY_BUCKETS})",
+        )
+    
+    initial = await status_at(session, device_id, start)
+    changes = await status_changes(session, device_id, start, end)
+    return StatusHistoryResponse(
+        device_id=device_id,
+        start=start,
+        end=end,
+        bucket=bucket,
+        initial_status=initial,
+        transitions=[StatusTransitionResponse(changed_at=at, status=status) for at, status in changes],
+        rollup=[
+            StatusRollupResponse(
+                start=slot.start,
+                minutes_up=round(slot.minutes(Status.UP), 3),
+                minutes_degraded=round(slot.minutes(Status.DEGRADED), 3),
+                minutes_down=round(slot.minutes(Status.DOWN), 3),
+            )
+            for slot in rollup(initial, changes, start, end, bucket)
+        ],
+    )
+
+
+class BulkDeleteResponse(BaseModel):
+    """Ids removed by a bulk delete"""
+
+    devices: list[int]
+    interfaces: list[int]
+    links: list[int]
+    detached: list[int] = Field(..., description="Children of deleted containers, now without parent")
+    missing: list[int] = Field(..., description="Requested ids that did not exist")
+
+
+async def _bulk_delete(session: AsyncSession, device_ids: list[int]) -> BulkDeleteResult:
+    """Run a set-based delete and broadcast one `devices:deleted` event."""
+    result = await delete_devices(session, device_ids)
+    if result.devices:
+        emit = get_emit_function()
+        await emit("devices:deleted", {
+            "ids": result.devices,
+            "interface_ids": result.interfaces,
+            "link_ids": result.links,
+            "detached_ids": result.detached,
+        })
+    return result
+
+
+@api_router.delete("/devices", response_model=BulkDeleteResponse)
+async def bulk_delete_devices(
+    ids: str = Query(..., description="Comma-separated device ids, e.g. `1,2,3`"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Delete many devices, their interfaces and links in one transaction.
+
+    Set-based (`DELETE ... WHERE id IN (...)`, no ORM objects loaded) and one
+    batched `devices:deleted` event instead of one per device. Children of
+    deleted containers are detached; see `DELETE /containers/{id}` to remove
+    a whole subtree.
+
+    Raises:
+        HTTPException 400: On a malformed or oversized id list.
+    """
+    result = await _bulk_delete(session, parse_id_list(ids, "ids"))
+    return BulkDeleteResponse(**result.to_dict())
+
+
 @api_router.delete("/devices/{device_id}", status_code=204)
 async def delete_device(device_id: int, session: AsyncSession = Depends(get_session)):
     """
@@ -442,122 +879,582 @@ async def delete_device(device_id: int, session: AsyncSession = Depends(get_sess
 
 
 # ==========================================
-# INTERFACES
+# STATUS OVERRIDES - BULK
 # ==========================================
 
 
-@api_router.get("/interfaces", response_model=list[InterfaceResponse])
-async def list_interfaces(session: AsyncSession = Depends(get_session)):
-    """List all interfaces"""
-    result = await session.execute(select(Interface))
-    interfaces = result.scalars().all()
-    return interfaces
-
-
-@api_router.post("/interfaces", response_model=InterfaceResponse, status_code=201)
-async def create_interface(
-    interface_data: InterfaceCreate,
-    session: AsyncSession = Depends(get_session),
-):
-    """Create new interface"""
-    # Check device exists
-    device = await session.get(Device, interface_data.device_id)
-    if not device:
-        raise HTTPException(status_code=404, detail="Device not found")
+class BulkOverrideRequest(BaseModel):
+    """Request model for setting or clearing overrides on many devices"""
     
-    interface = Interface(**interface_data.model_dump())
-    session.add(interface)
-    await session.commit()
-    await session.refresh(interface)
-    return interface
+    device_ids: list[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+    status_override: Optional[str] = Field(None, description="UP or DOWN; null clears the override")
+    override_reason: Optional[str] = Field(None, max_length=255)
+    dry_run: bool = Field(False, description="Only compute the impact, write nothing")
 
 
-# ==========================================
-# LINKS
-# ==========================================
+class StatusChangeResponse(BaseModel):
+    """Effective status of an overridden device before and after"""
+    
+    device_id: int
+    before: Status
+    after: Status
 
 
-@api_router.get("/links", response_model=list[LinkResponse])
-async def list_links(session: AsyncSession = Depends(get_session)):
-    """List all links"""
-    result = await session.execute(select(Link))
-    links = result.scalars().all()
-    return links
+class OverrideImpactResponse(BaseModel):
+    """Downstream effect of an override change"""
+    
+    changed: list[StatusChangeResponse]
+    cut_off: list[int] = Field(..., description="Devices that lose their path to a BACKBONE_GATEWAY")
+    restored: list[int] = Field(..., description="Devices that regain a path to a BACKBONE_GATEWAY")
+    customers_cut_off: int
+    customers_restored: int
 
 
-@api_router.get("/links/{link_id}", response_model=LinkResponse)
-async def get_link(link_id: int, session: AsyncSession = Depends(get_session)):
-    """Get single link"""
-    link = await session.get(Link, link_id)
-    if not link:
-        raise HTTPException(status_code=404, detail="Link not found")
-    return link
+class BulkOverrideResponse(BaseModel):
+    """Result of a bulk override request"""
+    
+    dry_run: bool
+    updated: list[int]
+    missing: list[int]
+    impact: OverrideImpactResponse
 
 
-@api_router.post("/links", response_model=LinkResponse, status_code=201)
-async def create_link(
-    link_data: LinkCreate,
+@api_router.post("/overrides/bulk", response_model=BulkOverrideResponse)
+async def bulk_override(
+    data: BulkOverrideRequest,
     session: AsyncSession = Depends(get_session),
 ):
-    """Create new link"""
-    # Check interfaces exist
-    intf_a = await session.get(Interface, link_data.a_interface_id)
-    intf_b = await session.get(Interface, link_data.b_interface_id)
-    
-    if not intf_a or not intf_b:
-        raise HTTPException(status_code=404, detail="Interface not found")
+    """
+    Apply (`UP` / `DOWN`) or clear (null) the status override of many devices.
     
-    link = Link(**link_data.model_dump())
-    session.add(link)
-    await session.commit()
-    await session.refresh(link)
-    return link
-
-
-@api_router.delete("/links/{link_id}", status_code=204)
-async def delete_link(link_id: int, session: AsyncSession = Depends(get_session)):
-    """Delete link"""
-    link = await session.get(Link, link_id)
-    if not link:
-        raise HTTPException(status_code=404, detail="Link not found")
+    Writes all devices with one UPDATE and returns the downstream impact:
+    devices that lose or regain a path to a BACKBONE_GATEWAY (links and
+    devices that are DOWN break a path). With `dry_run` the impact is only
+    previewed. Emits one `devices:overridden` event instead of one
+    `device:updated` per device (through the alarm correlator, which drops
+    devices suppressed by a root-cause alarm).
     
-    deleted_id = link.id
+    Raises:
+        HTTPException 400: When `status_override` is not `UP`, `DOWN` or null.
+    """
+    if data.status_override not in (None, "UP", "DOWN"):
+        raise HTTPException(status_code=400, detail="status_override must be 'UP', 'DOWN' or null")
+    status_override = Status(data.status_override) if data.status_override else None
     
-    await session.delete(link)
-    await session.commit()
+    result = await apply_overrides(
+        session, data.device_ids, status_override, data.override_reason, dry_run=data.dry_run,
+    )
+    impact = result.impact
     
-    # Emit WebSocket event
-    emit = get_emit_function()
-    await emit("link:deleted", {"id": deleted_id})
+    if result.updated and not data.dry_run:
+        # Suppressed devices are dropped from "ids" by the alarm correlator
+        await alarm_correlator.publish("devices:overridden", {
+            "ids": result.updated,
+            "status_override": data.status_override,
+            "cut_off": impact.cut_off,
+            "restored": impact.restored,
+        }, result.updated)
     
-    return None
+    return BulkOverrideResponse(
+        dry_run=data.dry_run,
+        updated=result.updated,
+        missing=result.missing,
+        impact=OverrideImpactResponse(
+            changed=[
+                StatusChangeResponse(device_id=device_id, before=before, after=after)
+                for device_id, (before, after) in sorted(impact.changed.items())
+            ],
+            cut_off=impact.cut_off,
+            restored=impact.restored,
+            customers_cut_off=impact.customers_cut_off,
+            customers_restored=impact.customers_restored,
+        ),
+    )
 
 
 # ==========================================
-# SIMPLE LINK CREATION (with auto-interface)
+# MAINTENANCE WINDOWS (SCHEDULED OVERRIDES)
 # ==========================================
 
 
-class SimpleLinkCreate(BaseModel):
-    device_a_id: int
-    device_b_id: int
-    link_type: str  # "fiber", "copper", "wireless"
-    status: str = "UP"
+class MaintenanceWindowCreate(BaseModel):
+    """Request model for scheduling a maintenance window"""
+    
+    device_ids: list[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+    status_override: str = Field("DOWN", description="UP or DOWN, applied at starts_at")
+    reason: Optional[str] = Field(None, max_length=255)
+    starts_at: datetime
+    ends_at: datetime
 
 
-@api_router.post("/links/create-simple")
-async def create_simple_link(
-    data: SimpleLinkCreate,
-    session: AsyncSession = Depends(get_session)
+class MaintenanceWindowResponse(BaseModel):
+    """A maintenance window with its devices"""
+    
+    id: int
+    status_override: Status
+    reason: Optional[str]
+    starts_at: datetime
+    ends_at: datetime
+    state: MaintenanceState
+    created_at: datetime
+    device_ids: list[int]
+
+
+async def _maintenance_window_responses(
+    session: AsyncSession, windows: list[MaintenanceWindow],
+) -> list[MaintenanceWindowResponse]:
+    """Responses for `windows`, loading all device ids with one query per chunk."""
+    device_ids: dict[int, list[int]] = {window.id: [] for window in windows}
+    for chunk in chunked(list(device_ids)):
+        rows = await session.execute(
+            select(MaintenanceWindowDevice.window_id, MaintenanceWindowDevice.device_id)
+            .where(MaintenanceWindowDevice.window_id.in_(chunk))
+            .order_by(MaintenanceWindowDevice.device_id)
+        )
+        for window_id, device_id in rows:
+            device_ids[window_id].append(device_id)
+    return [
+        MaintenanceWindowResponse(
+            id=window.id,
+            status_override=window.status_override,
+            reason=window.reason,
+            starts_at=utc(window.starts_at),
+            ends_at=utc(window.ends_at),
+            state=window.state,
+            created_at=utc(window.created_at),
+            device_ids=device_ids[window.id],
+        )
+        for window in windows
+    ]
+
+
+async def _get_maintenance_window(session: AsyncSession, window_id: int) -> MaintenanceWindow:
+    window = await session.get(MaintenanceWindow, window_id)
+    if window is None:
+        raise HTTPException(status_code=404, detail="Maintenance window not found")
+    return window
+
+
+@api_router.post("/maintenance-windows", response_model=MaintenanceWindowResponse, status_code=201)
+async def create_maintenance_window(
+    data: MaintenanceWindowCreate,
+    session: AsyncSession = Depends(get_session),
 ):
     """
-    Create a link between two devices with automatic interface creation.
+    Schedule a status override for many devices between `starts_at` and `ends_at`.
     
-    This is a convenience endpoint that:
-    1. Creates an interface on device A
-    2. Creates an interface on device B
-    3. Creates a link between those interfaces
-    4. Emits WebSocket events for real-time updates
+    The maintenance scheduler applies the override at `starts_at` and clears
+    it at `ends_at` (see `backend/services/maintenance.py`); a window that
+    already started is applied right away. Times without a timezone are UTC.
+    
+    Raises:
+        HTTPException 400: When `status_override` is not `UP` or `DOWN`, or
+            `ends_at` is not after `starts_at` or lies in the past.
+        HTTPException 404: When a device is not found.
+    """
+    if data.status_override not in ("UP", "DOWN"):
+        raise HTTPException(status_code=400, detail="status_override must be 'UP' or 'DOWN'")
+    starts_at, ends_at = utc(data.starts_at), utc(data.ends_at)
+    if ends_at <= starts_at:
+        raise HTTPException(status_code=400, detail="ends_at must be after starts_at")
+    if ends_at <= datetime.now(timezone.utc):
+        raise HTTPException(status_code=400, detail="ends_at lies in the past")
+    
+    device_ids = sorted(set(data.device_ids))
+    existing: set[int] = set()
+    for chunk in chunked(device_ids):
+        existing.update((await session.execute(select(Device.id).where(Device.id.in_(chunk)))).scalars())
+    missing = [device_id for device_id in device_ids if device_id not in existing]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Devices not found: {missing}")
+    
+    window = MaintenanceWindow(
+        status_override=Status(data.status_override),
+        reason=data.reason,
+        starts_at=starts_at,
+        ends_at=ends_at,
+    )
+    session.add(window)
+    await session.flush()
+    await session.execute(insert(MaintenanceWindowDevice), [
+        {"window_id": window.id, "device_id": device_id} for device_id in device_ids
+    ])
+    await session.commit()
+    
+    maintenance_scheduler.schedule(window.id, starts_at, ends_at)
+    [response] = await _maintenance_window_responses(session, [window])
+    return response
+
+
+@api_router.get("/maintenance-windows", response_model=list[MaintenanceWindowResponse])
+async def list_maintenance_windows(
+    state: Optional[list[MaintenanceState]] = Query(None, description="Only windows in these states"),
+    session: AsyncSession = Depends(get_session),
+):
+    """List maintenance windows ordered by start time."""
+    query = select(MaintenanceWindow).order_by(MaintenanceWindow.starts_at, MaintenanceWindow.id)
+    if state:
+        query = query.where(MaintenanceWindow.state.in_(state))
+    windows = (await session.execute(query)).scalars().all()
+    return await _maintenance_window_responses(session, list(windows))
+
+
+@api_router.get("/maintenance-windows/{window_id}", response_model=MaintenanceWindowResponse)
+async def get_maintenance_window(window_id: int, session: AsyncSession = Depends(get_session)):
+    """
+    Get a maintenance window with its devices.
+    
+    Raises:
+        HTTPException 404: When the window is not found.
+    """
+    window = await _get_maintenance_window(session, window_id)
+    [response] = await _maintenance_window_responses(session, [window])
+    return response
+
+
+@api_router.delete("/maintenance-windows/{window_id}", response_model=MaintenanceWindowResponse)
+async def cancel_maintenance_window(window_id: int, session: AsyncSession = Depends(get_session)):
+    """
+    Cancel a scheduled or active maintenance window.
+    
+    An active window's override is cleared immediately (devices still
+    covered by another active window keep that window's override).
+    
+    Raises:
+        HTTPException 404: When the window is not found.
+        HTTPException 409: When the window already finished or was cancelled.
+    """
+    window = await _get_maintenance_window(session, window_id)
+    if window.state not in (MaintenanceState.SCHEDULED, MaintenanceState.ACTIVE):
+        raise HTTPException(status_code=409, detail=f"Maintenance window already {window.state.value}")
+    
+    result = await apply_boundaries(session, [], [window_id], ended_state=MaintenanceState.CANCELLED)
+    maintenance_scheduler.forget(window_id)
+    if result:
+        emit = get_emit_function()
+        await emit(MAINTENANCE_EVENT, result.to_event())
+    window = await _get_maintenance_window(session, window_id)
+    [response] = await _maintenance_window_responses(session, [window])
+    return response
+
+
+# ==========================================
+# ALARMS (CORRELATED)
+# ==========================================
+
+
+class AlarmResponse(BaseModel):
+    """Active alarm on a root-cause device"""
+    
+    root_device_id: int
+    name: Optional[str]
+    device_type: Optional[DeviceType]
+    raised_at: datetime
+    suppressed_count: int = Field(..., description="DOWN devices explained by the root")
+
+
+class AlarmDetailResponse(AlarmResponse):
+    """Active alarm with the suppressed devices"""
+    
+    suppressed_ids: list[int]
+
+
+@api_router.get("/alarms", response_model=list[AlarmResponse])
+async def list_alarms(
+    limit: int = Query(100, ge=1, le=10_000),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Active root-cause alarms, most suppressed devices first.
+    
+    Downstream failures are collapsed into the alarm of their root-cause
+    device (see `backend/services/alarm_correlation.py`); live changes are
+    pushed as `alarm:raised` / `alarm:updated` / `alarm:cleared`, which
+    replace the per-device status events of suppressed devices.
+    """
+    index = await get_topology_index(session)
+    alarms = sorted(alarm_correlator.alarms.values(), key=lambda alarm: (-len(alarm.suppressed), alarm.root_id))
+    return [alarm.to_event(index) for alarm in alarms[:limit]]
+
+
+@api_router.get("/alarms/{root_device_id}", response_model=AlarmDetailResponse)
+async def get_alarm(root_device_id: int, session: AsyncSession = Depends(get_session)):
+    """
+    Active alarm of a root-cause device, with the devices it suppresses.
+    
+    Raises:
+        HTTPException 404: When the device has no active alarm.
+    """
+    alarm = alarm_correlator.alarms.get(root_device_id)
+    if alarm is None:
+        raise HTTPException(status_code=404, detail="No active alarm for this device")
+    index = await get_topology_index(session)
+    return alarm.to_event(index, with_ids=True)
+
+
+# ==========================================
+# INTERFACES
+# ==========================================
+
+
+@api_router.get("/interfaces", response_model=list[InterfaceResponse])
+async def list_interfaces(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    session: AsyncSession = Depends(get_session),
+    session_factory=Depends(get_session_factory),
+):
+    """List all interfaces (304 Not Modified on a matching ETag, `fields` for a sparse fieldset)"""
+    names, etag_suffix = sparse_fields(InterfaceResponse, fields)
+    etag = f'"interfaces-{await entity_version(session, "interface")}{etag_suffix}"'
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    return await fast_list_response(session_factory, Interface, InterfaceResponse, etag, response, names)
+
+
+@api_router.post("/interfaces", response_model=InterfaceResponse, status_code=201)
+async def create_interface(
+    interface_data: InterfaceCreate,
+    session: AsyncSession = Depends(get_session),
+):
+    """Create new interface"""
+    # Check device exists
+    if await entity_cache.get(session, "device", interface_data.device_id) is None:
+        raise HTTPException(status_code=404, detail="Device not found")
+    
+    interface = Interface(**interface_data.model_dump())
+    session.add(interface)
+    await session.commit()
+    await session.refresh(interface)
+    return interface
+
+
+# ==========================================
+# LINKS
+# ==========================================
+
+
+@api_router.get("/links", response_model=list[LinkResponse])
+async def list_links(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    session: AsyncSession = Depends(get_session),
+    session_factory=Depends(get_session_factory),
+):
+    """List all links (304 Not Modified on a matching ETag, `fields` for a sparse fieldset)"""
+    names, etag_suffix = sparse_fields(LinkResponse, fields)
+    etag = f'"links-{await entity_version(session, "link")}{etag_suffix}"'
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    return await fast_list_response(session_factory, Link, LinkResponse, etag, response, names)
+
+
+@api_router.post("/links/batch-get")
+async def batch_get_links(data: BatchGetRequest, session: AsyncSession = Depends(get_session)):
+    """
+    Fetch many links by id in a single query (replaces N x `GET /links/{id}`).
+
+    Response: 200 OK with {"items": [LinkResponse...], "missing": [int]}.
+
+    Raises:
+        HTTPException 400: When `fields` names an unknown field.
+    """
+    return await batch_get_response(session, Link, LinkResponse, data)
+
+
+@api_router.get("/links/{link_id}", response_model=LinkResponse)
+async def get_link(
+    link_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+):
+    """Get single link (304 Not Modified on a matching ETag)"""
+    etag = f'"link-{link_id}-{await entity_version(session, "link", link_id)}"'
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    link = await entity_cache.get(session, "link", link_id)
+    if link is None:
+        raise HTTPException(status_code=404, detail="Link not found")
+    return link
+
+
+LINK_ERROR_STATUS = {
+    LinkErrorKind.NOT_FOUND: 404,
+    LinkErrorKind.RULE_VIOLATION: 400,
+    LinkErrorKind.OCCUPIED: 409,
+}
+
+INTERFACE_PAIR_TAKEN = "Interfaces are already linked (concurrent request)"
+
+
+@api_router.post("/links", response_model=LinkResponse, status_code=201)
+async def create_link(
+    link_data: LinkCreate,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Create a link between two existing interfaces.
+
+    Validated from the in-memory topology index: both interfaces exist, the
+    device types satisfy L1-L9 and neither interface is already patched.
+
+    Raises:
+        HTTPException 400: When the link breaks an L1-L9 rule or is a self-link.
+        HTTPException 404: When an interface is not found.
+        HTTPException 409: When an interface is already in use.
+    """
+    validator = LinkValidator(await get_topology_index(session))
+    try:
+        validator.check(link_data.a_interface_id, link_data.b_interface_id)
+    except LinkValidationError as e:
+        raise HTTPException(status_code=LINK_ERROR_STATUS[e.kind], detail=str(e))
+    
+    link = Link(**link_data.model_dump())
+    session.add(link)
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(status_code=409, detail=INTERFACE_PAIR_TAKEN)
+    await session.refresh(link)
+    return link
+
+
+class BulkLinkCreateRequest(BaseModel):
+    """Request model for creating many links in one transaction"""
+
+    links: list[LinkCreate] = Field(..., max_length=MAX_BATCH_IDS)
+
+
+class BulkLinkError(BaseModel):
+    """A rejected item of a bulk link request"""
+
+    index: int = Field(..., description="Position in the request's `links` list")
+    kind: LinkErrorKind
+    detail: str
+
+
+class BulkLinkCreateResponse(BaseModel):
+    """Result of a bulk link request"""
+
+    created: dict[int, int] = Field(..., description="Request index → new link id")
+    errors: list[BulkLinkError]
+
+
+@api_router.post("/links/bulk", response_model=BulkLinkCreateResponse)
+async def create_links_bulk(
+    data: BulkLinkCreateRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Validate and insert many links in one transaction.
+
+    Each item is checked like `POST /links` (earlier items of the same
+    request count as occupying their interfaces); valid items are inserted
+    with one multi-row INSERT, invalid ones are reported per index.
+    Emits one `links:created` event.
+
+    Raises:
+        HTTPException 409: When a concurrent writer linked one of the pairs first
+            (nothing is inserted).
+    """
+    index = await get_topology_index(session)
+    validator = LinkValidator(index)
+    accepted: list[tuple[int, LinkCreate]] = []
+    errors: list[BulkLinkError] = []
+    for position, link_data in enumerate(data.links):
+        try:
+            validator.check(link_data.a_interface_id, link_data.b_interface_id)
+        except LinkValidationError as e:
+            errors.append(BulkLinkError(index=position, kind=e.kind, detail=str(e)))
+            continue
+        validator.reserve(link_data.a_interface_id, link_data.b_interface_id)
+        accepted.append((position, link_data))
+    
+    created: dict[int, int] = {}
+    if accepted:
+        now = datetime.now(timezone.utc)
+        rows = [
+            {**link_data.model_dump(), "status": Status.DOWN, "created_at": now, "updated_at": now}
+            for _, link_data in accepted
+        ]
+        try:
+            link_ids = (await session.scalars(
+                insert(Link).returning(Link.id, sort_by_parameter_order=True), rows,
+            )).all()
+            await claim_endpoints(session, [
+                (link_id, row["a_interface_id"], row["b_interface_id"]) for link_id, row in zip(link_ids, rows)
+            ])
+            await record_changes(session, "link", link_ids)
+            stage_changes(session, [
+                ("link", LinkEdge(
+                    id=link_id,
+                    a_interface_id=row["a_interface_id"],
+                    b_interface_id=row["b_interface_id"],
+                    status=Status.DOWN,
+                    length_km=row["length_km"],
+                ))
+                for link_id, row in zip(link_ids, rows)
+            ])
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            raise HTTPException(status_code=409, detail=INTERFACE_PAIR_TAKEN)
+        created = {position: link_id for (position, _), link_id in zip(accepted, link_ids)}
+        
+        emit = get_emit_function()
+        await emit("links:created", {"ids": list(created.values())})
+    
+    return BulkLinkCreateResponse(created=created, errors=errors)
+
+
+@api_router.delete("/links/{link_id}", status_code=204)
+async def delete_link(link_id: int, session: AsyncSession = Depends(get_session)):
+    """Delete link"""
+    link = await session.get(Link, link_id)
+    if not link:
+        raise HTTPException(status_code=404, detail="Link not found")
+    
+    deleted_id = link.id
+    
+    await session.delete(link)
+    await session.commit()
+    
+    # Emit WebSocket event
+    emit = get_emit_function()
+    await emit("link:deleted", {"id": deleted_id})
+    
+    return None
+
+
+# ==========================================
+# SIMPLE LINK CREATION (with auto-interface)
+# ==========================================
+
+
+class SimpleLinkCreate(BaseModel):
+    device_a_id: int
+    device_b_id: int
+    link_type: str  # "fiber", "copper", "wireless"
+    status: str = "UP"
+
+
+@api_router.post("/links/create-simple")
+async def create_simple_link(
+    data: SimpleLinkCreate,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Create a link between two devices with automatic interface creation.
+    
+    This is a convenience endpoint that:
+    1. Creates an interface on device A
+    2. Creates an interface on device B
+    3. Creates a link between those interfaces
+    4. Emits WebSocket events for real-time updates
     """
     # Validate devices exist
     device_a = await session.get(Device, data.device_a_id)
@@ -568,9 +1465,11 @@ async def create_simple_link(
     if not device_b:
         raise HTTPException(status_code=404, detail=f"Device B (id={data.device_b_id}) not found")
     
-    # Don't allow linking device to itself
-    if device_a.id == device_b.id:
-        raise HTTPException(status_code=400, detail="Cannot link device to itself")
+    # Don't allow linking device to itself; enforce L1-L9 by device type
+    try:
+        LinkValidator(await get_topology_index(session)).check_devices(device_a.id, device_b.id)
+    except LinkValidationError as e:
+        raise HTTPException(status_code=LINK_ERROR_STATUS[e.kind], detail=str(e))
     
     # Map link_type to interface_type
     # Available types: ETHERNET, OPTICAL, LOOPBACK
@@ -639,14 +1538,942 @@ async def create_simple_link(
     }
 
 
+# ==========================================
+# REFERENCE DATA (static, cacheable)
+# ==========================================
+
+
+def _static_payload(payload: dict) -> tuple[dict, str]:
+    """Pair a constant payload with a content-hash ETag (computed once at import)."""
+    digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+    return payload, f'"{digest}"'
+
+
+_ENUMS, _ENUMS_ETAG = _static_payload({
+    "device_types": [t.value for t in DeviceType],
+    "statuses": [s.value for s in Status],
+    "interface_types": [t.value for t in InterfaceType],
+    "link_types": [t.value for t in LinkType],
+})
+
+_LINK_RULES, _LINK_RULES_ETAG = _static_payload({
+    "rules": [
+        {
+            "link_type": rule.link_type.value,
+            "device_a_type": rule.device_a_type.value,
+            "device_b_type": rule.device_b_type.value,
+            "bidirectional": rule.bidirectional,
+            "description": rule.description,
+        }
+        for rule in LINK_RULES
+    ],
+    "passive_device_types": sorted(t.value for t in PASSIVE_DEVICE_TYPES),
+    "peer_to_peer_allowed": sorted(t.value for t in PEER_TO_PEER_ALLOWED),
+    "container_device_types": sorted(t.value for t in CONTAINER_DEVICE_TYPES),
+})
+
+
+@api_router.get("/meta/enums")
+async def get_enums(request: Request, response: Response):
+    """Enum values (device types, statuses, interface and link types); cacheable for an hour."""
+    if (not_modified := conditional_response(request, response, _ENUMS_ETAG, STATIC_CACHE_CONTROL)) is not None:
+        return not_modified
+    return _ENUMS
+
+
+@api_router.get("/link-rules")
+async def get_link_rules(request: Request, response: Response):
+    """L1-L9 link rules from `backend/constants/link_rules.py`; cacheable for an hour."""
+    if (not_modified := conditional_response(request, response, _LINK_RULES_ETAG, STATIC_CACHE_CONTROL)) is not None:
+        return not_modified
+    return _LINK_RULES
+
+
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss metrics of the entity cache and the list single-flight layer."""
+    return {
+        "entities": entity_cache.stats(),
+        "single_flight": {"executions": read_coalescer.executions, "coalesced": read_coalescer.coalesced},
+    }
+
+
+# ==========================================
+# CHANGES (DELTA SYNC)
+# ==========================================
+
+
+class DeletedIdsResponse(BaseModel):
+    """Ids removed since the requested sequence"""
+    
+    devices: list[int]
+    interfaces: list[int]
+    links: list[int]
+
+
+class ChangesResponse(BaseModel):
+    """Everything that changed after `since`"""
+    
+    since: Optional[int] = None
+    seq: int = Field(..., description="Pass as `since` on the next call")
+    reset: bool = Field(..., description="True: drop local state and reload everything")
+    has_more: bool = Field(..., description="True: more changes are pending, call again with `seq`")
+    devices: list[DeviceResponse]
+    interfaces: list[InterfaceResponse]
+    links: list[LinkResponse]
+    deleted: DeletedIdsResponse
+
+
+@api_router.get("/changes", response_model=ChangesResponse)
+async def get_changes(
+    since: Optional[int] = Query(None, ge=0, description="Last sequence number the client has seen"),
+    limit: int = Query(DEFAULT_CHANGES_LIMIT, ge=1, le=50000, description="Max change-log entries per call"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Delta sync: current rows for everything upserted and ids of everything
+    deleted after `since`.
+
+    Without `since` only the current sequence is returned; clients read it
+    before their initial full load and poll from there. After a reconnect the
+    cost scales with the number of changes, not with the network size.
+    """
+    if since is None:
+        seq = await current_seq(session)
+        return {
+            "since": None, "seq": seq, "reset": False, "has_more": False,
+            "devices": [], "interfaces": [], "links": [],
+            "deleted": {"devices": [], "interfaces": [], "links": []},
+        }
+    return await changes_since(session, since, limit)
+
+
+# ==========================================
+# CONTAINERS
+# ==========================================
+
+
+class ContainerContentsResponse(BaseModel):
+    """Devices nested in a POP/CORE_SITE container"""
+    
+    container_id: int
+    recursive: bool
+    count: int = Field(..., description="Number of contained devices")
+    counts_by_type: dict[str, int]
+    devices: list[DeviceResponse] = Field(default_factory=list)
+
+
+@api_router.get("/containers/{container_id}/contents", response_model=ContainerContentsResponse)
+async def get_container_contents(
+    container_id: int,
+    recursive: bool = Query(False, description="Include nested containers' contents"),
+    include_devices: bool = Query(True, description="Set false to return counts only"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    List everything inside a container.
+
+    Membership and counts come from the in-memory ancestor index (maintained on
+    create, delete and re-parent), so audits never run recursive queries; the
+    device rows themselves are loaded with one `IN` query.
+
+    Raises:
+        HTTPException 400: When the device is not a POP/CORE_SITE.
+        HTTPException 404: When the container is not found.
+    """
+    index = await get_topology_index(session)
+    container = index.devices.get(container_id)
+    if container is None:
+        raise HTTPException(status_code=404, detail="Container not found")
+    if container.device_type not in CONTAINER_DEVICE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Device {container_id} is not a container")
+    
+    member_ids = index.contents(container_id, recursive=recursive)
+    counts_by_type: dict[str, int] = {}
+    for member_id in member_ids:
+        device_type = index.devices[member_id].device_type.value
+        counts_by_type[device_type] = counts_by_type.get(device_type, 0) + 1
+    
+    devices = []
+    if include_devices and member_ids:
+        result = await session.execute(
+            select(Device).where(Device.id.in_(member_ids)).order_by(Device.id)
+        )
+        devices = result.scalars().all()
+    
+    return ContainerContentsResponse(
+        container_id=container_id,
+        recursive=recursive,
+        count=len(member_ids),
+        counts_by_type=counts_by_type,
+        devices=[DeviceResponse.model_validate(device) for device in devices],
+    )
+
+
+@api_router.delete("/containers/{container_id}", response_model=BulkDeleteResponse)
+async def delete_container(
+    container_id: int,
+    recursive: bool = Query(False, description="Also delete everything nested inside"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Decommission a POP/CORE_SITE in one set-based transaction.
+
+    With `recursive=true` the whole subtree (from the in-memory closure index)
+    goes with it; otherwise direct children are detached.
+
+    Raises:
+        HTTPException 400: When the device is not a POP/CORE_SITE.
+        HTTPException 404: When the container is not found.
+    """
+    index = await get_topology_index(session)
+    container = index.devices.get(container_id)
+    if container is None:
+        raise HTTPException(status_code=404, detail="Container not found")
+    if container.device_type not in CONTAINER_DEVICE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Device {container_id} is not a container")
+    
+    device_ids = [container_id]
+    if recursive:
+        device_ids += index.contents(container_id, recursive=True)
+    result = await _bulk_delete(session, device_ids)
+    return BulkDeleteResponse(**result.to_dict())
+
+
+# ==========================================
+# TOPOLOGY - AGGREGATED (LEVEL OF DETAIL)
+# ==========================================
+
+
+class ClusterNodeResponse(BaseModel):
+    """Visible node of an aggregated view (single device or collapsed cluster)"""
+    
+    id: str = Field(..., description="Cluster key, e.g. 'device:7', 'subtree:3', 'container:1'")
+    kind: str = Field(..., description="device | subtree | container")
+    anchor_id: int = Field(..., description="Device the cluster is anchored at (OLT, container, ...)")
+    name: Optional[str] = None
+    device_type: Optional[DeviceType] = None
+    count: int = Field(..., description="Number of devices folded into this node")
+    status: Status = Field(..., description="Worst-case effective status of the members")
+    status_counts: dict[str, int]
+    x: float
+    y: float
+
+
+class LinkBundleResponse(BaseModel):
+    """Parallel links between two visible nodes merged into one edge"""
+    
+    id: str
+    source: str
+    target: str
+    count: int
+    status: Status
+    status_counts: dict[str, int]
+
+
+class AggregatedTopologyResponse(BaseModel):
+    """Level-of-detail topology snapshot"""
+    
+    level: int
+    version: int = Field(..., description="Topology version the snapshot reflects")
+    nodes: list[ClusterNodeResponse]
+    bundles: list[LinkBundleResponse]
+
+
+@api_router.get("/topology/aggregate", response_model=AggregatedTopologyResponse)
+async def get_aggregated_topology(
+    level: Optional[int] = Query(None, ge=1, le=2, description="1 = fold customers into OLT/AON, 2 = also fold containers"),
+    zoom: Optional[float] = Query(None, gt=0, description="Canvas zoom factor; picks the level when `level` is omitted"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Return a collapsed view of the topology for zoomed-out canvases.
+
+    Clusters carry member counts and worst-case status; parallel links between
+    the same two visible nodes are merged into bundles. Aggregates are
+    maintained incrementally, so the cost is proportional to the size of the
+    aggregated graph rather than the full topology.
+    """
+    if level is not None:
+        lod = AggregationLevel(level)
+    elif zoom is not None:
+        lod = level_for_zoom(zoom)
+    else:
+        lod = AggregationLevel.SUBTREE
+    
+    await get_topology_index(session)
+    return topology_aggregator.snapshot(lod)
+
+
+# ==========================================
+# TOPOLOGY - PATHS
+# ==========================================
+
+
+class PathResponse(BaseModel):
+    """One device/link sequence between two devices"""
+    
+    device_ids: list[int]
+    link_ids: list[int]
+    cost: float = Field(..., description="Sum of the link weights along the path")
+    hops: int
+
+
+class PathsResponse(BaseModel):
+    """Result of a path query"""
+    
+    source: int
+    target: int
+    k: int
+    weight: PathWeight
+    version: int = Field(..., description="Topology version the paths were computed on")
+    paths: list[PathResponse] = Field(..., description="Link-disjoint paths, cheapest first")
+
+
+@api_router.get("/paths", response_model=PathsResponse)
+async def get_paths(
+    source: int = Query(..., alias="from", description="Start device id"),
+    target: int = Query(..., alias="to", description="End device id"),
+    k: int = Query(1, ge=1, le=MAX_DISJOINT_PATHS, description="Number of link-disjoint paths wanted"),
+    weight: PathWeight = Query(PathWeight.HOPS, description="hops | length_km | link_loss_db"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Shortest path (k=1) or up to k link-disjoint paths between two devices.
+    
+    Computed from the in-memory topology index; results are memoized until
+    the topology changes. An empty `paths` list means the devices are not
+    connected; fewer than `k` paths means there is less redundancy than asked.
+    
+    Raises:
+        HTTPException 400: When `from` and `to` are the same device.
+        HTTPException 404: When a device is not found.
+    """
+    index = await get_topology_index(session)
+    try:
+        paths = path_finder.find(source, target, k, weight)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Device {e.args[0]} not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PathsResponse(
+        source=source,
+        target=target,
+        k=k,
+        weight=weight,
+        version=index.version,
+        paths=[path.to_dict() for path in paths],
+    )
+
+
+# ==========================================
+# ANALYSIS - RESILIENCE
+# ==========================================
+
+
+class SpofDeviceResponse(BaseModel):
+    """Device whose loss cuts customers off the backbone (articulation point)"""
+    
+    device_id: int
+    name: str
+    device_type: DeviceType
+    affected_customers: int
+
+
+class SpofLinkResponse(BaseModel):
+    """Link whose loss cuts customers off the backbone (bridge)"""
+    
+    link_id: int
+    a_device_id: int
+    b_device_id: int
+    affected_customers: int
+
+
+class SpofResponse(BaseModel):
+    """Single-point-of-failure report"""
+    
+    version: int = Field(..., description="Topology version the report was computed on")
+    duration_ms: float = Field(..., description="Time the last computation took")
+    customers_total: int
+    customers_unreachable: int = Field(..., description="Customers already without a path to a BACKBONE_GATEWAY")
+    articulation_points: list[SpofDeviceResponse]
+    bridges: list[SpofLinkResponse]
+
+
+@api_router.get("/analysis/spof", response_model=SpofResponse)
+async def get_spof_report(
+    device_type: Optional[list[DeviceType]] = Query(None, description="Only report devices of these types"),
+    limit: Optional[int] = Query(None, ge=1, description="Keep the N entries with most affected customers"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Devices (articulation points) and links (bridges) whose loss would cut
+    customers off from every BACKBONE_GATEWAY, most affected customers first.
+    
+    The report is recomputed only when links or devices were added, removed
+    or re-pointed since the last call.
+    """
+    index = await get_topology_index(session)
+    report = spof_analyzer.report()
+    
+    devices = [
+        SpofDeviceResponse(
+            device_id=device_id,
+            name=index.devices[device_id].name,
+            device_type=index.devices[device_id].device_type,
+            affected_customers=affected,
+        )
+        for device_id, affected in report.articulation_points.items()
+        if not device_type or index.devices[device_id].device_type in device_type
+    ]
+    links = [
+        SpofLinkResponse(
+            link_id=link_id,
+            a_device_id=index.links[link_id].a_device_id,
+            b_device_id=index.links[link_id].b_device_id,
+            affected_customers=affected,
+        )
+        for link_id, affected in report.bridges.items()
+    ]
+    devices.sort(key=lambda entry: (-entry.affected_customers, entry.device_id))
+    links.sort(key=lambda entry: (-entry.affected_customers, entry.link_id))
+    return SpofResponse(
+        version=report.version,
+        duration_ms=report.duration_ms,
+        customers_total=report.customers_total,
+        customers_unreachable=report.customers_unreachable,
+        articulation_points=devices[:limit],
+        bridges=links[:limit],
+    )
+
+
+class OrphanDeviceResponse(BaseModel):
+    """Device without a path to any BACKBONE_GATEWAY"""
+    
+    id: int
+    name: str
+    device_type: DeviceType
+    status: Status
+
+
+class OrphanComponentResponse(BaseModel):
+    """Connected group of devices cut off from the backbone"""
+    
+    component_id: int
+    size: int
+    customers: int = Field(..., description="ONT / BUSINESS_ONT / AON_CPE in the component")
+    devices: list[OrphanDeviceResponse]
+
+
+class OrphansResponse(BaseModel):
+    """Devices with no path to a BACKBONE_GATEWAY, grouped by component"""
+    
+    version: int
+    orphan_devices: int
+    components: list[OrphanComponentResponse]
+
+
+@api_router.get("/analysis/orphans", response_model=OrphansResponse)
+async def get_orphans(
+    limit: Optional[int] = Query(None, ge=1, description="Keep the N largest components"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    List devices that cannot reach any BACKBONE_GATEWAY (e.g. provisioned
+    with `validate_upstream=false`, or whose uplink was deleted), grouped by
+    connected component, largest first. Containers are not listed.
+    
+    Components are tracked incrementally, so the cost is proportional to
+    the number of orphaned devices returned.
+    """
+    index = await get_topology_index(session)
+    components = component_tracker.orphaned_components()
+    result = []
+    for component in components[:limit]:
+        nodes = sorted((index.devices[device_id] for device_id in component.members), key=lambda node: node.id)
+        result.append(OrphanComponentResponse(
+            component_id=component.id,
+            size=len(nodes),
+            customers=sum(1 for node in nodes if node.device_type in CUSTOMER_DEVICE_TYPES),
+            devices=[
+                OrphanDeviceResponse(
+                    id=node.id, name=node.name, device_type=node.device_type, status=node.effective_status,
+                )
+                for node in nodes
+            ],
+        ))
+    return OrphansResponse(
+        version=index.version,
+        orphan_devices=sum(len(component.members) for component in components),
+        components=result,
+    )
+
+
+# ==========================================
+# ANALYSIS - AVAILABILITY / SLA
+# ==========================================
+
+
+class SlaComputeRequest(BaseModel):
+    """Request model for computing a monthly SLA report"""
+    
+    month: str = Field(..., description="YYYY-MM (UTC); the current month is computed up to now")
+    device_types: list[DeviceType] = Field(default_factory=lambda: list(SLA_DEVICE_TYPES), min_length=1)
+    target: float = Field(DEFAULT_SLA_TARGET, gt=0, le=100, description="Availability target in percent")
+
+
+class SlaDeviceResponse(BaseModel):
+    """Availability of one customer device"""
+    
+    device_id: int
+    name: Optional[str]
+    availability: Optional[float] = Field(..., description="Percent; null when nothing was measured")
+    measured_minutes: float
+    downtime_minutes: float
+    local_downtime_minutes: float = Field(..., description="Downtime while nothing upstream was down")
+
+
+class SlaContainerResponse(BaseModel):
+    """Customer-time weighted availability of the customers inside a container"""
+    
+    container_id: int
+    name: Optional[str]
+    customers: int
+    availability: Optional[float]
+    downtime_minutes: float = Field(..., description="Customer-minutes of downtime")
+
+
+class SlaRootCauseResponse(BaseModel):
+    """Device that caused customer downtime (the most upstream device that was DOWN)"""
+    
+    device_id: int
+    name: Optional[str]
+    device_type: Optional[DeviceType]
+    customer_minutes: float
+
+
+class SlaReportResponse(BaseModel):
+    """Monthly availability report"""
+    
+    month: str
+    start: datetime
+    end: datetime
+    device_types: list[DeviceType]
+    target: float
+    computed_at: datetime
+    duration_ms: float
+    customers: int
+    availability: Optional[float] = Field(..., description="Customer-time weighted, percent")
+    breaches: int = Field(..., description="Customers below the target")
+    worst: list[SlaDeviceResponse] = Field(..., description="Lowest availability first")
+    containers: list[SlaContainerResponse] = Field(..., description="Lowest availability first")
+    root_causes: list[SlaRootCauseResponse] = Field(..., description="Most customer-minutes first")
+
+
+def _percent(value: Optional[float]) -> Optional[float]:
+    return None if value is None or value != value else round(value, 4)  # NaN → null
+
+
+async def _sla_job(ctx: JobContext, month: str, device_types: list[str], target: float) -> dict:
+    """Job handler: compute a monthly SLA report and keep it in memory."""
+    await ctx.progress(0.1, f"Computing availability for {month}")
+    async with ctx.session() as session:
+        report = await sla_engine.compute(session, month, [DeviceType(t) for t in device_types], target)
+    return report.summary()
+
+
+job_manager.register("sla", _sla_job)
+
+
+@api_router.post("/sla/compute", status_code=202)
+async def compute_sla_report(data: SlaComputeRequest):
+    """
+    Queue the computation of a monthly availability report (202 + job record).
+    
+    Availability is derived from the status history: a customer is down
+    while it or any device on its upstream chain to the backbone is DOWN,
+    and each outage is attributed to the most upstream DOWN device (see
+    `backend/services/sla.py`). Fetch the result with `GET /sla/{month}`
+    once the job finished.
+    
+    Raises:
+        HTTPException 400: When `month` is malformed or has not started yet.
+    """
+    try:
+        month_period(data.month)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = await job_manager.submit(
+        "sla", month=data.month, device_types=[t.value for t in data.device_types], target=data.target,
+    )
+    return {"message": "SLA job queued", "job": job.to_dict()}
+
+
+@api_router.get("/sla/{month}", response_model=SlaReportResponse)
+async def get_sla_report(
+    month: str,
+    limit: int = Query(50, ge=1, le=10_000, description="Entries per list"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Latest computed availability report of a month.
+    
+    Raises:
+        HTTPException 404: When no report was computed for the month.
+    """
+    report = sla_engine.get(month)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"No SLA report for {month}; POST /api/sla/compute first")
+    index = await get_topology_index(session)
+    
+    def name(device_id: int) -> Optional[str]:
+        node = index.devices.get(device_id)
+        return node.name if node is not None else None
+    
+    availability = report.availability
+    return SlaReportResponse(
+        month=report.month,
+        start=report.start,
+        end=report.end,
+        device_types=list(report.device_types),
+        target=report.target,
+        computed_at=report.computed_at,
+        duration_ms=round(report.duration_ms, 1),
+        customers=len(report.device_ids),
+        availability=_percent(report.overall),
+        breaches=report.breaches,
+        worst=[
+            SlaDeviceResponse(
+                device_id=int(report.device_ids[i]),
+                name=name(int(report.device_ids[i])),
+                availability=_percent(float(availability[i])),
+                measured_minutes=round(float(report.measured[i]) / 60, 3),
+                downtime_minutes=round(float(report.downtime[i]) / 60, 3),
+                local_downtime_minutes=round(float(report.local_downtime[i]) / 60, 3),
+            )
+            for i in report.worst(limit)
+        ],
+        containers=[
+            SlaContainerResponse(
+                container_id=container_id,
+                name=name(container_id),
+                customers=customers,
+                availability=_percent(availability_pct),
+                downtime_minutes=round(downtime / 60, 3),
+            )
+            for container_id, customers, availability_pct, downtime in report.worst_containers(limit)
+        ],
+        root_causes=[
+            SlaRootCauseResponse(
+                device_id=device_id,
+                name=name(device_id),
+                device_type=index.devices[device_id].device_type if device_id in index.devices else None,
+                customer_minutes=round(seconds / 60, 3),
+            )
+            for device_id, seconds in report.top_root_causes(limit)
+        ],
+    )
+
+
+# ==========================================
+# TOPOLOGY - SERVER-SIDE LAYOUT
+# ==========================================
+
+
+class LayoutRequest(BaseModel):
+    """Request model for computing device positions on the server"""
+    
+    mode: Literal["incremental", "full"] = Field(
+        "incremental",
+        description="incremental: place only new/listed devices; full: re-layout everything",
+    )
+    device_ids: Optional[list[int]] = Field(
+        None,
+        description="Devices to place in incremental mode (default: all devices at the origin)",
+    )
+    iterations: int = Field(50, ge=0, le=500, description="Force refinement iterations")
+    background: bool = Field(False, description="Run as a background job and return 202 with the job")
+
+
+async def _layout_job(ctx: JobContext, mode: str, device_ids: Optional[list[int]], iterations: int) -> dict:
+    """Job handler: compute and persist a layout outside the request."""
+    await ctx.progress(0.1, "Computing layout")
+    async with ctx.session() as session:
+        moved = await LayoutService(session).apply_layout(
+            mode=mode, device_ids=device_ids, iterations=iterations,
+        )
+    if moved:
+        emit = get_emit_function()
+        await emit("layout:applied", {"mode": mode, "count": len(moved)})
+    return {"count": len(moved)}
+
+
+job_manager.register("layout", _layout_job)
+
+
+@api_router.post("/topology/layout")
+async def compute_topology_layout(
+    data: LayoutRequest,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Compute positions server-side and persist them with one bulk UPDATE.
+
+    The hierarchical/force layout runs in the worker process pool, so the event
+    loop stays responsive. Emits `layout:applied` with the number of moved
+    devices; clients refetch positions via `GET /api/devices`. With
+    `background=true` the work is queued as a job (202 + job record).
+    """
+    if data.background:
+        job = await job_manager.submit(
+            "layout", mode=data.mode, device_ids=data.device_ids, iterations=data.iterations,
+        )
+        response.status_code = 202
+        return {"message": "Layout job queued", "job": job.to_dict()}
+    
+    service = LayoutService(session)
+    moved = await service.apply_layout(
+        mode=data.mode,
+        device_ids=data.device_ids,
+        iterations=data.iterations,
+    )
+    
+    if moved:
+        emit = get_emit_function()
+        await emit("layout:applied", {"mode": data.mode, "count": len(moved)})
+    
+    return {
+        "message": f"Layout applied to {len(moved)} devices",
+        "positions": {str(device_id): {"x": x, "y": y} for device_id, (x, y) in moved.items()},
+    }
+
+
+# ==========================================
+# TOPOLOGY - BULK IMPORT
+# ==========================================
+
+
+async def _spool_request_body(request: Request, suffix: str) -> str:
+    """Write the raw request body to a temporary file chunk by chunk; returns its path."""
+    fd, path = tempfile.mkstemp(prefix="unoc-upload-", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            async for chunk in request.stream():
+                spool.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+async def _import_job(ctx: JobContext, path: str, fmt: str, batch_size: int) -> dict:
+    """Job handler: stream an uploaded topology file into the database."""
+    try:
+        async with ctx.session() as session:
+            importer = TopologyImporter(session, batch_size=batch_size, progress=ctx.progress)
+            report = await importer.run(path, fmt)
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+    
+    emit = get_emit_function()
+    await emit("topology:imported", {
+        "devices_created": report.devices_created,
+        "links_created": report.links_created,
+    })
+    return report.to_dict()
+
+
+job_manager.register("topology-import", _import_job)
+
+
+@api_router.post("/import", status_code=202)
+async def import_topology(
+    request: Request,
+    fmt: Literal["jsonl", "csv", "graphml"] = Query(..., alias="format", description="Upload format"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=50000, description="Rows per INSERT/commit"),
+):
+    """
+    Bulk-import devices and links from a JSON Lines, CSV or GraphML upload.
+
+    Send the file as the raw request body. It is spooled to a temporary file
+    chunk by chunk and imported by a background job; poll
+    `GET /api/jobs/{id}` for progress and the final report (created counts
+    and per-row errors). See `backend/services/topology_import.py` for the
+    record fields.
+    """
+    path = await _spool_request_body(request, suffix=f".{fmt}")
+    try:
+        job = await job_manager.submit("topology-import", path=path, fmt=fmt, batch_size=batch_size)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return {"message": "Import queued", "job": job.to_dict()}
+
+
+# ==========================================
+# TOPOLOGY - BINARY SNAPSHOT (BACKUP / RESTORE)
+# ==========================================
+
+
+@api_router.get("/topology/export")
+async def export_topology(session_factory=Depends(get_session_factory)):
+    """
+    Stream a gzip-compressed binary snapshot of all devices, interfaces and links.
+
+    The body is produced block by block from a server-side cursor, so memory
+    stays flat for any topology size. Restore with `POST /api/topology/import`.
+    """
+    async def body():
+        async with session_factory() as session:
+            async for chunk in export_snapshot(session):
+                yield chunk
+    
+    filename = f"unoc-topology-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.unocsnap"
+    return StreamingResponse(
+        body(),
+        media_type=SNAPSHOT_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _restore_job(ctx: JobContext, path: str) -> dict:
+    """Job handler: replace the topology with an uploaded snapshot."""
+    raw_path = f"{path}.raw"
+    try:
+        await ctx.progress(0.0, "Decompressing snapshot")
+        await asyncio.to_thread(decompress_to_file, path, raw_path)
+        async with ctx.session() as session:
+            counts = await import_snapshot(session, raw_path, progress=ctx.progress)
+    finally:
+        for leftover in (path, raw_path):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+    
+    emit = get_emit_function()
+    await emit("topology:imported", {
+        "devices_created": counts["devices"],
+        "links_created": counts["links"],
+    })
+    return counts
+
+
+job_manager.register("topology-restore", _restore_job)
+
+
+@api_router.post("/topology/import", status_code=202)
+async def import_topology_snapshot(request: Request):
+    """
+    Restore a snapshot produced by `GET /api/topology/export`.
+
+    Send the snapshot as the raw request body. The upload is spooled to disk,
+    the header is checked, and a background job replaces the whole topology
+    (ids preserved) in a single transaction.
+
+    Raises:
+        HTTPException 400: When the body is not a snapshot (schema mismatches
+            fail the job instead).
+    """
+    path = await _spool_request_body(request, suffix=".unocsnap")
+    try:
+        await asyncio.to_thread(check_snapshot_file, path)
+        job = await job_manager.submit("topology-restore", path=path)
+    except SnapshotError as e:
+        os.unlink(path)
+        raise HTTPException(status_code=400, detail=str(e))
+    except BaseException:
+        os.unlink(path)
+        raise
+    return {"message": "Restore queued", "job": job.to_dict()}
+
+
+# ==========================================
+# BACKGROUND JOBS
+# ==========================================
+
+
+class JobResponse(BaseModel):
+    """Status of a background job"""
+    
+    id: str
+    kind: str
+    state: str = Field(..., description="PENDING, RUNNING, SUCCEEDED, FAILED or CANCELLED")
+    progress: float = Field(..., description="0.0 - 1.0")
+    message: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+@api_router.get("/jobs", response_model=list[JobResponse])
+async def list_jobs(limit: int = Query(50, ge=1, le=500)):
+    """List the most recent background jobs, newest first."""
+    return [job.to_dict() for job in job_manager.list(limit)]
+
+
+@api_router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    Fetch the status of a background job.
+
+    Live progress is also pushed via Socket.IO `job:progress` / `job:finished`.
+
+    Raises:
+        HTTPException 404: When the job is not found.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@api_router.delete("/jobs/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    """
+    Cancel a pending or running job.
+
+    Raises:
+        HTTPException 404: When the job is not found.
+        HTTPException 409: When the job already finished.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    try:
+        await job_manager.cancel(job_id)
+    except JobError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return job.to_dict()
+
+
 # ==========================================
 # SEED / DEMO DATA
 # ==========================================
 
 
-@api_router.post("/seed", status_code=201)
-async def seed_database(session: AsyncSession = Depends(get_session)):
-    """Clear database and seed with demo topology"""
-    await clear_all_data(session)
-    await seed_demo_topology(session)
+async def _seed_job(ctx: JobContext) -> dict:
+    """Job handler: wipe the database and load the demo topology."""
+    async with ctx.session() as session:
+        await ctx.progress(0.1, "Clearing existing data")
+        await clear_all_data(session)
+        await ctx.progress(0.5, "Seeding demo topology")
+        await seed_demo_topology(session)
     return {"message": "Database seeded successfully"}
+
+
+job_manager.register("seed", _seed_job)
+
+
+@api_router.post("/seed", status_code=202)
+async def seed_database():
+    """
+    Clear database and seed with demo topology.
+
+    Runs as a background job; poll `GET /api/jobs/{id}` or listen for
+    `job:finished`.
+    """
+    job = await job_manager.submit("seed")
+    return {"message": "Seeding started", "job": job.to_dict()}
@@ -0,0 +1,99 @@
+"""
+Benchmark - Device List Serialization (ORM + response_model vs fast path)
+
+Builds an in-memory SQLite topology and times both ways of producing the
+`GET /api/devices` body:
+
+* standard: `select(Device)` → ORM objects → `DeviceResponse` validation →
+  `jsonable_encoder` → stdlib `json` (what FastAPI does for `response_model`)
+* fast: column tuples → dicts → `backend.services.fast_json.dumps`
+
+Usage:
+    python -m backend.benchmarks.list_serialization --devices 100000 --repeat 3
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+
+from backend.models.core import Device, DeviceResponse, DeviceType, Status
+from backend.services import fast_json
+
+DEVICE_LIST = TypeAdapter(list[DeviceResponse])
+
+
+async def populate(session: AsyncSession, count: int) -> None:
+    types = list(DeviceType)
+    statuses = list(Status)
+    rows = [
+        {
+            "name": f"dev-{i}",
+            "device_type": random.choice(types),
+            "status": random.choice(statuses),
+            "x": random.uniform(0, 5000),
+            "y": random.uniform(0, 5000),
+            "tx_power_dbm": 3.0 if i % 3 == 0 else None,
+        }
+        for i in range(count)
+    ]
+    for start in range(0, count, 10_000):
+        await session.execute(insert(Device), rows[start:start + 10_000])
+    await session.commit()
+
+
+async def standard_path(session: AsyncSession) -> bytes:
+    devices = (await session.execute(select(Device).order_by(Device.id))).scalars().all()
+    validated = DEVICE_LIST.validate_python(devices, from_attributes=True)
+    content = jsonable_encoder(DEVICE_LIST.dump_python(validated, mode="json"))
+    return JSONResponse(content).body
+
+
+async def fast_path(session: AsyncSession) -> bytes:
+    rows = await fast_json.fetch_rows(session, Device, DeviceResponse)
+    return fast_json.dumps(rows)
+
+
+async def timed(factory, fn, repeat: int) -> tuple[float, bytes]:
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        async with factory() as session:  # fresh identity map per run
+            started = time.perf_counter()
+            body = await fn(session)
+            best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+async def main(count: int, repeat: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with factory() as session:
+        await populate(session, count)
+
+    encoder = "orjson" if fast_json.orjson is not None else "stdlib json"
+    standard, standard_body = await timed(factory, standard_path, repeat)
+    fast, fast_body = await timed(factory, fast_path, repeat)
+
+    print(f"{count} devices, best of {repeat}")
+    print(f"  standard (ORM + response_model + json): {standard * 1000:8.1f} ms  {len(standard_body)} bytes")
+    print(f"  fast (columns + {encoder}):{' ' * max(0, 13 - len(encoder))} {fast * 1000:8.1f} ms  {len(fast_body)} bytes")
+    print(f"  speedup: {standard / fast:.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.devices, args.repeat))
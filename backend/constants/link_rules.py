@@ -35,6 +35,7 @@ LINK TYPE DEFINITIONS:
 
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 from backend.models.core import DeviceType
@@ -176,11 +177,31 @@ PEER_TO_PEER_ALLOWED = {
     DeviceType.EDGE_ROUTER,  # Edge redundancy
 }
 
+# Access layer (L3/L4 downstream end) - anchors of customer subtrees
+ACCESS_DEVICE_TYPES = {
+    DeviceType.OLT,
+    DeviceType.AON_SWITCH,
+}
+
+# Last mile (L5-L7 downstream end) - customer premise equipment
+CUSTOMER_DEVICE_TYPES = {
+    DeviceType.ONT,
+    DeviceType.BUSINESS_ONT,
+    DeviceType.AON_CPE,
+}
+
+# Containers - group devices via Device.parent_container_id
+CONTAINER_DEVICE_TYPES = {
+    DeviceType.POP,
+    DeviceType.CORE_SITE,
+}
+
 
 # ==========================================
 # VALIDATION FUNCTIONS
 # ==========================================
 
+@lru_cache(maxsize=None)  # pure function of two enums - a lookup after the first call
 def validate_link_between_devices(
     device_a_type: DeviceType,
     device_b_type: DeviceType,
@@ -273,6 +294,30 @@ def get_allowed_downstream_types(device_type: DeviceType) -> set[DeviceType]:
     return allowed
 
 
+def get_hierarchy_tiers() -> dict[DeviceType, int]:
+    """
+    Derive a layer index per device type from the L1-L7 hierarchy.
+
+    BACKBONE_GATEWAY is tier 0; each rule places `device_b_type` one tier
+    below `device_a_type` (shortest distance wins). Passive and container
+    types are not part of L1-L7 and are therefore absent from the result.
+
+    Returns:
+        Mapping of device type to tier (0 = top of the hierarchy)
+    """
+    tiers = {DeviceType.BACKBONE_GATEWAY: 0}
+    frontier = [DeviceType.BACKBONE_GATEWAY]
+    while frontier:
+        next_frontier = []
+        for device_type in frontier:
+            for rule in LINK_RULES:
+                if rule.device_a_type == device_type and rule.device_b_type not in tiers:
+                    tiers[rule.device_b_type] = tiers[device_type] + 1
+                    next_frontier.append(rule.device_b_type)
+        frontier = next_frontier
+    return tiers
+
+
 def get_link_type_description(link_type: LinkType) -> str:
     """Get human-readable description of link type"""
     descriptions = {
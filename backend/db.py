@@ -6,10 +6,14 @@ import os
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import SQLModel
 
+from backend.services.link_validation import migrate_link_endpoints
+
 # Database URL from environment
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -23,6 +27,28 @@ engine = create_async_engine(
     future=True,
 )
 
+
+
+def enable_sqlite_foreign_keys(async_engine: AsyncEngine) -> None:
+    """
+    Turn on `PRAGMA foreign_keys` for every SQLite connection of `async_engine`.
+
+    SQLite ignores FOREIGN KEY clauses - including the `ON DELETE CASCADE`
+    the delete paths rely on - unless enabled per connection. PostgreSQL
+    always enforces them; this keeps SQLite (tests, local runs) identical.
+    """
+    if async_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+enable_sqlite_foreign_keys(engine)
+
 # Session factory
 async_session = sessionmaker(
     engine,
@@ -32,9 +58,10 @@ async_session = sessionmaker(
 
 
 async def init_db() -> None:
-    """Initialize database - Create all tables"""
+    """Initialize database - Create all tables and migrate older ones"""
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(migrate_link_endpoints)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -61,3 +88,35 @@ async def get_session_context():
     """
     async with async_session() as session:
         yield session
+
+
+def get_session_factory():
+    """
+    Dependency returning a session factory for work that outlives the request.
+
+    Dependencies with `yield` are torn down before a `StreamingResponse` body
+    is produced, so streaming endpoints open their own session:
+
+        async def body():
+            async with session_factory() as session:
+                ...
+    """
+    return get_session_context
+
+
+def sync_identity_map(session: AsyncSession, model: type, rows: list[dict]) -> None:
+    """
+    Copy values written by a bulk UPDATE onto instances already loaded in `session`.
+
+    Bulk statements bypass the unit of work, and sessions are created with
+    `expire_on_commit=False`, so loaded objects would otherwise keep stale values.
+    Each row must contain the primary key under "id".
+    """
+    sync_session = session.sync_session
+    for row in rows:
+        instance = sync_session.identity_map.get(sync_session.identity_key(model, row["id"]))
+        if instance is None:
+            continue
+        for key, value in row.items():
+            if key != "id":
+                set_committed_value(instance, key, value)
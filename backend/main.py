@@ -4,6 +4,8 @@ UNOC Backend - FastAPI Application
 Clean, Simple, Tested.
 """
 
+import asyncio
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -12,15 +14,47 @@ import socketio
 
 from backend.api.routes import api_router
 from backend.db import init_db, get_session_context
+from backend.services.changelog import run_compaction_loop
+from backend.services.entity_cache import CACHE_INVALIDATE_EVENT, entity_cache
+from backend.services.jobs import job_manager
+from backend.services.maintenance import maintenance_scheduler
 from backend.services.seed import seed_if_empty
+from backend.services.workers import shutdown_process_pool
+
+
+class CacheSyncRedisManager(socketio.AsyncRedisManager):
+    """
+    Socket.IO message queue that also carries entity-cache invalidations.
+
+    `cache:invalidate` messages are applied to the local `entity_cache` of
+    every other worker and never forwarded to browsers.
+    """
+
+    async def _handle_emit(self, message):
+        if message.get('event') == CACHE_INVALIDATE_EVENT:
+            if message.get('host_id') != self.host_id:
+                entity_cache.apply_remote(message['data'][0])
+            return
+        await super()._handle_emit(message)
+
+
+def create_client_manager():
+    """Shared message queue for multi-worker deployments (`UNOC_SOCKETIO_MESSAGE_QUEUE`, e.g. redis://)."""
+    url = os.getenv('UNOC_SOCKETIO_MESSAGE_QUEUE')
+    return CacheSyncRedisManager(url) if url else None
 
 
 # Create Socket.IO server
 sio = socketio.AsyncServer(
     async_mode='asgi',
-    cors_allowed_origins=['http://localhost:5173', 'http://localhost:5174']  # Vite dev server (both ports)
+    cors_allowed_origins=['http://localhost:5173', 'http://localhost:5174'],  # Vite dev server (both ports)
+    client_manager=create_client_manager(),
 )
 
+# Cross-process cache invalidation rides on the same queue
+if isinstance(sio.manager, CacheSyncRedisManager):
+    entity_cache.publisher = lambda payload: sio.emit(CACHE_INVALIDATE_EVENT, payload)
+
 # Create Socket.IO ASGI app
 socket_app = socketio.ASGIApp(sio)
 
@@ -38,10 +72,23 @@ async def lifespan(app: FastAPI):
         await seed_if_empty(session)
     print("✅ Seed check complete")
     
+    # Background jobs (re-queues persisted pending jobs when UNOC_JOB_DB is set)
+    await job_manager.start()
+    
+    # Maintenance windows (reloads SCHEDULED/ACTIVE windows, applies overdue boundaries)
+    await maintenance_scheduler.start()
+    
+    # Periodic change-log compaction (delta sync history)
+    compaction_task = asyncio.create_task(run_compaction_loop(get_session_context))
+    
     yield
     
     # Shutdown
     print("👋 Shutting down UNOC Backend...")
+    compaction_task.cancel()
+    await maintenance_scheduler.shutdown()
+    await job_manager.shutdown()
+    shutdown_process_pool()
 
 
 # Create FastAPI app
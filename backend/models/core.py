@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -91,6 +92,7 @@ class Device(SQLModel, table=True):
     """
 
     __tablename__ = "devices"
+    __table_args__ = {"sqlite_autoincrement": True}  # Never reuse ids: status history outlives devices
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True, index=True)
@@ -107,7 +109,8 @@ class Device(SQLModel, table=True):
     insertion_loss_db: Optional[float] = Field(default=None)  # Passive device loss
     
     # Container relationship (nullable - for containment hierarchy)
-    parent_container_id: Optional[int] = Field(default=None, foreign_key="devices.id")
+    # Deleting a container detaches its children
+    parent_container_id: Optional[int] = Field(default=None, foreign_key="devices.id", ondelete="SET NULL")
     
     # Location
     x: float = Field(default=0.0)
@@ -118,9 +121,12 @@ class Device(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
     # Relationships
+    # Interfaces (and their links) are removed by the database cascade
+    # (ondelete="CASCADE"); passive_deletes keeps the ORM from loading them
     interfaces: list["Interface"] = Relationship(
         back_populates="device",
         cascade_delete=True,
+        passive_deletes=True,
     )
 
 
@@ -144,13 +150,16 @@ class Interface(SQLModel, table=True):
     # Relationships
     device: Device = Relationship(back_populates="interfaces")
     
-    # Links (as endpoint A or B)
+    # Links (as endpoint A or B) - deleted by the database cascade, never
+    # loaded or nulled out by the ORM
     links_as_a: list["Link"] = Relationship(
         back_populates="interface_a",
+        passive_deletes="all",
         sa_relationship_kwargs={"foreign_keys": "[Link.a_interface_id]"},
     )
     links_as_b: list["Link"] = Relationship(
         back_populates="interface_b",
+        passive_deletes="all",
         sa_relationship_kwargs={"foreign_keys": "[Link.b_interface_id]"},
     )
 
@@ -191,6 +200,123 @@ class Link(SQLModel, table=True):
     )
 
 
+class LinkEndpoint(SQLModel, table=True):
+    """
+    Interface Occupancy - One Row per Link End
+    
+    The primary key on `interface_id` makes the database reject a second
+    cable on a port, whichever side (a or b) either link uses it on - also
+    for concurrent writers the in-memory checks cannot see. Written with
+    every link by `backend/services/link_validation.py`; removed with the
+    link or the interface.
+    """
+
+    __tablename__ = "link_endpoints"
+
+    interface_id: int = Field(primary_key=True, foreign_key="interfaces.id", ondelete="CASCADE")
+    link_id: int = Field(foreign_key="links.id", ondelete="CASCADE", index=True)
+
+
+# ==========================================
+# CHANGE TRACKING
+# ==========================================
+
+
+class ChangeLogEntry(SQLModel, table=True):
+    """
+    Change Log - One Row per Mutation
+    
+    `seq` is the monotonic change sequence used for delta sync
+    (`GET /api/changes?since=<seq>`); writers are serialized so entries
+    become visible in seq order. Written by the session hooks in
+    `backend/services/changelog.py`; op "reset" marks a point after which
+    clients must reload everything.
+    """
+
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_entity_seq", "entity", "seq"),  # max(seq) per table for ETags
+        {"sqlite_autoincrement": True},  # Never reuse sequence numbers
+    )
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    entity: str  # "device", "interface", "link" ("*" for resets)
+    entity_id: Optional[int] = Field(default=None, index=True)
+    op: str  # "upsert", "delete", "reset"
+    changed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# ==========================================
+# STATUS HISTORY
+# ==========================================
+
+
+class DeviceStatusChange(SQLModel, table=True):
+    """
+    Status History - One Row per Effective-Status Transition
+    
+    Append-only: `status` is the device's effective status (override first)
+    from `changed_at` until the next row of the same device. Written in
+    batches by `backend/services/status_history.py`; range queries use the
+    (device_id, changed_at) index. Times are UTC. `device_id` has no foreign
+    key: rows outlive deleted devices and snapshot restores, so availability
+    of past periods can still be computed.
+    """
+
+    __tablename__ = "device_status_history"
+    __table_args__ = (
+        Index("ix_device_status_history_device_time", "device_id", "changed_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    device_id: int
+    changed_at: datetime
+    status: Status
+
+
+# ==========================================
+# MAINTENANCE WINDOWS
+# ==========================================
+
+
+class MaintenanceState(str, Enum):
+    """Lifecycle of a maintenance window"""
+
+    SCHEDULED = "SCHEDULED"  # waiting for starts_at
+    ACTIVE = "ACTIVE"        # override applied
+    FINISHED = "FINISHED"    # ends_at passed, override cleared
+    CANCELLED = "CANCELLED"  # cancelled by an operator
+
+
+class MaintenanceWindow(SQLModel, table=True):
+    """
+    Scheduled Status Override
+    
+    Between `starts_at` and `ends_at` the devices listed in
+    `maintenance_window_devices` carry `status_override`. Applied and expired
+    by `backend/services/maintenance.py`. Times are UTC.
+    """
+
+    __tablename__ = "maintenance_windows"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    status_override: Status = Field(default=Status.DOWN)
+    reason: Optional[str] = Field(default=None, max_length=255)
+    starts_at: datetime
+    ends_at: datetime
+    state: MaintenanceState = Field(default=MaintenanceState.SCHEDULED, index=True)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class MaintenanceWindowDevice(SQLModel, table=True):
+    """Device covered by a maintenance window"""
+
+    __tablename__ = "maintenance_window_devices"
+
+    window_id: int = Field(foreign_key="maintenance_windows.id", primary_key=True, ondelete="CASCADE")
+    device_id: int = Field(foreign_key="devices.id", primary_key=True, index=True, ondelete="CASCADE")
+
+
 # ==========================================
 # RESPONSE MODELS (for API)
 # ==========================================
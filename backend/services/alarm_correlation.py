@@ -0,0 +1,321 @@
+"""
+Alarm Correlation - One Root Alarm per Outage
+
+When an EDGE_ROUTER drops, every OLT, ONT and CPE behind it turns DOWN too.
+Instead of one event per device, `AlarmCorrelator` sits in front of the
+per-device status events: it collects the committed status transitions
+(`status_history.on_transitions`) for a short window and collapses them into
+alarms on their root-cause device:
+
+* Upstream is defined by the L1-L7 hierarchy (`get_hierarchy_tiers`): the
+  upstream neighbours of a device are linked devices on a lower tier.
+  Passive devices (ODF, splitter, NVT) sit half a tier below the lowest
+  active device they lead to, so a failed splitter is the root of the ONTs
+  behind it.
+* A DOWN device is suppressed when *all* its upstream neighbours are DOWN
+  (a dual-homed router with one uplink left is its own root). Its root is
+  found by walking up through DOWN devices.
+* One `alarm:raised` event per new root carries the suppressed children
+  (count and ids); children joining or recovering later produce at most one
+  `alarm:updated` per root and window. When the root recovers (or is
+  absorbed by a newly failed device further up) `alarm:cleared` is emitted
+  and children that are still DOWN are correlated again.
+
+Per-device status events (`device:updated`, `devices:overridden`) are sent
+through `publish`: events touching a DOWN device wait for the window to
+close, and events of suppressed devices are then dropped (multi-device
+payloads lose the suppressed ids) - the root alarm stands in for them.
+Other events go out at once unless earlier ones are still held, so clients
+always see them in order. Initial status rows of newly created devices are
+not alarms.
+
+Configuration:
+    UNOC_ALARM_WINDOW_SECONDS: Collection window (default 2.0).
+"""
+
+import asyncio
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncContextManager, Callable, Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.constants.link_rules import PASSIVE_DEVICE_TYPES, get_hierarchy_tiers
+from backend.db import get_session_context
+from backend.models.core import Status
+from backend.services.status_history import Transitions, on_transitions
+from backend.services.topology_index import TopologyIndex, get_topology_index, topology_index
+
+PASSIVE_TIER_OFFSET = 0.5  # below the lowest active device a passive chain leads to
+PASSIVE_HOP_OFFSET = 0.001  # per passive hop, so inline passives order among themselves
+
+
+@dataclass
+class Alarm:
+    """Active alarm on a root-cause device."""
+
+    root_id: int
+    raised_at: datetime
+    suppressed: set[int] = field(default_factory=set)
+
+    def to_event(self, index: TopologyIndex, with_ids: bool = False) -> dict:
+        node = index.devices.get(self.root_id)
+        event = {
+            "root_device_id": self.root_id,
+            "name": node.name if node is not None else None,
+            "device_type": node.device_type.value if node is not None else None,
+            "raised_at": self.raised_at.isoformat(),
+            "suppressed_count": len(self.suppressed),
+        }
+        if with_ids:
+            event["suppressed_ids"] = sorted(self.suppressed)
+        return event
+
+
+class _Hierarchy:
+    """Tier and root lookups over the index, memoized for one correlation pass."""
+
+    def __init__(self, index: TopologyIndex, tiers: dict):
+        self.index = index
+        self.tiers = tiers
+        self._tier: dict[int, Optional[float]] = {}
+        self._root: dict[int, int] = {}
+
+    def down(self, device_id: int) -> bool:
+        node = self.index.devices.get(device_id)
+        return node is not None and node.effective_status == Status.DOWN
+
+    def tier(self, device_id: int) -> Optional[float]:
+        if device_id not in self._tier:
+            node = self.index.devices[device_id]
+            if node.device_type in PASSIVE_DEVICE_TYPES:
+                self._tier[device_id] = self._passive_tier(device_id)
+            else:
+                tier = self.tiers.get(node.device_type)
+                self._tier[device_id] = float(tier) if tier is not None else None
+        return self._tier[device_id]
+
+    def _passive_tier(self, device_id: int) -> Optional[float]:
+        # BFS through passive devices to the active ones they connect
+        best: Optional[tuple[int, int]] = None  # (tier, passive hops)
+        seen = {device_id}
+        queue = deque([(device_id, 0)])
+        while queue:
+            current, hops = queue.popleft()
+            for neighbour in self.index.neighbors(current).values():
+                if neighbour in seen:
+                    continue
+                seen.add(neighbour)
+                node = self.index.devices[neighbour]
+                if node.device_type in PASSIVE_DEVICE_TYPES:
+                    queue.append((neighbour, hops + 1))
+                elif node.device_type in self.tiers:
+                    candidate = (self.tiers[node.device_type], hops)
+                    if best is None or candidate < best:
+                        best = candidate
+        if best is None:
+            return None
+        return best[0] + PASSIVE_TIER_OFFSET + PASSIVE_HOP_OFFSET * best[1]
+
+    def upstream(self, device_id: int) -> list[int]:
+        tier = self.tier(device_id)
+        if tier is None:
+            return []
+        return sorted(
+            {
+                neighbour for neighbour in self.index.neighbors(device_id).values()
+                if (neighbour_tier := self.tier(neighbour)) is not None and neighbour_tier < tier
+            },
+            key=lambda neighbour: (self.tier(neighbour), neighbour),
+        )
+
+    def root(self, device_id: int) -> int:
+        """Most upstream DOWN device explaining `device_id` (itself if none)."""
+        if device_id not in self._root:
+            upstream = self.upstream(device_id)
+            if upstream and all(self.down(neighbour) for neighbour in upstream):
+                self._root[device_id] = self.root(upstream[0])
+            else:
+                self._root[device_id] = device_id
+        return self._root[device_id]
+
+
+class AlarmCorrelator:
+    """
+    Collapse status transitions into root-cause alarms and filter the
+    per-device status events they explain.
+
+    Attributes:
+        window: Seconds transitions and held events are collected before
+            correlating.
+        session_factory: Used only to load the topology index when it is
+            not loaded yet (tests point it at their own engine).
+    """
+
+    def __init__(self, window: Optional[float] = None):
+        self.window = window if window is not None else float(os.getenv("UNOC_ALARM_WINDOW_SECONDS", "2.0"))
+        self.session_factory: Callable[[], AsyncContextManager[AsyncSession]] = get_session_context
+        self.alarms: dict[int, Alarm] = {}
+        self._owner: dict[int, int] = {}  # suppressed device → root of its alarm
+        self._pending: set[int] = set()
+        self._outbox: list[tuple[str, dict, list[int]]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tiers = get_hierarchy_tiers()
+
+    def reset(self) -> None:
+        """Forget alarms, pending transitions and held events."""
+        self.alarms.clear()
+        self._owner.clear()
+        self._pending.clear()
+        self._outbox.clear()
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_loop = None
+
+    def observe(self, transitions: Transitions) -> None:
+        """Queue committed transitions; correlation runs when the window closes."""
+        self._pending.update(device_id for device_id, _ in transitions)
+        self._schedule()
+
+    async def publish(self, event: str, payload: dict, device_ids: Iterable[int]) -> None:
+        """
+        Emit a per-device status event through the correlation stage.
+
+        Held until the window closes when one of `device_ids` is DOWN (or
+        earlier events are still held); then dropped for suppressed devices.
+        A payload with an "ids" list keeps only the ids not suppressed.
+        """
+        device_ids = list(device_ids)
+        if not self._outbox and not any(self._may_be_suppressed(device_id) for device_id in device_ids):
+            await self._emit([(event, payload)])
+            return
+        self._outbox.append((event, payload, device_ids))
+        self._schedule()
+
+    def alarm_of(self, device_id: int) -> Optional[Alarm]:
+        """Alarm that suppresses `device_id` or is rooted at it."""
+        return self.alarms.get(self._owner.get(device_id, device_id))
+
+    async def flush(self) -> list[tuple[str, dict]]:
+        """Correlate everything pending, emit the resulting and held events and return them."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, set()
+        outbox, self._outbox = self._outbox, []
+        if not pending and not self.alarms and not outbox:
+            return []
+        index = topology_index
+        if not index.loaded:
+            async with self.session_factory() as session:
+                index = await get_topology_index(session)
+
+        events = self._correlate(index, pending)
+        for event, payload, device_ids in outbox:
+            kept = [device_id for device_id in device_ids if device_id not in self._owner]
+            if not kept:
+                continue
+            if len(kept) < len(device_ids) and "ids" in payload:
+                payload = {**payload, "ids": kept}
+            events.append((event, payload))
+        await self._emit(events)
+        return events
+
+    # ----- internals -----
+
+    def _may_be_suppressed(self, device_id: int) -> bool:
+        # Only DOWN devices can be suppressed; without a loaded index, assume they may be
+        if not topology_index.loaded:
+            return True
+        node = topology_index.devices.get(device_id)
+        return node is not None and node.effective_status == Status.DOWN
+
+    def _schedule(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no event loop (scripts): picked up by the next flush
+        if self._timer is not None and self._timer_loop is loop and not loop.is_closed():
+            return
+        self._timer_loop = loop
+        self._timer = loop.call_later(self.window, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._timer = None
+        self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+
+    async def _emit(self, events: list[tuple[str, dict]]) -> None:
+        if not events:
+            return
+        # Late import: backend.main imports the routers that use this module
+        from backend.main import emit_to_all
+        for name, payload in events:
+            await emit_to_all(name, payload)
+
+    def _correlate(self, index: TopologyIndex, pending: set[int]) -> list[tuple[str, dict]]:
+        hierarchy = _Hierarchy(index, self._tiers)
+        now = datetime.now(timezone.utc)
+        owner = self._owner
+        cleared: dict[int, dict] = {}
+        raised: set[int] = set()
+        touched: set[int] = set()
+
+        # Recovered (or deleted) roots are cleared and their DOWN children correlated again
+        candidates = {device_id for device_id in pending if hierarchy.down(device_id)}
+        for root_id, alarm in list(self.alarms.items()):
+            if not hierarchy.down(root_id):
+                del self.alarms[root_id]
+                cleared[root_id] = {**alarm.to_event(index), "merged_into": None}
+                for device_id in alarm.suppressed:
+                    owner.pop(device_id, None)
+                candidates |= {device_id for device_id in alarm.suppressed if hierarchy.down(device_id)}
+                continue
+            recovered = {device_id for device_id in alarm.suppressed if not hierarchy.down(device_id)}
+            if recovered:
+                alarm.suppressed -= recovered
+                for device_id in recovered:
+                    owner.pop(device_id, None)
+                touched.add(root_id)
+        candidates |= self.alarms.keys()
+
+        for device_id in sorted(candidates):
+            root_id = hierarchy.root(device_id)
+            alarm = self.alarms.get(root_id)
+            if alarm is None:
+                alarm = self.alarms[root_id] = Alarm(root_id=root_id, raised_at=now)
+                raised.add(root_id)
+            if device_id == root_id:
+                continue
+            # An existing alarm below a newly failed device is absorbed into its alarm
+            absorbed = self.alarms.pop(device_id, None)
+            if absorbed is not None:
+                cleared[device_id] = {**absorbed.to_event(index), "merged_into": root_id}
+                touched.discard(device_id)
+                alarm.suppressed |= absorbed.suppressed
+                owner.update((child, root_id) for child in absorbed.suppressed)
+                touched.add(root_id)
+            previous = owner.get(device_id)
+            if previous != root_id:
+                if previous in self.alarms:
+                    self.alarms[previous].suppressed.discard(device_id)
+                    touched.add(previous)
+                alarm.suppressed.add(device_id)
+                owner[device_id] = root_id
+                touched.add(root_id)
+
+        events = [("alarm:cleared", payload) for payload in cleared.values()]
+        events += [("alarm:raised", self.alarms[root_id].to_event(index, with_ids=True)) for root_id in sorted(raised)]
+        events += [
+            ("alarm:updated", self.alarms[root_id].to_event(index, with_ids=True))
+            for root_id in sorted(touched - raised) if root_id in self.alarms
+        ]
+        return events
+
+
+alarm_correlator = AlarmCorrelator()
+on_transitions(alarm_correlator.observe)
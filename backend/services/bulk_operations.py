@@ -0,0 +1,208 @@
+"""
+Bulk Operations - Set-Based Writes for Many Devices
+
+`DELETE /api/devices/{id}` removes one device per request. Decommissioning
+a POP that way means thousands of requests.
+
+`delete_devices` instead resolves the affected ids with column-only queries
+and removes links, interfaces and devices with chunked
+`DELETE ... WHERE id IN (...)` statements in one transaction. No ORM objects
+are loaded, so the session hooks do not see the rows; the function records
+the change log (which also invalidates the entity cache) and stages the
+topology-index removals itself.
+
+`apply_overrides` sets or clears the status override of many devices with
+one chunked UPDATE and reports the downstream impact computed by
+`status_propagation` (optionally as a dry run that writes nothing). Its
+write step, `write_overrides`, does not commit and is shared with the
+maintenance-window scheduler.
+"""
+
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.core import Device, Interface, Link, Status
+from backend.services.changelog import ChangeOp, record_changes
+from backend.services.status_history import record_status_changes
+from backend.services.status_propagation import OverrideImpact, status_propagation
+from backend.services.topology_index import get_topology_index, stage_changes
+
+# Ids per IN (...) - stays below SQLite's bound-parameter limit
+ID_CHUNK = 500
+
+
+def chunked(ids: list[int]) -> Iterable[list[int]]:
+    """Split ids into `IN (...)`-sized lists."""
+    for start in range(0, len(ids), ID_CHUNK):
+        yield ids[start:start + ID_CHUNK]
+
+
+@dataclass
+class BulkDeleteResult:
+    """Ids removed (or affected) by a bulk delete."""
+
+    devices: list[int] = field(default_factory=list)
+    interfaces: list[int] = field(default_factory=list)
+    links: list[int] = field(default_factory=list)
+    detached: list[int] = field(default_factory=list)  # children moved out of deleted containers
+    missing: list[int] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class BulkOverrideResult:
+    """Devices whose override was (or would be) written, and the resulting impact."""
+
+    updated: list[int] = field(default_factory=list)
+    missing: list[int] = field(default_factory=list)
+    impact: OverrideImpact = field(default_factory=OverrideImpact)
+
+
+async def _existing_device_ids(session: AsyncSession, requested: list[int]) -> set[int]:
+    existing: set[int] = set()
+    for chunk in chunked(requested):
+        existing.update((await session.execute(select(Device.id).where(Device.id.in_(chunk)))).scalars())
+    return existing
+
+
+async def apply_overrides(
+    session: AsyncSession,
+    device_ids: Iterable[int],
+    status_override: Optional[Status],
+    override_reason: Optional[str] = None,
+    dry_run: bool = False,
+) -> BulkOverrideResult:
+    """
+    Set (`status_override`) or clear (None) the override of many devices.
+
+    The impact is computed from the topology index before anything is
+    written; with `dry_run` nothing else happens. Otherwise one UPDATE per
+    chunk of ids runs and the transaction is committed.
+    """
+    requested = sorted(set(device_ids))
+    existing = await _existing_device_ids(session, requested)
+    result = BulkOverrideResult(
+        updated=sorted(existing),
+        missing=[device_id for device_id in requested if device_id not in existing],
+    )
+    if not existing:
+        return result
+
+    await get_topology_index(session)
+    result.impact = status_propagation.preview({device_id: status_override for device_id in result.updated})
+    if dry_run:
+        return result
+
+    await write_overrides(session, result.updated, status_override, override_reason)
+    await session.commit()
+    session.expunge_all()
+    return result
+
+
+async def write_overrides(
+    session: AsyncSession,
+    device_ids: list[int],
+    status_override: Optional[Status],
+    override_reason: Optional[str] = None,
+) -> None:
+    """
+    Chunked UPDATE of the override columns, with change log, status history
+    and index staging.
+
+    Does not commit, so callers can combine it with other writes in one
+    transaction. Clearing (`status_override=None`) also clears the reason.
+    """
+    if not device_ids:
+        return
+    index = await get_topology_index(session)
+    reason = override_reason if status_override is not None else None
+    now = datetime.now(timezone.utc)
+    for chunk in chunked(device_ids):
+        await session.execute(
+            update(Device).where(Device.id.in_(chunk))
+            .values(status_override=status_override, override_reason=reason, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    await record_changes(session, "device", device_ids)
+    nodes = [
+        (index.devices[device_id], replace(index.devices[device_id], status_override=status_override))
+        for device_id in device_ids if device_id in index.devices
+    ]
+    await record_status_changes(session, [
+        (new.id, new.effective_status) for old, new in nodes if old.effective_status != new.effective_status
+    ])
+    stage_changes(session, [("device", new) for _, new in nodes])
+
+
+async def delete_devices(session: AsyncSession, device_ids: Iterable[int]) -> BulkDeleteResult:
+    """
+    Delete devices with their interfaces and links in one transaction (commits).
+
+    Devices left inside a deleted container are detached
+    (`parent_container_id = NULL`), not deleted - pass the whole subtree to
+    remove them as well. Unknown ids are reported in `missing`.
+    """
+    requested = sorted(set(device_ids))
+    result = BulkDeleteResult()
+
+    existing = await _existing_device_ids(session, requested)
+    result.devices = sorted(existing)
+    result.missing = [device_id for device_id in requested if device_id not in existing]
+    if not existing:
+        return result
+
+    interface_ids: set[int] = set()
+    children: set[int] = set()
+    for chunk in chunked(result.devices):
+        interface_ids.update((await session.execute(
+            select(Interface.id).where(Interface.device_id.in_(chunk))
+        )).scalars())
+        children.update((await session.execute(
+            select(Device.id).where(Device.parent_container_id.in_(chunk))
+        )).scalars())
+    result.interfaces = sorted(interface_ids)
+    result.detached = sorted(children - existing)
+
+    link_ids: set[int] = set()
+    for chunk in chunked(result.interfaces):
+        link_ids.update((await session.execute(
+            select(Link.id).where(or_(Link.a_interface_id.in_(chunk), Link.b_interface_id.in_(chunk)))
+        )).scalars())
+    result.links = sorted(link_ids)
+
+    # Capture index nodes before the statements run (needed to re-home children)
+    index = await get_topology_index(session)
+    now = datetime.now(timezone.utc)
+
+    for chunk in chunked(result.detached):
+        await session.execute(
+            update(Device).where(Device.id.in_(chunk)).values(parent_container_id=None, updated_at=now)
+        )
+    for model, ids in ((Link, result.links), (Interface, result.interfaces), (Device, result.devices)):
+        for chunk in chunked(ids):
+            await session.execute(
+                delete(model).where(model.id.in_(chunk)).execution_options(synchronize_session=False)
+            )
+
+    await record_changes(session, "device", result.detached)
+    await record_changes(session, "link", result.links, ChangeOp.DELETE)
+    await record_changes(session, "interface", result.interfaces, ChangeOp.DELETE)
+    await record_changes(session, "device", result.devices, ChangeOp.DELETE)
+
+    staged: list[tuple] = [
+        ("device", replace(index.devices[device_id], parent_container_id=None))
+        for device_id in result.detached if device_id in index.devices
+    ]
+    staged += [("-device", device_id) for device_id in result.devices]
+    stage_changes(session, staged)
+
+    await session.commit()
+    # Drop stale identity-map entries a caller may still hold
+    session.expunge_all()
+    return result
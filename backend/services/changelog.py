@@ -0,0 +1,404 @@
+"""
+Change Log - Delta Sync for Reconnecting Clients
+
+Every mutation of a device, interface or link appends a row to
+`change_log` in the same transaction, so a client that remembers the last
+sequence number it saw can ask for just what changed since
+(`GET /api/changes?since=<seq>`). Reconnect cost scales with the number of
+changes, not with the size of the network.
+
+Recording
+---------
+* ORM writes (routes, `ProvisioningService`, seeding) are captured by
+  session hooks: `before_flush` bumps `updated_at` on modified rows and
+  collects the interfaces and links a device/interface delete takes with it
+  (database cascade, never loaded by the ORM) and detaches the children of a
+  deleted container as ORM updates, `after_flush` inserts the log rows.
+* Set-based statements bypass the hooks and call `record_changes` /
+  `record_reset` explicitly (layout, bulk import, snapshot restore,
+  clearing all data).
+
+Commit order
+------------
+`seq` is assigned when a row is inserted, but clients read the log in seq
+order and resume after the highest seq they saw - so entries must become
+visible in seq order, or a transaction that took seq 10 and commits after
+one with seq 11 would never be seen. Writers of the log are therefore
+serialized for the rest of their transaction (`_serialize_writers`): a
+transaction-scoped advisory lock on PostgreSQL; SQLite already allows a
+single writing transaction at a time.
+
+Compaction
+----------
+`compact_change_log` keeps only the newest entry per entity, drops
+everything before the latest reset marker and expires entries older than
+the retention window. Expiry leaves a reset marker at the newest expired
+sequence, so clients that fell behind that horizon are told to reload.
+`run_compaction_loop` runs it periodically (see `backend/main.py`).
+
+Commit notifications
+--------------------
+Every recorded change is also remembered on the session and handed to the
+`on_committed` listeners once the transaction commits (dropped on
+rollback) - the single write-path signal for in-process caches.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import delete, event, func, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.models.core import ChangeLogEntry, Device, Interface, Link
+
+RESET_ENTITY = "*"
+DEFAULT_CHANGES_LIMIT = 5000
+FETCH_CHUNK = 500  # ids per IN (...) when loading upserted rows
+
+ENTITY_MODELS = {"device": Device, "interface": Interface, "link": Link}
+_ENTITY_OF = {model: entity for entity, model in ENTITY_MODELS.items()}
+
+# (entity, entity_id) pairs; a reset is (RESET_ENTITY, None)
+CommittedChanges = set[tuple[str, Optional[int]]]
+_commit_listeners: list[Callable[[CommittedChanges], None]] = []
+_PENDING_KEY = "changelog_pending"
+_LOCKED_KEY = "changelog_locked"
+CHANGELOG_LOCK_KEY = 0x554E4F43  # pg_advisory_xact_lock key ("UNOC")
+
+
+class ChangeOp(str, Enum):
+    """Kind of change-log entry"""
+
+    UPSERT = "upsert"
+    DELETE = "delete"
+    RESET = "reset"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _serialize_writers(session: Session) -> None:
+    """Hold the change-log writer lock until this transaction ends (once per transaction)."""
+    if session.info.get(_LOCKED_KEY):
+        return
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGELOG_LOCK_KEY})
+    session.info[_LOCKED_KEY] = True
+
+
+# ==========================================
+# EXPLICIT RECORDING (set-based statements)
+# ==========================================
+
+
+async def record_changes(
+    session: AsyncSession,
+    entity: str,
+    ids: Iterable[int],
+    op: ChangeOp = ChangeOp.UPSERT,
+) -> None:
+    """Append entries for rows written without the ORM unit of work (caller commits)."""
+    now = _now()
+    rows = [{"entity": entity, "entity_id": entity_id, "op": op.value, "changed_at": now} for entity_id in ids]
+    if rows:
+        await session.run_sync(_serialize_writers)
+        await session.execute(insert(ChangeLogEntry), rows)
+        _remember(session.sync_session, rows)
+
+
+async def record_reset(session: AsyncSession) -> None:
+    """Mark that clients must reload everything (caller commits)."""
+    await session.run_sync(_serialize_writers)
+    await session.execute(insert(ChangeLogEntry).values(
+        entity=RESET_ENTITY, entity_id=None, op=ChangeOp.RESET.value, changed_at=_now(),
+    ))
+    _remember(session.sync_session, [{"entity": RESET_ENTITY, "entity_id": None}])
+
+
+# ==========================================
+# COMMIT NOTIFICATIONS
+# ==========================================
+
+
+def on_committed(listener: Callable[[CommittedChanges], None]) -> Callable[[CommittedChanges], None]:
+    """
+    Register `listener(changes)`, called after each commit that recorded changes.
+
+    Listeners run synchronously inside the commit hook and must not do I/O
+    (schedule a task instead).
+    """
+    _commit_listeners.append(listener)
+    return listener
+
+
+def _remember(session: Session, rows: list[dict]) -> None:
+    session.info.setdefault(_PENDING_KEY, set()).update((row["entity"], row["entity_id"]) for row in rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed(session: Session) -> None:
+    session.info.pop(_LOCKED_KEY, None)
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        for listener in _commit_listeners:
+            listener(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_LOCKED_KEY, None)
+
+
+# ==========================================
+# QUERIES
+# ==========================================
+
+
+async def current_seq(session: AsyncSession) -> int:
+    """Newest sequence number (0 when nothing was recorded yet)."""
+    return (await session.execute(select(func.max(ChangeLogEntry.seq)))).scalar() or 0
+
+
+async def entity_version(session: AsyncSession, entity: str, entity_id: Optional[int] = None) -> int:
+    """
+    Newest sequence that touched `entity` rows (or the single row `entity_id`).
+
+    Resets count for every entity. Two index lookups, no table scan - the
+    basis for ETags on list and detail endpoints.
+    """
+    changed = select(func.max(ChangeLogEntry.seq)).where(ChangeLogEntry.entity == entity)
+    if entity_id is not None:
+        changed = changed.where(ChangeLogEntry.entity_id == entity_id)
+    reset = select(func.max(ChangeLogEntry.seq)).where(ChangeLogEntry.entity == RESET_ENTITY)
+    row = (await session.execute(select(changed.scalar_subquery(), reset.scalar_subquery()))).one()
+    return max(row[0] or 0, row[1] or 0)
+
+
+async def changes_since(
+    session: AsyncSession,
+    since: int,
+    limit: int = DEFAULT_CHANGES_LIMIT,
+) -> dict:
+    """
+    Collapse log entries after `since` into current rows and deleted ids.
+
+    At most `limit` entries are consumed per call; `has_more` tells the client
+    to call again with the returned `seq`. `reset` means the client must drop
+    its state and reload (a reset happened, or `since` is beyond the log).
+
+    Returns:
+        dict with since, seq, reset, has_more, devices, interfaces, links and
+        deleted ({"devices": [...], "interfaces": [...], "links": [...]}).
+    """
+    latest = await current_seq(session)
+    result = {
+        "since": since,
+        "seq": latest,
+        "reset": False,
+        "has_more": False,
+        "devices": [],
+        "interfaces": [],
+        "links": [],
+        "deleted": {"devices": [], "interfaces": [], "links": []},
+    }
+    last_reset = (await session.execute(
+        select(func.max(ChangeLogEntry.seq)).where(
+            ChangeLogEntry.op == ChangeOp.RESET.value, ChangeLogEntry.seq > since,
+        )
+    )).scalar()
+    if last_reset is not None or since > latest:
+        result["reset"] = True
+        return result
+
+    entries = (await session.execute(
+        select(ChangeLogEntry.seq, ChangeLogEntry.entity, ChangeLogEntry.entity_id, ChangeLogEntry.op)
+        .where(ChangeLogEntry.seq > since)
+        .order_by(ChangeLogEntry.seq)
+        .limit(limit + 1)
+    )).all()
+    if len(entries) > limit:
+        entries = entries[:limit]
+        result["has_more"] = True
+        result["seq"] = entries[-1].seq
+
+    # Latest op per entity wins
+    latest_op: dict[tuple[str, int], str] = {}
+    for entry in entries:
+        latest_op[(entry.entity, entry.entity_id)] = entry.op
+
+    for entity, model in ENTITY_MODELS.items():
+        upserted = sorted(i for (e, i), op in latest_op.items() if e == entity and op == ChangeOp.UPSERT.value)
+        deleted = {i for (e, i), op in latest_op.items() if e == entity and op == ChangeOp.DELETE.value}
+        found = set()
+        for start in range(0, len(upserted), FETCH_CHUNK):
+            chunk = upserted[start:start + FETCH_CHUNK]
+            rows = (await session.execute(select(model).where(model.id.in_(chunk)))).scalars().all()
+            result[f"{entity}s"].extend(rows)
+            found.update(row.id for row in rows)
+        # Upserted but gone again (e.g. removed by a database cascade)
+        deleted.update(i for i in upserted if i not in found)
+        result["deleted"][f"{entity}s"] = sorted(deleted)
+    return result
+
+
+# ==========================================
+# COMPACTION
+# ==========================================
+
+
+async def compact_change_log(session: AsyncSession, retention: timedelta) -> int:
+    """
+    Shrink the log without changing what any client will be told.
+
+    Returns:
+        Number of deleted entries.
+    """
+    removed = 0
+    await session.run_sync(_serialize_writers)
+
+    # 1. Everything before the latest reset is irrelevant
+    last_reset = (await session.execute(
+        select(func.max(ChangeLogEntry.seq)).where(ChangeLogEntry.op == ChangeOp.RESET.value)
+    )).scalar()
+    if last_reset is not None:
+        removed += (await session.execute(
+            delete(ChangeLogEntry).where(ChangeLogEntry.seq < last_reset)
+        )).rowcount
+
+    # 2. Only the newest entry per entity matters
+    newest = (
+        select(func.max(ChangeLogEntry.seq))
+        .where(ChangeLogEntry.entity != RESET_ENTITY)
+        .group_by(ChangeLogEntry.entity, ChangeLogEntry.entity_id)
+    )
+    removed += (await session.execute(
+        delete(ChangeLogEntry).where(
+            ChangeLogEntry.entity != RESET_ENTITY,
+            ChangeLogEntry.seq.not_in(newest.scalar_subquery()),
+        )
+    )).rowcount
+
+    # 3. Expire old entries behind a reset marker at the horizon
+    cutoff = _now() - retention
+    horizon = (await session.execute(
+        select(func.max(ChangeLogEntry.seq)).where(ChangeLogEntry.changed_at < cutoff)
+    )).scalar()
+    if horizon is not None:
+        removed += (await session.execute(
+            delete(ChangeLogEntry).where(ChangeLogEntry.seq <= horizon)
+        )).rowcount
+        await session.execute(insert(ChangeLogEntry).values(
+            seq=horizon, entity=RESET_ENTITY, entity_id=None,
+            op=ChangeOp.RESET.value, changed_at=cutoff,
+        ))
+        removed -= 1
+
+    await session.commit()
+    return max(removed, 0)
+
+
+async def run_compaction_loop(session_factory, interval: Optional[float] = None) -> None:
+    """Compact forever (until cancelled); interval/retention come from the environment."""
+    interval = interval or float(os.getenv("UNOC_CHANGELOG_COMPACT_SECONDS", "3600"))
+    retention = timedelta(hours=float(os.getenv("UNOC_CHANGELOG_RETENTION_HOURS", "24")))
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as session:
+                removed = await compact_change_log(session, retention)
+            if removed:
+                print(f"🧹 Compacted change log: {removed} entries removed")
+        except Exception as e:  # noqa: BLE001 - keep the loop alive
+            print(f"⚠️  Change log compaction failed: {e}")
+
+
+# ==========================================
+# SESSION HOOKS
+# ==========================================
+
+_CASCADED_KEY = "changelog_cascaded"
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_and_collect(session: Session, flush_context, instances) -> None:
+    """Detach children of deleted containers, bump `updated_at` on modified rows and
+    remember rows a delete will cascade to."""
+    session.info.pop(_CASCADED_KEY, None)
+    device_ids = [obj.id for obj in session.deleted if isinstance(obj, Device)]
+    if device_ids:
+        _detach_children(session, device_ids)
+
+    now = _now()
+    for obj in session.dirty:
+        if type(obj) in _ENTITY_OF and session.is_modified(obj, include_collections=False):
+            obj.updated_at = now
+
+    interface_ids = [obj.id for obj in session.deleted if isinstance(obj, Interface)]
+    if not device_ids and not interface_ids:
+        return
+    connection = session.connection()
+    cascaded_interfaces = set()
+    if device_ids:
+        cascaded_interfaces = set(connection.execute(
+            select(Interface.id).where(Interface.device_id.in_(device_ids))
+        ).scalars()) - set(interface_ids)
+        interface_ids += cascaded_interfaces
+    link_ids = connection.execute(
+        select(Link.id).where(or_(
+            Link.a_interface_id.in_(interface_ids), Link.b_interface_id.in_(interface_ids),
+        ))
+    ).scalars().all()
+    session.info[_CASCADED_KEY] = {"interface": cascaded_interfaces, "link": set(link_ids)}
+
+
+def _detach_children(session: Session, device_ids: list[int]) -> None:
+    """
+    Clear `parent_container_id` of devices left in deleted containers.
+
+    The database would do it (ON DELETE SET NULL), but unseen by the change
+    log, the entity cache and the topology index; as ORM updates in the same
+    flush they go through every hook like any other change.
+    """
+    children = session.execute(
+        select(Device).where(Device.parent_container_id.in_(device_ids), Device.id.not_in(device_ids))
+    ).scalars()
+    for child in children:
+        child.parent_container_id = None
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session: Session, flush_context) -> None:
+    """Append change-log rows for everything this flush wrote, in the same transaction."""
+    now = _now()
+    rows = []
+    for obj in session.new:
+        entity = _ENTITY_OF.get(type(obj))
+        if entity is not None:
+            rows.append({"entity": entity, "entity_id": obj.id, "op": ChangeOp.UPSERT.value, "changed_at": now})
+    for obj in session.dirty:
+        entity = _ENTITY_OF.get(type(obj))
+        if entity is not None and session.is_modified(obj, include_collections=False):
+            rows.append({"entity": entity, "entity_id": obj.id, "op": ChangeOp.UPSERT.value, "changed_at": now})
+    cascaded = session.info.pop(_CASCADED_KEY, {})
+    deleted = {"link": set(cascaded.get("link", ())), "interface": set(cascaded.get("interface", ())), "device": set()}
+    for obj in session.deleted:
+        entity = _ENTITY_OF.get(type(obj))
+        if entity is not None:
+            deleted[entity].add(obj.id)
+    # Children before parents, matching the cascade order
+    rows += [
+        {"entity": entity, "entity_id": entity_id, "op": ChangeOp.DELETE.value, "changed_at": now}
+        for entity in ("link", "interface", "device")
+        for entity_id in sorted(deleted[entity])
+    ]
+    if rows:
+        _serialize_writers(session)
+        session.connection().execute(insert(ChangeLogEntry), rows)
+        _remember(session, rows)
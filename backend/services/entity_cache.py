@@ -0,0 +1,169 @@
+"""
+Entity Cache - Process-Wide Read-Through Cache for Single Rows
+
+Each request gets a fresh session, so the identity map never helps across
+requests and the `session.get(Device, id)` at the top of most handlers goes
+to the database every time. `EntityCache` keeps committed device, interface
+and link rows (plain column dicts, never ORM instances) in a size-bounded
+LRU, keyed by id and - for devices - by name.
+
+Invalidation
+------------
+* Local writes: every change recorded in the change log (ORM flushes in
+  routes, `ProvisioningService`, seeding, plus the explicit `record_changes`
+  / `record_reset` of set-based writers) is delivered through
+  `changelog.on_committed` after the transaction commits; the touched keys
+  are evicted (a reset clears everything).
+* Loads racing a commit cannot re-insert stale rows: a load only stores its
+  result when no invalidation happened while it was reading.
+* Other processes: when a publisher is configured (see `backend/main.py`,
+  `UNOC_SOCKETIO_MESSAGE_QUEUE`), each invalidation is broadcast as a
+  `cache:invalidate` event over the Socket.IO message queue and applied by
+  the peers via `apply_remote`.
+
+Only read paths use the cache; handlers that modify a row keep loading it
+through their session.
+
+Usage
+-----
+    device = await entity_cache.get(session, "device", device_id)
+    if device is None:
+        raise HTTPException(status_code=404, detail="Device not found")
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.services.changelog import ENTITY_MODELS, RESET_ENTITY, CommittedChanges, on_committed
+
+CACHE_INVALIDATE_EVENT = "cache:invalidate"
+DEFAULT_MAX_ENTRIES = 50_000
+
+Publisher = Callable[[dict], Awaitable[None]]
+
+
+class EntityCache:
+    """
+    Size-bounded LRU of committed rows.
+
+    Attributes:
+        max_entries: Capacity across all entities.
+        publisher: Optional coroutine function used to broadcast
+            invalidations to other processes.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.getenv("UNOC_ENTITY_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+        self.publisher: Optional[Publisher] = None
+        self._rows: OrderedDict[tuple[str, int], dict] = OrderedDict()
+        self._device_ids_by_name: dict[str, int] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # ----- reads -----
+
+    async def get(self, session: AsyncSession, entity: str, entity_id: int) -> Optional[dict]:
+        """Committed row of `entity` as a column dict, or None when it does not exist."""
+        key = (entity, entity_id)
+        row = self._rows.get(key)
+        if row is not None:
+            self._rows.move_to_end(key)
+            self.hits += 1
+            return row
+        self.misses += 1
+        model = ENTITY_MODELS[entity]
+        return await self._load(session, entity, select(*model.__table__.columns).where(model.id == entity_id))
+
+    async def get_device_by_name(self, session: AsyncSession, name: str) -> Optional[dict]:
+        """Committed device row with the given (unique) name, or None."""
+        device_id = self._device_ids_by_name.get(name)
+        if device_id is not None and ("device", device_id) in self._rows:
+            return await self.get(session, "device", device_id)
+        self.misses += 1
+        model = ENTITY_MODELS["device"]
+        return await self._load(session, "device", select(*model.__table__.columns).where(model.name == name))
+
+    async def _load(self, session: AsyncSession, entity: str, statement) -> Optional[dict]:
+        generation = self._generation
+        row = (await session.execute(statement)).mappings().first()
+        if row is None:
+            return None
+        row = dict(row)
+        # An invalidation while we were reading may mean `row` is already stale
+        if generation == self._generation:
+            self._store(entity, row)
+        return row
+
+    def _store(self, entity: str, row: dict) -> None:
+        key = (entity, row["id"])
+        self._rows[key] = row
+        self._rows.move_to_end(key)
+        if entity == "device":
+            self._device_ids_by_name[row["name"]] = row["id"]
+        while len(self._rows) > self.max_entries:
+            (old_entity, _), old_row = self._rows.popitem(last=False)
+            self._forget_name(old_entity, old_row)
+            self.evictions += 1
+
+    def _forget_name(self, entity: str, row: dict) -> None:
+        if entity == "device" and self._device_ids_by_name.get(row["name"]) == row["id"]:
+            del self._device_ids_by_name[row["name"]]
+
+    # ----- invalidation -----
+
+    def invalidate(self, changes: CommittedChanges) -> None:
+        """Evict the given (entity, id) keys; a reset entry clears everything."""
+        self._generation += 1
+        self.invalidations += len(changes)
+        if any(entity == RESET_ENTITY for entity, _ in changes):
+            self.clear()
+            return
+        for key in changes:
+            row = self._rows.pop(key, None)
+            if row is not None:
+                self._forget_name(key[0], row)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._rows.clear()
+        self._device_ids_by_name.clear()
+
+    def _on_committed(self, changes: CommittedChanges) -> None:
+        self.invalidate(changes)
+        if self.publisher is None:
+            return
+        payload = {"changes": sorted(([entity, entity_id] for entity, entity_id in changes), key=str)}
+        try:
+            asyncio.get_running_loop().create_task(self.publisher(payload))
+        except RuntimeError:  # committed outside the event loop (scripts)
+            pass
+
+    def apply_remote(self, payload: dict) -> None:
+        """Apply a `cache:invalidate` payload broadcast by another process."""
+        self.invalidate({(entity, entity_id) for entity, entity_id in payload.get("changes", [])})
+
+    # ----- metrics -----
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._rows),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+entity_cache = EntityCache()
+on_committed(entity_cache._on_committed)
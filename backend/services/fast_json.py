@@ -0,0 +1,159 @@
+"""
+Fast JSON - Column Projection + Optimized Encoding for Large Lists
+
+The regular path for `GET /api/devices` loads full ORM objects, validates
+each one into a `DeviceResponse` (`response_model`) and encodes the result
+with the stdlib `json` module. For 100k rows the per-row model construction
+and encoding dominate CPU.
+
+The fast path:
+* selects only the response columns as tuples (Core `select(Device.id, ...)`,
+  no identity map, no ORM instances),
+* skips per-row Pydantic validation - the rows come straight from our own
+  schema, so they already satisfy the response model,
+* encodes with `orjson` when it is installed, falling back to a compact
+  stdlib encoder otherwise.
+
+Endpoints keep their `response_model` (for OpenAPI) and return a
+`FastJSONResponse`, which FastAPI passes through untouched.
+
+Sparse fieldsets (`?fields=id,status,x,y`) narrow the SELECT itself, so
+unrequested columns are neither read from the database nor serialized.
+
+Full-table lists go through `read_coalescer` (single-flight): identical
+concurrent requests share one query and one encoded body.
+
+See `backend/benchmarks/list_serialization.py` for the comparison.
+"""
+
+import json
+from enum import Enum
+from typing import Any, AsyncContextManager, Callable, Hashable, Iterable, Optional
+
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from backend.services.single_flight import read_coalescer
+
+try:  # Optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - exercised without orjson installed
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode to compact UTF-8 JSON with the fastest encoder available."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        payload, default=_default, ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with `dumps` (orjson when available)."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class UnknownFieldError(ValueError):
+    """Raised when a sparse fieldset names a field the response model lacks."""
+
+
+def parse_fields(response_model: type[SQLModel], fields: Optional[str]) -> list[str]:
+    """
+    Turn a comma-separated `fields` parameter into response field names.
+
+    `id` is always included; names keep the response model's field order.
+    Empty or missing `fields` selects everything.
+
+    Raises:
+        UnknownFieldError: When a requested name is not a response field.
+    """
+    available = list(response_model.model_fields)
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return available
+    unknown = sorted(requested.difference(available))
+    if unknown:
+        raise UnknownFieldError(
+            f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}"
+        )
+    requested.add("id")
+    return [name for name in available if name in requested]
+
+
+def response_columns(
+    model: type[SQLModel],
+    response_model: type[SQLModel],
+    names: Optional[list[str]] = None,
+) -> list:
+    """Table columns of `model` named like the fields of `response_model`, in field order."""
+    return [getattr(model, name) for name in (names or response_model.model_fields)]
+
+
+async def fetch_rows(
+    session: AsyncSession,
+    model: type[SQLModel],
+    response_model: type[SQLModel],
+    *where: Any,
+    fields: Optional[list[str]] = None,
+    order_by: Optional[Any] = None,
+) -> list[dict]:
+    """
+    Load rows of `model` as plain dicts shaped like `response_model`.
+
+    Only the needed columns (all response fields, or `fields` from
+    `parse_fields`) are selected and no ORM objects are built. Defaults to
+    primary-key order, matching the ORM list endpoints.
+    """
+    names = fields or list(response_model.model_fields)
+    columns = response_columns(model, response_model, names)
+    statement = select(*columns).where(*where).order_by(order_by if order_by is not None else model.id)
+    result = await session.execute(statement)
+    return rows_to_dicts(names, result)
+
+
+def rows_to_dicts(names: list[str], rows: Iterable[tuple]) -> list[dict]:
+    """Zip column names onto result tuples."""
+    return [dict(zip(names, row)) for row in rows]
+
+
+async def fast_list_response(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    model: type[SQLModel],
+    response_model: type[SQLModel],
+    flight_key: Hashable,
+    response: Optional[Response] = None,
+    fields: Optional[list[str]] = None,
+) -> Response:
+    """
+    Full-table list response on the fast path (optionally a sparse fieldset).
+
+    Concurrent calls with the same `flight_key` (route + parameters +
+    topology version, i.e. the ETag) share one query and one encoded body;
+    the query runs in its own session so it outlives any single request.
+
+    Headers already set on the injected `response` (e.g. the ETag) are
+    carried over, since returning a `Response` bypasses FastAPI's merge.
+    """
+    async def render() -> bytes:
+        async with session_factory() as session:
+            return dumps(await fetch_rows(session, model, response_model, fields=fields))
+
+    body = await read_coalescer.run((model.__name__, flight_key), render)
+    headers = dict(response.headers) if response is not None else None
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,367 @@
+"""
+Graph Analysis - Resilience Reports over the Topology Index
+
+Single points of failure
+------------------------
+An articulation point is a device and a bridge is a link whose loss splits
+the graph. Only splits that cut customers (ONT, BUSINESS_ONT, AON_CPE) off
+from every BACKBONE_GATEWAY matter, so the DFS runs from a virtual root
+attached to all gateways: a device or link is reported when the part of the
+network it separates from that root contains customers, together with that
+customer count.
+
+The report is one iterative Tarjan pass, O(devices + links). It is rebuilt
+only when the structure changes (links added, removed or re-pointed, devices
+added, removed or retyped); status, position and length updates - the bulk
+of the change stream - keep the cached report. Links are considered
+regardless of their status: the report is about redundancy by design, not
+about what is currently up.
+
+Orphans
+-------
+`ComponentTracker` keeps the connected components as a disjoint-set
+structure with direct labels (device → component id, union by size
+relabels the smaller side), so "which component is this device in" is
+O(1). It follows the index incrementally: a new link merges two components;
+a removed link triggers a bidirectional search between its ends that stops
+as soon as they meet, and only when one side runs out (the component really
+split) is that side relabelled. Components without a BACKBONE_GATEWAY are
+orphans. Containers (POP, CORE_SITE) are not part of the physical graph and
+are ignored.
+"""
+
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from backend.constants.link_rules import CONTAINER_DEVICE_TYPES, CUSTOMER_DEVICE_TYPES
+from backend.models.core import DeviceType
+from backend.services.topology_index import (
+    DeviceNode,
+    LinkEdge,
+    TopologyIndex,
+    TopologyListener,
+    topology_index,
+)
+
+# Id of the virtual root joined to every BACKBONE_GATEWAY (device ids are positive)
+VIRTUAL_ROOT = 0
+
+
+@dataclass(slots=True)
+class SpofReport:
+    """Articulation points / bridges that cut customers off the backbone."""
+
+    version: int
+    duration_ms: float
+    customers_total: int
+    customers_unreachable: int
+    articulation_points: dict[int, int]  # device id → affected customers
+    bridges: dict[int, int]              # link id → affected customers
+
+
+class SpofAnalyzer(TopologyListener):
+    """
+    Keeps the single-point-of-failure report for a `TopologyIndex`.
+
+    Attributes:
+        computations: Number of full Tarjan passes so far.
+    """
+
+    def __init__(self, index: TopologyIndex):
+        self.index = index
+        self._report: Optional[SpofReport] = None
+        self._link_ends: dict[int, tuple[Optional[int], Optional[int]]] = {}
+        self._touched_links: set[int] = set()
+        self.computations = 0
+        index.subscribe(self)
+
+    # ----- public API -----
+
+    def report(self) -> SpofReport:
+        """Return the current report, recomputing it only after structural changes."""
+        if self._report is None or self._links_restructured():
+            self._report = self._compute()
+        return self._report
+
+    # ----- TopologyListener -----
+
+    def on_topology_reset(self) -> None:
+        self._report = None
+
+    def on_device_upserted(self, old: Optional[DeviceNode], new: DeviceNode) -> None:
+        if old is None or old.device_type != new.device_type:
+            self._report = None
+
+    def on_device_removed(self, node: DeviceNode) -> None:
+        self._report = None
+
+    def on_link_added(self, edge: LinkEdge) -> None:
+        self._touched_links.add(edge.id)
+
+    def on_link_removed(self, edge: LinkEdge) -> None:
+        self._touched_links.add(edge.id)
+
+    def _links_restructured(self) -> bool:
+        """True when a touched link now connects other devices than at the last pass."""
+        touched, self._touched_links = self._touched_links, set()
+        for link_id in touched:
+            edge = self.index.links.get(link_id)
+            ends = (edge.a_device_id, edge.b_device_id) if edge is not None else None
+            if self._link_ends.get(link_id) != ends:
+                return True
+        return False
+
+    # ----- computation -----
+
+    def _compute(self) -> SpofReport:
+        started = time.perf_counter()
+        index = self.index
+        self.computations += 1
+        self._touched_links = set()
+        self._link_ends = {edge.id: (edge.a_device_id, edge.b_device_id) for edge in index.links.values()}
+
+        gateways = [n.id for n in index.devices.values() if n.device_type == DeviceType.BACKBONE_GATEWAY]
+        gateways_set = set(gateways)
+        customers = {n.id for n in index.devices.values() if n.device_type in CUSTOMER_DEVICE_TYPES}
+
+        def neighbours(device_id: int):
+            if device_id == VIRTUAL_ROOT:
+                # Virtual edges carry negative ids so they never clash with links
+                return iter([(-gateway, gateway) for gateway in gateways])
+            items = list(index.adjacency.get(device_id, {}).items())
+            if device_id in gateways_set:
+                items.append((-device_id, VIRTUAL_ROOT))
+            return iter(items)
+
+        discovered: dict[int, int] = {VIRTUAL_ROOT: 0}
+        low: dict[int, int] = {VIRTUAL_ROOT: 0}
+        below: dict[int, int] = {VIRTUAL_ROOT: 0}  # customers in the DFS subtree
+        articulation: dict[int, int] = {}
+        bridges: dict[int, int] = {}
+
+        # Iterative DFS: (device, link id used to enter it, neighbour iterator)
+        stack = [(VIRTUAL_ROOT, None, neighbours(VIRTUAL_ROOT))]
+        while stack:
+            node, entry_link, pending = stack[-1]
+            advanced = False
+            for link_id, neighbour in pending:
+                if link_id == entry_link:
+                    continue  # parallel links stay usable; only the tree edge is skipped
+                if neighbour in discovered:
+                    low[node] = min(low[node], discovered[neighbour])
+                    continue
+                discovered[neighbour] = low[neighbour] = len(discovered)
+                below[neighbour] = 1 if neighbour in customers else 0
+                stack.append((neighbour, link_id, neighbours(neighbour)))
+                advanced = True
+                break
+            if advanced:
+                continue
+
+            stack.pop()
+            if not stack:
+                break
+            parent = stack[-1][0]
+            low[parent] = min(low[parent], low[node])
+            below[parent] += below[node]
+            if not below[node]:
+                continue
+            if low[node] >= discovered[parent] and parent != VIRTUAL_ROOT:
+                articulation[parent] = articulation.get(parent, 0) + below[node]
+            if low[node] > discovered[parent] and entry_link is not None and entry_link > 0:
+                bridges[entry_link] = below[node]
+
+        reachable = sum(1 for customer in customers if customer in discovered)
+        return SpofReport(
+            version=index.version,
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+            customers_total=len(customers),
+            customers_unreachable=len(customers) - reachable,
+            articulation_points=articulation,
+            bridges=bridges,
+        )
+
+
+@dataclass(slots=True)
+class Component:
+    """Connected set of devices."""
+
+    id: int
+    members: set[int] = field(default_factory=set)
+    gateways: int = 0
+
+
+class ComponentTracker(TopologyListener):
+    """
+    Connected components of a `TopologyIndex`, maintained incrementally.
+
+    Attributes:
+        splits: Link removals that actually split a component.
+        rebuilds: Full builds (first use and after index resets).
+    """
+
+    def __init__(self, index: TopologyIndex):
+        self.index = index
+        self.component_of: dict[int, int] = {}
+        self.components: dict[int, Component] = {}
+        self._orphaned: set[int] = set()
+        self._ids = itertools.count(1)
+        self._built = False
+        self.splits = 0
+        self.rebuilds = 0
+        index.subscribe(self)
+
+    # ----- public API -----
+
+    def component(self, device_id: int) -> Optional[Component]:
+        """Component containing the device (None for containers and unknown ids)."""
+        self._ensure_built()
+        component_id = self.component_of.get(device_id)
+        return self.components[component_id] if component_id is not None else None
+
+    def reaches_backbone(self, device_id: int) -> bool:
+        """True when the device has a path to at least one BACKBONE_GATEWAY."""
+        component = self.component(device_id)
+        return component is not None and component.gateways > 0
+
+    def orphaned_components(self) -> list[Component]:
+        """Components without a BACKBONE_GATEWAY, largest first."""
+        self._ensure_built()
+        orphaned = [self.components[component_id] for component_id in self._orphaned]
+        return sorted(orphaned, key=lambda component: (-len(component.members), component.id))
+
+    def _ensure_built(self) -> None:
+        if self._built:
+            return
+        self.rebuilds += 1
+        self.component_of = {}
+        self.components = {}
+        self._orphaned = set()
+        for node in self.index.devices.values():
+            self._add_device(node)
+        for edge in self.index.links.values():
+            self._union(edge.a_device_id, edge.b_device_id)
+        self._built = True
+
+    # ----- TopologyListener -----
+
+    def on_topology_reset(self) -> None:
+        self._built = False
+
+    def on_device_upserted(self, old: Optional[DeviceNode], new: DeviceNode) -> None:
+        if not self._built:
+            return
+        if old is None:
+            self._add_device(new)
+        elif old.device_type != new.device_type:
+            self._remove_device(old)
+            self._add_device(new)
+            # A retyped device keeps its links: merge it back with its neighbours
+            for neighbour in self.index.neighbors(new.id).values():
+                self._union(new.id, neighbour)
+
+    def on_device_removed(self, node: DeviceNode) -> None:
+        if self._built:
+            self._remove_device(node)  # its links are gone already: a singleton
+
+    def on_link_added(self, edge: LinkEdge) -> None:
+        if self._built:
+            self._union(edge.a_device_id, edge.b_device_id)
+
+    def on_link_removed(self, edge: LinkEdge) -> None:
+        if not self._built:
+            return
+        current = self.index.links.get(edge.id)
+        if current is not None and (current.a_device_id, current.b_device_id) == (edge.a_device_id, edge.b_device_id):
+            return  # attribute-only update
+        self._split_if_disconnected(edge.a_device_id, edge.b_device_id)
+
+    # ----- disjoint-set operations -----
+
+    def _add_device(self, node: DeviceNode) -> None:
+        if node.device_type in CONTAINER_DEVICE_TYPES:
+            return
+        component = Component(id=next(self._ids), members={node.id})
+        component.gateways = 1 if node.device_type == DeviceType.BACKBONE_GATEWAY else 0
+        self.components[component.id] = component
+        self.component_of[node.id] = component.id
+        self._refresh_orphaned(component)
+
+    def _remove_device(self, node: DeviceNode) -> None:
+        component_id = self.component_of.pop(node.id, None)
+        if component_id is None:
+            return
+        component = self.components[component_id]
+        component.members.discard(node.id)
+        if node.device_type == DeviceType.BACKBONE_GATEWAY:
+            component.gateways -= 1
+        if not component.members:
+            del self.components[component_id]
+            self._orphaned.discard(component_id)
+        else:
+            self._refresh_orphaned(component)
+
+    def _union(self, a: Optional[int], b: Optional[int]) -> None:
+        if a not in self.component_of or b not in self.component_of:
+            return
+        keep = self.components[self.component_of[a]]
+        other = self.components[self.component_of[b]]
+        if keep is other:
+            return
+        if len(keep.members) < len(other.members):
+            keep, other = other, keep
+        for device_id in other.members:
+            self.component_of[device_id] = keep.id
+        keep.members |= other.members
+        keep.gateways += other.gateways
+        del self.components[other.id]
+        self._orphaned.discard(other.id)
+        self._refresh_orphaned(keep)
+
+    def _split_if_disconnected(self, a: Optional[int], b: Optional[int]) -> None:
+        """Relabel the side cut off by a removed link, if the ends are no longer connected."""
+        if a not in self.component_of or b not in self.component_of or a == b:
+            return
+        # Grow both sides in turn; the first to run out is the (smaller) split-off part
+        seen = ({a}, {b})
+        queues = (deque([a]), deque([b]))
+        while queues[0] and queues[1]:
+            for side in (0, 1):
+                device_id = queues[side].popleft()
+                for neighbour in self.index.neighbors(device_id).values():
+                    if neighbour in seen[1 - side]:
+                        return  # still connected
+                    if neighbour not in seen[side]:
+                        seen[side].add(neighbour)
+                        queues[side].append(neighbour)
+                if not queues[side]:
+                    self._split_off(seen[side])
+                    return
+
+    def _split_off(self, members: set[int]) -> None:
+        self.splits += 1
+        members = {device_id for device_id in members if device_id in self.component_of}
+        old = self.components[self.component_of[next(iter(members))]]
+        new = Component(id=next(self._ids), members=members)
+        for device_id in members:
+            self.component_of[device_id] = new.id
+            if self.index.devices[device_id].device_type == DeviceType.BACKBONE_GATEWAY:
+                new.gateways += 1
+        old.members -= members
+        old.gateways -= new.gateways
+        self.components[new.id] = new
+        self._refresh_orphaned(old)
+        self._refresh_orphaned(new)
+
+    def _refresh_orphaned(self, component: Component) -> None:
+        if component.gateways:
+            self._orphaned.discard(component.id)
+        else:
+            self._orphaned.add(component.id)
+
+
+spof_analyzer = SpofAnalyzer(topology_index)
+component_tracker = ComponentTracker(topology_index)
@@ -0,0 +1,406 @@
+"""
+Background Jobs - Long-Running Work Outside the Request
+
+Heavy operations (seeding, layout, bulk imports, audits) are submitted as jobs
+instead of running inline in an HTTP handler. Each job is an asyncio task;
+CPU-bound steps inside it go to the shared process pool via
+:meth:`JobContext.run_cpu_bound`, so neither HTTP workers nor the event loop
+are ever blocked.
+
+Features
+--------
+* Job ids, state machine (PENDING → RUNNING → SUCCEEDED/FAILED/CANCELLED).
+* Progress reporting, broadcast as Socket.IO `job:progress` / `job:finished`.
+* Cancellation of pending and running jobs.
+* Concurrency limit (`UNOC_JOB_CONCURRENCY`, default 2).
+* Optional persistent queue: set `UNOC_JOB_DB` to a SQLite file path and
+  pending jobs survive restarts (re-queued by `JobManager.start`); jobs that
+  were running when the process stopped or died are marked FAILED.
+* Retention of finished jobs: at most `UNOC_JOB_RETENTION` (default 500)
+  are kept, none longer than `UNOC_JOB_TTL_SECONDS` (default 86400); older
+  ones are evicted from memory and from the store.
+
+Usage
+-----
+    async def seed_job(ctx: JobContext) -> dict:
+        async with ctx.session() as session:
+            await ctx.progress(0.5, "Clearing data")
+            ...
+        return {"devices": 10}
+
+    job_manager.register("seed", seed_job)
+    job = await job_manager.submit("seed")
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, AsyncContextManager, Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db import get_session_context
+from backend.services.workers import run_cpu_bound
+
+
+class JobError(Exception):
+    """Raised for unknown job kinds or invalid job state transitions."""
+
+
+class JobState(str, Enum):
+    """Lifecycle of a job"""
+
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
+FINISHED_STATES = {JobState.SUCCEEDED, JobState.FAILED, JobState.CANCELLED}
+
+# Only broadcast progress when it moved by at least this much
+PROGRESS_EMIT_STEP = 0.01
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class Job:
+    """A unit of background work and its observable state."""
+
+    id: str
+    kind: str
+    params: dict = field(default_factory=dict)
+    state: JobState = JobState.PENDING
+    progress: float = 0.0
+    message: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=_now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        """JSON-ready representation (used for API responses and events)."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "state": self.state.value,
+            "progress": round(self.progress, 4),
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+JobHandler = Callable[..., Awaitable[Optional[dict]]]
+
+
+class JobContext:
+    """Handle passed to a running job for progress reporting and CPU offload."""
+
+    def __init__(self, manager: "JobManager", job: Job):
+        self._manager = manager
+        self.job = job
+        self._last_emitted = -1.0
+
+    async def progress(self, fraction: float, message: Optional[str] = None) -> None:
+        """Record progress (0..1) and broadcast it when it moved noticeably."""
+        self.job.progress = max(0.0, min(1.0, fraction))
+        if message is not None:
+            self.job.message = message
+        if self.job.progress - self._last_emitted >= PROGRESS_EMIT_STEP or message is not None:
+            self._last_emitted = self.job.progress
+            await self._manager._emit("job:progress", self.job)
+        # Give cancellation (and other tasks) a chance between chunks of work
+        await asyncio.sleep(0)
+
+    async def run_cpu_bound(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a picklable function in the worker process pool."""
+        return await run_cpu_bound(fn, *args)
+
+    def session(self) -> AsyncContextManager[AsyncSession]:
+        """Open a database session owned by the job (not by any request)."""
+        return self._manager.session_factory()
+
+
+class JobStore:
+    """
+    SQLite persistence for job metadata (stdlib `sqlite3`, off the event loop).
+
+    Writes run in worker threads; a lock serializes them on the shared
+    connection, and saves arriving after `close()` are dropped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                state TEXT NOT NULL,
+                progress REAL NOT NULL,
+                message TEXT,
+                result TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT
+            )
+            """
+        )
+        self._conn.commit()
+
+    def _save_sync(self, job: Job) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id, job.kind, json.dumps(job.params), job.state.value, job.progress,
+                    job.message, json.dumps(job.result) if job.result is not None else None,
+                    job.error, job.created_at.isoformat(),
+                    job.started_at.isoformat() if job.started_at else None,
+                    job.finished_at.isoformat() if job.finished_at else None,
+                ),
+            )
+            self._conn.commit()
+
+    async def save(self, job: Job) -> None:
+        await asyncio.to_thread(self._save_sync, job)
+
+    def _delete_sync(self, job_ids: list[str]) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+            self._conn.commit()
+
+    async def delete(self, job_ids: list[str]) -> None:
+        await asyncio.to_thread(self._delete_sync, job_ids)
+
+    def load_all(self) -> list[Job]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY created_at").fetchall()
+        jobs = []
+        for row in rows:
+            jobs.append(Job(
+                id=row[0], kind=row[1], params=json.loads(row[2]), state=JobState(row[3]),
+                progress=row[4], message=row[5],
+                result=json.loads(row[6]) if row[6] else None, error=row[7],
+                created_at=datetime.fromisoformat(row[8]),
+                started_at=datetime.fromisoformat(row[9]) if row[9] else None,
+                finished_at=datetime.fromisoformat(row[10]) if row[10] else None,
+            ))
+        return jobs
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class JobManager:
+    """
+    In-process job queue.
+
+    Jobs are kept in memory (and mirrored to `JobStore` when configured);
+    finished jobs are evicted beyond `retention` or after `ttl`. The
+    concurrency semaphore is recreated per event loop so the manager can be
+    used from independent loops (tests, reloads).
+
+    Attributes:
+        session_factory: Zero-argument callable returning an async context
+            manager that yields an `AsyncSession` (tests point it at their
+            own engine).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        retention: Optional[int] = None,
+        ttl: Optional[timedelta] = None,
+    ):
+        self.max_concurrency = max_concurrency or int(os.getenv("UNOC_JOB_CONCURRENCY", "2"))
+        self.retention = retention if retention is not None else int(os.getenv("UNOC_JOB_RETENTION", "500"))
+        self.ttl = ttl if ttl is not None else timedelta(seconds=float(os.getenv("UNOC_JOB_TTL_SECONDS", "86400")))
+        self.jobs: dict[str, Job] = {}
+        self.store: Optional[JobStore] = None
+        self.session_factory: Callable[[], AsyncContextManager[AsyncSession]] = get_session_context
+        self._handlers: dict[str, JobHandler] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shutting_down = False
+
+    # ----- registration / lifecycle -----
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Register `handler(ctx, **params)` for jobs of the given kind."""
+        self._handlers[kind] = handler
+
+    async def start(self, store_path: Optional[str] = None) -> None:
+        """Open the persistent store (if any) and re-queue interrupted work."""
+        store_path = store_path or os.getenv("UNOC_JOB_DB")
+        if not store_path:
+            return
+        self.store = JobStore(store_path)
+        for job in self.store.load_all():
+            self.jobs[job.id] = job
+            if job.state == JobState.RUNNING:
+                job.state = JobState.FAILED
+                job.error = "Interrupted by server restart"
+                job.finished_at = _now()
+                await self.store.save(job)
+            elif job.state == JobState.PENDING and job.kind in self._handlers:
+                self._spawn(job)
+        await self.prune()
+
+    async def shutdown(self) -> None:
+        """
+        Stop in-flight tasks and close the store.
+
+        These cancellations are not the user's: the jobs keep their stored
+        state, so the next `start` re-queues pending ones and marks running
+        ones interrupted.
+        """
+        self._shutting_down = True
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        self._shutting_down = False
+
+    # ----- API -----
+
+    async def submit(self, kind: str, **params: Any) -> Job:
+        """Queue a job; it starts as soon as a concurrency slot is free."""
+        if kind not in self._handlers:
+            raise JobError(f"Unknown job kind '{kind}'")
+        job = Job(id=uuid.uuid4().hex, kind=kind, params=params)
+        self.jobs[job.id] = job
+        await self._persist(job)
+        self._spawn(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def list(self, limit: int = 50) -> list[Job]:
+        """Most recent jobs first."""
+        return sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)[:limit]
+
+    async def cancel(self, job_id: str) -> Job:
+        """Cancel a pending or running job."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise JobError(f"Job '{job_id}' not found")
+        if job.state in FINISHED_STATES:
+            raise JobError(f"Job '{job_id}' already finished ({job.state.value})")
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        else:
+            await self._finish(job, JobState.CANCELLED)
+        return job
+
+    async def wait(self, job_id: str) -> Job:
+        """Await completion of a job (mainly for tests and scripts)."""
+        job = self.jobs[job_id]
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        return job
+
+    async def prune(self) -> "list[str]":
+        """Evict finished jobs past the TTL or beyond the retention cap (oldest first)."""
+        finished = sorted(
+            (job for job in self.jobs.values() if job.state in FINISHED_STATES),
+            key=lambda job: job.finished_at or job.created_at,
+            reverse=True,
+        )
+        cutoff = _now() - self.ttl
+        evicted = [
+            job.id for rank, job in enumerate(finished)
+            if rank >= self.retention or (job.finished_at or job.created_at) < cutoff
+        ]
+        for job_id in evicted:
+            del self.jobs[job_id]
+        if evicted and self.store is not None:
+            await self.store.delete(evicted)
+        return evicted
+
+    # ----- internals -----
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _spawn(self, job: Job) -> None:
+        task = asyncio.create_task(self._run(job), name=f"job-{job.kind}-{job.id}")
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+
+    async def _run(self, job: Job) -> None:
+        handler = self._handlers[job.kind]
+        try:
+            async with self._get_semaphore():
+                job.state = JobState.RUNNING
+                job.started_at = _now()
+                await self._persist(job)
+                await self._emit("job:progress", job)
+                result = await handler(JobContext(self, job), **job.params)
+            job.result = result
+            job.progress = 1.0
+            await self._finish(job, JobState.SUCCEEDED)
+        except asyncio.CancelledError:
+            if self._shutting_down:
+                return
+            await self._finish(job, JobState.CANCELLED)
+        except Exception as exc:  # noqa: BLE001 - surfaced through the job record
+            job.error = str(exc) or exc.__class__.__name__
+            await self._finish(job, JobState.FAILED)
+
+    async def _finish(self, job: Job, state: JobState) -> None:
+        job.state = state
+        job.finished_at = _now()
+        await self._persist(job)
+        await self._emit("job:finished", job)
+        await self.prune()
+
+    async def _persist(self, job: Job) -> None:
+        if self.store is not None:
+            await self.store.save(job)
+
+    async def _emit(self, event: str, job: Job) -> None:
+        # Late import: backend.main imports the routers that use this module
+        from backend.main import emit_to_all
+        await emit_to_all(event, job.to_dict())
+
+
+job_manager = JobManager()
@@ -0,0 +1,289 @@
+"""
+Layout Engine - Server-Side Topology Layout
+
+Computes canvas coordinates on the server so bulk-onboarded devices do not
+pile up at the origin and browsers never run layout over the whole network.
+
+Algorithm
+---------
+1. Hierarchical seeding: every device gets a layer from the L1-L7 hierarchy
+   (`get_hierarchy_tiers`); passive devices sit between the layers of their
+   neighbours, containers just above their contents. Within a layer, free
+   nodes are ordered by the barycenter of already-placed neighbours.
+2. Force refinement: Fruchterman-Reingold springs along links plus repulsion
+   approximated on a uniform grid (each node is repelled by cell centroids,
+   exact for its own cell), fully vectorized with NumPy. A layer pull keeps
+   the hierarchy readable.
+
+The numeric kernel (`compute_layout`) is a pure function of NumPy arrays and
+runs in the shared process pool. `LayoutService` collects input from the
+topology index and writes the result back with one bulk UPDATE.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.constants.link_rules import (
+    CONTAINER_DEVICE_TYPES,
+    PASSIVE_DEVICE_TYPES,
+    get_hierarchy_tiers,
+)
+from backend.db import sync_identity_map
+from backend.models.core import Device
+from backend.services.changelog import record_changes
+from backend.services.topology_index import TopologyIndex, get_topology_index
+from backend.services.workers import run_cpu_bound
+
+LAYER_SPACING = 150.0  # Vertical distance between hierarchy tiers
+NODE_SPACING = 80.0  # Ideal link length / minimum horizontal gap
+LAYER_STIFFNESS = 0.5  # Fraction of the gap to the tier's y closed per iteration
+DEFAULT_PASSIVE_TIER = 3.5  # Between access and customer layers
+DEFAULT_CONTAINER_TIER = 1.5
+GRID_MAX_CELLS = 32  # Per axis; repulsion cost is O(nodes × cells)
+CHUNK_SIZE = 512  # Nodes per repulsion block (bounds memory to CHUNK × cells)
+
+
+# ==========================================
+# NUMERIC KERNEL (runs in worker processes)
+# ==========================================
+
+
+def compute_layout(
+    tiers: np.ndarray,
+    positions: np.ndarray,
+    fixed: np.ndarray,
+    edges: np.ndarray,
+    iterations: int,
+) -> np.ndarray:
+    """
+    Lay out a graph; only rows where `fixed` is False are moved.
+
+    Args:
+        tiers: (n,) float layer index per node.
+        positions: (n, 2) current coordinates (used for fixed nodes).
+        fixed: (n,) bool mask of nodes that must keep their position.
+        edges: (m, 2) int node indices of each link.
+        iterations: Force refinement steps (0 = hierarchical seeding only).
+
+    Returns:
+        (n, 2) float array of coordinates.
+    """
+    pos = np.asarray(positions, dtype=np.float64).copy()
+    if len(pos) == 0 or fixed.all():
+        return pos
+    _seed_layers(pos, tiers, fixed, edges)
+    if iterations > 0 and len(pos) > 1:
+        _refine(pos, tiers * LAYER_SPACING, ~fixed, edges, iterations)
+    return pos
+
+
+def _seed_layers(pos: np.ndarray, tiers: np.ndarray, fixed: np.ndarray, edges: np.ndarray) -> None:
+    """Place free nodes layer by layer at the barycenter of placed neighbours."""
+    n = len(pos)
+    placed = fixed.copy()
+    a, b = (edges[:, 0], edges[:, 1]) if len(edges) else (np.empty(0, int), np.empty(0, int))
+    for tier in np.unique(tiers[~fixed]):
+        layer = np.flatnonzero((tiers == tier) & ~fixed)
+        # Barycenter of placed neighbours, both link directions
+        sum_x = np.zeros(n)
+        sum_x += np.bincount(a[placed[b]], weights=pos[b[placed[b]], 0], minlength=n)
+        sum_x += np.bincount(b[placed[a]], weights=pos[a[placed[a]], 0], minlength=n)
+        count = np.bincount(a[placed[b]], minlength=n) + np.bincount(b[placed[a]], minlength=n)
+        bary = np.where(count[layer] > 0, sum_x[layer] / np.maximum(count[layer], 1), np.nan)
+
+        # Anchored nodes keep barycentric order; the rest queue up behind them
+        anchored = ~np.isnan(bary)
+        occupied = pos[placed & (tiers == tier), 0]
+        start = occupied.max() + NODE_SPACING if len(occupied) else 0.0
+        order = np.argsort(np.where(anchored, bary, np.inf), kind="stable")
+        desired = np.where(anchored[order], bary[order], start)
+        # Enforce minimum spacing: x_i = max(desired_i, x_{i-1} + spacing)
+        steps = np.arange(len(order)) * NODE_SPACING
+        x = np.maximum.accumulate(desired - steps) + steps
+        pos[layer[order], 0] = x
+        pos[layer, 1] = tier * LAYER_SPACING
+        placed[layer] = True
+
+
+def _refine(
+    pos: np.ndarray,
+    target_y: np.ndarray,
+    free: np.ndarray,
+    edges: np.ndarray,
+    iterations: int,
+) -> None:
+    """Grid-approximated Fruchterman-Reingold refinement, in place."""
+    n = len(pos)
+    k2 = NODE_SPACING * NODE_SPACING
+    free_idx = np.flatnonzero(free)
+    extent = max(float(np.ptp(pos[:, 0])), float(np.ptp(pos[:, 1])), NODE_SPACING)
+    temperature = extent / 10.0
+    cooling = (0.01) ** (1.0 / iterations)
+    cells_per_axis = int(np.clip(np.sqrt(n), 1, GRID_MAX_CELLS))
+
+    for _ in range(iterations):
+        disp = np.zeros_like(pos)
+
+        # --- repulsion against grid cell centroids ---
+        lo = pos.min(axis=0)
+        size = np.maximum((pos.max(axis=0) - lo) / cells_per_axis, 1e-9)
+        cell_xy = np.minimum(((pos - lo) / size).astype(np.int64), cells_per_axis - 1)
+        cell = cell_xy[:, 0] * cells_per_axis + cell_xy[:, 1]
+        mass = np.bincount(cell, minlength=cells_per_axis ** 2).astype(np.float64)
+        sum_xy = np.stack([
+            np.bincount(cell, weights=pos[:, 0], minlength=cells_per_axis ** 2),
+            np.bincount(cell, weights=pos[:, 1], minlength=cells_per_axis ** 2),
+        ], axis=1)
+        occupied = np.flatnonzero(mass)
+        column_of = np.full(len(mass), -1)
+        column_of[occupied] = np.arange(len(occupied))
+        centroid = sum_xy[occupied] / mass[occupied, None]
+        weight = mass[occupied]
+
+        for start in range(0, len(free_idx), CHUNK_SIZE):
+            rows = free_idx[start:start + CHUNK_SIZE]
+            delta = pos[rows, None, :] - centroid[None, :, :]
+            dist2 = np.einsum("ijk,ijk->ij", delta, delta) + 1e-9
+            w = np.broadcast_to(weight, dist2.shape).copy()
+            w[np.arange(len(rows)), column_of[cell[rows]]] = 0.0  # own cell handled exactly
+            disp[rows] += np.einsum("ij,ijk->ik", w * k2 / dist2, delta)
+
+            own_mass = mass[cell[rows]] - 1.0
+            others = own_mass > 0
+            if others.any():
+                own_centroid = (sum_xy[cell[rows]] - pos[rows]) / np.maximum(own_mass, 1.0)[:, None]
+                own_delta = pos[rows] - own_centroid
+                own_dist2 = (own_delta ** 2).sum(axis=1) + 1e-9
+                jitter = np.where(own_dist2 < 1e-6, 1.0, 0.0)  # coincident nodes: push sideways
+                own_delta[:, 0] += jitter * (np.arange(len(rows)) % 2 * 2 - 1)
+                disp[rows] += (own_mass * k2 / np.maximum(own_dist2, 1.0))[:, None] * own_delta * others[:, None]
+
+        # --- attraction along links ---
+        if len(edges):
+            a, b = edges[:, 0], edges[:, 1]
+            delta = pos[a] - pos[b]
+            dist = np.sqrt((delta ** 2).sum(axis=1)) + 1e-9
+            pull = (dist / NODE_SPACING)[:, None] * delta
+            np.add.at(disp, a, -pull)
+            np.add.at(disp, b, pull)
+
+        length = np.sqrt((disp ** 2).sum(axis=1)) + 1e-9
+        step = np.minimum(length, temperature) / length
+        pos[free] += disp[free] * step[free, None]
+
+        # --- keep tiers horizontal ---
+        pos[free, 1] += (target_y[free] - pos[free, 1]) * LAYER_STIFFNESS
+        temperature *= cooling
+
+
+# ==========================================
+# SERVICE
+# ==========================================
+
+
+def _device_tiers(index: TopologyIndex, device_ids: list[int]) -> np.ndarray:
+    """Tier per device: hierarchy for active types, derived for passive/containers."""
+    type_tiers = get_hierarchy_tiers()
+    tiers = np.empty(len(device_ids), dtype=np.float64)
+    for i, device_id in enumerate(device_ids):
+        node = index.devices[device_id]
+        if node.device_type in type_tiers:
+            tiers[i] = type_tiers[node.device_type]
+        elif node.device_type in PASSIVE_DEVICE_TYPES:
+            neighbor_tiers = [
+                type_tiers[index.devices[n].device_type]
+                for n in index.neighbors(device_id).values()
+                if n in index.devices and index.devices[n].device_type in type_tiers
+            ]
+            tiers[i] = (sum(neighbor_tiers) / len(neighbor_tiers)) if neighbor_tiers else DEFAULT_PASSIVE_TIER
+            if neighbor_tiers and tiers[i] in type_tiers.values():
+                tiers[i] += 0.5  # never share a layer with active devices
+        elif node.device_type in CONTAINER_DEVICE_TYPES:
+            child_tiers = [
+                type_tiers[index.devices[c].device_type]
+                for c in index.children.get(device_id, ())
+                if c in index.devices and index.devices[c].device_type in type_tiers
+            ]
+            tiers[i] = (min(child_tiers) - 0.5) if child_tiers else DEFAULT_CONTAINER_TIER
+        else:
+            tiers[i] = DEFAULT_PASSIVE_TIER
+    return tiers
+
+
+class LayoutService:
+    """
+    Compute and persist device positions.
+
+    Usage
+    -----
+        service = LayoutService(session)
+        placed = await service.apply_layout(mode="incremental")
+
+    Modes
+    -----
+    * ``incremental``: move only the given `device_ids`, or - when omitted -
+      every device still sitting at the origin; all other devices are fixed.
+    * ``full``: lay out the whole topology from scratch.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply_layout(
+        self,
+        mode: str = "incremental",
+        device_ids: Optional[list[int]] = None,
+        iterations: int = 50,
+    ) -> dict[int, tuple[float, float]]:
+        """
+        Run the layout in the process pool and bulk-write moved devices.
+
+        Returns:
+            Mapping of device id to its new `(x, y)` for every moved device.
+        """
+        index = await get_topology_index(self.session)
+        ids = sorted(index.devices)
+        if not ids:
+            return {}
+        row_of = {device_id: i for i, device_id in enumerate(ids)}
+
+        positions = np.array([(index.devices[d].x, index.devices[d].y) for d in ids], dtype=np.float64)
+        if mode == "full":
+            fixed = np.zeros(len(ids), dtype=bool)
+        elif device_ids is not None:
+            fixed = np.ones(len(ids), dtype=bool)
+            fixed[[row_of[d] for d in device_ids if d in row_of]] = False
+        else:
+            fixed = (positions[:, 0] != 0.0) | (positions[:, 1] != 0.0)
+        if fixed.all():
+            return {}
+
+        edges = np.array(
+            [
+                (row_of[edge.a_device_id], row_of[edge.b_device_id])
+                for edge in index.links.values()
+                if edge.a_device_id in row_of and edge.b_device_id in row_of
+                and edge.a_device_id != edge.b_device_id
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        tiers = _device_tiers(index, ids)
+
+        result = await run_cpu_bound(compute_layout, tiers, positions, fixed, edges, iterations)
+
+        moved = {
+            ids[i]: (round(float(result[i, 0]), 2), round(float(result[i, 1]), 2))
+            for i in np.flatnonzero(~fixed)
+        }
+        now = datetime.now(timezone.utc)
+        rows = [{"id": device_id, "x": x, "y": y, "updated_at": now} for device_id, (x, y) in moved.items()]
+        await self.session.execute(update(Device), rows)
+        await record_changes(self.session, "device", moved)
+        await self.session.commit()
+        sync_identity_map(self.session, Device, rows)
+        index.move_devices(moved)
+        return moved
@@ -0,0 +1,199 @@
+"""
+Link Validation - L1-L9 Rules and Interface Exclusivity from Memory
+
+Every new link must
+* connect two existing interfaces on two different devices,
+* satisfy the L1-L9 device-type rules (`validate_link_between_devices`,
+  cached per type pair), and
+* use interfaces that are not already patched (one cable per port).
+
+All three checks are answered from the `TopologyIndex` (interface → device,
+interface → links) instead of per-request joins. The database backs the
+occupancy check against concurrent writers: every link claims its two
+interfaces in `link_endpoints` (primary key `interface_id`) in the same
+transaction - ORM inserts through a mapper hook, set-based inserts through
+`claim_endpoints` / `rebuild_endpoints` - so a second link on a port fails
+with an `IntegrityError`. Databases created before `link_endpoints` existed
+are brought up to date by `migrate_link_endpoints` (run by `init_db`).
+
+Usage
+-----
+    validator = LinkValidator(await get_topology_index(session))
+    link_type = validator.check(a_interface_id, b_interface_id)  # raises LinkValidationError
+    validator.reserve(a_interface_id, b_interface_id)             # batch: later items see it
+"""
+
+from enum import Enum
+from typing import Iterable, Optional
+
+from sqlalchemy import Connection, event, insert, inspect, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
+
+from backend.constants.link_rules import LinkType, validate_link_between_devices
+from backend.models.core import Link, LinkEndpoint
+from backend.services.topology_index import TopologyIndex
+
+
+class LinkErrorKind(str, Enum):
+    """Why a link was rejected (routes map it to 404 / 400 / 409)."""
+
+    NOT_FOUND = "not_found"
+    RULE_VIOLATION = "rule_violation"
+    OCCUPIED = "occupied"
+
+
+class LinkValidationError(Exception):
+    """Raised when a link would break a topology rule."""
+
+    def __init__(self, kind: LinkErrorKind, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+class LinkValidator:
+    """
+    Checks candidate links against the committed topology plus the links
+    reserved earlier in the same batch.
+    """
+
+    def __init__(self, index: TopologyIndex):
+        self.index = index
+        self._reserved: set[int] = set()
+
+    def check_devices(self, device_a_id: int, device_b_id: int) -> LinkType:
+        """
+        Validate the device pair of a link (existence, self-link, L1-L9).
+
+        Raises:
+            LinkValidationError: NOT_FOUND or RULE_VIOLATION.
+        """
+        device_a = self.index.devices.get(device_a_id)
+        device_b = self.index.devices.get(device_b_id)
+        if device_a is None or device_b is None:
+            missing = device_a_id if device_a is None else device_b_id
+            raise LinkValidationError(LinkErrorKind.NOT_FOUND, f"Device {missing} not found")
+        if device_a_id == device_b_id:
+            raise LinkValidationError(LinkErrorKind.RULE_VIOLATION, "Cannot link device to itself")
+        is_valid, link_type, reason = validate_link_between_devices(device_a.device_type, device_b.device_type)
+        if not is_valid:
+            raise LinkValidationError(LinkErrorKind.RULE_VIOLATION, reason)
+        return link_type
+
+    def check(self, a_interface_id: int, b_interface_id: int) -> LinkType:
+        """
+        Validate a link between two existing interfaces.
+
+        Raises:
+            LinkValidationError: NOT_FOUND, RULE_VIOLATION or OCCUPIED.
+        """
+        for interface_id in (a_interface_id, b_interface_id):
+            if interface_id not in self.index.interface_device:
+                raise LinkValidationError(LinkErrorKind.NOT_FOUND, f"Interface {interface_id} not found")
+        if a_interface_id == b_interface_id:
+            raise LinkValidationError(LinkErrorKind.RULE_VIOLATION, "Cannot link an interface to itself")
+        for interface_id in (a_interface_id, b_interface_id):
+            existing = self.occupied_by(interface_id)
+            if existing is not None:
+                detail = f"link {existing}" if existing > 0 else "another link in this request"
+                raise LinkValidationError(
+                    LinkErrorKind.OCCUPIED, f"Interface {interface_id} is already used by {detail}",
+                )
+        return self.check_devices(
+            self.index.interface_device[a_interface_id], self.index.interface_device[b_interface_id],
+        )
+
+    def occupied_by(self, interface_id: int) -> Optional[int]:
+        """Link id using the interface (0 for a reservation of this batch), or None."""
+        if interface_id in self._reserved:
+            return 0
+        links = self.index.interface_links.get(interface_id)
+        return min(links) if links else None
+
+    def reserve(self, a_interface_id: int, b_interface_id: int) -> None:
+        """Mark both interfaces as taken for the rest of the batch."""
+        self._reserved.update((a_interface_id, b_interface_id))
+
+
+# ==========================================
+# DATABASE-ENFORCED EXCLUSIVITY
+# ==========================================
+
+
+def _endpoint_rows(links: Iterable[tuple[int, int, int]]) -> list[dict]:
+    return [
+        {"interface_id": interface_id, "link_id": link_id}
+        for link_id, a_interface_id, b_interface_id in links
+        for interface_id in (a_interface_id, b_interface_id)
+    ]
+
+
+async def claim_endpoints(session: AsyncSession, links: Iterable[tuple[int, int, int]]) -> None:
+    """
+    Claim the interfaces of `(link_id, a_interface_id, b_interface_id)` rows
+    inserted without the ORM (caller commits).
+
+    Raises:
+        IntegrityError: When an interface is already used by another link.
+    """
+    rows = _endpoint_rows(links)
+    if rows:
+        await session.execute(insert(LinkEndpoint), rows)
+
+
+async def rebuild_endpoints(session: AsyncSession) -> None:
+    """Claim the interfaces of every link (after restoring the links table; caller commits)."""
+    ends = union_all(select(Link.a_interface_id, Link.id), select(Link.b_interface_id, Link.id))
+    await session.execute(insert(LinkEndpoint).from_select(["interface_id", "link_id"], ends))
+
+
+@event.listens_for(Link, "after_insert")
+def _claim_inserted_link(mapper, connection, link: Link) -> None:
+    connection.execute(insert(LinkEndpoint), _endpoint_rows([(link.id, link.a_interface_id, link.b_interface_id)]))
+
+
+# ==========================================
+# MIGRATION OF OLDER DATABASES
+# ==========================================
+
+LEGACY_PAIR_CONSTRAINT = "uq_links_interface_pair"
+
+
+def _drop_pair_constraint(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        connection.execute(text(f"ALTER TABLE links DROP CONSTRAINT IF EXISTS {LEGACY_PAIR_CONSTRAINT}"))
+        return
+    names = {constraint["name"] for constraint in inspect(connection).get_unique_constraints("links")}
+    if LEGACY_PAIR_CONSTRAINT not in names:
+        return
+    # SQLite cannot drop a constraint: rebuild the table without it. Dropping
+    # `links` empties `link_endpoints` (ON DELETE CASCADE); it is refilled below.
+    ddl = str(CreateTable(Link.__table__).compile(dialect=connection.dialect))
+    columns = ", ".join(column.name for column in Link.__table__.columns)
+    connection.execute(text(ddl.replace("CREATE TABLE links ", "CREATE TABLE links_rebuilt ", 1)))
+    connection.execute(text(f"INSERT INTO links_rebuilt ({columns}) SELECT {columns} FROM links"))
+    connection.execute(text("DROP TABLE links"))
+    connection.execute(text("ALTER TABLE links_rebuilt RENAME TO links"))
+
+
+def migrate_link_endpoints(connection: Connection) -> None:
+    """
+    Bring a database created before `link_endpoints` up to date (idempotent).
+
+    Drops the old `(a_interface_id, b_interface_id)` unique constraint and,
+    when `link_endpoints` is empty but `links` is not, claims the interfaces
+    of every existing link. Interfaces the old constraint let two links share
+    go to the lower link id; the other link stays unclaimed on that port.
+    """
+    _drop_pair_constraint(connection)
+    if connection.execute(select(LinkEndpoint.interface_id).limit(1)).first() is not None:
+        return
+    claimed: dict[int, int] = {}
+    links = connection.execute(select(Link.id, Link.a_interface_id, Link.b_interface_id).order_by(Link.id))
+    for row in _endpoint_rows(links):
+        claimed.setdefault(row["interface_id"], row["link_id"])
+    if claimed:
+        connection.execute(
+            insert(LinkEndpoint),
+            [{"interface_id": interface_id, "link_id": link_id} for interface_id, link_id in claimed.items()],
+        )
@@ -0,0 +1,315 @@
+"""
+Maintenance Windows - Scheduled Status Overrides
+
+A maintenance window overrides the status of a set of devices between
+`starts_at` and `ends_at`. `MaintenanceScheduler` applies and expires them:
+
+* One asyncio task for all windows. Boundaries (start / end) live in a
+  min-heap keyed by time; the task sleeps until the earliest one (or until
+  `schedule` wakes it), so idle windows cost neither queries nor tasks.
+* All boundaries that are due together are applied by `apply_boundaries`
+  in one transaction - one chunked UPDATE per distinct override - and
+  announced with one `maintenance:applied` event.
+* `start` (called from the app lifespan) reloads SCHEDULED and ACTIVE
+  windows, so boundaries that passed while the server was down are applied
+  right away.
+
+Overlapping windows: a device keeps the override of the newest (highest
+id) window that still covers it; it is cleared only when no window covers
+it any more. Ending a window clears the override of its devices even if it
+was changed manually in the meantime.
+"""
+
+import asyncio
+import heapq
+import itertools
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import AsyncContextManager, Callable, Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db import get_session_context
+from backend.models.core import MaintenanceState, MaintenanceWindow, MaintenanceWindowDevice, Status
+from backend.services.bulk_operations import chunked, write_overrides
+
+MAINTENANCE_EVENT = "maintenance:applied"
+OPEN_STATES = (MaintenanceState.SCHEDULED, MaintenanceState.ACTIVE)
+
+
+def utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values (SQLite) are taken to be UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@dataclass
+class BoundaryResult:
+    """Windows that changed state and devices whose override was written."""
+
+    started: list[int] = field(default_factory=list)
+    finished: list[int] = field(default_factory=list)
+    cancelled: list[int] = field(default_factory=list)
+    overridden: list[int] = field(default_factory=list)
+    cleared: list[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.started or self.finished or self.cancelled)
+
+    def to_event(self) -> dict:
+        return asdict(self)
+
+
+async def _window_devices(session: AsyncSession, window_ids: Iterable[int]) -> dict[int, set[int]]:
+    devices: dict[int, set[int]] = {}
+    for chunk in chunked(sorted(set(window_ids))):
+        rows = await session.execute(
+            select(MaintenanceWindowDevice.window_id, MaintenanceWindowDevice.device_id)
+            .where(MaintenanceWindowDevice.window_id.in_(chunk))
+        )
+        for window_id, device_id in rows:
+            devices.setdefault(window_id, set()).add(device_id)
+    return devices
+
+
+async def apply_boundaries(
+    session: AsyncSession,
+    starting: Iterable[int],
+    ending: Iterable[int],
+    ended_state: MaintenanceState = MaintenanceState.FINISHED,
+) -> BoundaryResult:
+    """
+    Start and end maintenance windows in one transaction (commits).
+
+    Only SCHEDULED windows start and only SCHEDULED/ACTIVE windows end;
+    other ids are ignored, so replaying a boundary is harmless. A window
+    that starts and ends in the same batch goes straight to `ended_state`
+    without touching its devices.
+    """
+    starting, ending = set(starting), set(ending)
+    rows = (await session.execute(
+        select(MaintenanceWindow).where(MaintenanceWindow.id.in_(starting | ending))
+    )).scalars().all() if starting or ending else []
+    windows = {window.id: window for window in rows}
+
+    ending = {
+        window_id for window_id in ending
+        if window_id in windows and windows[window_id].state in OPEN_STATES
+    }
+    starting = {
+        window_id for window_id in starting - ending
+        if window_id in windows and windows[window_id].state == MaintenanceState.SCHEDULED
+    }
+    result = BoundaryResult()
+    if not starting and not ending:
+        return result
+
+    # Devices whose override may change: those of starting and of ending ACTIVE windows
+    releasing = {window_id for window_id in ending if windows[window_id].state == MaintenanceState.ACTIVE}
+    members = await _window_devices(session, starting | releasing)
+    touched = set().union(*members.values()) if members else set()
+
+    # Windows that cover a touched device after this batch: starting ones and other ACTIVE ones
+    covering: dict[int, MaintenanceWindow] = {window_id: windows[window_id] for window_id in starting}
+    if touched:
+        for chunk in chunked(sorted(touched)):
+            others = (await session.execute(
+                select(MaintenanceWindow)
+                .join(MaintenanceWindowDevice, MaintenanceWindowDevice.window_id == MaintenanceWindow.id)
+                .where(
+                    MaintenanceWindowDevice.device_id.in_(chunk),
+                    MaintenanceWindow.state == MaintenanceState.ACTIVE,
+                    MaintenanceWindow.id.notin_(ending),
+                )
+            )).scalars().unique()
+            covering.update((window.id, window) for window in others)
+        members.update(await _window_devices(session, covering.keys() - members.keys()))
+
+    # Newest covering window wins; devices nobody covers any more are cleared
+    desired: dict[int, Optional[tuple[Status, str]]] = {device_id: None for device_id in touched}
+    for window_id in sorted(covering):
+        window = covering[window_id]
+        override = (window.status_override, window.reason or f"Maintenance window {window_id}")
+        for device_id in members.get(window_id, ()):
+            if device_id in touched:
+                desired[device_id] = override
+
+    groups: dict[Optional[tuple[Status, str]], list[int]] = {}
+    for device_id, override in desired.items():
+        groups.setdefault(override, []).append(device_id)
+    for override, device_ids in groups.items():
+        device_ids.sort()
+        if override is None:
+            await write_overrides(session, device_ids, None)
+            result.cleared = device_ids
+        else:
+            await write_overrides(session, device_ids, *override)
+            result.overridden.extend(device_ids)
+    result.overridden.sort()
+
+    for state, window_ids in ((MaintenanceState.ACTIVE, starting), (ended_state, ending)):
+        for chunk in chunked(sorted(window_ids)):
+            await session.execute(
+                update(MaintenanceWindow).where(MaintenanceWindow.id.in_(chunk))
+                .values(state=state).execution_options(synchronize_session=False)
+            )
+    await session.commit()
+    session.expunge_all()
+
+    result.started = sorted(starting)
+    if ended_state == MaintenanceState.CANCELLED:
+        result.cancelled = sorted(ending)
+    else:
+        result.finished = sorted(ending)
+    return result
+
+
+class Boundary(str, Enum):
+    START = "start"
+    END = "end"
+
+
+class MaintenanceScheduler:
+    """
+    Single-task scheduler for maintenance window boundaries.
+
+    Heap entries are `(timestamp, seq, window_id, generation, boundary)`.
+    Rescheduling or forgetting a window bumps/drops its generation, so stale
+    entries are skipped when popped instead of being searched for.
+
+    Attributes:
+        session_factory: Zero-argument callable returning an async context
+            manager that yields an `AsyncSession` (tests point it at their
+            own engine).
+    """
+
+    RETRY_SECONDS = 30.0   # after a failed boundary batch
+    MAX_SLEEP_SECONDS = 300.0  # re-read the wall clock at least this often
+
+    def __init__(self):
+        self.session_factory: Callable[[], AsyncContextManager[AsyncSession]] = get_session_context
+        self._heap: list[tuple[float, int, int, int, Boundary]] = []
+        self._generations: dict[int, int] = {}
+        self._seq = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ----- lifecycle -----
+
+    async def start(self) -> None:
+        """Load SCHEDULED and ACTIVE windows and start the timer task."""
+        async with self.session_factory() as session:
+            rows = (await session.execute(
+                select(MaintenanceWindow.id, MaintenanceWindow.starts_at, MaintenanceWindow.ends_at, MaintenanceWindow.state)
+                .where(MaintenanceWindow.state.in_(OPEN_STATES))
+            )).all()
+        for window_id, starts_at, ends_at, state in rows:
+            self.schedule(window_id, starts_at, ends_at, state)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="maintenance-scheduler")
+
+    async def shutdown(self) -> None:
+        """Stop the timer task; pending boundaries are reloaded on next start."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._wakeup = None
+        self._heap.clear()
+        self._generations.clear()
+
+    # ----- API -----
+
+    def schedule(
+        self,
+        window_id: int,
+        starts_at: datetime,
+        ends_at: datetime,
+        state: MaintenanceState = MaintenanceState.SCHEDULED,
+    ) -> None:
+        """(Re)schedule the boundaries of a window; replaces earlier entries for it."""
+        generation = self._generations.get(window_id, 0) + 1
+        self._generations[window_id] = generation
+        if state == MaintenanceState.SCHEDULED:
+            self._push(utc(starts_at).timestamp(), window_id, generation, Boundary.START)
+        self._push(utc(ends_at).timestamp(), window_id, generation, Boundary.END)
+        self._wake()
+
+    def forget(self, window_id: int) -> None:
+        """Drop all pending boundaries of a window (e.g. after cancelling it)."""
+        self._generations.pop(window_id, None)
+
+    def next_boundary(self) -> Optional[datetime]:
+        """Time of the earliest pending boundary, if any."""
+        self._discard_stale()
+        if not self._heap:
+            return None
+        return datetime.fromtimestamp(self._heap[0][0], timezone.utc)
+
+    async def run_due(self, now: Optional[datetime] = None) -> BoundaryResult:
+        """Apply every boundary at or before `now` in one batch and emit one event."""
+        now_ts = utc(now or datetime.now(timezone.utc)).timestamp()
+        due: list[tuple[float, int, int, int, Boundary]] = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            entry = heapq.heappop(self._heap)
+            if self._generations.get(entry[2]) == entry[3]:
+                due.append(entry)
+        if not due:
+            return BoundaryResult()
+
+        starting = {entry[2] for entry in due if entry[4] == Boundary.START}
+        ending = {entry[2] for entry in due if entry[4] == Boundary.END}
+        try:
+            async with self.session_factory() as session:
+                result = await apply_boundaries(session, starting, ending)
+        except Exception as e:  # noqa: BLE001 - keep the scheduler alive, retry later
+            print(f"⚠️  Maintenance boundaries failed, retrying in {self.RETRY_SECONDS:.0f}s: {e}")
+            for _, _, window_id, generation, boundary in due:
+                self._push(now_ts + self.RETRY_SECONDS, window_id, generation, boundary)
+            return BoundaryResult()
+
+        for window_id in ending:
+            self.forget(window_id)
+        if result:
+            await self._emit(result)
+        return result
+
+    # ----- internals -----
+
+    def _push(self, timestamp: float, window_id: int, generation: int, boundary: Boundary) -> None:
+        heapq.heappush(self._heap, (timestamp, next(self._seq), window_id, generation, boundary))
+
+    def _discard_stale(self) -> None:
+        while self._heap and self._generations.get(self._heap[0][2]) != self._heap[0][3]:
+            heapq.heappop(self._heap)
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _delay(self) -> float:
+        upcoming = self.next_boundary()
+        if upcoming is None:
+            return self.MAX_SLEEP_SECONDS
+        delay = (upcoming - datetime.now(timezone.utc)).total_seconds()
+        return min(max(delay, 0.0), self.MAX_SLEEP_SECONDS)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            await self.run_due()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._delay())
+            except asyncio.TimeoutError:
+                pass
+
+    async def _emit(self, result: BoundaryResult) -> None:
+        # Late import: backend.main imports the routers that use this module
+        from backend.main import emit_to_all
+        await emit_to_all(MAINTENANCE_EVENT, result.to_event())
+
+
+maintenance_scheduler = MaintenanceScheduler()
@@ -0,0 +1,229 @@
+"""
+Path Finding - Shortest and Link-Disjoint Paths Between Devices
+
+Answers "how does this ONT reach its BACKBONE_GATEWAY" and "is there a
+redundant path" from the `TopologyIndex` adjacency (device → {link id:
+neighbour}), without touching the database.
+
+Weights
+-------
+* ``hops``: every link costs 1 (plain shortest path).
+* ``length_km`` / ``link_loss_db``: the link attribute; links without a value
+  cost 0 and ties are broken by hop count.
+
+Disjoint paths
+--------------
+For ``k > 1`` the finder returns up to ``k`` link-disjoint paths of minimum
+total cost (Suurballe's algorithm generalised to ``k`` as successive shortest
+paths on the residual graph, with Dijkstra on potential-reduced costs).
+Fewer paths are returned when the topology has fewer disjoint routes; the
+L9 core/edge mesh is what normally provides the second one.
+
+Results are memoized per (from, to, k, weight) and dropped as soon as the
+index version changes.
+"""
+
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from backend.services.topology_index import LinkEdge, TopologyIndex, topology_index
+
+MAX_DISJOINT_PATHS = 8
+MEMO_SIZE = 1024
+
+INFINITY = float("inf")
+
+
+class PathWeight(str, Enum):
+    """Link attribute minimised by the search."""
+
+    HOPS = "hops"
+    LENGTH_KM = "length_km"
+    LINK_LOSS_DB = "link_loss_db"
+
+
+@dataclass(frozen=True, slots=True)
+class Path:
+    """Device and link sequence from source to target."""
+
+    device_ids: tuple[int, ...]
+    link_ids: tuple[int, ...]
+    cost: float
+
+    @property
+    def hops(self) -> int:
+        return len(self.link_ids)
+
+    def to_dict(self) -> dict:
+        return {
+            "device_ids": list(self.device_ids),
+            "link_ids": list(self.link_ids),
+            "cost": self.cost,
+            "hops": self.hops,
+        }
+
+
+def link_cost(edge: LinkEdge, weight: PathWeight) -> float:
+    """Cost of traversing `edge` (unknown attribute values cost 0)."""
+    if weight is PathWeight.HOPS:
+        return 1.0
+    value = getattr(edge, weight.value)
+    return float(value) if value is not None and value > 0 else 0.0
+
+
+class PathFinder:
+    """
+    Path queries over a `TopologyIndex`, memoized per topology version.
+
+    Attributes:
+        hits: Queries answered from the memo.
+        misses: Queries that ran a search.
+    """
+
+    def __init__(self, index: TopologyIndex, memo_size: int = MEMO_SIZE):
+        self.index = index
+        self.memo_size = memo_size
+        self._memo: OrderedDict[tuple, list[Path]] = OrderedDict()
+        self._memo_version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def find(
+        self,
+        source: int,
+        target: int,
+        k: int = 1,
+        weight: PathWeight = PathWeight.HOPS,
+    ) -> list[Path]:
+        """
+        Return up to `k` link-disjoint paths from `source` to `target`,
+        cheapest first (empty when the devices are not connected).
+
+        Raises:
+            KeyError: When either device is not in the topology.
+            ValueError: When `source == target` or `k` is out of range.
+        """
+        for device_id in (source, target):
+            if device_id not in self.index.devices:
+                raise KeyError(device_id)
+        if source == target:
+            raise ValueError("Source and target must be different devices")
+        if not 1 <= k <= MAX_DISJOINT_PATHS:
+            raise ValueError(f"k must be between 1 and {MAX_DISJOINT_PATHS}")
+
+        if self._memo_version != self.index.version:
+            self._memo.clear()
+            self._memo_version = self.index.version
+        key = (source, target, k, weight)
+        paths = self._memo.get(key)
+        if paths is not None:
+            self._memo.move_to_end(key)
+            self.hits += 1
+            return paths
+
+        self.misses += 1
+        paths = self._search(source, target, k, weight)
+        self._memo[key] = paths
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return paths
+
+    # ----- search -----
+
+    def _search(self, source: int, target: int, k: int, weight: PathWeight) -> list[Path]:
+        # flow[link id] = device the unit of flow enters (absent: link unused)
+        flow: dict[int, int] = {}
+        potential: dict[int, float] = {}
+        found = 0
+        for _ in range(k):
+            distance, via = self._dijkstra(source, flow, potential, weight)
+            if target not in distance:
+                break
+            for device_id, reduced in distance.items():
+                potential[device_id] = potential.get(device_id, 0.0) + reduced
+            # Push one unit along the path; traversing a used link backwards cancels it
+            node = target
+            while node != source:
+                link_id, previous = via[node]
+                if flow.get(link_id) == previous:
+                    del flow[link_id]
+                else:
+                    flow[link_id] = node
+                node = previous
+            found += 1
+        return self._decompose(source, target, flow, found, weight)
+
+    def _dijkstra(
+        self,
+        source: int,
+        flow: dict[int, int],
+        potential: dict[int, float],
+        weight: PathWeight,
+    ) -> tuple[dict[int, float], dict[int, tuple[int, int]]]:
+        """Shortest reduced-cost distances on the residual graph."""
+        distance: dict[int, float] = {source: 0.0}
+        hops: dict[int, int] = {source: 0}
+        via: dict[int, tuple[int, int]] = {}
+        done: set[int] = set()
+        heap = [(0.0, 0, source)]
+        while heap:
+            dist, hop, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            for link_id, neighbour in self.index.neighbors(node).items():
+                used = flow.get(link_id)
+                if used == neighbour:
+                    continue  # already carries flow node → neighbour
+                cost = link_cost(self.index.links[link_id], weight)
+                if used == node:
+                    cost = -cost  # cancel flow neighbour → node
+                if potential:
+                    if neighbour not in potential:
+                        continue
+                    # Clamp float noise; reduced costs are non-negative in theory
+                    cost = max(0.0, cost + potential[node] - potential[neighbour])
+                candidate = (dist + cost, hop + 1)
+                if candidate < (distance.get(neighbour, INFINITY), hops.get(neighbour, 0)):
+                    distance[neighbour], hops[neighbour] = candidate
+                    via[neighbour] = (link_id, node)
+                    heapq.heappush(heap, (candidate[0], candidate[1], neighbour))
+        return distance, via
+
+    def _decompose(
+        self,
+        source: int,
+        target: int,
+        flow: dict[int, int],
+        count: int,
+        weight: PathWeight,
+    ) -> list[Path]:
+        """Split the final flow (`count` units) into simple source → target paths."""
+        outgoing: dict[int, list[tuple[int, int]]] = {}
+        for link_id, head in flow.items():
+            edge = self.index.links[link_id]
+            tail = edge.other_end(head)
+            outgoing.setdefault(tail, []).append((link_id, head))
+
+        paths = []
+        for _ in range(count):
+            devices, links = [source], []
+            while devices[-1] != target:
+                link_id, head = outgoing[devices[-1]].pop()
+                if head in devices:
+                    # Zero-cost cycle in the flow: cut it out of the path
+                    cut = devices.index(head)
+                    del devices[cut + 1:], links[cut:]
+                    continue
+                devices.append(head)
+                links.append(link_id)
+            cost = sum(link_cost(self.index.links[link_id], weight) for link_id in links)
+            paths.append(Path(device_ids=tuple(devices), link_ids=tuple(links), cost=cost))
+        paths.sort(key=lambda path: (path.cost, path.hops))
+        return paths
+
+
+path_finder = PathFinder(topology_index)
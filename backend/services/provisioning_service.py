@@ -5,18 +5,125 @@ relationships, interfaces, and optical metadata. The logic lives behind
 layouts, and unique naming guarantees consistent across the topology.
 """
 
+from enum import Enum
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from backend.models.core import Device, DeviceType, Interface, InterfaceType, Status
+from backend.services.entity_cache import entity_cache
+from backend.services.graph_analysis import ComponentTracker, component_tracker
+from backend.services.topology_index import TopologyIndex, get_topology_index
 
 
 class ProvisioningError(Exception):
     """Raised when provisioning cannot proceed (validation or dependency failure)."""
 
 
+class UpstreamValidation(str, Enum):
+    """How `validate_upstream` checks the upstream dependency."""
+
+    EXISTS = "exists"        # a device of a required type exists anywhere
+    REACHABLE = "reachable"  # the given upstream device / container reaches a BACKBONE_GATEWAY
+
+
+# Upstream device types each device type depends on
+UPSTREAM_REQUIREMENTS = {
+    DeviceType.EDGE_ROUTER: {
+        "required_types": {DeviceType.CORE_ROUTER, DeviceType.BACKBONE_GATEWAY},
+        "error_message": "Cannot provision EDGE_ROUTER: No CORE_ROUTER or BACKBONE_GATEWAY exists",
+    },
+    DeviceType.OLT: {
+        "required_types": {DeviceType.EDGE_ROUTER},
+        "error_message": "Cannot provision OLT: No EDGE_ROUTER exists for upstream connectivity",
+    },
+    DeviceType.AON_SWITCH: {
+        "required_types": {DeviceType.EDGE_ROUTER},
+        "error_message": "Cannot provision AON_SWITCH: No EDGE_ROUTER exists for upstream connectivity",
+    },
+    DeviceType.ONT: {
+        "required_types": {DeviceType.OLT},
+        "error_message": "Cannot provision ONT: No OLT exists for PON connection",
+    },
+    DeviceType.BUSINESS_ONT: {
+        "required_types": {DeviceType.OLT},
+        "error_message": "Cannot provision BUSINESS_ONT: No OLT exists for PON connection",
+    },
+    DeviceType.AON_CPE: {
+        "required_types": {DeviceType.AON_SWITCH},
+        "error_message": "Cannot provision AON_CPE: No AON_SWITCH exists for upstream connectivity",
+    },
+}
+
+
+def check_reachable_upstream(
+    index: TopologyIndex,
+    tracker: ComponentTracker,
+    device_type: DeviceType,
+    parent_container_id: Optional[int] = None,
+    upstream_device_id: Optional[int] = None,
+) -> Optional[int]:
+    """
+    Validate that a new device would hang off connected infrastructure.
+
+    With `upstream_device_id` that device must be of a required upstream type
+    and have a path to a BACKBONE_GATEWAY; otherwise some device of a required
+    type inside `parent_container_id` (at any depth) must. Answered from the
+    topology index and the component tracker, so it costs no queries.
+
+    Returns:
+        Id of the upstream device that satisfied the check (None when the
+        device type has no requirement and no upstream was given).
+
+    Raises:
+        ProvisioningError: When the upstream is missing, of the wrong type,
+            or cut off from the backbone.
+    """
+    requirement = UPSTREAM_REQUIREMENTS.get(device_type)
+    required_types = requirement["required_types"] if requirement else None
+    label = device_type.value
+    
+    if upstream_device_id is not None:
+        upstream = index.devices.get(upstream_device_id)
+        if upstream is None:
+            raise ProvisioningError(f"Cannot provision {label}: upstream device {upstream_device_id} not found")
+        if required_types and upstream.device_type not in required_types:
+            expected = ", ".join(sorted(t.value for t in required_types))
+            raise ProvisioningError(
+                f"Cannot provision {label}: upstream device '{upstream.name}' is "
+                f"{upstream.device_type.value}, expected {expected}"
+            )
+        if not tracker.reaches_backbone(upstream.id):
+            raise ProvisioningError(
+                f"Cannot provision {label}: upstream device '{upstream.name}' has no path to a BACKBONE_GATEWAY"
+            )
+        return upstream.id
+    
+    if parent_container_id is not None:
+        container = index.devices.get(parent_container_id)
+        if container is None:
+            raise ProvisioningError(f"Cannot provision {label}: container {parent_container_id} not found")
+        for member_id in index.descendants.get(parent_container_id, ()):
+            member = index.devices[member_id]
+            if required_types and member.device_type not in required_types:
+                continue
+            if tracker.reaches_backbone(member_id):
+                return member_id
+        wanted = ", ".join(sorted(t.value for t in required_types)) if required_types else "device"
+        raise ProvisioningError(
+            f"Cannot provision {label}: no {wanted} in container '{container.name}' "
+            f"has a path to a BACKBONE_GATEWAY"
+        )
+    
+    if required_types:
+        raise ProvisioningError(
+            f"Cannot provision {label}: reachable upstream validation needs "
+            f"upstream_device_id or parent_container_id"
+        )
+    return None
+
+
 class ProvisioningService:
     """
     Provision a device and its default interfaces while enforcing topology rules.
@@ -25,6 +132,8 @@ class ProvisioningService:
     ------------
     * Validates device name uniqueness before persisting.
     * Enforces upstream dependencies (for example an OLT requires an EDGE router).
+      Optionally (`UpstreamValidation.REACHABLE`) the upstream must also be
+      connected to the backbone, checked against the in-memory topology.
     * Applies optional optical attributes directly to the `Device` row.
     * Auto-generates interface sets that match hardware expectations (PON, Ethernet).
     * Returns SQLModel entities so API responses can reuse the same schema.
@@ -55,6 +164,8 @@ class ProvisioningService:
         device_type: DeviceType,
         parent_container_id: Optional[int] = None,
         validate_upstream: bool = True,
+        upstream_validation: UpstreamValidation = UpstreamValidation.EXISTS,
+        upstream_device_id: Optional[int] = None,
         x: float = 0.0,
         y: float = 0.0,
         **optical_attrs,
@@ -67,6 +178,9 @@ class ProvisioningService:
             device_type: Enum describing the hardware role.
             parent_container_id: Optional POP/CORE_SITE container relationship.
             validate_upstream: Enforce upstream dependencies when True.
+            upstream_validation: EXISTS (a required upstream type exists
+                anywhere) or REACHABLE (see `check_reachable_upstream`).
+            upstream_device_id: Upstream device checked in REACHABLE mode.
             x: Initial X coordinate for the topology canvas.
             y: Initial Y coordinate for the topology canvas.
             **optical_attrs: Optional optical fields (`tx_power_dbm`,
@@ -85,7 +199,15 @@ class ProvisioningService:
             raise ProvisioningError(f"Device with name '{name}' already exists")
         
         # Enforce upstream dependency rules when requested
-        if validate_upstream:
+        if validate_upstream and upstream_validation == UpstreamValidation.REACHABLE:
+            check_reachable_upstream(
+                await get_topology_index(self.session),
+                component_tracker,
+                device_type,
+                parent_container_id=parent_container_id,
+                upstream_device_id=upstream_device_id,
+            )
+        elif validate_upstream:
             await self._validate_upstream_dependency(device_type)
         
         # Create device
@@ -109,10 +231,7 @@ class ProvisioningService:
     
     async def _check_name_exists(self, name: str) -> bool:
         """Return True when a device with the provided name already exists."""
-        result = await self.session.execute(
-            select(Device).where(Device.name == name)
-        )
-        return result.scalar_one_or_none() is not None
+        return await entity_cache.get_device_by_name(self.session, name) is not None
     
     async def _validate_upstream_dependency(self, device_type: DeviceType) -> None:
         """
@@ -127,39 +246,11 @@ class ProvisioningService:
         Raises:
             ProvisioningError: When no qualifying upstream device is present.
         """
-        # Define upstream requirements
-        upstream_requirements = {
-            DeviceType.EDGE_ROUTER: {
-                "required_types": {DeviceType.CORE_ROUTER, DeviceType.BACKBONE_GATEWAY},
-                "error_message": "Cannot provision EDGE_ROUTER: No CORE_ROUTER or BACKBONE_GATEWAY exists",
-            },
-            DeviceType.OLT: {
-                "required_types": {DeviceType.EDGE_ROUTER},
-                "error_message": "Cannot provision OLT: No EDGE_ROUTER exists for upstream connectivity",
-            },
-            DeviceType.AON_SWITCH: {
-                "required_types": {DeviceType.EDGE_ROUTER},
-                "error_message": "Cannot provision AON_SWITCH: No EDGE_ROUTER exists for upstream connectivity",
-            },
-            DeviceType.ONT: {
-                "required_types": {DeviceType.OLT},
-                "error_message": "Cannot provision ONT: No OLT exists for PON connection",
-            },
-            DeviceType.BUSINESS_ONT: {
-                "required_types": {DeviceType.OLT},
-                "error_message": "Cannot provision BUSINESS_ONT: No OLT exists for PON connection",
-            },
-            DeviceType.AON_CPE: {
-                "required_types": {DeviceType.AON_SWITCH},
-                "error_message": "Cannot provision AON_CPE: No AON_SWITCH exists for upstream connectivity",
-            },
-        }
-        
         # Check if this device type has upstream requirements
-        if device_type not in upstream_requirements:
+        if device_type not in UPSTREAM_REQUIREMENTS:
             return  # No upstream validation needed
         
-        requirement = upstream_requirements[device_type]
+        requirement = UPSTREAM_REQUIREMENTS[device_type]
         required_types = requirement["required_types"]
         error_message = requirement["error_message"]
         
@@ -16,6 +16,8 @@ from backend.models.core import (
     Link,
     Status,
 )
+from backend.services.changelog import record_reset
+from backend.services.topology_index import topology_index
 
 
 async def clear_all_data(session: AsyncSession) -> None:
@@ -24,7 +26,11 @@ async def clear_all_data(session: AsyncSession) -> None:
     await session.execute(text("DELETE FROM links"))
     await session.execute(text("DELETE FROM interfaces"))
     await session.execute(text("DELETE FROM devices"))
+    await record_reset(session)
     await session.commit()
+    
+    # Raw SQL bypasses the ORM hooks - drop in-memory topology state
+    topology_index.invalidate()
 
 
 async def seed_demo_topology(session: AsyncSession) -> None:
@@ -154,12 +160,13 @@ async def seed_demo_topology(session: AsyncSession) -> None:
             device_id=device.id,
             status=Status.UP,
         ))
-        interfaces.append(Interface(
-            name="eth0",
-            interface_type=InterfaceType.ETHERNET,
-            device_id=device.id,
-            status=Status.UP,
-        ))
+        for port in ("eth0", "eth1"):  # uplink, downlink (one link per port)
+            interfaces.append(Interface(
+                name=port,
+                interface_type=InterfaceType.ETHERNET,
+                device_id=device.id,
+                status=Status.UP,
+            ))
     
     # Edge routers interfaces
     for device in [edge1, edge2]:
@@ -169,12 +176,13 @@ async def seed_demo_topology(session: AsyncSession) -> None:
             device_id=device.id,
             status=Status.UP,
         ))
-        interfaces.append(Interface(
-            name="eth0",
-            interface_type=InterfaceType.ETHERNET,
-            device_id=device.id,
-            status=Status.UP,
-        ))
+        for port in ("eth0", "eth1"):  # uplink, downlink (one link per port)
+            interfaces.append(Interface(
+                name=port,
+                interface_type=InterfaceType.ETHERNET,
+                device_id=device.id,
+                status=Status.UP,
+            ))
     
     # OLT1 interfaces (optical)
     interfaces.append(Interface(
@@ -244,7 +252,7 @@ async def seed_demo_topology(session: AsyncSession) -> None:
     
     # Core1 <-> Edge1
     links.append(Link(
-        a_interface_id=find_interface(core1, "eth0").id,
+        a_interface_id=find_interface(core1, "eth1").id,
         b_interface_id=find_interface(edge1, "eth0").id,
         status=Status.UP,
     ))
@@ -258,7 +266,7 @@ async def seed_demo_topology(session: AsyncSession) -> None:
     
     # Edge1 <-> OLT1
     links.append(Link(
-        a_interface_id=find_interface(edge1, "eth0").id,
+        a_interface_id=find_interface(edge1, "eth1").id,
         b_interface_id=find_interface(olt1, "eth0").id,
         status=Status.UP,
     ))
@@ -0,0 +1,62 @@
+"""
+Single-Flight - Coalesce Identical Concurrent Reads
+
+When an incident starts, hundreds of clients request `GET /api/devices` at
+the same moment. Without coalescing each request runs its own identical
+full-table query. `SingleFlight.run(key, fn)` lets the first caller for a
+key (the leader) start `fn` and every caller that arrives while it is still
+running await the same result, so one query and one serialization serve the
+whole burst.
+
+Keys must capture everything the result depends on - for list endpoints
+that is route, query parameters and the topology version (the ETag), so a
+write in between starts a new flight instead of serving stale data.
+
+`fn` runs in its own task: a leader whose client disconnects (request
+cancelled) does not cancel the work the followers are waiting for. It must
+therefore not use request-scoped resources (open its own session).
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Per-key deduplication of in-flight coroutines.
+
+    Attributes:
+        executions: Number of times `fn` actually ran.
+        coalesced: Number of callers served by another caller's flight.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of `fn()`, sharing a still-running call for the same key."""
+        task = self._flights.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # shield: one cancelled waiter must not cancel the shared flight
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved; waiters re-raise it themselves
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+
+# Shared by the list endpoints (see `backend/services/fast_json.py`)
+read_coalescer = SingleFlight()
@@ -0,0 +1,435 @@
+"""
+SLA Engine - Monthly Availability from the Status History
+
+Business customers (`DeviceType.BUSINESS_ONT`, rule L6 "enhanced SLA") are
+owed an availability figure per month. `SlaEngine.compute` derives it from
+the append-only status history (`status_history.py`):
+
+* A customer is down while its own effective status is DOWN *or* any device
+  on its upstream chain to the backbone is. The history already stores the
+  effective status (overrides merged in); DOWN intervals of a device and of
+  its chain are merged by interval union.
+* Downtime is attributed to its root cause: the most upstream device that
+  was DOWN at the time. A customer's own outage only counts against itself
+  when nothing above it was down.
+* The upstream chain is the BFS tree towards the nearest BACKBONE_GATEWAY in
+  the *current* topology index (link status ignored).
+* Time before a device's first history row is not measured; it counts
+  neither as up nor as down. For customers first recorded mid-period the
+  upstream share of the root-cause totals is apportioned pro rata.
+
+The numeric kernel (`compute_availability`) is a pure function of NumPy
+arrays and runs in the shared process pool. Upstream chains are merged
+once per upstream device (a few thousand OLTs/routers), customers are then
+handled in one vectorized pass: the overlap of each customer's own outages
+with its chain's outages is read from a cumulative-measure function over
+all chains laid end to end. Reports are kept in memory per month;
+`POST /api/sla/compute` runs the computation as a background job.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import and_, func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.core import DeviceStatusChange, DeviceType, Status
+from backend.services.topology_index import TopologyIndex, get_topology_index
+from backend.services.workers import run_cpu_bound
+
+SLA_DEVICE_TYPES = (DeviceType.BUSINESS_ONT,)
+DEFAULT_SLA_TARGET = 99.9  # percent
+
+
+def month_period(month: str, now: Optional[datetime] = None) -> tuple[datetime, datetime]:
+    """
+    UTC range of a `YYYY-MM` month; the current month ends at `now`.
+
+    Raises:
+        ValueError: When `month` is malformed or has not started yet.
+    """
+    try:
+        year, number = (int(part) for part in month.split("-"))
+        start = datetime(year, number, 1, tzinfo=timezone.utc)
+    except ValueError:
+        raise ValueError(f"Invalid month '{month}', expected YYYY-MM") from None
+    end = datetime(year + number // 12, number % 12 + 1, 1, tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    if start >= now:
+        raise ValueError(f"Month '{month}' has not started yet")
+    return start, min(end, now)
+
+
+# ==========================================
+# NUMERIC KERNEL (runs in worker processes)
+# ==========================================
+
+
+_EMPTY = np.zeros(0, dtype=np.float64)
+
+
+def _union(starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Merge intervals into sorted, disjoint ones."""
+    if len(starts) <= 1:
+        return starts, ends
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    opens = np.empty(len(starts), dtype=bool)
+    opens[0] = True
+    opens[1:] = starts[1:] > reach[:-1]
+    first = np.flatnonzero(opens)
+    last = np.append(first[1:], len(starts)) - 1
+    return starts[first], reach[last]
+
+
+def compute_availability(
+    period: float,
+    hist_node: np.ndarray,
+    hist_t: np.ndarray,
+    hist_down: np.ndarray,
+    parent: np.ndarray,
+    upstream_order: np.ndarray,
+    customers: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Availability inputs for `customers` over `[0, period)` seconds.
+
+    Args:
+        period: Length of the period in seconds.
+        hist_node: (r,) node index of each history row, sorted by node then time.
+        hist_t: (r,) seconds since period start (the row in effect at the
+            start is clipped to 0).
+        hist_down: (r,) True where the row's status is DOWN.
+        parent: (n,) next node towards the backbone, -1 for none.
+        upstream_order: Nodes that are upstream of some customer, parents
+            before children.
+        customers: (c,) node indices to report on.
+
+    Returns:
+        `(measured, downtime, local, cause)`: seconds measured, down and down
+        through the customer's own fault, per customer; and customer-seconds
+        of downtime caused by each node, per node.
+    """
+    n = len(parent)
+    rows = len(hist_node)
+    if rows:
+        same_node = np.zeros(rows, dtype=bool)
+        same_node[:-1] = hist_node[1:] == hist_node[:-1]
+        next_t = np.full(rows, float(period))
+        next_t[:-1] = np.where(same_node[:-1], hist_t[1:], period)
+        keep = hist_down & (next_t > hist_t)
+        iv_node, iv_a, iv_b = hist_node[keep], hist_t[keep], next_t[keep]
+    else:
+        iv_node, iv_a, iv_b = np.zeros(0, dtype=np.int64), _EMPTY, _EMPTY
+
+    first_t = np.full(n, np.nan)
+    seen, first_row = np.unique(hist_node, return_index=True)
+    first_t[seen] = hist_t[first_row]
+
+    nodes = np.arange(n)
+    lo, hi = np.searchsorted(iv_node, nodes), np.searchsorted(iv_node, nodes, side="right")
+
+    # Outages along each upstream chain; `new` is the part first caused by the node itself
+    chain_a: dict[int, np.ndarray] = {}
+    chain_b: dict[int, np.ndarray] = {}
+    chain_len = np.zeros(n)
+    new = np.zeros(n)
+    for u in upstream_order.tolist():
+        p = int(parent[u])
+        pa, pb = (chain_a[p], chain_b[p]) if p >= 0 else (_EMPTY, _EMPTY)
+        chain_a[u], chain_b[u] = _union(
+            np.concatenate([pa, iv_a[lo[u]:hi[u]]]), np.concatenate([pb, iv_b[lo[u]:hi[u]]]),
+        )
+        chain_len[u] = float((chain_b[u] - chain_a[u]).sum())
+        new[u] = chain_len[u] - (chain_len[p] if p >= 0 else 0.0)
+
+    # All groups' chain outages end to end: F(x) = outage seconds before x
+    group = parent[customers]
+    groups = np.unique(group[group >= 0])
+    stride = float(period) + 1.0
+    if len(groups):
+        ga = np.concatenate([chain_a[g] + k * stride for k, g in enumerate(groups.tolist())])
+        gb = np.concatenate([chain_b[g] + k * stride for k, g in enumerate(groups.tolist())])
+    else:
+        ga = gb = _EMPTY
+    glen = gb - ga
+    gcum = np.concatenate([[0.0], np.cumsum(glen)])
+
+    def before(x: np.ndarray) -> np.ndarray:
+        k = np.searchsorted(ga, x, side="right") - 1
+        safe = np.maximum(k, 0)
+        inside = np.clip(x - ga[safe], 0.0, glen[safe]) if len(ga) else np.zeros_like(x)
+        return np.where(k >= 0, gcum[safe] + inside, 0.0)
+
+    grouped = group >= 0
+    offset = np.where(grouped, np.searchsorted(groups, group) * stride, 0.0)
+    start = first_t[customers]
+    measured_mask = ~np.isnan(start)
+    start = np.where(measured_mask, start, period)
+    measured = period - start
+    upstream = np.where(grouped & measured_mask, before(offset + period) - before(offset + start), 0.0)
+
+    slot = np.full(n, -1)
+    slot[customers] = np.arange(len(customers))
+    own_rows = slot[iv_node] >= 0
+    own_slot = slot[iv_node[own_rows]]
+    own_a, own_b = iv_a[own_rows], iv_b[own_rows]
+    own_off = offset[own_slot]
+    overlap_rows = np.where(grouped[own_slot], before(own_off + own_b) - before(own_off + own_a), 0.0)
+    own = np.bincount(own_slot, own_b - own_a, minlength=len(customers))
+    overlap = np.bincount(own_slot, overlap_rows, minlength=len(customers))
+    local = own - overlap
+    downtime = upstream + local
+
+    # Customer-seconds per root cause: chain outages weighted by the customers below each node
+    full = np.where(grouped, chain_len[np.maximum(group, 0)], 0.0)
+    weight = np.divide(upstream, full, out=np.zeros(len(customers)), where=full > 0)
+    through = np.bincount(group[grouped], weight[grouped], minlength=n)
+    for u in upstream_order[::-1].tolist():
+        if parent[u] >= 0:
+            through[parent[u]] += through[u]
+    cause = new * through
+    np.add.at(cause, customers, local)
+    return measured, downtime, local, cause
+
+
+# ==========================================
+# SERVICE
+# ==========================================
+
+
+@dataclass
+class SlaReport:
+    """Availability of one month; per-customer arrays share the order of `device_ids`."""
+
+    month: str
+    start: datetime
+    end: datetime
+    device_types: tuple[DeviceType, ...]
+    target: float
+    computed_at: datetime
+    duration_ms: float
+    device_ids: np.ndarray
+    measured: np.ndarray
+    downtime: np.ndarray
+    local_downtime: np.ndarray
+    containers: dict[int, tuple[int, float, float]]  # id → (customers, measured s, downtime s)
+    root_causes: dict[int, float]  # device id → customer-seconds of downtime caused
+
+    @property
+    def availability(self) -> np.ndarray:
+        """Percent per customer (NaN when nothing was measured)."""
+        return np.divide(
+            100.0 * (self.measured - self.downtime), self.measured,
+            out=np.full(len(self.measured), np.nan), where=self.measured > 0,
+        )
+
+    @property
+    def overall(self) -> Optional[float]:
+        """Customer-time weighted availability in percent."""
+        total = float(self.measured.sum())
+        return 100.0 * (total - float(self.downtime.sum())) / total if total > 0 else None
+
+    @property
+    def breaches(self) -> int:
+        return int(np.count_nonzero(self.availability < self.target))
+
+    def worst(self, limit: int) -> list[int]:
+        """Row positions of the `limit` lowest availabilities (unmeasured last)."""
+        availability = self.availability
+        order = np.argsort(np.where(np.isnan(availability), np.inf, availability), kind="stable")
+        return order[:limit].tolist()
+
+    def worst_containers(self, limit: int) -> list[tuple[int, int, Optional[float], float]]:
+        """`(container id, customers, availability %, downtime s)`, lowest availability first."""
+        rows = [
+            (container_id, customers, 100.0 * (measured - downtime) / measured if measured > 0 else None, downtime)
+            for container_id, (customers, measured, downtime) in self.containers.items()
+        ]
+        rows.sort(key=lambda row: (row[2] is None, row[2] if row[2] is not None else 0.0, row[0]))
+        return rows[:limit]
+
+    def top_root_causes(self, limit: int) -> list[tuple[int, float]]:
+        """`(device id, customer-seconds)`, largest first."""
+        return sorted(self.root_causes.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def summary(self) -> dict:
+        return {
+            "month": self.month,
+            "customers": len(self.device_ids),
+            "availability": self.overall,
+            "breaches": self.breaches,
+            "duration_ms": round(self.duration_ms, 1),
+        }
+
+
+class SlaEngine:
+    """
+    Compute and keep monthly SLA reports.
+
+    `cpu` runs the kernel (the process pool by default; tests may run it
+    inline).
+    """
+
+    def __init__(self, cpu: Callable = run_cpu_bound):
+        self.cpu = cpu
+        self.reports: dict[str, SlaReport] = {}
+
+    def get(self, month: str) -> Optional[SlaReport]:
+        return self.reports.get(month)
+
+    async def compute(
+        self,
+        session: AsyncSession,
+        month: str,
+        device_types: Iterable[DeviceType] = SLA_DEVICE_TYPES,
+        target: float = DEFAULT_SLA_TARGET,
+    ) -> SlaReport:
+        """
+        Compute (and keep) the report of a `YYYY-MM` month.
+
+        Raises:
+            ValueError: When `month` is malformed or has not started yet.
+        """
+        began = time.perf_counter()
+        start, end = month_period(month)
+        device_types = tuple(DeviceType(device_type) for device_type in device_types)
+        index = await get_topology_index(session)
+
+        customer_ids = sorted(
+            node.id for node in index.devices.values() if node.device_type in device_types
+        )
+        parent_of, upstream = _upstream_tree(index, customer_ids)
+        node_ids = np.array(sorted(set(customer_ids) | set(upstream)), dtype=np.int64)
+        position = {device_id: i for i, device_id in enumerate(node_ids.tolist())}
+        parent = np.array([position.get(parent_of.get(d, -1), -1) for d in node_ids.tolist()], dtype=np.int64)
+        upstream_order = np.array([position[d] for d in upstream], dtype=np.int64)
+        customers = np.array([position[d] for d in customer_ids], dtype=np.int64)
+
+        hist_node, hist_t, hist_down = await _load_history(session, node_ids, start, end)
+        period = (end - start).total_seconds()
+        measured, downtime, local, cause = await self.cpu(
+            compute_availability, period, hist_node, hist_t, hist_down, parent, upstream_order, customers,
+        )
+
+        report = SlaReport(
+            month=month,
+            start=start,
+            end=end,
+            device_types=device_types,
+            target=target,
+            computed_at=datetime.now(timezone.utc),
+            duration_ms=0.0,
+            device_ids=np.array(customer_ids, dtype=np.int64),
+            measured=measured,
+            downtime=downtime,
+            local_downtime=local,
+            containers=_container_totals(index, customer_ids, measured, downtime),
+            root_causes={
+                int(node_ids[i]): float(cause[i]) for i in np.flatnonzero(cause > 0)
+            },
+        )
+        report.duration_ms = (time.perf_counter() - began) * 1000
+        self.reports[month] = report
+        return report
+
+
+def _upstream_tree(index: TopologyIndex, customer_ids: list[int]) -> tuple[dict[int, int], list[int]]:
+    """
+    BFS tree towards the nearest BACKBONE_GATEWAY.
+
+    Returns the parent of every reached device and the devices upstream of
+    any customer, parents before children.
+    """
+    parent: dict[int, int] = {}
+    depth: dict[int, int] = {}
+    queue: deque[int] = deque()
+    for node in index.devices.values():
+        if node.device_type == DeviceType.BACKBONE_GATEWAY:
+            depth[node.id] = 0
+            queue.append(node.id)
+    while queue:
+        device_id = queue.popleft()
+        for neighbour in index.neighbors(device_id).values():
+            if neighbour not in depth:
+                depth[neighbour] = depth[device_id] + 1
+                parent[neighbour] = device_id
+                queue.append(neighbour)
+
+    upstream: set[int] = set()
+    for customer_id in customer_ids:
+        device_id = parent.get(customer_id)
+        while device_id is not None and device_id not in upstream:
+            upstream.add(device_id)
+            device_id = parent.get(device_id)
+    return parent, sorted(upstream, key=lambda device_id: (depth[device_id], device_id))
+
+
+async def _load_history(
+    session: AsyncSession, node_ids: np.ndarray, start: datetime, end: datetime,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """History rows of `node_ids` in effect during `[start, end)`, as kernel arrays."""
+    in_effect = (
+        select(DeviceStatusChange.device_id, func.max(DeviceStatusChange.changed_at).label("changed_at"))
+        .where(DeviceStatusChange.changed_at <= start)
+        .group_by(DeviceStatusChange.device_id)
+        .subquery()
+    )
+    columns = (DeviceStatusChange.device_id, DeviceStatusChange.changed_at, DeviceStatusChange.status, DeviceStatusChange.id)
+    rows = union_all(
+        select(*columns).join(in_effect, and_(
+            DeviceStatusChange.device_id == in_effect.c.device_id,
+            DeviceStatusChange.changed_at == in_effect.c.changed_at,
+        )),
+        select(*columns).where(DeviceStatusChange.changed_at > start, DeviceStatusChange.changed_at < end),
+    ).subquery()
+    result = await session.execute(select(rows).order_by(rows.c.device_id, rows.c.changed_at, rows.c.id))
+
+    start_ts = start.timestamp()
+    device, seconds, down = [], [], []
+    for device_id, changed_at, status, _ in result:
+        if changed_at.tzinfo is None:
+            changed_at = changed_at.replace(tzinfo=timezone.utc)
+        device.append(device_id)
+        seconds.append(changed_at.timestamp() - start_ts)
+        down.append(status == Status.DOWN)
+
+    device_ids = np.array(device, dtype=np.int64)
+    position = np.searchsorted(node_ids, device_ids)
+    known = (position < len(node_ids)) & (node_ids[np.minimum(position, len(node_ids) - 1)] == device_ids) \
+        if len(node_ids) else np.zeros(len(device_ids), dtype=bool)
+    return (
+        position[known].astype(np.int64),
+        np.maximum(np.array(seconds, dtype=np.float64)[known], 0.0),
+        np.array(down, dtype=bool)[known],
+    )
+
+
+def _container_totals(
+    index: TopologyIndex, customer_ids: list[int], measured: np.ndarray, downtime: np.ndarray,
+) -> dict[int, tuple[int, float, float]]:
+    """(customers, measured, downtime) per enclosing container, at any depth."""
+    pairs = [
+        (container_id, i)
+        for i, customer_id in enumerate(customer_ids)
+        for container_id in index.ancestors.get(customer_id, ())
+    ]
+    if not pairs:
+        return {}
+    containers, rows = np.array(pairs, dtype=np.int64).T
+    ids, slot = np.unique(containers, return_inverse=True)
+    counts = np.bincount(slot, minlength=len(ids))
+    measured_sum = np.bincount(slot, measured[rows], minlength=len(ids))
+    downtime_sum = np.bincount(slot, downtime[rows], minlength=len(ids))
+    return {
+        int(ids[k]): (int(counts[k]), float(measured_sum[k]), float(downtime_sum[k]))
+        for k in range(len(ids))
+    }
+
+
+sla_engine = SlaEngine()
@@ -0,0 +1,244 @@
+"""
+Status History - Append-Only Log of Effective-Status Transitions
+
+`Device.status` / `status_override` are overwritten in place. Every write
+that changes a device's effective status (override first, then `status`)
+also appends a `DeviceStatusChange` row in the same transaction:
+
+* ORM writes (single-device endpoints) are picked up by an `after_flush`
+  hook that compares attribute history - one multi-row INSERT per flush.
+* Set-based writes (`bulk_operations.write_overrides`, shared by bulk
+  overrides and maintenance windows) call `record_status_changes` with the
+  transitions they computed.
+
+Devices created through the ORM get an initial row, and a snapshot restore
+writes one for every restored device (`record_current_status`); for rows
+inserted by bulk imports history starts at the first transition. Rows are
+kept when their device is deleted or the topology is restored.
+
+Transitions of existing devices are also handed to the `on_transitions`
+listeners once the transaction commits (alarm correlation); initial rows
+are not. Rows are read back per device and time
+range (`status_changes`, `status_at`) through the (device_id, changed_at)
+index, and `rollup` turns them into time spent per status per hour/day.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event, func, insert, inspect, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.models.core import Device, DeviceStatusChange, Status
+
+# (device id, new effective status) pairs of one committed transaction
+Transitions = list[tuple[int, Status]]
+_transition_listeners: list[Callable[[Transitions], None]] = []
+_PENDING_KEY = "status_history_pending"
+
+
+class HistoryBucket(str, Enum):
+    """Rollup granularity (buckets are aligned to UTC hours / days)"""
+
+    HOUR = "hour"
+    DAY = "day"
+
+    @property
+    def seconds(self) -> int:
+        return 3600 if self == HistoryBucket.HOUR else 86400
+
+
+@dataclass
+class StatusBucket:
+    """Seconds spent in each status during one bucket (unknown time is omitted)."""
+
+    start: datetime
+    seconds: dict[Status, float] = field(default_factory=dict)
+
+    def minutes(self, status: Status) -> float:
+        return self.seconds.get(status, 0.0) / 60
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; all stored times are UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+# ==========================================
+# RECORDING
+# ==========================================
+
+
+async def record_status_changes(session: AsyncSession, changes: Iterable[tuple[int, Status]]) -> None:
+    """Append `(device_id, new effective status)` rows for set-based writes (caller commits)."""
+    now = _now()
+    rows = [{"device_id": device_id, "changed_at": now, "status": status} for device_id, status in changes]
+    if rows:
+        await session.execute(insert(DeviceStatusChange), rows)
+        _remember(session.sync_session, rows)
+
+
+async def record_current_status(session: AsyncSession) -> None:
+    """Append the current effective status of every device (after set-based restores; caller commits)."""
+    await session.execute(
+        insert(DeviceStatusChange).from_select(
+            ["device_id", "changed_at", "status"],
+            select(Device.id, literal(_now()), func.coalesce(Device.status_override, Device.status)),
+        )
+    )
+
+
+def _previous(state, attribute: str):
+    history = state.attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def _effective(status, status_override) -> Optional[Status]:
+    value = status_override or status
+    return Status(value) if value is not None else None
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_status(session: Session, flush_context) -> None:
+    """Append a history row for every flushed device whose effective status changed."""
+    now = _now()
+    initial = []
+    rows = []
+    for obj in session.new:
+        if isinstance(obj, Device):
+            initial.append({"device_id": obj.id, "changed_at": now, "status": _effective(obj.status, obj.status_override)})
+    for obj in session.dirty:
+        if not isinstance(obj, Device):
+            continue
+        state = inspect(obj)
+        before = _effective(_previous(state, "status"), _previous(state, "status_override"))
+        after = _effective(obj.status, obj.status_override)
+        if before != after:
+            rows.append({"device_id": obj.id, "changed_at": now, "status": after})
+    if initial or rows:
+        session.connection().execute(insert(DeviceStatusChange), initial + rows)
+        _remember(session, rows)
+
+
+# ==========================================
+# COMMIT NOTIFICATIONS
+# ==========================================
+
+
+def on_transitions(listener: Callable[[Transitions], None]) -> Callable[[Transitions], None]:
+    """
+    Register `listener(transitions)`, called after each commit that changed
+    the effective status of existing devices.
+
+    Listeners run synchronously inside the commit hook and must not do I/O
+    (schedule a task instead).
+    """
+    _transition_listeners.append(listener)
+    return listener
+
+
+def _remember(session: Session, rows: list[dict]) -> None:
+    if rows:
+        session.info.setdefault(_PENDING_KEY, []).extend((row["device_id"], row["status"]) for row in rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_transitions(session: Session) -> None:
+    transitions = session.info.pop(_PENDING_KEY, None)
+    if transitions:
+        for listener in _transition_listeners:
+            listener(transitions)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_transitions(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ==========================================
+# QUERIES
+# ==========================================
+
+
+async def status_at(session: AsyncSession, device_id: int, at: datetime) -> Optional[Status]:
+    """Effective status at `at` (None when nothing was recorded before it)."""
+    return (await session.execute(
+        select(DeviceStatusChange.status)
+        .where(DeviceStatusChange.device_id == device_id, DeviceStatusChange.changed_at <= at)
+        .order_by(DeviceStatusChange.changed_at.desc(), DeviceStatusChange.id.desc())
+        .limit(1)
+    )).scalar()
+
+
+async def status_changes(
+    session: AsyncSession, device_id: int, start: datetime, end: datetime,
+) -> list[tuple[datetime, Status]]:
+    """Transitions with `start < changed_at < end`, oldest first."""
+    rows = await session.execute(
+        select(DeviceStatusChange.changed_at, DeviceStatusChange.status)
+        .where(
+            DeviceStatusChange.device_id == device_id,
+            DeviceStatusChange.changed_at > start,
+            DeviceStatusChange.changed_at < end,
+        )
+        .order_by(DeviceStatusChange.changed_at, DeviceStatusChange.id)
+    )
+    return [(_aware(changed_at), Status(status)) for changed_at, status in rows]
+
+
+def _bucket_starts(start_ts: float, end_ts: float, size: int) -> range:
+    return range(int(start_ts - start_ts % size), math.ceil(end_ts), size)
+
+
+def rollup(
+    initial: Optional[Status],
+    changes: list[tuple[datetime, Status]],
+    start: datetime,
+    end: datetime,
+    bucket: HistoryBucket,
+) -> list[StatusBucket]:
+    """
+    Time spent per status in each bucket overlapping `[start, end)`.
+
+    `initial` is the status at `start`; `changes` are the transitions after
+    it (as returned by `status_changes`). Buckets start at UTC multiples of
+    the bucket size; the first and last are clipped to the range.
+    """
+    size = bucket.seconds
+    start_ts, end_ts = _aware(start).timestamp(), _aware(end).timestamp()
+    starts = _bucket_starts(start_ts, end_ts, size)
+    first = starts.start
+    buckets = [StatusBucket(start=datetime.fromtimestamp(ts, timezone.utc)) for ts in starts]
+
+    def spend(status: Optional[Status], begin: float, until: float) -> None:
+        while status is not None and begin < until:
+            slot = int((begin - first) // size)
+            slot_end = min(until, first + (slot + 1) * size)
+            seconds = buckets[slot].seconds
+            seconds[status] = seconds.get(status, 0.0) + (slot_end - begin)
+            begin = slot_end
+
+    current, cursor = initial, start_ts
+    for changed_at, status in changes:
+        ts = min(max(changed_at.timestamp(), start_ts), end_ts)
+        spend(current, cursor, ts)
+        current, cursor = status, ts
+    spend(current, cursor, end_ts)
+    return buckets
+
+
+def bucket_count(start: datetime, end: datetime, bucket: HistoryBucket) -> int:
+    """Number of buckets `rollup` returns for the range."""
+    return len(_bucket_starts(_aware(start).timestamp(), _aware(end).timestamp(), bucket.seconds))
@@ -0,0 +1,103 @@
+"""
+Status Propagation - Downstream Impact of Effective-Status Changes
+
+A device is *reachable* when it has a path to a BACKBONE_GATEWAY along
+links that are not DOWN, through devices whose effective status (override
+first, then `status`) is not DOWN; the gateway itself must not be DOWN
+either. Overriding a router DOWN therefore cuts off everything behind it
+that has no other way to the backbone.
+
+`StatusPropagation.preview(overrides)` compares reachability before and
+after a set of override changes without writing anything: it backs both
+the dry-run and the response of `POST /api/overrides/bulk`. The baseline
+reachable set is one BFS over the topology index and is cached until the
+index version changes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from backend.constants.link_rules import CUSTOMER_DEVICE_TYPES
+from backend.models.core import DeviceType, Status
+from backend.services.topology_index import TopologyIndex, topology_index
+
+# device id → new override (None clears it)
+OverrideMap = dict[int, Optional[Status]]
+
+
+@dataclass
+class OverrideImpact:
+    """Effect of override changes on effective status and reachability."""
+
+    changed: dict[int, tuple[Status, Status]] = field(default_factory=dict)  # own status before → after
+    cut_off: list[int] = field(default_factory=list)    # lose their path to the backbone
+    restored: list[int] = field(default_factory=list)   # regain it
+    customers_cut_off: int = 0
+    customers_restored: int = 0
+
+
+class StatusPropagation:
+    """Reachability over a `TopologyIndex`, with the baseline cached per version."""
+
+    def __init__(self, index: TopologyIndex):
+        self.index = index
+        self._baseline: Optional[set[int]] = None
+        self._baseline_version: Optional[int] = None
+
+    def effective_status(self, device_id: int, overrides: Optional[OverrideMap] = None) -> Status:
+        node = self.index.devices[device_id]
+        if overrides and device_id in overrides:
+            return overrides[device_id] or node.status
+        return node.effective_status
+
+    def reachable(self, overrides: Optional[OverrideMap] = None) -> set[int]:
+        """Devices with a working path to a BACKBONE_GATEWAY (`overrides` applied)."""
+        if not overrides:
+            if self._baseline is None or self._baseline_version != self.index.version:
+                self._baseline = self._search(None)
+                self._baseline_version = self.index.version
+            return self._baseline
+        return self._search(overrides)
+
+    def preview(self, overrides: OverrideMap) -> OverrideImpact:
+        """Compare the current state with the state after applying `overrides`."""
+        before = self.reachable()
+        after = self.reachable(overrides)
+        impact = OverrideImpact()
+        for device_id in overrides:
+            if device_id not in self.index.devices:
+                continue
+            old, new = self.effective_status(device_id), self.effective_status(device_id, overrides)
+            if old != new:
+                impact.changed[device_id] = (old, new)
+        impact.cut_off = sorted(before - after - impact.changed.keys())
+        impact.restored = sorted(after - before - impact.changed.keys())
+        impact.customers_cut_off = self._customers(impact.cut_off)
+        impact.customers_restored = self._customers(impact.restored)
+        return impact
+
+    def _customers(self, device_ids: list[int]) -> int:
+        return sum(1 for device_id in device_ids if self.index.devices[device_id].device_type in CUSTOMER_DEVICE_TYPES)
+
+    def _search(self, overrides: Optional[OverrideMap]) -> set[int]:
+        index = self.index
+
+        def up(device_id: int) -> bool:
+            return self.effective_status(device_id, overrides) != Status.DOWN
+
+        reached = {
+            node.id for node in index.devices.values()
+            if node.device_type == DeviceType.BACKBONE_GATEWAY and up(node.id)
+        }
+        frontier = list(reached)
+        while frontier:
+            device_id = frontier.pop()
+            for link_id, neighbour in index.neighbors(device_id).items():
+                if neighbour in reached or index.links[link_id].status == Status.DOWN or not up(neighbour):
+                    continue
+                reached.add(neighbour)
+                frontier.append(neighbour)
+        return reached
+
+
+status_propagation = StatusPropagation(topology_index)
@@ -0,0 +1,397 @@
+"""
+Topology Aggregation - Level-of-Detail Views for Zoomed-Out Clients
+
+Collapses the topology into cluster nodes and merges parallel links into
+bundles so a browser zoomed out to the whole network receives a few hundred
+nodes instead of every ONT.
+
+Levels
+------
+* ``SUBTREE`` (1): customer devices (ONT, BUSINESS_ONT, AON_CPE) fold into the
+  access device (OLT / AON_SWITCH) they hang off, reached through passive
+  inline devices if necessary.
+* ``CONTAINER`` (2): additionally, everything inside a POP / CORE_SITE (via
+  `parent_container_id`, nested containers fold into the outermost one) becomes
+  a single node. Customers follow their access device into its container.
+
+Cluster membership, worst-case status and bundle counts are precomputed once
+and then maintained incrementally from `TopologyIndex` callbacks, so a query
+only serializes the (small) aggregated graph.
+"""
+
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Iterable, Optional
+
+from backend.constants.link_rules import (
+    ACCESS_DEVICE_TYPES,
+    CUSTOMER_DEVICE_TYPES,
+    PASSIVE_DEVICE_TYPES,
+)
+from backend.models.core import Status
+from backend.services.topology_index import (
+    DeviceNode,
+    LinkEdge,
+    TopologyIndex,
+    TopologyListener,
+    topology_index,
+)
+
+
+class AggregationLevel(IntEnum):
+    """How aggressively the topology is collapsed."""
+
+    SUBTREE = 1
+    CONTAINER = 2
+
+
+# Zoom factors below this value collapse whole containers
+CONTAINER_ZOOM_THRESHOLD = 0.25
+
+# DOWN beats DEGRADED beats UP
+STATUS_SEVERITY = {Status.UP: 0, Status.DEGRADED: 1, Status.DOWN: 2}
+
+
+def level_for_zoom(zoom: float) -> AggregationLevel:
+    """Map a canvas zoom factor (1.0 = 100 %) to an aggregation level."""
+    if zoom < CONTAINER_ZOOM_THRESHOLD:
+        return AggregationLevel.CONTAINER
+    return AggregationLevel.SUBTREE
+
+
+def worst_status(status_counts: Counter) -> Status:
+    """Return the most severe status with a non-zero count (UP when empty)."""
+    present = [status for status, count in status_counts.items() if count > 0]
+    if not present:
+        return Status.UP
+    return max(present, key=STATUS_SEVERITY.__getitem__)
+
+
+@dataclass
+class ClusterStats:
+    """Running totals for one visible node at one level."""
+
+    key: str
+    kind: str  # "device" | "subtree" | "container"
+    anchor_id: int
+    count: int = 0
+    status_counts: Counter = field(default_factory=Counter)
+    sum_x: float = 0.0
+    sum_y: float = 0.0
+
+
+@dataclass
+class BundleStats:
+    """Running totals for all links between two visible nodes."""
+
+    source: str
+    target: str
+    count: int = 0
+    status_counts: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class _LevelState:
+    clusters: dict[str, ClusterStats] = field(default_factory=dict)
+    bundles: dict[tuple[str, str], BundleStats] = field(default_factory=dict)
+    # Contributions, stored so they can be withdrawn exactly
+    device_contrib: dict[int, tuple[str, Status, float, float]] = field(default_factory=dict)
+    link_contrib: dict[int, tuple[tuple[str, str], Status]] = field(default_factory=dict)
+
+
+class TopologyAggregator(TopologyListener):
+    """
+    Maintains every aggregation level on top of a `TopologyIndex`.
+
+    State is built lazily on the first `snapshot` after a reset and then
+    updated in place by the index callbacks.
+    """
+
+    def __init__(self, index: TopologyIndex):
+        self.index = index
+        self.owner_of: dict[int, int] = {}
+        self.owned: dict[int, set[int]] = {}
+        self._levels: dict[AggregationLevel, _LevelState] = {}
+        self._built = False
+        index.subscribe(self)
+
+    # ----- public API -----
+
+    def snapshot(self, level: AggregationLevel) -> dict:
+        """Return the aggregated graph for `level` as plain dicts."""
+        if not self._built:
+            self._build()
+        state = self._levels[level]
+        nodes = []
+        for cluster in state.clusters.values():
+            anchor = self.index.devices.get(cluster.anchor_id)
+            nodes.append({
+                "id": cluster.key,
+                "kind": cluster.kind,
+                "anchor_id": cluster.anchor_id,
+                "name": anchor.name if anchor else None,
+                "device_type": anchor.device_type if anchor else None,
+                "count": cluster.count,
+                "status": worst_status(cluster.status_counts),
+                "status_counts": {s.value: n for s, n in cluster.status_counts.items() if n},
+                "x": cluster.sum_x / cluster.count,
+                "y": cluster.sum_y / cluster.count,
+            })
+        bundles = [
+            {
+                "id": f"{bundle.source}~{bundle.target}",
+                "source": bundle.source,
+                "target": bundle.target,
+                "count": bundle.count,
+                "status": worst_status(bundle.status_counts),
+                "status_counts": {s.value: n for s, n in bundle.status_counts.items() if n},
+            }
+            for bundle in state.bundles.values()
+        ]
+        return {
+            "level": int(level),
+            "version": self.index.version,
+            "nodes": nodes,
+            "bundles": bundles,
+        }
+
+    # ----- TopologyListener -----
+
+    def on_topology_reset(self) -> None:
+        self._built = False
+        self._levels = {}
+        self.owner_of = {}
+        self.owned = {}
+
+    def on_device_upserted(self, old: Optional[DeviceNode], new: DeviceNode) -> None:
+        if not self._built:
+            return
+        affected = {new.id}
+        if old is not None and (
+            old.parent_container_id != new.parent_container_id
+            or old.device_type != new.device_type
+        ):
+            affected |= self.index.contents(new.id, recursive=True)
+            if old.device_type != new.device_type:
+                affected |= self._refresh_owners(self._customers_near(new.id, include_access=True))
+        for device_id in list(affected):
+            affected |= self.owned.get(device_id, set())
+        self._replace(affected)
+
+    def on_device_removed(self, node: DeviceNode) -> None:
+        if not self._built:
+            return
+        for state in self._levels.values():
+            self._withdraw_device(state, node.id)
+        owner = self.owner_of.pop(node.id, None)
+        if owner is not None:
+            self.owned.get(owner, set()).discard(node.id)
+        orphans = self.owned.pop(node.id, set())
+        for customer_id in orphans:
+            self.owner_of.pop(customer_id, None)
+        # The index already cut the subtree loose; rebuild it from the direct children
+        former_subtree = set()
+        for child_id in self.index.contents(node.id):
+            former_subtree |= {child_id} | self.index.contents(child_id, recursive=True)
+        affected = self._refresh_owners(orphans) | orphans | former_subtree
+        affected.discard(node.id)
+        self._replace(affected)
+
+    def on_link_added(self, edge: LinkEdge) -> None:
+        if not self._built:
+            return
+        self._replace(self._refresh_owners(self._customers_near_edge(edge)))
+        for level, state in self._levels.items():
+            self._add_link(level, state, edge)
+
+    def on_link_removed(self, edge: LinkEdge) -> None:
+        if not self._built:
+            return
+        for state in self._levels.values():
+            self._withdraw_link(state, edge.id)
+        self._replace(self._refresh_owners(self._customers_near_edge(edge)))
+
+    # ----- build -----
+
+    def _build(self) -> None:
+        self._levels = {level: _LevelState() for level in AggregationLevel}
+        self.owner_of = {}
+        self.owned = {}
+        customers = [
+            node.id for node in self.index.devices.values()
+            if node.device_type in CUSTOMER_DEVICE_TYPES
+        ]
+        self._refresh_owners(customers)
+        for level, state in self._levels.items():
+            for node in self.index.devices.values():
+                self._place_device(level, state, node)
+            for edge in self.index.links.values():
+                self._add_link(level, state, edge)
+        self._built = True
+
+    # ----- ownership (customer → access device) -----
+
+    def _find_owner(self, customer_id: int) -> Optional[int]:
+        """Nearest access device reachable through passive devices only."""
+        devices = self.index.devices
+        seen = {customer_id}
+        frontier = [customer_id]
+        while frontier:
+            found = []
+            next_frontier = []
+            for device_id in frontier:
+                for neighbor_id in self.index.neighbors(device_id).values():
+                    if neighbor_id in seen:
+                        continue
+                    seen.add(neighbor_id)
+                    neighbor = devices.get(neighbor_id)
+                    if neighbor is None:
+                        continue
+                    if neighbor.device_type in ACCESS_DEVICE_TYPES:
+                        found.append(neighbor_id)
+                    elif neighbor.device_type in PASSIVE_DEVICE_TYPES:
+                        next_frontier.append(neighbor_id)
+            if found:
+                return min(found)
+            frontier = next_frontier
+        return None
+
+    def _refresh_owners(self, customer_ids: Iterable[int]) -> set[int]:
+        """Recompute owners; return the customers whose owner changed."""
+        changed = set()
+        for customer_id in customer_ids:
+            owner = self._find_owner(customer_id)
+            previous = self.owner_of.get(customer_id)
+            if owner == previous:
+                continue
+            if previous is not None:
+                self.owned.get(previous, set()).discard(customer_id)
+            if owner is None:
+                self.owner_of.pop(customer_id, None)
+            else:
+                self.owner_of[customer_id] = owner
+                self.owned.setdefault(owner, set()).add(customer_id)
+            changed.add(customer_id)
+        return changed
+
+    def _customers_near(self, device_id: int, include_access: bool = False) -> set[int]:
+        """Customers whose ownership may depend on `device_id`'s links."""
+        devices = self.index.devices
+        node = devices.get(device_id)
+        if node is None:
+            return set()
+        if node.device_type in CUSTOMER_DEVICE_TYPES:
+            return {device_id}
+        if node.device_type not in PASSIVE_DEVICE_TYPES and not include_access:
+            return set()
+        customers = set()
+        seen = {device_id}
+        queue = deque([device_id])
+        while queue:
+            current = queue.popleft()
+            for neighbor_id in self.index.neighbors(current).values():
+                if neighbor_id in seen:
+                    continue
+                seen.add(neighbor_id)
+                neighbor = devices.get(neighbor_id)
+                if neighbor is None:
+                    continue
+                if neighbor.device_type in CUSTOMER_DEVICE_TYPES:
+                    customers.add(neighbor_id)
+                elif neighbor.device_type in PASSIVE_DEVICE_TYPES:
+                    queue.append(neighbor_id)
+        return customers
+
+    def _customers_near_edge(self, edge: LinkEdge) -> set[int]:
+        customers = set()
+        for device_id in (edge.a_device_id, edge.b_device_id):
+            if device_id is not None:
+                customers |= self._customers_near(device_id)
+        return customers
+
+    # ----- cluster assignment -----
+
+    def _cluster_for(self, level: AggregationLevel, node: DeviceNode) -> tuple[str, str, int]:
+        """Return `(key, kind, anchor_id)` of the visible node `node` folds into."""
+        anchor_id = node.id
+        if node.device_type in CUSTOMER_DEVICE_TYPES:
+            anchor_id = self.owner_of.get(node.id, node.id)
+        if level >= AggregationLevel.CONTAINER:
+            root = self.index.container_root(node.id)
+            if root is None and anchor_id != node.id:
+                root = self.index.container_root(anchor_id)
+            if root is not None:
+                return f"container:{root}", "container", root
+        if anchor_id != node.id or node.device_type in ACCESS_DEVICE_TYPES:
+            return f"subtree:{anchor_id}", "subtree", anchor_id
+        return f"device:{node.id}", "device", node.id
+
+    def _place_device(self, level: AggregationLevel, state: _LevelState, node: DeviceNode) -> None:
+        key, kind, anchor_id = self._cluster_for(level, node)
+        cluster = state.clusters.get(key)
+        if cluster is None:
+            cluster = state.clusters[key] = ClusterStats(key=key, kind=kind, anchor_id=anchor_id)
+        status = node.effective_status
+        cluster.count += 1
+        cluster.status_counts[status] += 1
+        cluster.sum_x += node.x
+        cluster.sum_y += node.y
+        state.device_contrib[node.id] = (key, status, node.x, node.y)
+
+    def _withdraw_device(self, state: _LevelState, device_id: int) -> None:
+        contrib = state.device_contrib.pop(device_id, None)
+        if contrib is None:
+            return
+        key, status, x, y = contrib
+        cluster = state.clusters[key]
+        cluster.count -= 1
+        cluster.status_counts[status] -= 1
+        cluster.sum_x -= x
+        cluster.sum_y -= y
+        if cluster.count == 0:
+            del state.clusters[key]
+
+    def _add_link(self, level: AggregationLevel, state: _LevelState, edge: LinkEdge) -> None:
+        self._withdraw_link(state, edge.id)
+        source = state.device_contrib.get(edge.a_device_id)
+        target = state.device_contrib.get(edge.b_device_id)
+        if source is None or target is None or source[0] == target[0]:
+            return  # dangling, or folded inside a single cluster
+        pair = tuple(sorted((source[0], target[0])))
+        bundle = state.bundles.get(pair)
+        if bundle is None:
+            bundle = state.bundles[pair] = BundleStats(source=pair[0], target=pair[1])
+        bundle.count += 1
+        bundle.status_counts[edge.status] += 1
+        state.link_contrib[edge.id] = (pair, edge.status)
+
+    def _withdraw_link(self, state: _LevelState, link_id: int) -> None:
+        contrib = state.link_contrib.pop(link_id, None)
+        if contrib is None:
+            return
+        pair, status = contrib
+        bundle = state.bundles[pair]
+        bundle.count -= 1
+        bundle.status_counts[status] -= 1
+        if bundle.count == 0:
+            del state.bundles[pair]
+
+    def _replace(self, device_ids: set[int]) -> None:
+        """Withdraw and re-place devices (and their links) at every level."""
+        if not device_ids:
+            return
+        nodes = [self.index.devices[d] for d in device_ids if d in self.index.devices]
+        edges = {edge.id: edge for node in nodes for edge in self.index.incident_links(node.id)}
+        for level, state in self._levels.items():
+            for link_id in edges:
+                self._withdraw_link(state, link_id)
+            for node in nodes:
+                self._withdraw_device(state, node.id)
+            for node in nodes:
+                self._place_device(level, state, node)
+            for edge in edges.values():
+                self._add_link(level, state, edge)
+
+
+topology_aggregator = TopologyAggregator(topology_index)
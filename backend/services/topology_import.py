@@ -0,0 +1,424 @@
+"""
+Topology Import - Streaming Bulk Onboarding
+
+Loads devices and links from an uploaded file without one HTTP call per row.
+The file is parsed as a stream, validated row by row and written in batches,
+so memory stays bounded by the batch size (plus one name → id entry per
+device) no matter how large the file is.
+
+Formats
+-------
+* ``jsonl`` - one JSON object per line (JSON Lines):
+      {"kind": "device", "name": "olt-1", "device_type": "OLT", "parent": "pop-1"}
+      {"kind": "link", "a": "edge-1", "b": "olt-1", "length_km": 2.5}
+* ``csv`` - header row plus one record per row; the ``kind`` column selects
+  device or link, unused columns stay empty.
+* ``graphml`` - ``<node id="name">`` become devices and
+  ``<edge source= target=>`` become links; ``<data>`` keys map to the same
+  field names (``device_type``, ``parent``, ``x``, ``length_km``, ...).
+
+Fields
+------
+device: name, device_type, parent (container name), x, y, status,
+        tx_power_dbm, sensitivity_min_dbm, insertion_loss_db
+link:   a, b (device names), status, length_km, physical_medium_id,
+        link_type (fiber | copper, selects the interface type)
+
+Rules
+-----
+* Device names are unique (existing devices and earlier rows).
+* Parents must be POP/CORE_SITE devices defined earlier in the file or
+  already present.
+* Links reference devices by name and must satisfy
+  `validate_link_between_devices` (L1-L9). Each link gets one new interface
+  per end, named like `POST /api/links/create-simple` does.
+
+Invalid rows are skipped and reported (row number + reason); valid rows are
+committed batch by batch.
+"""
+
+import csv
+import io
+import json
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import IO, Any, Awaitable, Callable, Iterator, Optional, Union
+
+from sqlalchemy import func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from backend.constants.link_rules import CONTAINER_DEVICE_TYPES, validate_link_between_devices
+from backend.models.core import Device, DeviceType, Interface, InterfaceType, Link, Status
+from backend.services.changelog import record_changes
+from backend.services.link_validation import claim_endpoints
+from backend.services.topology_index import topology_index
+
+IMPORT_FORMATS = ("jsonl", "csv", "graphml")
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000  # Further errors are only counted
+
+# Same mapping as the simple link endpoint
+LINK_MEDIUM_INTERFACE_TYPES = {
+    "fiber": InterfaceType.OPTICAL,
+    "copper": InterfaceType.ETHERNET,
+    "wireless": InterfaceType.ETHERNET,
+}
+
+ProgressCallback = Callable[[float, Optional[str]], Awaitable[None]]
+
+
+class TopologyImportError(ValueError):
+    """Raised for a malformed row (reported per row) or an unusable file."""
+
+
+# ==========================================
+# STREAMING PARSERS
+# ==========================================
+
+# Each parser yields (row_number, record) where record is a dict of fields or
+# a TopologyImportError for rows that could not be parsed at all.
+ParsedRow = tuple[int, Union[dict, TopologyImportError]]
+
+
+def _iter_jsonl(stream: IO[bytes]) -> Iterator[ParsedRow]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    for row, line in enumerate(text, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, TopologyImportError(f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(record, dict):
+            yield row, TopologyImportError("Expected a JSON object")
+            continue
+        yield row, record
+
+
+def _iter_csv(stream: IO[bytes]) -> Iterator[ParsedRow]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    for record in reader:
+        yield reader.line_num, {k: v for k, v in record.items() if k and v not in (None, "")}
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _iter_graphml(stream: IO[bytes]) -> Iterator[ParsedRow]:
+    keys: dict[str, str] = {}
+    graph: Optional[ET.Element] = None
+    row = 0
+    try:
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            tag = _local(elem.tag)
+            if event == "start":
+                if tag == "graph":
+                    graph = elem
+                continue
+            if tag == "key":
+                keys[elem.get("id", "")] = elem.get("attr.name") or elem.get("id", "")
+            elif tag in ("node", "edge"):
+                row += 1
+                if tag == "node":
+                    record: dict[str, Any] = {"kind": "device", "name": elem.get("id")}
+                else:
+                    record = {"kind": "link", "a": elem.get("source"), "b": elem.get("target")}
+                for data in elem:
+                    if _local(data.tag) == "data" and data.text is not None:
+                        record[keys.get(data.get("key", ""), data.get("key", ""))] = data.text.strip()
+                yield row, record
+                # Drop the parsed element so the tree never grows with the file
+                elem.clear()
+                if graph is not None:
+                    try:
+                        graph.remove(elem)
+                    except ValueError:
+                        pass
+    except ET.ParseError as e:
+        yield row + 1, TopologyImportError(f"Invalid GraphML: {e}")
+
+
+_PARSERS = {"jsonl": _iter_jsonl, "csv": _iter_csv, "graphml": _iter_graphml}
+
+
+# ==========================================
+# IMPORTER
+# ==========================================
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import run."""
+
+    rows: int = 0
+    devices_created: int = 0
+    links_created: int = 0
+    interfaces_created: int = 0
+    error_count: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add_error(self, row: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "devices_created": self.devices_created,
+            "links_created": self.links_created,
+            "interfaces_created": self.interfaces_created,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "errors_truncated": self.error_count > len(self.errors),
+        }
+
+
+def _optional_float(record: dict, key: str) -> Optional[float]:
+    value = record.get(key)
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise TopologyImportError(f"'{key}' must be a number, got {value!r}")
+
+
+def _status(record: dict, default: Status) -> Status:
+    value = record.get("status")
+    if value is None or value == "":
+        return default
+    try:
+        return Status(str(value).upper())
+    except ValueError:
+        raise TopologyImportError(f"Invalid status {value!r}")
+
+
+class TopologyImporter:
+    """
+    Stream a topology file into the database in batches.
+
+    Usage
+    -----
+        importer = TopologyImporter(session, batch_size=1000, progress=ctx.progress)
+        report = await importer.run("/tmp/network.jsonl", "jsonl")
+
+    Device names resolve to ids through an in-memory map preloaded from the
+    database (streamed, so large tables never sit in one result set). Rows
+    are written with multi-row ``INSERT ... RETURNING`` statements and each
+    batch is committed on its own, together with its change-log entries. The
+    topology index is invalidated at the end because bulk inserts bypass the
+    ORM hooks.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        self.session = session
+        self.batch_size = batch_size
+        self.progress = progress
+        self.report = ImportReport()
+        # name -> [id (None while pending), device_type]
+        self._devices: dict[str, list] = {}
+        # device id -> interfaces on it (drives port numbering)
+        self._port_counts: dict[int, int] = {}
+        self._pending_devices: list[dict] = []
+        self._pending_links: list[dict] = []
+
+    async def run(self, path: str, fmt: str) -> ImportReport:
+        """
+        Import the file at `path` in format `fmt` (jsonl, csv or graphml).
+
+        Raises:
+            TopologyImportError: When the format is unknown.
+        """
+        if fmt not in _PARSERS:
+            raise TopologyImportError(f"Unsupported import format '{fmt}'")
+        await self._load_existing()
+
+        total = os.path.getsize(path) or 1
+        try:
+            with open(path, "rb") as stream:
+                for row, record in _PARSERS[fmt](stream):
+                    self.report.rows += 1
+                    try:
+                        if isinstance(record, TopologyImportError):
+                            raise record
+                        await self._add_record(record)
+                    except TopologyImportError as e:
+                        self.report.add_error(row, str(e))
+                    if self.report.rows % self.batch_size == 0 and self.progress is not None:
+                        await self.progress(
+                            min(stream.tell() / total, 0.99),
+                            f"Imported {self.report.rows} rows",
+                        )
+            await self._flush_devices()
+            await self._flush_links()
+        finally:
+            topology_index.invalidate()
+
+        if self.progress is not None:
+            await self.progress(1.0, f"Imported {self.report.rows} rows")
+        return self.report
+
+    # ----- setup -----
+
+    async def _load_existing(self) -> None:
+        result = await self.session.stream(select(Device.id, Device.name, Device.device_type))
+        async for device_id, name, device_type in result:
+            self._devices[name] = [device_id, device_type]
+        counts = await self.session.execute(
+            select(Interface.device_id, func.count()).group_by(Interface.device_id)
+        )
+        self._port_counts = {device_id: count for device_id, count in counts}
+
+    # ----- validation -----
+
+    async def _add_record(self, record: dict) -> None:
+        kind = str(record.get("kind", "")).lower()
+        if kind == "device":
+            await self._add_device(record)
+        elif kind == "link":
+            await self._add_link(record)
+        else:
+            raise TopologyImportError(f"Unknown record kind {record.get('kind')!r} (expected device or link)")
+
+    async def _add_device(self, record: dict) -> None:
+        name = str(record.get("name") or "").strip()
+        if not name:
+            raise TopologyImportError("Device name is required")
+        if name in self._devices:
+            raise TopologyImportError(f"Device with name '{name}' already exists")
+        try:
+            device_type = DeviceType(str(record.get("device_type", "")).upper())
+        except ValueError:
+            raise TopologyImportError(f"Invalid device_type {record.get('device_type')!r}")
+
+        parent_id = None
+        parent_name = record.get("parent")
+        if parent_name:
+            parent = self._devices.get(parent_name)
+            if parent is None:
+                raise TopologyImportError(f"Unknown parent container '{parent_name}'")
+            if parent[1] not in CONTAINER_DEVICE_TYPES:
+                raise TopologyImportError(f"Parent '{parent_name}' is not a container (POP, CORE_SITE)")
+            if parent[0] is None:
+                await self._flush_devices()
+            parent_id = parent[0]
+
+        now = datetime.now(timezone.utc)
+        self._pending_devices.append({
+            "name": name,
+            "device_type": device_type,
+            "status": _status(record, Status.DOWN),
+            "parent_container_id": parent_id,
+            "x": _optional_float(record, "x") or 0.0,
+            "y": _optional_float(record, "y") or 0.0,
+            "tx_power_dbm": _optional_float(record, "tx_power_dbm"),
+            "sensitivity_min_dbm": _optional_float(record, "sensitivity_min_dbm"),
+            "insertion_loss_db": _optional_float(record, "insertion_loss_db"),
+            "created_at": now,
+            "updated_at": now,
+        })
+        self._devices[name] = [None, device_type]
+        if len(self._pending_devices) >= self.batch_size:
+            await self._flush_devices()
+
+    async def _add_link(self, record: dict) -> None:
+        a_name, b_name = record.get("a"), record.get("b")
+        if not a_name or not b_name:
+            raise TopologyImportError("Link requires device names 'a' and 'b'")
+        a, b = self._devices.get(a_name), self._devices.get(b_name)
+        if a is None or b is None:
+            raise TopologyImportError(f"Unknown device '{a_name if a is None else b_name}'")
+        if a_name == b_name:
+            raise TopologyImportError("Cannot link device to itself")
+        is_valid, _, reason = validate_link_between_devices(a[1], b[1])
+        if not is_valid:
+            raise TopologyImportError(reason)
+        medium = str(record.get("link_type") or "fiber").lower()
+        if medium not in LINK_MEDIUM_INTERFACE_TYPES:
+            raise TopologyImportError(f"Invalid link_type {medium!r}")
+        status = _status(record, Status.UP)
+        length_km = _optional_float(record, "length_km")
+
+        if a[0] is None or b[0] is None:
+            await self._flush_devices()
+        self._pending_links.append({
+            "a_device_id": a[0],
+            "b_device_id": b[0],
+            "interface_type": LINK_MEDIUM_INTERFACE_TYPES[medium],
+            "status": status,
+            "length_km": length_km,
+            "physical_medium_id": record.get("physical_medium_id"),
+        })
+        if len(self._pending_links) >= self.batch_size:
+            await self._flush_links()
+
+    # ----- batched writes -----
+
+    async def _flush_devices(self) -> None:
+        if not self._pending_devices:
+            return
+        rows, self._pending_devices = self._pending_devices, []
+        ids = (await self.session.scalars(
+            insert(Device).returning(Device.id, sort_by_parameter_order=True), rows,
+        )).all()
+        await record_changes(self.session, "device", ids)
+        await self.session.commit()
+        for row, device_id in zip(rows, ids):
+            self._devices[row["name"]][0] = device_id
+        self.report.devices_created += len(rows)
+
+    async def _flush_links(self) -> None:
+        if not self._pending_links:
+            return
+        links, self._pending_links = self._pending_links, []
+        now = datetime.now(timezone.utc)
+        interfaces = []
+        for link in links:
+            for device_id in (link["a_device_id"], link["b_device_id"]):
+                port = self._port_counts.get(device_id, 0) + 1
+                self._port_counts[device_id] = port
+                interfaces.append({
+                    "name": f"port{port}",
+                    "interface_type": link["interface_type"],
+                    "status": Status.UP,
+                    "device_id": device_id,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+        interface_ids = (await self.session.scalars(
+            insert(Interface).returning(Interface.id, sort_by_parameter_order=True), interfaces,
+        )).all()
+        link_ids = (await self.session.scalars(insert(Link).returning(Link.id, sort_by_parameter_order=True), [
+            {
+                "a_interface_id": interface_ids[2 * i],
+                "b_interface_id": interface_ids[2 * i + 1],
+                "status": link["status"],
+                "length_km": link["length_km"],
+                "physical_medium_id": link["physical_medium_id"],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, link in enumerate(links)
+        ])).all()
+        await claim_endpoints(self.session, [
+            (link_id, interface_ids[2 * i], interface_ids[2 * i + 1]) for i, link_id in enumerate(link_ids)
+        ])
+        await record_changes(self.session, "interface", interface_ids)
+        await record_changes(self.session, "link", link_ids)
+        await self.session.commit()
+        self.report.interfaces_created += len(interfaces)
+        self.report.links_created += len(links)
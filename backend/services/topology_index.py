@@ -0,0 +1,548 @@
+"""
+Topology Index - In-Memory Graph of the Committed Topology
+
+Holds a lightweight copy of devices, interfaces and links (ids, types, status,
+position, adjacency) so graph-shaped features can answer from memory instead of
+re-querying the database on every request.
+
+The index is loaded lazily from the database and then kept current by SQLAlchemy
+session hooks: every flush snapshots the touched `Device`/`Interface`/`Link`
+rows and the snapshot is applied once the transaction commits (rolled-back work
+is discarded). Set-based SQL that bypasses the ORM (for example
+`clear_all_data`) must call :meth:`TopologyIndex.invalidate`.
+
+Derived structures (aggregations, analyses) subscribe via
+:meth:`TopologyIndex.subscribe` and receive fine-grained change callbacks.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from backend.constants.link_rules import CONTAINER_DEVICE_TYPES
+from backend.models.core import Device, DeviceType, Interface, Link, Status
+
+
+# ==========================================
+# NODES & EDGES
+# ==========================================
+
+
+@dataclass(slots=True)
+class DeviceNode:
+    """Device row as seen by the index (no timestamps, no optical attributes)."""
+
+    id: int
+    name: str
+    device_type: DeviceType
+    status: Status
+    status_override: Optional[Status]
+    parent_container_id: Optional[int]
+    x: float
+    y: float
+
+    @property
+    def effective_status(self) -> Status:
+        """Status shown to operators: the manual override wins over `status`."""
+        return self.status_override or self.status
+
+
+@dataclass(slots=True)
+class LinkEdge:
+    """Link row resolved to the devices on both ends."""
+
+    id: int
+    a_interface_id: int
+    b_interface_id: int
+    status: Status
+    length_km: Optional[float] = None
+    link_loss_db: Optional[float] = None
+    a_device_id: Optional[int] = None
+    b_device_id: Optional[int] = None
+
+    def other_end(self, device_id: int) -> Optional[int]:
+        """Return the device on the opposite side of `device_id`."""
+        return self.b_device_id if device_id == self.a_device_id else self.a_device_id
+
+
+def _as_status(value) -> Optional[Status]:
+    """Normalize raw column values (enum or plain string) to `Status`."""
+    if value is None:
+        return None
+    return value if isinstance(value, Status) else Status(value)
+
+
+def _as_device_type(value) -> DeviceType:
+    return value if isinstance(value, DeviceType) else DeviceType(value)
+
+
+def device_node_from_row(row) -> DeviceNode:
+    """Build a `DeviceNode` from a `Device` instance or an equivalent row."""
+    return DeviceNode(
+        id=row.id,
+        name=row.name,
+        device_type=_as_device_type(row.device_type),
+        status=_as_status(row.status),
+        status_override=_as_status(row.status_override),
+        parent_container_id=row.parent_container_id,
+        x=float(row.x or 0.0),
+        y=float(row.y or 0.0),
+    )
+
+
+def link_edge_from_row(row) -> LinkEdge:
+    """Build an unresolved `LinkEdge` from a `Link` instance or row."""
+    return LinkEdge(
+        id=row.id,
+        a_interface_id=row.a_interface_id,
+        b_interface_id=row.b_interface_id,
+        status=_as_status(row.status),
+        length_km=row.length_km,
+        link_loss_db=row.link_loss_db,
+    )
+
+
+# ==========================================
+# LISTENER PROTOCOL
+# ==========================================
+
+
+class TopologyListener:
+    """
+    Base class for structures derived from the index.
+
+    Callbacks run synchronously right after the index itself changed. When a
+    device is removed, `on_link_removed` fires for each attached link first.
+    """
+
+    def on_topology_reset(self) -> None:
+        """The index was (re)loaded or invalidated; drop all derived state."""
+
+    def on_device_upserted(self, old: Optional[DeviceNode], new: DeviceNode) -> None:
+        """A device was created (`old is None`) or changed."""
+
+    def on_device_removed(self, node: DeviceNode) -> None:
+        """A device left the topology."""
+
+    def on_link_added(self, edge: LinkEdge) -> None:
+        """A link was created or re-pointed (after the old edge was removed)."""
+
+    def on_link_removed(self, edge: LinkEdge) -> None:
+        """A link left the topology."""
+
+
+# ==========================================
+# INDEX
+# ==========================================
+
+
+class TopologyIndex:
+    """
+    Process-wide in-memory view of the committed topology.
+
+    Attributes:
+        devices: Device id → `DeviceNode`.
+        links: Link id → `LinkEdge` (device ids resolved).
+        adjacency: Device id → {link id: neighbour device id}.
+        children: Container id → ids of devices whose `parent_container_id`
+            points at it.
+        ancestors: Device id → enclosing containers, innermost first.
+        descendants: Container id → every device nested in it at any depth
+            (the in-memory closure table; `len()` is the subtree size).
+        version: Monotonic counter bumped on every applied change; derived
+            caches key their results on it.
+    """
+
+    def __init__(self) -> None:
+        self.devices: dict[int, DeviceNode] = {}
+        self.interface_device: dict[int, int] = {}
+        self.device_interfaces: dict[int, set[int]] = {}
+        self.links: dict[int, LinkEdge] = {}
+        self.interface_links: dict[int, set[int]] = {}
+        self.adjacency: dict[int, dict[int, int]] = {}
+        self.children: dict[int, set[int]] = {}
+        self.ancestors: dict[int, tuple[int, ...]] = {}
+        self.descendants: dict[int, set[int]] = {}
+        self.version = 0
+        self.loaded = False
+        self._loading = False
+        self._changed_while_loading = False
+        self._listeners: list[TopologyListener] = []
+
+    # ----- lifecycle -----
+
+    def subscribe(self, listener: TopologyListener) -> None:
+        """Register a derived structure for change callbacks."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def invalidate(self) -> None:
+        """Forget everything; the next `ensure_loaded` reloads from the database."""
+        self._clear()
+        self.loaded = False
+        self._changed_while_loading = self._loading
+        self.version += 1
+        for listener in self._listeners:
+            listener.on_topology_reset()
+
+    async def ensure_loaded(self, session: AsyncSession) -> "TopologyIndex":
+        """Load the index on first use (or after `invalidate`) and return it."""
+        while not self.loaded:
+            await self.load(session)
+        return self
+
+    async def load(self, session: AsyncSession) -> None:
+        """
+        Rebuild the index from the database with three column-only queries.
+
+        If a commit lands while the rows are being read the result may be stale,
+        so the index stays unloaded and `ensure_loaded` simply tries again.
+        """
+        self._loading = True
+        self._changed_while_loading = False
+        try:
+            device_rows = (await session.execute(select(
+                Device.id, Device.name, Device.device_type, Device.status,
+                Device.status_override, Device.parent_container_id, Device.x, Device.y,
+            ))).all()
+            interface_rows = (await session.execute(
+                select(Interface.id, Interface.device_id)
+            )).all()
+            link_rows = (await session.execute(select(
+                Link.id, Link.a_interface_id, Link.b_interface_id, Link.status,
+                Link.length_km, Link.link_loss_db,
+            ))).all()
+        finally:
+            self._loading = False
+
+        self._clear()
+        for row in device_rows:
+            self._add_device(device_node_from_row(row))
+        for interface_id, device_id in interface_rows:
+            self._add_interface(interface_id, device_id)
+        for row in link_rows:
+            self._add_link(link_edge_from_row(row))
+        self._build_ancestry()
+
+        self.loaded = not self._changed_while_loading
+        self.version += 1
+        for listener in self._listeners:
+            listener.on_topology_reset()
+
+    def _clear(self) -> None:
+        self.devices.clear()
+        self.interface_device.clear()
+        self.device_interfaces.clear()
+        self.links.clear()
+        self.interface_links.clear()
+        self.adjacency.clear()
+        self.children.clear()
+        self.ancestors.clear()
+        self.descendants.clear()
+
+    # ----- queries -----
+
+    def neighbors(self, device_id: int) -> dict[int, int]:
+        """Return {link id: neighbour device id} for a device."""
+        return self.adjacency.get(device_id, {})
+
+    def incident_links(self, device_id: int) -> list[LinkEdge]:
+        """Return every link attached to a device."""
+        return [self.links[link_id] for link_id in self.adjacency.get(device_id, {})]
+
+    def container_root(self, device_id: int) -> Optional[int]:
+        """Outermost container enclosing the device (the device itself if it is one)."""
+        chain = self.ancestors.get(device_id, ())
+        if chain:
+            return chain[-1]
+        node = self.devices.get(device_id)
+        if node is not None and node.device_type in CONTAINER_DEVICE_TYPES:
+            return device_id
+        return None
+
+    def contents(self, container_id: int, recursive: bool = False) -> set[int]:
+        """Devices inside a container: direct children, or the whole subtree."""
+        source = self.descendants if recursive else self.children
+        return set(source.get(container_id, ()))
+
+    # ----- mutations (applied after commit) -----
+
+    def upsert_device(self, node: DeviceNode) -> None:
+        old = self.devices.get(node.id)
+        if old == node:
+            return
+        if old is not None and old.parent_container_id != node.parent_container_id:
+            self._unparent(old)
+            self._add_device(node)
+            self._reparent(node)
+        else:
+            self._add_device(node)
+            if old is None:
+                self._attach_ancestry(node)
+        self.version += 1
+        for listener in self._listeners:
+            listener.on_device_upserted(old, node)
+
+    def remove_device(self, device_id: int) -> None:
+        node = self.devices.get(device_id)
+        if node is None:
+            return
+        for interface_id in list(self.device_interfaces.get(device_id, ())):
+            self.remove_interface(interface_id)
+        del self.devices[device_id]
+        self.device_interfaces.pop(device_id, None)
+        self.adjacency.pop(device_id, None)
+        self._unparent(node)
+        self._detach_ancestry(node)
+        self.version += 1
+        for listener in self._listeners:
+            listener.on_device_removed(node)
+
+    def move_devices(self, positions: dict[int, tuple[float, float]]) -> None:
+        """Apply coordinates written by a bulk UPDATE (which bypasses the hooks)."""
+        for device_id, (x, y) in positions.items():
+            node = self.devices.get(device_id)
+            if node is not None:
+                self.upsert_device(replace(node, x=x, y=y))
+
+    def upsert_interface(self, interface_id: int, device_id: int) -> None:
+        previous = self.interface_device.get(interface_id)
+        if previous == device_id:
+            return
+        if previous is not None:
+            # Re-homed interface: re-resolve its links against the new device
+            attached = [self.links[link_id] for link_id in self.interface_links.get(interface_id, ())]
+            for edge in attached:
+                self.remove_link(edge.id)
+            self.device_interfaces.get(previous, set()).discard(interface_id)
+            self._add_interface(interface_id, device_id)
+            for edge in attached:
+                self.upsert_link(edge)
+        else:
+            self._add_interface(interface_id, device_id)
+        self.version += 1
+
+    def remove_interface(self, interface_id: int) -> None:
+        for link_id in list(self.interface_links.get(interface_id, ())):
+            self.remove_link(link_id)
+        device_id = self.interface_device.pop(interface_id, None)
+        self.interface_links.pop(interface_id, None)
+        if device_id is not None:
+            self.device_interfaces.get(device_id, set()).discard(interface_id)
+            self.version += 1
+
+    def upsert_link(self, edge: LinkEdge) -> None:
+        old = self.links.get(edge.id)
+        if old is not None:
+            same_ends = (
+                old.a_interface_id == edge.a_interface_id
+                and old.b_interface_id == edge.b_interface_id
+            )
+            if same_ends:
+                # Attribute-only change (status, length, loss): keep adjacency
+                edge.a_device_id, edge.b_device_id = old.a_device_id, old.b_device_id
+                if edge == old:
+                    return
+                self.links[edge.id] = edge
+                self.version += 1
+                for listener in self._listeners:
+                    listener.on_link_removed(old)
+                    listener.on_link_added(edge)
+                return
+            self.remove_link(edge.id)
+        self._add_link(edge)
+        self.version += 1
+        for listener in self._listeners:
+            listener.on_link_added(edge)
+
+    def remove_link(self, link_id: int) -> None:
+        edge = self.links.pop(link_id, None)
+        if edge is None:
+            return
+        for interface_id in (edge.a_interface_id, edge.b_interface_id):
+            self.interface_links.get(interface_id, set()).discard(link_id)
+        for device_id in (edge.a_device_id, edge.b_device_id):
+            if device_id is not None:
+                self.adjacency.get(device_id, {}).pop(link_id, None)
+        self.version += 1
+        for listener in self._listeners:
+            listener.on_link_removed(edge)
+
+    # ----- raw helpers (no callbacks) -----
+
+    def _add_device(self, node: DeviceNode) -> None:
+        self.devices[node.id] = node
+        self.adjacency.setdefault(node.id, {})
+        if node.parent_container_id is not None:
+            self.children.setdefault(node.parent_container_id, set()).add(node.id)
+
+    def _unparent(self, node: DeviceNode) -> None:
+        if node.parent_container_id is not None:
+            siblings = self.children.get(node.parent_container_id)
+            if siblings is not None:
+                siblings.discard(node.id)
+                if not siblings:
+                    del self.children[node.parent_container_id]
+
+    def _chain_above(self, parent_id: Optional[int], device_id: int) -> tuple[int, ...]:
+        """Ancestor chain for a device placed under `parent_id` (cycle-safe)."""
+        if parent_id is None or parent_id not in self.devices:
+            return ()
+        chain = (parent_id,) + self.ancestors.get(parent_id, ())
+        if device_id in chain:
+            return chain[:chain.index(device_id)]
+        return chain
+
+    def _attach_ancestry(self, node: DeviceNode) -> None:
+        chain = self._chain_above(node.parent_container_id, node.id)
+        self.ancestors[node.id] = chain
+        for ancestor_id in chain:
+            self.descendants.setdefault(ancestor_id, set()).add(node.id)
+
+    def _reparent(self, node: DeviceNode) -> None:
+        """Move a device and its whole subtree under the new parent chain."""
+        outer = self._chain_above(node.parent_container_id, node.id)
+        for device_id in [node.id, *self.descendants.get(node.id, ())]:
+            old_chain = self.ancestors.get(device_id, ())
+            inner = old_chain[:old_chain.index(node.id) + 1] if device_id != node.id else ()
+            for ancestor_id in old_chain[len(inner):]:
+                self._discard_descendant(ancestor_id, device_id)
+            self.ancestors[device_id] = inner + outer
+            for ancestor_id in outer:
+                self.descendants.setdefault(ancestor_id, set()).add(device_id)
+
+    def _detach_ancestry(self, node: DeviceNode) -> None:
+        """Drop a removed device; its subtree is cut loose below it."""
+        for ancestor_id in self.ancestors.pop(node.id, ()):
+            self._discard_descendant(ancestor_id, node.id)
+        for device_id in self.descendants.pop(node.id, set()):
+            old_chain = self.ancestors.get(device_id, ())
+            cut = old_chain.index(node.id)
+            for ancestor_id in old_chain[cut + 1:]:
+                self._discard_descendant(ancestor_id, device_id)
+            self.ancestors[device_id] = old_chain[:cut]
+
+    def _discard_descendant(self, ancestor_id: int, device_id: int) -> None:
+        members = self.descendants.get(ancestor_id)
+        if members is not None:
+            members.discard(device_id)
+            if not members:
+                del self.descendants[ancestor_id]
+
+    def _build_ancestry(self) -> None:
+        """Compute every ancestor chain once after a full load."""
+        for device_id in self.devices:
+            if device_id in self.ancestors:
+                continue
+            # Walk up until a device with a known chain (or the top) is reached
+            path = []
+            current = device_id
+            while current is not None and current in self.devices and current not in self.ancestors:
+                if current in path:
+                    break  # cycle in stored data: stop here
+                path.append(current)
+                current = self.devices[current].parent_container_id
+            for member in reversed(path):
+                self._attach_ancestry(self.devices[member])
+
+    def _add_interface(self, interface_id: int, device_id: int) -> None:
+        self.interface_device[interface_id] = device_id
+        self.device_interfaces.setdefault(device_id, set()).add(interface_id)
+
+    def _add_link(self, edge: LinkEdge) -> None:
+        edge.a_device_id = self.interface_device.get(edge.a_interface_id)
+        edge.b_device_id = self.interface_device.get(edge.b_interface_id)
+        self.links[edge.id] = edge
+        for interface_id in (edge.a_interface_id, edge.b_interface_id):
+            self.interface_links.setdefault(interface_id, set()).add(edge.id)
+        if edge.a_device_id is not None and edge.b_device_id is not None:
+            self.adjacency.setdefault(edge.a_device_id, {})[edge.id] = edge.b_device_id
+            self.adjacency.setdefault(edge.b_device_id, {})[edge.id] = edge.a_device_id
+
+    # ----- change application -----
+
+    def apply_changes(self, changes: list[tuple]) -> None:
+        """Apply `(op, payload)` tuples captured by the session hooks, in order."""
+        if self._loading:
+            self._changed_while_loading = True
+        if not self.loaded:
+            return
+        for op, payload in changes:
+            if op == "device":
+                self.upsert_device(payload)
+            elif op == "interface":
+                self.upsert_interface(*payload)
+            elif op == "link":
+                self.upsert_link(payload)
+            elif op == "-link":
+                self.remove_link(payload)
+            elif op == "-interface":
+                self.remove_interface(payload)
+            elif op == "-device":
+                self.remove_device(payload)
+
+
+topology_index = TopologyIndex()
+
+
+async def get_topology_index(session: AsyncSession) -> TopologyIndex:
+    """Return the process-wide index, loading it from `session` if needed."""
+    return await topology_index.ensure_loaded(session)
+
+
+# ==========================================
+# SESSION HOOKS
+# ==========================================
+
+_CHANGES_KEY = "topology_index_changes"
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_flushed_topology(session: Session, flush_context) -> None:
+    """Snapshot flushed topology rows; they are applied only after commit."""
+    upserts: list[tuple] = []
+    removals: list[tuple] = []
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Device):
+            upserts.append((0, ("device", device_node_from_row(obj))))
+        elif isinstance(obj, Interface):
+            upserts.append((1, ("interface", (obj.id, obj.device_id))))
+        elif isinstance(obj, Link):
+            upserts.append((2, ("link", link_edge_from_row(obj))))
+    for obj in session.deleted:
+        if isinstance(obj, Link):
+            removals.append((0, ("-link", obj.id)))
+        elif isinstance(obj, Interface):
+            removals.append((1, ("-interface", obj.id)))
+        elif isinstance(obj, Device):
+            removals.append((2, ("-device", obj.id)))
+    if upserts or removals:
+        changes = [change for _, change in sorted(upserts, key=lambda item: item[0])]
+        changes += [change for _, change in sorted(removals, key=lambda item: item[0])]
+        session.info.setdefault(_CHANGES_KEY, []).extend(changes)
+
+
+def stage_changes(session: AsyncSession, changes: list[tuple]) -> None:
+    """
+    Queue `(op, payload)` index changes for a set-based write on `session`.
+
+    They are applied when the transaction commits, exactly like rows captured
+    from a flush (ops as in `TopologyIndex.apply_changes`).
+    """
+    session.sync_session.info.setdefault(_CHANGES_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_topology(session: Session) -> None:
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if changes:
+        topology_index.apply_changes(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_topology(session: Session) -> None:
+    session.info.pop(_CHANGES_KEY, None)
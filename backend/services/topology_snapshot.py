@@ -0,0 +1,389 @@
+"""
+Topology Snapshot - Compressed Binary Backup and Restore
+
+A snapshot holds every device, interface and link in a compact columnar
+binary layout, gzip-compressed as it is produced. Export streams from a
+server-side cursor block by block; import decompresses to a temporary file,
+memory-maps it and decodes columns straight from the mapping with NumPy, so
+neither side ever materializes the whole topology.
+
+Layout (before compression)
+---------------------------
+    b"UNOCSNP1"                       magic
+    u32 header length, header JSON    {"version", "created_at", "tables": [
+                                         {"name", "columns": [[name, kind], ...]}]}
+    block*                            u8 table index, u32 row count, then per
+                                      column: u64 byte length + payload
+    u8 255                            end marker
+
+Column payloads start with a validity bitmap (`np.packbits`, 1 = not NULL):
+* ``int`` / ``float`` / ``datetime`` - little-endian int64 / float64 /
+  int64 microseconds since the Unix epoch (UTC).
+* ``str`` - u32 offsets (rows + 1) followed by the UTF-8 blob. Enum columns
+  are stored by value.
+
+All integers are little-endian. Ids are preserved on restore.
+"""
+
+import asyncio
+import enum
+import json
+import mmap
+import os
+import shutil
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import numpy as np
+from sqlalchemy import DateTime, Enum, Float, Integer, Table, bindparam, delete, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.core import Device, Interface, Link
+from backend.services.changelog import record_reset
+from backend.services.link_validation import rebuild_endpoints
+from backend.services.status_history import record_current_status
+from backend.services.topology_index import topology_index
+
+SNAPSHOT_MAGIC = b"UNOCSNP1"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MEDIA_TYPE = "application/vnd.unoc.snapshot"
+BLOCK_ROWS = 10_000
+END_MARKER = 255
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Restore order (parents before children); export uses the same order
+SNAPSHOT_TABLES: tuple[Table, ...] = (Device.__table__, Interface.__table__, Link.__table__)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+ProgressCallback = Callable[[float, Optional[str]], Awaitable[None]]
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot is malformed or does not match the current schema."""
+
+
+# ==========================================
+# COLUMN CODECS
+# ==========================================
+
+
+def _column_kind(column) -> str:
+    if isinstance(column.type, Enum):
+        return "str"
+    if isinstance(column.type, Integer):
+        return "int"
+    if isinstance(column.type, Float):
+        return "float"
+    if isinstance(column.type, DateTime):
+        return "datetime"
+    return "str"
+
+
+def table_schema(table: Table) -> list[list[str]]:
+    """`[[column, kind], ...]` in table order."""
+    return [[column.name, _column_kind(column)] for column in table.columns]
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def encode_column(values: list, kind: str) -> bytes:
+    """Encode one column of a block."""
+    valid = np.fromiter((v is not None for v in values), dtype=bool, count=len(values))
+    parts = [np.packbits(valid).tobytes()]
+    if kind == "int":
+        parts.append(np.array([v if v is not None else 0 for v in values], dtype="<i8").tobytes())
+    elif kind == "float":
+        parts.append(np.array([v if v is not None else 0.0 for v in values], dtype="<f8").tobytes())
+    elif kind == "datetime":
+        parts.append(np.array([_to_micros(v) if v is not None else 0 for v in values], dtype="<i8").tobytes())
+    else:
+        sample = next((v for v in values if v is not None), None)
+        if isinstance(sample, enum.Enum):
+            lookup = {member: member.value.encode() for member in type(sample)}
+            encoded = [lookup[v] if v is not None else b"" for v in values]
+        else:
+            encoded = [str(v).encode() if v is not None else b"" for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        parts.append(offsets.tobytes())
+        parts.append(b"".join(encoded))
+    return b"".join(parts)
+
+
+def decode_column(buffer, offset: int, nbytes: int, rows: int, kind: str) -> list:
+    """Decode one column of a block from `buffer` (bytes or mmap) without copying it."""
+    mask_len = (rows + 7) // 8
+    valid = np.unpackbits(np.frombuffer(buffer, dtype=np.uint8, count=mask_len, offset=offset))[:rows].astype(bool)
+    start = offset + mask_len
+    if kind in ("int", "float", "datetime"):
+        raw = np.frombuffer(buffer, dtype="<f8" if kind == "float" else "<i8", count=rows, offset=start)
+        if kind == "datetime":
+            values = raw.astype("datetime64[us]").tolist()
+        else:
+            values = raw.tolist()
+    else:
+        offsets = np.frombuffer(buffer, dtype="<u4", count=rows + 1, offset=start)
+        blob_start = start + 4 * (rows + 1)
+        if blob_start + int(offsets[-1]) > offset + nbytes:
+            raise SnapshotError("Corrupt string column")
+        blob = bytes(buffer[blob_start:blob_start + int(offsets[-1])])
+        bounds = offsets.tolist()
+        values = [blob[bounds[i]:bounds[i + 1]].decode() for i in range(rows)]
+    if not valid.all():
+        values = [v if ok else None for v, ok in zip(values, valid.tolist())]
+    return values
+
+
+def encode_block(table_index: int, schema: list[list[str]], rows: list) -> bytes:
+    """Encode a block of row tuples (in `schema` column order)."""
+    parts = [struct.pack("<BI", table_index, len(rows))]
+    columns = list(zip(*rows)) if rows else [() for _ in schema]
+    for (_, kind), values in zip(schema, columns):
+        payload = encode_column(list(values), kind)
+        parts.append(struct.pack("<Q", len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+# ==========================================
+# EXPORT
+# ==========================================
+
+
+def snapshot_read_options(dialect_name: str) -> dict:
+    """
+    Connection options giving all reads of one export the same MVCC snapshot.
+
+    Devices, interfaces and links are read by three statements; under READ
+    COMMITTED each would see different commits, and a link created after the
+    interface scan would make the backup unrestorable (FK violation). On
+    PostgreSQL the export runs REPEATABLE READ, read-only and deferrable
+    (never aborts with a serialization failure). SQLite has no such level
+    and keeps its default.
+    """
+    if dialect_name == "postgresql":
+        return {
+            "isolation_level": "REPEATABLE READ",
+            "postgresql_readonly": True,
+            "postgresql_deferrable": True,
+        }
+    return {}
+
+
+async def export_snapshot(session: AsyncSession, block_rows: int = BLOCK_ROWS) -> AsyncIterator[bytes]:
+    """
+    Yield the gzip-compressed snapshot in chunks.
+
+    Rows are read through a server-side cursor (`yield_per`) and encoded one
+    block at a time; compression runs in a worker thread (zlib releases the
+    GIL). All tables are read in one transaction with the isolation from
+    `snapshot_read_options`, so `session` must not have begun one yet.
+    """
+    options = snapshot_read_options(session.get_bind().dialect.name)
+    if options:
+        await session.connection(execution_options=options)
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    header = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "tables": [{"name": table.name, "columns": table_schema(table)} for table in SNAPSHOT_TABLES],
+    }).encode()
+    yield compressor.compress(SNAPSHOT_MAGIC + struct.pack("<I", len(header)) + header)
+
+    for table_index, table in enumerate(SNAPSHOT_TABLES):
+        schema = table_schema(table)
+        stmt = select(*table.columns).order_by(table.c.id).execution_options(yield_per=block_rows)
+        result = await session.stream(stmt)
+        async for rows in result.partitions(block_rows):
+            block = encode_block(table_index, schema, rows)
+            chunk = await asyncio.to_thread(compressor.compress, block)
+            if chunk:
+                yield chunk
+
+    yield compressor.compress(struct.pack("<B", END_MARKER)) + compressor.flush()
+
+
+# ==========================================
+# IMPORT
+# ==========================================
+
+
+def check_snapshot_file(path: str) -> None:
+    """
+    Cheap upfront check that `path` starts with a (possibly gzipped) snapshot magic.
+
+    Raises:
+        SnapshotError: When it does not.
+    """
+    with open(path, "rb") as f:
+        head = f.read(1 << 16)  # Enough for the Huffman tables of the first deflate block
+    if head[:2] == GZIP_MAGIC:
+        try:
+            head = zlib.decompressobj(31).decompress(head, len(SNAPSHOT_MAGIC))
+        except zlib.error:
+            raise SnapshotError("Corrupt gzip stream")
+    if not head.startswith(SNAPSHOT_MAGIC):
+        raise SnapshotError("Not a UNOC snapshot")
+
+
+def decompress_to_file(src_path: str, dst_path: str) -> None:
+    """Inflate a gzip snapshot to `dst_path` in bounded memory (plain files are copied)."""
+    with open(src_path, "rb") as src:
+        compressed = src.read(2) == GZIP_MAGIC
+    if not compressed:
+        shutil.copyfile(src_path, dst_path)
+        return
+    decompressor = zlib.decompressobj(31)
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        while chunk := src.read(1 << 20):
+            dst.write(decompressor.decompress(chunk))
+        dst.write(decompressor.flush())
+
+
+def _read_header(buffer) -> tuple[dict, int]:
+    if bytes(buffer[:len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+        raise SnapshotError("Not a UNOC snapshot")
+    (header_len,) = struct.unpack_from("<I", buffer, len(SNAPSHOT_MAGIC))
+    start = len(SNAPSHOT_MAGIC) + 4
+    header = json.loads(bytes(buffer[start:start + header_len]))
+    if header.get("version") != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {header.get('version')}")
+    expected = [{"name": t.name, "columns": table_schema(t)} for t in SNAPSHOT_TABLES]
+    if header.get("tables") != expected:
+        raise SnapshotError("Snapshot schema does not match this server's schema")
+    return header, start + header_len
+
+
+def iter_blocks(buffer, offset: int):
+    """Yield `(table_index, rows, [(column_offset, nbytes), ...])` for each block."""
+    column_counts = [len(t.columns) for t in SNAPSHOT_TABLES]
+    while True:
+        if offset >= len(buffer):
+            raise SnapshotError("Snapshot is truncated (missing end marker)")
+        table_index = buffer[offset]
+        if table_index == END_MARKER:
+            return
+        if table_index >= len(SNAPSHOT_TABLES):
+            raise SnapshotError(f"Unknown table index {table_index}")
+        (rows,) = struct.unpack_from("<I", buffer, offset + 1)
+        offset += 5
+        columns = []
+        for _ in range(column_counts[table_index]):
+            (nbytes,) = struct.unpack_from("<Q", buffer, offset)
+            columns.append((offset + 8, nbytes))
+            offset += 8 + nbytes
+        if offset > len(buffer):
+            raise SnapshotError("Snapshot is truncated")
+        yield table_index, rows, columns
+
+
+def sequence_advance_sql(table_name: str) -> str:
+    """
+    PostgreSQL statement moving the id sequence of `table_name` past its rows.
+
+    The sequence never goes backwards: restoring an older snapshot must not
+    hand out ids already used (and announced through the change log) since.
+    """
+    sequence = f"pg_get_serial_sequence('{table_name}', 'id')"
+    return (
+        f"SELECT setval({sequence}, GREATEST("
+        f"COALESCE(pg_sequence_last_value({sequence}), 0), "
+        f"COALESCE((SELECT MAX(id) FROM {table_name}), 0)) + 1, false)"
+    )
+
+
+async def import_snapshot(
+    session: AsyncSession,
+    path: str,
+    progress: Optional[ProgressCallback] = None,
+) -> dict[str, int]:
+    """
+    Replace the whole topology with the (uncompressed) snapshot at `path`.
+
+    Runs in one transaction: existing rows are deleted, blocks are bulk
+    inserted with their original ids, and device parents are set in a second
+    pass over the mapping (a parent may have a higher id than its child).
+    On PostgreSQL the id sequences are advanced past the restored ids (and
+    never moved back).
+    Status history is kept; each restored device gets a row with its
+    restored status.
+
+    Returns:
+        Row count per table.
+
+    Raises:
+        SnapshotError: When the file is not a valid snapshot for this schema.
+    """
+    counts = {table.name: 0 for table in SNAPSHOT_TABLES}
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise SnapshotError("Empty snapshot")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            _, body_start = _read_header(buffer)
+            # Validate the block structure before touching the database
+            for _ in iter_blocks(buffer, body_start):
+                pass
+
+            try:
+                for table in reversed(SNAPSHOT_TABLES):
+                    await session.execute(delete(table))
+
+                device_table = Device.__table__
+                parent_column = list(device_table.columns.keys()).index("parent_container_id")
+                for table_index, rows, columns in iter_blocks(buffer, body_start):
+                    table = SNAPSHOT_TABLES[table_index]
+                    schema = table_schema(table)
+                    values = [
+                        decode_column(buffer, col_offset, nbytes, rows, kind)
+                        for (col_offset, nbytes), (_, kind) in zip(columns, schema)
+                    ]
+                    if table is device_table:
+                        values[parent_column] = [None] * rows
+                    names = [name for name, _ in schema]
+                    await session.execute(insert(table), [dict(zip(names, row)) for row in zip(*values)])
+                    counts[table.name] += rows
+                    if progress is not None:
+                        block_end = columns[-1][0] + columns[-1][1]
+                        await progress(0.9 * block_end / len(buffer), f"Restored {sum(counts.values())} rows")
+
+                # Second pass: container parents
+                for table_index, rows, columns in iter_blocks(buffer, body_start):
+                    if SNAPSHOT_TABLES[table_index] is not device_table:
+                        continue
+                    ids = decode_column(buffer, *columns[0], rows, "int")
+                    parents = decode_column(buffer, *columns[parent_column], rows, "int")
+                    updates = [
+                        {"b_id": device_id, "b_parent": parent}
+                        for device_id, parent in zip(ids, parents) if parent is not None
+                    ]
+                    if updates:
+                        await session.execute(
+                            update(device_table)
+                            .where(device_table.c.id == bindparam("b_id"))
+                            .values(parent_container_id=bindparam("b_parent")),
+                            updates,
+                        )
+
+                if session.bind.dialect.name == "postgresql":
+                    for table in SNAPSHOT_TABLES:
+                        await session.execute(text(sequence_advance_sql(table.name)))
+                await rebuild_endpoints(session)
+                await record_current_status(session)
+                await record_reset(session)
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+            finally:
+                # Bulk statements bypass the ORM hooks
+                topology_index.invalidate()
+    return counts
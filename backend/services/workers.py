@@ -0,0 +1,45 @@
+"""
+Worker Processes - CPU-Bound Work Off the Event Loop
+
+A single, lazily created process pool shared by every service that needs to
+crunch numbers (layout, analytics). Work is submitted through
+:func:`run_cpu_bound` so request handlers only ever await a future.
+
+Configuration:
+    UNOC_WORKER_PROCESSES: Pool size (default: min(4, CPU count)).
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared pool, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        workers = int(os.getenv("UNOC_WORKER_PROCESSES", "0")) or min(4, os.cpu_count() or 1)
+        # "spawn" keeps children independent of the parent's event loop and threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+async def run_cpu_bound(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a picklable, module-level function in the process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), fn, *args)
+
+
+def shutdown_process_pool() -> None:
+    """Stop worker processes (called from the application lifespan)."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
@@ -9,8 +9,13 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
-from backend.db import get_session
+from backend.db import enable_sqlite_foreign_keys, get_session, get_session_context, get_session_factory
 from backend.main import app
+from backend.services.alarm_correlation import alarm_correlator
+from backend.services.entity_cache import entity_cache
+from backend.services.jobs import job_manager
+from backend.services.maintenance import maintenance_scheduler
+from backend.services.topology_index import topology_index
 
 # Use in-memory SQLite for tests
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -21,6 +26,8 @@ test_engine = create_async_engine(
     echo=False,
     future=True,
 )
+# Same ON DELETE CASCADE behaviour as PostgreSQL
+enable_sqlite_foreign_keys(test_engine)
 
 # Test session factory
 test_async_session = sessionmaker(
@@ -30,6 +37,18 @@ test_async_session = sessionmaker(
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_topology_index():
+    """Every test starts from an empty database - drop in-memory topology state."""
+    topology_index.invalidate()
+    entity_cache.clear()
+    alarm_correlator.reset()
+    yield
+    topology_index.invalidate()
+    entity_cache.clear()
+    alarm_correlator.reset()
+
+
 @pytest_asyncio.fixture
 async def async_session():
     """
@@ -52,11 +71,18 @@ async def async_session():
 
 @pytest.fixture
 def override_get_session(async_session):
-    """Override FastAPI dependency for testing"""
+    """Override FastAPI dependency (and background job / scheduler / correlator sessions) for testing"""
     
     async def _override():
         yield async_session
     
     app.dependency_overrides[get_session] = _override
+    app.dependency_overrides[get_session_factory] = lambda: test_async_session
+    job_manager.session_factory = test_async_session
+    maintenance_scheduler.session_factory = test_async_session
+    alarm_correlator.session_factory = test_async_session
     yield
     app.dependency_overrides.clear()
+    job_manager.session_factory = get_session_context
+    maintenance_scheduler.session_factory = get_session_context
+    alarm_correlator.session_factory = get_session_context
@@ -0,0 +1,171 @@
+"""
+Test Alarm Correlation
+
+Root-cause suppression over the hierarchy (dual homing, recovery, merging),
+suppression of per-device status events and /api/alarms
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import select
+
+from backend.main import app
+from backend.models.core import Device, Status
+from backend.services.alarm_correlation import alarm_correlator
+
+
+async def _chain(client, session):
+    """gw ─ core ─┬─ edge1 ─┬─ olt1 ─ ont1
+                  │         └─ olt3 (dual-homed)
+                  └─ edge2 ─┴─ olt2 ─ ont2"""
+    ids = {}
+    for name, device_type in [
+        ("gw", "BACKBONE_GATEWAY"), ("core", "CORE_ROUTER"), ("edge1", "EDGE_ROUTER"), ("edge2", "EDGE_ROUTER"),
+        ("olt1", "OLT"), ("olt2", "OLT"), ("olt3", "OLT"), ("ont1", "ONT"), ("ont2", "ONT"),
+    ]:
+        response = await client.post("/api/devices", json={"name": name, "device_type": device_type})
+        ids[name] = response.json()["id"]
+    for a, b in [
+        ("gw", "core"), ("core", "edge1"), ("core", "edge2"), ("edge1", "olt1"), ("edge2", "olt2"),
+        ("edge1", "olt3"), ("edge2", "olt3"), ("olt1", "ont1"), ("olt2", "ont2"),
+    ]:
+        response = await client.post("/api/links/create-simple", json={
+            "device_a_id": ids[a], "device_b_id": ids[b], "link_type": "fiber",
+        })
+        assert response.status_code in (200, 201), response.text
+    # Devices are created DOWN; bring the whole chain up
+    for device in (await session.execute(select(Device))).scalars():
+        device.status = Status.UP
+    await session.commit()
+    alarm_correlator.reset()  # the UP transitions above are not part of the scenario
+    return ids
+
+
+async def _set_status(session, device_ids, status):
+    for device in (await session.execute(select(Device).where(Device.id.in_(device_ids)))).scalars():
+        device.status = status
+    await session.commit()
+
+
+async def _flush():
+    with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+        events = await alarm_correlator.flush()
+    assert [call.args for call in emit.await_args_list] == events
+    return events
+
+
+@pytest.mark.asyncio
+async def test_outage_collapses_to_root_alarm(async_session, override_get_session):
+    """Test: One alarm for the failed edge router; a dual-homed OLT is its own root"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = await _chain(client, async_session)
+    await _set_status(async_session, [ids["edge1"], ids["olt1"], ids["ont1"], ids["olt3"]], Status.DOWN)
+
+    events = await _flush()
+    assert [(name, payload["root_device_id"], payload["suppressed_count"]) for name, payload in events] == [
+        ("alarm:raised", ids["edge1"], 2),
+        ("alarm:raised", ids["olt3"], 0),
+    ]
+    assert events[0][1]["name"] == "edge1" and events[0][1]["device_type"] == "EDGE_ROUTER"
+    assert alarm_correlator.alarm_of(ids["ont1"]).root_id == ids["edge1"]
+
+    # A child recovering only updates its root
+    await _set_status(async_session, [ids["ont1"]], Status.UP)
+    events = await _flush()
+    assert [(name, payload["root_device_id"], payload["suppressed_count"]) for name, payload in events] == [
+        ("alarm:updated", ids["edge1"], 1),
+    ]
+    assert await _flush() == []
+
+
+@pytest.mark.asyncio
+async def test_root_recovery_and_merge(async_session, override_get_session):
+    """Test: A recovered root is cleared and re-roots its children; a new upstream failure absorbs alarms"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = await _chain(client, async_session)
+    await _set_status(async_session, [ids["edge1"], ids["olt1"], ids["ont1"]], Status.DOWN)
+    await _flush()
+
+    await _set_status(async_session, [ids["edge1"]], Status.UP)
+    events = await _flush()
+    assert [(name, payload["root_device_id"]) for name, payload in events] == [
+        ("alarm:cleared", ids["edge1"]),
+        ("alarm:raised", ids["olt1"]),
+    ]
+    assert events[0][1]["merged_into"] is None
+    assert events[1][1]["suppressed_count"] == 1
+
+    # The core fails: the OLT alarm is merged into the new root
+    await _set_status(async_session, [ids["core"], ids["edge1"], ids["edge2"]], Status.DOWN)
+    events = await _flush()
+    assert [(name, payload["root_device_id"]) for name, payload in events] == [
+        ("alarm:cleared", ids["olt1"]),
+        ("alarm:raised", ids["core"]),
+    ]
+    assert events[0][1]["merged_into"] == ids["core"]
+    assert alarm_correlator.alarms[ids["core"]].suppressed == {ids["edge1"], ids["edge2"], ids["olt1"], ids["ont1"]}
+
+
+@pytest.mark.asyncio
+async def test_per_device_events_of_suppressed_devices_are_dropped(async_session, override_get_session):
+    """Test: Only the root alarm and unsuppressed devices reach clients; DOWN events wait for the window"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = await _chain(client, async_session)
+        with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+            for name in ("edge1", "olt1", "ont1", "olt3"):
+                response = await client.patch(f"/api/devices/{ids[name]}/override", json={"status_override": "DOWN"})
+                assert response.status_code == 200
+            bulk = await client.post("/api/overrides/bulk", json={
+                "device_ids": [ids["olt2"], ids["ont2"]], "status_override": "DOWN",
+            })
+            assert bulk.status_code == 200
+            emit.assert_not_awaited()
+            await alarm_correlator.flush()
+        events = [call.args for call in emit.await_args_list]
+        assert [(name, payload.get("root_device_id", payload.get("id"))) for name, payload in events] == [
+            ("alarm:raised", ids["edge1"]),
+            ("alarm:raised", ids["olt2"]),
+            ("alarm:raised", ids["olt3"]),
+            ("device:updated", ids["edge1"]),
+            ("device:updated", ids["olt3"]),
+            ("devices:overridden", None),
+        ]
+        assert events[0][1]["suppressed_ids"] == sorted([ids["olt1"], ids["ont1"]])
+        assert events[-1][1]["ids"] == [ids["olt2"]]
+
+        # Recovery of a suppressed child is not held (nothing queued, device not DOWN)
+        with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+            await client.delete(f"/api/devices/{ids['ont1']}/override")
+            assert [call.args[0] for call in emit.await_args_list] == ["device:updated"]
+            await alarm_correlator.flush()
+        assert emit.await_args.args[0] == "alarm:updated"
+        assert emit.await_args.args[1]["suppressed_ids"] == [ids["olt1"]]
+
+
+@pytest.mark.asyncio
+async def test_alarm_api(async_session, override_get_session):
+    """Test: Commits are correlated after the window and listed by /api/alarms"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = await _chain(client, async_session)
+        window = alarm_correlator.window
+        alarm_correlator.window = 0.05
+        try:
+            with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+                await _set_status(async_session, [ids["edge1"], ids["olt1"], ids["ont1"]], Status.DOWN)
+                await _set_status(async_session, [ids["olt2"]], Status.DOWN)
+                await asyncio.sleep(0.2)
+        finally:
+            alarm_correlator.window = window
+        assert [call.args[0] for call in emit.await_args_list] == ["alarm:raised", "alarm:raised"]
+
+        alarms = (await client.get("/api/alarms")).json()
+        assert [(alarm["root_device_id"], alarm["suppressed_count"]) for alarm in alarms] == [
+            (ids["edge1"], 2), (ids["olt2"], 0),
+        ]
+        detail = await client.get(f"/api/alarms/{ids['edge1']}")
+        assert detail.status_code == 200
+        assert detail.json()["suppressed_ids"] == sorted([ids["olt1"], ids["ont1"]])
+        assert (await client.get(f"/api/alarms/{ids['ont1']}")).status_code == 404
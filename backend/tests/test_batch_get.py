@@ -0,0 +1,56 @@
+"""
+Test Batch Get Endpoints
+
+POST /api/devices/batch-get, POST /api/links/batch-get and
+GET /api/devices/interfaces?device_ids=...
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+
+
+@pytest.mark.asyncio
+async def test_batch_get_devices_and_links(async_session, override_get_session):
+    """Test: Found rows sorted by id, unknown ids reported as missing"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = []
+        for name in ("olt1", "olt2", "olt3"):
+            response = await client.post("/api/devices", json={"name": name, "device_type": "OLT"})
+            ids.append(response.json()["id"])
+
+        response = await client.post("/api/devices/batch-get", json={"ids": [ids[2], 999, ids[0], ids[0]]})
+        assert response.status_code == 200
+        body = response.json()
+        assert [d["name"] for d in body["items"]] == ["olt1", "olt3"]
+        assert body["missing"] == [999]
+
+        sparse = await client.post("/api/devices/batch-get", json={"ids": ids, "fields": "status"})
+        assert sparse.json()["items"][0] == {"id": ids[0], "status": "DOWN"}
+
+        links = await client.post("/api/links/batch-get", json={"ids": [1, 2]})
+        assert links.json() == {"items": [], "missing": [1, 2]}
+
+        too_many = await client.post("/api/devices/batch-get", json={"ids": list(range(10_001))})
+        assert too_many.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_interfaces_for_many_devices(async_session, override_get_session):
+    """Test: Interfaces grouped per device in one call"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        gw = (await client.post("/api/devices/provision", json={"name": "bb1", "device_type": "BACKBONE_GATEWAY"})).json()
+        bare = (await client.post("/api/devices", json={"name": "pop1", "device_type": "POP"})).json()
+        gw_id = gw["device"]["id"]
+
+        response = await client.get("/api/devices/interfaces", params={"device_ids": f"{gw_id},{bare['id']},999"})
+        assert response.status_code == 200
+        body = response.json()
+        single = (await client.get(f"/api/devices/{gw_id}/interfaces")).json()
+        assert body["items"][str(gw_id)] == single
+        assert body["items"][str(bare["id"])] == []
+        assert body["missing"] == [999]
+
+        response = await client.get("/api/devices/interfaces", params={"device_ids": "1,abc"})
+        assert response.status_code == 400
@@ -0,0 +1,95 @@
+"""
+Test Bulk Delete
+
+DELETE /api/devices?ids=... and DELETE /api/containers/{id}?recursive=true
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import select
+
+from backend.main import app
+from backend.models.core import Device, Interface, Link
+from backend.services.topology_index import topology_index
+
+
+async def _device(client, name, device_type, parent=None):
+    response = await client.post("/api/devices", json={
+        "name": name, "device_type": device_type, "parent_container_id": parent,
+    })
+    return response.json()["id"]
+
+
+async def _link(client, a, b):
+    response = await client.post("/api/links/create-simple", json={
+        "device_a_id": a, "device_b_id": b, "link_type": "fiber",
+    })
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_devices_with_links(async_session, override_get_session):
+    """Test: Devices, interfaces and links removed in one call, one event"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        core = await _device(client, "core1", "CORE_ROUTER")
+        edge1 = await _device(client, "edge1", "EDGE_ROUTER")
+        edge2 = await _device(client, "edge2", "EDGE_ROUTER")
+        keep = await _device(client, "edge3", "EDGE_ROUTER")
+        await _link(client, core, edge1)
+        await _link(client, core, edge2)
+        await _link(client, core, keep)
+        await topology_index.ensure_loaded(async_session)
+
+        with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+            response = await client.delete("/api/devices", params={"ids": f"{edge1},{edge2},999"})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["devices"] == [edge1, edge2]
+        assert body["missing"] == [999]
+        assert len(body["links"]) == 2 and len(body["interfaces"]) == 2
+        emit.assert_awaited_once()
+        assert emit.await_args.args[0] == "devices:deleted"
+
+        remaining = (await client.get("/api/devices")).json()
+        assert {d["id"] for d in remaining} == {core, keep}
+        assert len((await client.get("/api/links")).json()) == 1
+        assert (await client.get(f"/api/devices/{edge1}")).status_code == 404
+
+        changes = (await client.get("/api/changes", params={"since": 0})).json()
+        assert set(body["links"]) <= set(changes["deleted"]["links"])
+
+    # Staged index removals == a fresh load
+    assert set(topology_index.devices) == {core, keep}
+    assert set(topology_index.links) == {link.id for link in (await async_session.execute(select(Link))).scalars()}
+
+
+@pytest.mark.asyncio
+async def test_delete_container_recursive_and_detach(async_session, override_get_session):
+    """Test: Recursive delete removes the subtree; otherwise children are detached"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        site = await _device(client, "site1", "CORE_SITE")
+        pop = await _device(client, "pop1", "POP", parent=site)
+        olt = await _device(client, "olt1", "OLT", parent=pop)
+        odf = await _device(client, "odf1", "ODF", parent=pop)
+        other = await _device(client, "pop2", "POP", parent=site)
+
+        assert (await client.delete(f"/api/containers/{olt}")).status_code == 400
+        assert (await client.delete("/api/containers/9999")).status_code == 404
+
+        response = await client.delete(f"/api/containers/{pop}", params={"recursive": "true"})
+        assert response.status_code == 200
+        assert response.json()["devices"] == sorted([pop, olt, odf])
+
+        response = await client.delete(f"/api/containers/{site}")
+        assert response.json()["devices"] == [site]
+        assert response.json()["detached"] == [other]
+
+    detached = await async_session.get(Device, other)
+    await async_session.refresh(detached)
+    assert detached.parent_container_id is None
+    assert (await async_session.execute(select(Interface))).scalars().all() == []
+    assert topology_index.contents(other, recursive=True) == set()
+    assert topology_index.devices[other].parent_container_id is None
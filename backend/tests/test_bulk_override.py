@@ -0,0 +1,109 @@
+"""
+Test Bulk Overrides
+
+POST /api/overrides/bulk with impact preview (dry run) and status propagation
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import select
+
+from backend.main import app
+from backend.models.core import Device, Status
+from backend.services.alarm_correlation import alarm_correlator
+
+
+async def _chain(client, session):
+    """gw ─ core ─┬─ edge1 ─ olt1 ─ ont1
+                  └─ edge2 ─ olt2 ─ ont2"""
+    ids = {}
+    for name, device_type in [
+        ("gw", "BACKBONE_GATEWAY"), ("core", "CORE_ROUTER"), ("edge1", "EDGE_ROUTER"), ("edge2", "EDGE_ROUTER"),
+        ("olt1", "OLT"), ("olt2", "OLT"), ("ont1", "ONT"), ("ont2", "ONT"),
+    ]:
+        response = await client.post("/api/devices", json={"name": name, "device_type": device_type})
+        ids[name] = response.json()["id"]
+    for a, b in [
+        ("gw", "core"), ("core", "edge1"), ("core", "edge2"), ("edge1", "olt1"), ("edge2", "olt2"),
+        ("olt1", "ont1"), ("olt2", "ont2"),
+    ]:
+        await client.post("/api/links/create-simple", json={
+            "device_a_id": ids[a], "device_b_id": ids[b], "link_type": "fiber",
+        })
+    # Devices are created DOWN; bring the whole chain up
+    for device in (await session.execute(select(Device))).scalars():
+        device.status = Status.UP
+    await session.commit()
+    return ids
+
+
+async def _override(session, device_id):
+    row = (await session.execute(
+        select(Device.status_override, Device.override_reason).where(Device.id == device_id)
+    )).one()
+    return tuple(row)
+
+
+@pytest.mark.asyncio
+async def test_dry_run_previews_without_writing(async_session, override_get_session):
+    """Test: Dry run reports the cut-off subtree and leaves devices untouched"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = await _chain(client, async_session)
+
+        with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+            response = await client.post("/api/overrides/bulk", json={
+                "device_ids": [ids["edge1"], 999], "status_override": "DOWN", "dry_run": True,
+            })
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["dry_run"] is True
+        assert data["updated"] == [ids["edge1"]] and data["missing"] == [999]
+        assert data["impact"]["changed"] == [{"device_id": ids["edge1"], "before": "UP", "after": "DOWN"}]
+        assert data["impact"]["cut_off"] == sorted([ids["olt1"], ids["ont1"]])
+        assert data["impact"]["customers_cut_off"] == 1
+        emit.assert_not_awaited()
+
+        assert await _override(async_session, ids["edge1"]) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_apply_and_clear_overrides(async_session, override_get_session):
+    """Test: One call overrides many devices, emits one event, clearing restores"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = await _chain(client, async_session)
+
+        with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+            response = await client.post("/api/overrides/bulk", json={
+                "device_ids": [ids["edge1"], ids["edge2"]], "status_override": "DOWN",
+                "override_reason": "maintenance",
+            })
+            emit.assert_not_awaited()  # DOWN devices: held for the alarm correlation window
+            await alarm_correlator.flush()
+        data = response.json()
+        assert data["impact"]["customers_cut_off"] == 2
+        events = [call.args for call in emit.await_args_list]
+        assert [name for name, _ in events] == ["alarm:raised", "alarm:raised", "devices:overridden"]
+        assert events[-1][1]["ids"] == [ids["edge1"], ids["edge2"]]
+
+        assert await _override(async_session, ids["edge2"]) == (Status.DOWN, "maintenance")
+        assert await _override(async_session, ids["core"]) == (None, None)
+
+        # Already DOWN: overriding edge1 again changes nothing downstream
+        again = (await client.post("/api/overrides/bulk", json={
+            "device_ids": [ids["edge1"]], "status_override": "DOWN", "dry_run": True,
+        })).json()
+        assert again["impact"]["changed"] == [] and again["impact"]["cut_off"] == []
+
+        cleared = (await client.post("/api/overrides/bulk", json={
+            "device_ids": [ids["edge1"], ids["edge2"]], "status_override": None,
+        })).json()
+        assert cleared["impact"]["restored"] == sorted([ids["olt1"], ids["olt2"], ids["ont1"], ids["ont2"]])
+        assert cleared["impact"]["customers_restored"] == 2
+        assert await _override(async_session, ids["edge1"]) == (None, None)
+
+        invalid = await client.post("/api/overrides/bulk", json={
+            "device_ids": [ids["edge1"]], "status_override": "DEGRADED",
+        })
+        assert invalid.status_code == 400
@@ -0,0 +1,160 @@
+"""
+Test Change Log
+
+GET /api/changes delta sync, updated_at bumping and compaction
+"""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+
+from backend.main import app
+from backend.models.core import ChangeLogEntry, Device, DeviceType
+from backend.services.changelog import CHANGELOG_LOCK_KEY, _serialize_writers, changes_since, compact_change_log
+from backend.services.seed import clear_all_data
+
+
+async def _create(client, name, device_type="EDGE_ROUTER"):
+    response = await client.post("/api/devices", json={"name": name, "device_type": device_type})
+    return response.json()["id"]
+
+
+async def _changes(client, since, **params):
+    response = await client.get("/api/changes", params={"since": since, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_changes_since_returns_only_deltas(async_session, override_get_session):
+    """Test: Upserts and deletes after the cursor; updated_at is bumped"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        removed = await _create(client, "edge-removed")
+        untouched = await _create(client, "edge-untouched")
+        moved = await _create(client, "edge-moved")
+
+        cursor = (await client.get("/api/changes")).json()["seq"]
+        assert cursor > 0
+
+        await client.patch(f"/api/devices/{moved}", json={"x": 120, "y": 80})
+        await client.delete(f"/api/devices/{removed}")
+        added = await _create(client, "edge-added")
+        new_link = (await client.post("/api/links/create-simple", json={
+            "device_a_id": moved, "device_b_id": added, "link_type": "fiber",
+        })).json()["link"]
+
+        delta = await _changes(client, cursor)
+        assert delta["reset"] is False
+        assert {d["id"] for d in delta["devices"]} == {moved, added}
+        assert untouched not in {d["id"] for d in delta["devices"]}
+        assert delta["deleted"]["devices"] == [removed]
+        assert [link["id"] for link in delta["links"]] == [new_link["id"]]
+        assert len(delta["interfaces"]) == 2
+
+        entries = (await async_session.execute(
+            select(ChangeLogEntry).where(ChangeLogEntry.entity == "device", ChangeLogEntry.entity_id == moved)
+        )).scalars().all()
+        assert [e.op for e in entries] == ["upsert", "upsert"]  # created + moved
+
+        # Nothing new since the returned cursor
+        empty = await _changes(client, delta["seq"])
+        assert empty["devices"] == [] and empty["deleted"]["devices"] == []
+
+        # Paging through the log with a small limit
+        page = await _changes(client, cursor, limit=1)
+        assert page["has_more"] is True and page["seq"] == cursor + 1
+
+
+@pytest.mark.asyncio
+async def test_position_update_bumps_updated_at(async_session, override_get_session):
+    """Test: ORM updates stamp updated_at"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        device_id = await _create(client, "edge1")
+        before = (await async_session.get(Device, device_id)).updated_at
+        await client.patch(f"/api/devices/{device_id}", json={"x": 5, "y": 5})
+        after = (await async_session.get(Device, device_id)).updated_at
+        assert after > before
+
+
+@pytest.mark.asyncio
+async def test_reset_and_compaction(async_session, override_get_session):
+    """Test: Clearing data forces a reload; compaction keeps answers stable"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = await _create(client, "edge1")
+        for x in range(1, 6):
+            await client.patch(f"/api/devices/{first}", json={"x": x, "y": 0})
+        second = await _create(client, "edge2")
+
+        before = await changes_since(async_session, 0)
+        removed = await compact_change_log(async_session, retention=timedelta(days=1))
+        assert removed == 5  # superseded updates of edge1
+        after = await changes_since(async_session, 0)
+        assert [d.id for d in after["devices"]] == [d.id for d in before["devices"]] == [first, second]
+
+        # Expiring everything leaves a reset marker for clients behind the horizon
+        cursor = after["seq"]
+        await compact_change_log(async_session, retention=timedelta(seconds=-1))
+        assert (await _changes(client, 0))["reset"] is True
+        assert (await _changes(client, cursor))["reset"] is False
+
+        await client.delete(f"/api/devices/{second}")
+        await clear_all_data(async_session)
+        assert (await _changes(client, cursor))["reset"] is True
+
+
+@pytest.mark.asyncio
+async def test_interleaved_writers_become_visible_in_seq_order(tmp_path):
+    """Test: A later writer waits for the open one, so a polling client never skips a seq"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'changes.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def write(session, name):
+        session.add(Device(name=name, device_type=DeviceType.EDGE_ROUTER))
+        await session.commit()
+
+    try:
+        async with factory() as first, factory() as second, factory() as reader:
+            first.add(Device(name="first", device_type=DeviceType.EDGE_ROUTER))
+            await first.flush()  # seq taken, not committed
+            later = asyncio.create_task(write(second, "second"))
+            await asyncio.sleep(0.2)
+            assert not later.done()
+            assert (await changes_since(reader, 0))["devices"] == []
+
+            await first.commit()
+            polled = await changes_since(reader, 0)
+            await later
+            delta = await changes_since(reader, polled["seq"])
+
+            entries = (await reader.execute(
+                select(ChangeLogEntry.entity_id).where(ChangeLogEntry.entity == "device").order_by(ChangeLogEntry.seq)
+            )).scalars().all()
+            names = {d.id: d.name for d in (await reader.execute(select(Device))).scalars()}
+
+        # Whatever the poll saw first, resuming from its cursor yields the rest
+        assert "first" in {d.name for d in polled["devices"]}
+        assert {d.name for d in polled["devices"]} | {d.name for d in delta["devices"]} == {"first", "second"}
+        assert [names[device_id] for device_id in entries] == ["first", "second"]
+    finally:
+        await engine.dispose()
+
+
+def test_postgresql_writers_take_the_advisory_lock_once():
+    """Test: One transaction-scoped advisory lock per transaction on PostgreSQL"""
+    session = MagicMock(info={})
+    connection = session.connection.return_value
+    connection.dialect.name = "postgresql"
+
+    _serialize_writers(session)
+    _serialize_writers(session)
+    [call] = connection.execute.call_args_list
+    assert "pg_advisory_xact_lock" in str(call.args[0])
+    assert call.args[1] == {"key": CHANGELOG_LOCK_KEY}
@@ -0,0 +1,102 @@
+"""
+Test Container Hierarchy
+
+GET /api/containers/{id}/contents and PATCH /api/devices/{id}/parent
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+from backend.services.topology_index import topology_index
+
+
+async def _create(client, name, device_type, parent=None):
+    response = await client.post("/api/devices", json={
+        "name": name, "device_type": device_type, "parent_container_id": parent,
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def _contents(client, container_id, recursive):
+    response = await client.get(
+        f"/api/containers/{container_id}/contents",
+        params={"recursive": str(recursive).lower()},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_container_contents_direct_and_recursive(async_session, override_get_session):
+    """Test: Direct children vs whole subtree, with per-type counts"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        site = await _create(client, "site1", "CORE_SITE")
+        pop = await _create(client, "pop1", "POP", parent=site)
+        edge = await _create(client, "edge1", "EDGE_ROUTER", parent=site)
+        olt = await _create(client, "olt1", "OLT", parent=pop)
+        odf = await _create(client, "odf1", "ODF", parent=pop)
+
+        direct = await _contents(client, site, recursive=False)
+        assert {d["id"] for d in direct["devices"]} == {pop, edge}
+        assert direct["count"] == 2
+
+        nested = await _contents(client, site, recursive=True)
+        assert {d["id"] for d in nested["devices"]} == {pop, edge, olt, odf}
+        assert nested["counts_by_type"] == {"POP": 1, "EDGE_ROUTER": 1, "OLT": 1, "ODF": 1}
+
+        counts_only = await client.get(
+            f"/api/containers/{site}/contents",
+            params={"recursive": "true", "include_devices": "false"},
+        )
+        assert counts_only.json()["count"] == 4
+        assert counts_only.json()["devices"] == []
+
+
+@pytest.mark.asyncio
+async def test_reparent_moves_whole_subtree(async_session, override_get_session):
+    """Test: Re-parenting a POP moves its contents; delete shrinks counts"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        site_a = await _create(client, "siteA", "CORE_SITE")
+        site_b = await _create(client, "siteB", "CORE_SITE")
+        pop = await _create(client, "pop1", "POP", parent=site_a)
+        olt = await _create(client, "olt1", "OLT", parent=pop)
+        ont = await _create(client, "ont1", "ONT", parent=pop)
+
+        response = await client.patch(f"/api/devices/{pop}/parent", json={"parent_container_id": site_b})
+        assert response.status_code == 200
+
+        assert (await _contents(client, site_a, recursive=True))["count"] == 0
+        moved = await _contents(client, site_b, recursive=True)
+        assert {d["id"] for d in moved["devices"]} == {pop, olt, ont}
+
+        await client.delete(f"/api/devices/{ont}")
+        assert (await _contents(client, site_b, recursive=True))["count"] == 2
+
+    # Incrementally maintained closure equals a fresh build
+    incremental = {k: set(v) for k, v in topology_index.descendants.items()}
+    topology_index.invalidate()
+    await topology_index.ensure_loaded(async_session)
+    assert incremental == topology_index.descendants
+
+
+@pytest.mark.asyncio
+async def test_reparent_validation(async_session, override_get_session):
+    """Test: Cycles and non-container targets are rejected"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        site = await _create(client, "site1", "CORE_SITE")
+        pop = await _create(client, "pop1", "POP", parent=site)
+        olt = await _create(client, "olt1", "OLT")
+
+        response = await client.patch(f"/api/devices/{site}/parent", json={"parent_container_id": pop})
+        assert response.status_code == 400
+
+        response = await client.patch(f"/api/devices/{pop}/parent", json={"parent_container_id": olt})
+        assert response.status_code == 400
+
+        response = await client.get(f"/api/containers/{olt}/contents")
+        assert response.status_code == 400
+
+        response = await client.get("/api/containers/9999/contents")
+        assert response.status_code == 404
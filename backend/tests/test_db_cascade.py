@@ -0,0 +1,88 @@
+"""
+Test Database-Level Cascades
+
+Deleting a device relies on ON DELETE CASCADE (SQLite foreign keys enabled
+like PostgreSQL) instead of ORM-loaded cascades.
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, func, select, text
+
+from backend.main import app
+from backend.models.core import Device, DeviceType, Interface, InterfaceType, Link
+from backend.services.topology_index import get_topology_index
+
+PORTS = 48
+
+
+@pytest.mark.asyncio
+async def test_delete_patched_odf_is_one_statement(async_session, override_get_session):
+    """Test: An ODF with 48 patched ports goes with a single DELETE"""
+    assert (await async_session.execute(text("PRAGMA foreign_keys"))).scalar() == 1
+
+    odf = Device(name="odf1", device_type=DeviceType.ODF)
+    olt = Device(name="olt1", device_type=DeviceType.OLT)
+    async_session.add_all([odf, olt])
+    await async_session.flush()
+    odf_ports = [Interface(name=f"p{i}", interface_type=InterfaceType.OPTICAL, device_id=odf.id) for i in range(PORTS)]
+    olt_ports = [Interface(name=f"pon{i}", interface_type=InterfaceType.OPTICAL, device_id=olt.id) for i in range(PORTS)]
+    async_session.add_all(odf_ports + olt_ports)
+    await async_session.flush()
+    async_session.add_all([Link(a_interface_id=a.id, b_interface_id=b.id) for a, b in zip(olt_ports, odf_ports)])
+    await async_session.commit()
+    odf_id = odf.id
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0:3])
+
+    engine = async_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.delete(f"/api/devices/{odf_id}")
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert response.status_code == 204
+
+    deletes = [s for s in statements if s[0] == "DELETE"]
+    assert deletes == [["DELETE", "FROM", "devices"]]
+
+    count = lambda model: select(func.count()).select_from(model)  # noqa: E731
+    assert (await async_session.execute(count(Link))).scalar() == 0
+    assert (await async_session.execute(count(Interface))).scalar() == PORTS
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        changes = (await client.get("/api/changes", params={"since": 0})).json()
+    assert len(changes["deleted"]["links"]) == PORTS
+    assert len(changes["deleted"]["interfaces"]) == PORTS
+    assert changes["deleted"]["devices"] == [odf_id]
+
+
+@pytest.mark.asyncio
+async def test_deleting_container_detaches_children(async_session, override_get_session):
+    """Test: Children are detached and the change reaches the ETag, /changes and the index"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        pop = (await client.post("/api/devices", json={"name": "pop1", "device_type": "POP"})).json()["id"]
+        olt = (await client.post("/api/devices", json={
+            "name": "olt1", "device_type": "OLT", "parent_container_id": pop,
+        })).json()["id"]
+        index = await get_topology_index(async_session)
+        before = await client.get(f"/api/devices/{olt}")
+        assert before.json()["parent_container_id"] == pop
+        cursor = (await client.get("/api/changes")).json()["seq"]
+
+        assert (await client.delete(f"/api/devices/{pop}")).status_code == 204
+        after = await client.get(f"/api/devices/{olt}", headers={"If-None-Match": before.headers["etag"]})
+        assert after.status_code == 200
+        assert after.json()["parent_container_id"] is None
+        assert after.headers["etag"] != before.headers["etag"]
+
+        changes = (await client.get("/api/changes", params={"since": cursor})).json()
+        assert [device["id"] for device in changes["devices"]] == [olt]
+        assert changes["deleted"]["devices"] == [pop]
+
+        assert index.devices[olt].parent_container_id is None
+        assert pop not in index.children
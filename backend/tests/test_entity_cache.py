@@ -0,0 +1,81 @@
+"""
+Test Entity Cache (read-through LRU with write-path invalidation)
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+from backend.models.core import Device, DeviceType
+from backend.services.entity_cache import EntityCache, entity_cache
+from backend.services.seed import clear_all_data
+
+
+@pytest.mark.asyncio
+async def test_detail_reads_hit_cache_and_see_writes(async_session, override_get_session):
+    """Test: Second read is a hit; updates and deletes invalidate"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = (await client.post("/api/devices", json={"name": "r1", "device_type": "CORE_ROUTER"})).json()
+        second = (await client.post("/api/devices", json={"name": "r2", "device_type": "CORE_ROUTER"})).json()
+
+        await client.get(f"/api/devices/{first['id']}")
+        before = entity_cache.stats()
+        assert (await client.get(f"/api/devices/{first['id']}")).json()["name"] == "r1"
+        assert entity_cache.stats()["hits"] == before["hits"] + 1
+
+        await client.patch(f"/api/devices/{first['id']}", json={"x": 7, "y": 8})
+        assert (await client.get(f"/api/devices/{first['id']}")).json()["x"] == 7
+
+        await client.get(f"/api/devices/{second['id']}")
+        await client.delete(f"/api/devices/{first['id']}")
+        assert (await client.get(f"/api/devices/{first['id']}")).status_code == 404
+
+        stats = (await client.get("/api/cache/stats")).json()
+        assert stats["entities"]["hits"] >= 1
+        assert stats["entities"]["invalidations"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_name_lookup_eviction_and_reset(async_session):
+    """Test: Name index, LRU bound, reset and remote invalidation"""
+    for i in range(3):
+        async_session.add(Device(name=f"olt{i}", device_type=DeviceType.OLT))
+    await async_session.commit()
+
+    cache = EntityCache(max_entries=2)
+    assert (await cache.get_device_by_name(async_session, "olt0"))["id"] == 1
+    await cache.get(async_session, "device", 2)
+    await cache.get(async_session, "device", 3)
+    assert cache.stats()["entries"] == 2 and cache.evictions == 1
+    assert await cache.get_device_by_name(async_session, "missing") is None
+
+    cache.apply_remote({"changes": [["device", 2]]})
+    assert cache.stats()["entries"] == 1
+
+    # Set-based writers invalidate through the change log
+    await entity_cache.get(async_session, "device", 3)
+    await clear_all_data(async_session)
+    assert entity_cache.stats()["entries"] == 0
+    assert await entity_cache.get(async_session, "device", 3) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_cached(async_session):
+    """Test: A row read before a concurrent commit is returned but not stored"""
+    async_session.add(Device(name="olt1", device_type=DeviceType.OLT))
+    await async_session.commit()
+
+    cache = EntityCache()
+    execute = async_session.execute
+
+    async def execute_then_commit_elsewhere(statement, *args, **kwargs):
+        result = await execute(statement, *args, **kwargs)
+        cache.invalidate({("device", 1)})
+        return result
+
+    async_session.execute = execute_then_commit_elsewhere
+    try:
+        assert (await cache.get(async_session, "device", 1))["name"] == "olt1"
+    finally:
+        del async_session.execute
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,62 @@
+"""
+Test Conditional GETs (ETag / If-None-Match)
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+
+
+@pytest.mark.asyncio
+async def test_device_list_and_detail_etags(async_session, override_get_session):
+    """Test: 304 while nothing changed, new ETag after a mutation"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = await client.post("/api/devices", json={"name": "r1", "device_type": "CORE_ROUTER"})
+        device_id = created.json()["id"]
+
+        first = await client.get("/api/devices")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+
+        again = await client.get("/api/devices", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+        assert (await client.get("/api/devices", headers={"If-None-Match": f"W/{etag}"})).status_code == 304
+
+        detail = await client.get(f"/api/devices/{device_id}")
+        detail_etag = detail.headers["etag"]
+        assert (await client.get(
+            f"/api/devices/{device_id}", headers={"If-None-Match": detail_etag}
+        )).status_code == 304
+
+        await client.patch(f"/api/devices/{device_id}", json={"x": 10, "y": 20})
+
+        changed = await client.get("/api/devices", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json()[0]["x"] == 10
+        assert (await client.get(
+            f"/api/devices/{device_id}", headers={"If-None-Match": detail_etag}
+        )).status_code == 200
+
+        assert (await client.get("/api/devices/9999")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_reference_data_is_cacheable(async_session, override_get_session):
+    """Test: Enum and link-rule endpoints are publicly cacheable"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        enums = await client.get("/api/meta/enums")
+        assert enums.status_code == 200
+        assert "OLT" in enums.json()["device_types"]
+        assert "max-age=3600" in enums.headers["cache-control"]
+        assert (await client.get(
+            "/api/meta/enums", headers={"If-None-Match": enums.headers["etag"]}
+        )).status_code == 304
+
+        rules = await client.get("/api/link-rules")
+        assert rules.status_code == 200
+        assert rules.json()["rules"]
+        assert "POP" in rules.json()["container_device_types"]
@@ -0,0 +1,60 @@
+"""
+Test Fast JSON List Path
+
+List endpoints skip per-row validation; the output must still match the
+response models exactly.
+"""
+
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+from backend.models.core import Device, DeviceResponse, DeviceType
+from backend.services import fast_json
+
+
+@pytest.mark.asyncio
+async def test_device_list_matches_response_model(async_session, override_get_session):
+    """Test: Fast path output == DeviceResponse validation of the ORM rows"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/api/devices", json={"name": "olt1", "device_type": "OLT", "x": 1.5, "y": 2})
+        await client.post("/api/devices", json={"name": "pop1", "device_type": "POP"})
+
+        response = await client.get("/api/devices")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["etag"]
+
+    devices = await async_session.get(Device, 1), await async_session.get(Device, 2)
+    expected = [DeviceResponse.model_validate(d, from_attributes=True).model_dump(mode="json") for d in devices]
+    assert response.json() == expected
+
+
+def test_stdlib_fallback_encoder(monkeypatch):
+    """Test: Without orjson the stdlib encoder produces the same JSON"""
+    payload = [{"id": 1, "device_type": DeviceType.OLT, "x": 0.5, "parent_container_id": None}]
+    fast = fast_json.dumps(payload)
+    monkeypatch.setattr(fast_json, "orjson", None)
+    assert json.loads(fast_json.dumps(payload)) == json.loads(fast)
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets(async_session, override_get_session):
+    """Test: ?fields= narrows the payload, keeps id and gets its own ETag"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/api/devices", json={"name": "olt1", "device_type": "OLT", "x": 3, "y": 4})
+
+        full = await client.get("/api/devices")
+        sparse = await client.get("/api/devices", params={"fields": "status, x,y,device_type"})
+        assert sparse.status_code == 200
+        assert sparse.json() == [{"id": 1, "device_type": "OLT", "status": "DOWN", "x": 3.0, "y": 4.0}]
+        assert sparse.headers["etag"] != full.headers["etag"]
+
+        links = await client.get("/api/links", params={"fields": "status"})
+        assert links.status_code == 200 and links.json() == []
+
+        response = await client.get("/api/interfaces", params={"fields": "name,secret"})
+        assert response.status_code == 400
+        assert "secret" in response.json()["detail"]
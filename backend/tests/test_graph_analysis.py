@@ -0,0 +1,165 @@
+"""
+Test Graph Analysis
+
+Single points of failure (SpofAnalyzer), orphans (ComponentTracker) and
+GET /api/analysis/spof, /api/analysis/orphans
+"""
+
+from dataclasses import replace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+from backend.models.core import DeviceType, Status
+from backend.services.graph_analysis import ComponentTracker, SpofAnalyzer
+from backend.services.topology_index import DeviceNode, LinkEdge, TopologyIndex
+
+
+DEVICES = {
+    1: DeviceType.BACKBONE_GATEWAY, 2: DeviceType.BACKBONE_GATEWAY,
+    3: DeviceType.CORE_ROUTER, 4: DeviceType.CORE_ROUTER,
+    5: DeviceType.EDGE_ROUTER, 6: DeviceType.OLT, 7: DeviceType.SPLITTER,
+    8: DeviceType.ONT, 9: DeviceType.ONT, 10: DeviceType.ONT, 11: DeviceType.ONT,
+}
+
+# gw1─core1═core2─gw2, both cores ─ edge ─ olt ─┬─ ont8, ont9
+#                                               └─ splitter ─ ont10   (ont11 unlinked)
+LINKS = {
+    1: (1, 3), 2: (2, 4), 3: (3, 4), 4: (3, 5), 5: (4, 5),
+    6: (5, 6), 7: (6, 8), 8: (6, 9), 9: (6, 7), 10: (7, 10),
+}
+
+
+def _index():
+    index = TopologyIndex()
+    for device_id, device_type in DEVICES.items():
+        index._add_device(DeviceNode(
+            id=device_id, name=f"d{device_id}", device_type=device_type,
+            status=Status.UP, status_override=None, parent_container_id=None, x=0.0, y=0.0,
+        ))
+    for link_id, (a, b) in LINKS.items():
+        index._add_interface(link_id * 10, a)
+        index._add_interface(link_id * 10 + 1, b)
+        index._add_link(LinkEdge(
+            id=link_id, a_interface_id=link_id * 10, b_interface_id=link_id * 10 + 1, status=Status.UP,
+        ))
+    index.loaded = True
+    return index
+
+
+def test_articulation_points_and_bridges():
+    """Test: Only devices/links that cut customers off the backbone are reported"""
+    analyzer = SpofAnalyzer(_index())
+    report = analyzer.report()
+
+    assert report.articulation_points == {5: 3, 6: 3, 7: 1}
+    assert report.bridges == {6: 3, 7: 1, 8: 1, 9: 1, 10: 1}
+    assert report.customers_total == 4
+    assert report.customers_unreachable == 1
+
+
+def test_recomputed_only_on_structural_changes():
+    """Test: Status updates keep the report, removing the redundant uplink changes it"""
+    index = _index()
+    analyzer = SpofAnalyzer(index)
+    analyzer.report()
+
+    index.upsert_link(replace(index.links[5], status=Status.DOWN))
+    index.upsert_device(replace(index.devices[5], status=Status.DOWN))
+    analyzer.report()
+    assert analyzer.computations == 1
+
+    index.remove_link(5)
+    report = analyzer.report()
+    assert analyzer.computations == 2
+    assert report.articulation_points[3] == 3
+    assert report.bridges[4] == 3
+
+
+def _orphans(tracker):
+    return [sorted(component.members) for component in tracker.orphaned_components()]
+
+
+def test_components_follow_link_changes():
+    """Test: Redundant link removal keeps the component, cutting the uplink splits it"""
+    index = _index()
+    tracker = ComponentTracker(index)
+    assert _orphans(tracker) == [[11]]
+
+    index.remove_link(5)  # core2 ─ edge: core1 still connects
+    assert tracker.splits == 0
+    assert _orphans(tracker) == [[11]]
+
+    index.remove_link(6)  # edge ─ olt
+    assert tracker.splits == 1
+    assert _orphans(tracker) == [[6, 7, 8, 9, 10], [11]]
+    assert tracker.component(8) is tracker.component(6)
+
+    index.upsert_link(LinkEdge(id=6, a_interface_id=60, b_interface_id=61, status=Status.UP))
+    assert _orphans(tracker) == [[11]]
+
+    index.remove_device(1)  # gw1 gone, gw2 still reaches everything
+    assert _orphans(tracker) == [[11]]
+    index.remove_device(2)
+    assert _orphans(tracker) == [[3, 4, 5, 6, 7, 8, 9, 10], [11]]
+    assert tracker.rebuilds == 1
+
+
+@pytest.mark.asyncio
+async def test_spof_endpoint(async_session, override_get_session):
+    """Test: GET /api/analysis/spof lists the single uplink of an access chain"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = {}
+        for name, device_type in [
+            ("gw", "BACKBONE_GATEWAY"), ("core", "CORE_ROUTER"), ("edge", "EDGE_ROUTER"),
+            ("olt", "OLT"), ("ont1", "ONT"), ("ont2", "ONT"),
+        ]:
+            ids[name] = (await client.post("/api/devices", json={"name": name, "device_type": device_type})).json()["id"]
+        for a, b in [("gw", "core"), ("core", "edge"), ("edge", "olt"), ("olt", "ont1"), ("olt", "ont2")]:
+            await client.post("/api/links/create-simple", json={
+                "device_a_id": ids[a], "device_b_id": ids[b], "link_type": "fiber",
+            })
+
+        response = await client.get("/api/analysis/spof")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["customers_total"] == 2 and data["customers_unreachable"] == 0
+        assert [(p["name"], p["affected_customers"]) for p in data["articulation_points"]] == [
+            ("gw", 2), ("core", 2), ("edge", 2), ("olt", 2),
+        ]
+        assert len(data["bridges"]) == 5
+
+        routers = (await client.get("/api/analysis/spof", params={
+            "device_type": ["CORE_ROUTER", "EDGE_ROUTER"], "limit": 1,
+        })).json()
+        assert [p["name"] for p in routers["articulation_points"]] == ["core"]
+        assert len(routers["bridges"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_orphans_endpoint(async_session, override_get_session):
+    """Test: Deleting an uplink lists the cut-off devices as one component"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = {}
+        for name, device_type in [
+            ("gw", "BACKBONE_GATEWAY"), ("core", "CORE_ROUTER"), ("edge", "EDGE_ROUTER"),
+            ("olt", "OLT"), ("ont1", "ONT"), ("pop", "POP"),
+        ]:
+            ids[name] = (await client.post("/api/devices", json={"name": name, "device_type": device_type})).json()["id"]
+        links = {}
+        for a, b in [("gw", "core"), ("core", "edge"), ("edge", "olt"), ("olt", "ont1")]:
+            response = await client.post("/api/links/create-simple", json={
+                "device_a_id": ids[a], "device_b_id": ids[b], "link_type": "fiber",
+            })
+            links[(a, b)] = response.json()["link"]["id"]
+
+        data = (await client.get("/api/analysis/orphans")).json()
+        assert data == {"version": data["version"], "orphan_devices": 0, "components": []}
+
+        await client.delete(f"/api/links/{links[('edge', 'olt')]}")
+        data = (await client.get("/api/analysis/orphans")).json()
+        assert data["orphan_devices"] == 2
+        [component] = data["components"]
+        assert component["size"] == 2 and component["customers"] == 1
+        assert [device["name"] for device in component["devices"]] == ["olt", "ont1"]
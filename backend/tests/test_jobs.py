@@ -0,0 +1,172 @@
+"""
+Test Background Jobs
+
+JobManager lifecycle (progress, cancellation, concurrency, persistence) and
+the job-backed /api/seed and /api/jobs endpoints
+"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+from backend.services.jobs import JobManager, JobState, JobStore, job_manager
+
+
+@pytest.mark.asyncio
+async def test_job_runs_and_reports_progress():
+    """Test: A submitted job runs to completion and keeps its result"""
+    manager = JobManager(max_concurrency=1)
+
+    async def work(ctx, count):
+        for i in range(count):
+            await ctx.progress((i + 1) / count, f"step {i + 1}")
+        return {"count": count}
+
+    manager.register("work", work)
+    job = await manager.submit("work", count=4)
+    finished = await manager.wait(job.id)
+
+    assert finished.state == JobState.SUCCEEDED
+    assert finished.progress == 1.0
+    assert finished.result == {"count": 4}
+    assert finished.message == "step 4"
+
+
+@pytest.mark.asyncio
+async def test_job_failure_and_cancellation():
+    """Test: Exceptions mark a job FAILED; cancel() stops a running job"""
+    manager = JobManager(max_concurrency=2)
+    started = asyncio.Event()
+
+    async def boom(ctx):
+        raise ValueError("bad input")
+
+    async def forever(ctx):
+        started.set()
+        await asyncio.sleep(3600)
+
+    manager.register("boom", boom)
+    manager.register("forever", forever)
+
+    failed = await manager.wait((await manager.submit("boom")).id)
+    assert failed.state == JobState.FAILED
+    assert failed.error == "bad input"
+
+    job = await manager.submit("forever")
+    await started.wait()
+    await manager.cancel(job.id)
+    assert job.state == JobState.CANCELLED
+    assert job.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    """Test: No more than max_concurrency jobs run at once"""
+    manager = JobManager(max_concurrency=2)
+    running = 0
+    peak = 0
+
+    async def work(ctx):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    manager.register("work", work)
+    jobs = [await manager.submit("work") for _ in range(6)]
+    for job in jobs:
+        await manager.wait(job.id)
+
+    assert peak == 2
+    assert all(job.state == JobState.SUCCEEDED for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_persistent_store_requeues_pending_jobs(tmp_path):
+    """Test: Pending jobs survive a shutdown and restart; interrupted running jobs fail"""
+    store_path = str(tmp_path / "jobs.sqlite")
+    started = asyncio.Event()
+
+    async def blocked(ctx):
+        started.set()
+        await asyncio.Event().wait()
+
+    first = JobManager(max_concurrency=1)
+    first.register("blocked", blocked)
+    await first.start(store_path)
+    running = await first.submit("blocked")
+    pending = await first.submit("blocked")
+    await started.wait()
+    await first.shutdown()
+    store = JobStore(store_path)
+    stored = {job.id: job.state for job in store.load_all()}
+    store.close()
+    assert stored == {running.id: JobState.RUNNING, pending.id: JobState.PENDING}
+
+    ran = []
+
+    async def resumed(ctx):
+        ran.append(ctx.job.id)
+        return {"ok": True}
+
+    second = JobManager()
+    second.register("blocked", resumed)
+    await second.start(store_path)
+    await second.wait(pending.id)
+
+    assert second.get(running.id).state == JobState.FAILED
+    assert second.get(pending.id).state == JobState.SUCCEEDED
+    assert ran == [pending.id]
+    await second.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_evicted(tmp_path):
+    """Test: Finished jobs beyond the retention cap or past the TTL leave memory and the store"""
+    store_path = str(tmp_path / "jobs.sqlite")
+
+    async def work(ctx):
+        return {}
+
+    manager = JobManager(max_concurrency=1, retention=2)
+    manager.register("work", work)
+    await manager.start(store_path)
+    ids = []
+    for _ in range(4):
+        job = await manager.submit("work")
+        await manager.wait(job.id)
+        ids.append(job.id)
+
+    assert set(manager.jobs) == set(ids[-2:])
+    assert {job.id for job in manager.store.load_all()} == set(ids[-2:])
+
+    manager.ttl = timedelta(0)
+    assert sorted(await manager.prune()) == sorted(ids[-2:])
+    assert manager.jobs == {} and manager.store.load_all() == []
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_seed_endpoint_runs_as_job(async_session, override_get_session):
+    """Test: POST /api/seed returns 202 with a job that can be polled"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/seed")
+        assert response.status_code == 202
+        job_id = response.json()["job"]["id"]
+
+        await job_manager.wait(job_id)
+        status = await client.get(f"/api/jobs/{job_id}")
+        assert status.status_code == 200
+        assert status.json()["state"] == "SUCCEEDED"
+        assert status.json()["progress"] == 1.0
+
+        devices = (await client.get("/api/devices")).json()
+        assert len(devices) > 0
+
+        # Finished jobs cannot be cancelled; unknown jobs are 404
+        assert (await client.delete(f"/api/jobs/{job_id}")).status_code == 409
+        assert (await client.get("/api/jobs/unknown")).status_code == 404
@@ -0,0 +1,74 @@
+"""
+Test Layout Engine
+
+Server-side layout: compute_layout kernel and POST /api/topology/layout
+"""
+
+import numpy as np
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+from backend.services.layout_engine import LAYER_SPACING, compute_layout
+
+
+def test_compute_layout_respects_tiers_and_fixed_nodes():
+    """Test: Kernel layers nodes by tier, separates them and keeps fixed nodes"""
+    # backbone(0) ─ core(1) ─┬─ edge(2)
+    #                        ├─ edge(2)
+    #                        └─ edge(2)   plus one fixed node
+    tiers = np.array([0, 1, 2, 2, 2, 2], dtype=float)
+    positions = np.zeros((6, 2))
+    positions[5] = (500.0, 300.0)
+    fixed = np.array([False] * 5 + [True])
+    edges = np.array([(0, 1), (1, 2), (1, 3), (1, 4), (1, 5)])
+
+    result = compute_layout(tiers, positions, fixed, edges, iterations=30)
+
+    assert tuple(result[5]) == (500.0, 300.0)
+    assert result[0, 1] < result[1, 1] < result[2, 1]
+    assert np.allclose(result[2:5, 1], 2 * LAYER_SPACING, atol=5.0)
+    # No two nodes end up on top of each other
+    gaps = np.linalg.norm(result[:, None, :] - result[None, :, :], axis=2)
+    assert gaps[np.triu_indices(6, k=1)].min() > 10.0
+
+
+async def _provision(client, name, device_type):
+    response = await client.post("/api/devices/provision", json={
+        "name": name, "device_type": device_type, "validate_upstream": False,
+    })
+    return response.json()["device"]["id"]
+
+
+@pytest.mark.asyncio
+async def test_layout_api_full_then_incremental(async_session, override_get_session):
+    """Test: Full layout spreads devices; incremental only places new ones"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        backbone = await _provision(client, "bb1", "BACKBONE_GATEWAY")
+        core = await _provision(client, "core1", "CORE_ROUTER")
+        edges = [await _provision(client, f"edge{i}", "EDGE_ROUTER") for i in range(3)]
+        for a, b in [(backbone, core)] + [(core, e) for e in edges]:
+            await client.post("/api/links/create-simple", json={
+                "device_a_id": a, "device_b_id": b, "link_type": "fiber",
+            })
+
+        response = await client.post("/api/topology/layout", json={"mode": "full", "iterations": 20})
+        assert response.status_code == 200
+        assert len(response.json()["positions"]) == 5
+
+        devices = {d["id"]: d for d in (await client.get("/api/devices")).json()}
+        assert len({(d["x"], d["y"]) for d in devices.values()}) == 5
+        assert devices[backbone]["y"] < devices[core]["y"] < devices[edges[0]]["y"]
+
+        # A newly provisioned device lands at the origin; only it is placed
+        olt = await _provision(client, "olt1", "OLT")
+        await client.post("/api/links/create-simple", json={
+            "device_a_id": edges[1], "device_b_id": olt, "link_type": "fiber",
+        })
+        response = await client.post("/api/topology/layout", json={"mode": "incremental"})
+        assert list(response.json()["positions"]) == [str(olt)]
+
+        after = {d["id"]: d for d in (await client.get("/api/devices")).json()}
+        for device_id, device in devices.items():
+            assert (after[device_id]["x"], after[device_id]["y"]) == (device["x"], device["y"])
+        assert after[olt]["y"] > after[edges[1]]["y"]
@@ -152,20 +152,21 @@ async def test_multiple_links_with_different_fiber_types(async_session):
         devices.append(dev)
     await async_session.commit()
     
-    # Create interfaces
+    # Create interfaces (one port per link end - a port takes one cable)
     interfaces = []
-    for idx, dev in enumerate(devices):
-        iface = Interface(name=f"pon{idx}", interface_type=InterfaceType.OPTICAL, device_id=dev.id)
-        async_session.add(iface)
-        interfaces.append(iface)
+    for idx in range(len(fiber_types)):
+        for end, dev in enumerate(devices[idx:idx + 2]):
+            iface = Interface(name=f"pon{idx}-{end}", interface_type=InterfaceType.OPTICAL, device_id=dev.id)
+            async_session.add(iface)
+            interfaces.append(iface)
     await async_session.commit()
     
     # Create links with different fiber types
     links = []
     for idx, fiber_type in enumerate(fiber_types):
         link = Link(
-            a_interface_id=interfaces[idx].id,
-            b_interface_id=interfaces[idx + 1].id,
+            a_interface_id=interfaces[2 * idx].id,
+            b_interface_id=interfaces[2 * idx + 1].id,
             length_km=1.0 + idx,
             physical_medium_id=fiber_type,
         )
@@ -0,0 +1,199 @@
+"""
+Test Link Validation
+
+POST /api/links, POST /api/links/bulk and /api/links/create-simple against
+the L1-L9 rules and interface exclusivity.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateTable
+
+from backend.api.routes import INTERFACE_PAIR_TAKEN
+from backend.main import app
+from backend.models.core import Link, LinkEndpoint
+from backend.services.link_validation import LEGACY_PAIR_CONSTRAINT, LinkValidator, migrate_link_endpoints
+from backend.services.topology_index import topology_index
+
+
+async def _device(client, name, device_type):
+    response = await client.post("/api/devices", json={"name": name, "device_type": device_type})
+    return response.json()["id"]
+
+
+async def _interface(client, device_id, name="eth0"):
+    response = await client.post("/api/interfaces", json={
+        "name": name, "interface_type": "ETHERNET", "device_id": device_id,
+    })
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_create_link_validation(async_session, override_get_session):
+    """Test: 201 for a valid pair, 400 / 404 / 409 for rule, missing and occupied"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        core = await _device(client, "core1", "CORE_ROUTER")
+        edge = await _device(client, "edge1", "EDGE_ROUTER")
+        ont = await _device(client, "ont1", "ONT")
+        core_a = await _interface(client, core, "eth0")
+        core_b = await _interface(client, core, "eth1")
+        edge_a = await _interface(client, edge, "eth0")
+        edge_b = await _interface(client, edge, "eth1")
+        ont_a = await _interface(client, ont)
+
+        ok = await client.post("/api/links", json={"a_interface_id": core_a, "b_interface_id": edge_a})
+        assert ok.status_code == 201, ok.text
+
+        taken = await client.post("/api/links", json={"a_interface_id": core_b, "b_interface_id": edge_a})
+        assert taken.status_code == 409
+        assert "already used" in taken.json()["detail"]
+
+        rule = await client.post("/api/links", json={"a_interface_id": ont_a, "b_interface_id": core_b})
+        assert rule.status_code == 400
+
+        self_link = await client.post("/api/links", json={"a_interface_id": core_b, "b_interface_id": core_b})
+        assert self_link.status_code == 400
+
+        missing = await client.post("/api/links", json={"a_interface_id": core_b, "b_interface_id": 9999})
+        assert missing.status_code == 404
+
+        second = await client.post("/api/links", json={"a_interface_id": core_b, "b_interface_id": edge_b})
+        assert second.status_code == 201
+        assert len((await client.get("/api/links")).json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_create_simple_link_enforces_rules(async_session, override_get_session):
+    """Test: create-simple rejects device type pairs outside L1-L9"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        core = await _device(client, "core1", "CORE_ROUTER")
+        ont = await _device(client, "ont1", "ONT")
+        response = await client.post("/api/links/create-simple", json={
+            "device_a_id": ont, "device_b_id": core, "link_type": "fiber",
+        })
+        assert response.status_code == 400
+        assert (await client.get("/api/interfaces")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_links(async_session, override_get_session):
+    """Test: Valid items inserted in one call, invalid ones reported per index"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        core = await _device(client, "core1", "CORE_ROUTER")
+        edges = [await _device(client, f"edge{i}", "EDGE_ROUTER") for i in range(3)]
+        ont = await _device(client, "ont1", "ONT")
+        core_ports = [await _interface(client, core, f"eth{i}") for i in range(3)]
+        edge_ports = [await _interface(client, edge) for edge in edges]
+        ont_port = await _interface(client, ont)
+
+        with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+            response = await client.post("/api/links/bulk", json={"links": [
+                {"a_interface_id": core_ports[0], "b_interface_id": edge_ports[0]},
+                {"a_interface_id": core_ports[1], "b_interface_id": edge_ports[0]},  # duplicate in batch
+                {"a_interface_id": core_ports[1], "b_interface_id": ont_port},       # L1-L9
+                {"a_interface_id": core_ports[1], "b_interface_id": 9999},
+                {"a_interface_id": core_ports[2], "b_interface_id": edge_ports[2], "length_km": 1.5},
+            ]})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert set(body["created"]) == {"0", "4"}
+        assert [(e["index"], e["kind"]) for e in body["errors"]] == [
+            (1, "occupied"), (2, "rule_violation"), (3, "not_found"),
+        ]
+        emit.assert_awaited_once()
+        assert emit.await_args.args[0] == "links:created"
+
+        links = (await client.get("/api/links")).json()
+        assert {link["id"] for link in links} == set(body["created"].values())
+        assert all(link["status"] == "DOWN" for link in links)
+
+        index = await topology_index.ensure_loaded(async_session)
+        assert edge_ports[2] in index.interface_links
+        assert edges[2] in index.adjacency[core].values()
+
+        again = await client.post("/api/links/bulk", json={"links": [
+            {"a_interface_id": core_ports[0], "b_interface_id": edge_ports[1]},
+        ]})
+        assert again.json()["created"] == {}
+        assert again.json()["errors"][0]["kind"] == "occupied"
+
+
+@pytest.mark.asyncio
+async def test_database_rejects_second_link_on_an_interface(async_session, override_get_session):
+    """Test: Reversed pairs and shared interfaces fail in the database even past the in-memory check"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        core = await _device(client, "core1", "CORE_ROUTER")
+        edge = await _device(client, "edge1", "EDGE_ROUTER")
+        core_a = await _interface(client, core, "eth0")
+        core_b = await _interface(client, core, "eth1")
+        edge_a = await _interface(client, edge, "eth0")
+        ok = await client.post("/api/links", json={"a_interface_id": core_a, "b_interface_id": edge_a})
+        assert ok.status_code == 201
+
+        # A concurrent writer (another worker) that validated against a stale view
+        with patch.object(LinkValidator, "occupied_by", return_value=None):
+            for a_interface_id, b_interface_id in ((edge_a, core_a), (core_b, edge_a)):
+                response = await client.post("/api/links", json={
+                    "a_interface_id": a_interface_id, "b_interface_id": b_interface_id,
+                })
+                assert response.status_code == 409
+                assert response.json()["detail"] == INTERFACE_PAIR_TAKEN
+
+            bulk = await client.post("/api/links/bulk", json={"links": [
+                {"a_interface_id": core_b, "b_interface_id": edge_a},
+            ]})
+            assert bulk.status_code == 409
+
+        async_session.add(Link(a_interface_id=edge_a, b_interface_id=core_b))
+        with pytest.raises(IntegrityError):
+            await async_session.commit()
+        await async_session.rollback()
+        assert len((await client.get("/api/links")).json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_migration_backfills_endpoints_and_drops_pair_constraint(async_session, override_get_session):
+    """Test: A database from before link_endpoints loses the pair constraint and gets its links claimed"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        core = await _device(client, "core1", "CORE_ROUTER")
+        edge = await _device(client, "edge1", "EDGE_ROUTER")
+        core_a = await _interface(client, core, "eth0")
+        core_b = await _interface(client, core, "eth1")
+        edge_a = await _interface(client, edge, "eth0")
+
+    connection = await async_session.connection()
+    legacy_ddl = str(CreateTable(Link.__table__).compile(dialect=connection.dialect)).rstrip().rstrip(")")
+    await connection.execute(text("DROP TABLE link_endpoints"))
+    await connection.execute(text("DROP TABLE links"))
+    await connection.execute(text(
+        f"{legacy_ddl}, CONSTRAINT {LEGACY_PAIR_CONSTRAINT} UNIQUE (a_interface_id, b_interface_id))"
+    ))
+    await connection.run_sync(LinkEndpoint.__table__.create)
+    # The pair constraint let a second link share edge_a
+    for link_id, a_interface_id, b_interface_id in ((1, core_a, edge_a), (2, core_b, edge_a)):
+        await connection.execute(text(
+            "INSERT INTO links (id, status, a_interface_id, b_interface_id, created_at, updated_at) "
+            "VALUES (:id, 'UP', :a, :b, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+        ), {"id": link_id, "a": a_interface_id, "b": b_interface_id})
+
+    def constraint_names(sync_connection):
+        return [constraint["name"] for constraint in inspect(sync_connection).get_unique_constraints("links")]
+
+    assert await connection.run_sync(constraint_names) == [LEGACY_PAIR_CONSTRAINT]
+    await connection.run_sync(migrate_link_endpoints)
+    await connection.run_sync(migrate_link_endpoints)
+    assert await connection.run_sync(constraint_names) == []
+    await async_session.commit()
+    endpoints = (await async_session.execute(select(LinkEndpoint.interface_id, LinkEndpoint.link_id))).all()
+    assert sorted(endpoints) == sorted([(core_a, 1), (edge_a, 1), (core_b, 2)])
+    assert (await async_session.execute(select(Link.id).order_by(Link.id))).scalars().all() == [1, 2]
+
+    async_session.add(Link(a_interface_id=core_a, b_interface_id=edge_a))
+    with pytest.raises(IntegrityError):
+        await async_session.commit()
+    await async_session.rollback()
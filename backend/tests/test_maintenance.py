@@ -0,0 +1,165 @@
+"""
+Test Maintenance Windows
+
+apply_boundaries (overlapping windows), MaintenanceScheduler timing and
+/api/maintenance-windows
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from sqlmodel import select
+
+from backend.main import app
+from backend.models.core import Device, MaintenanceState, MaintenanceWindow, MaintenanceWindowDevice, Status
+from backend.services.maintenance import apply_boundaries, maintenance_scheduler
+
+
+async def _devices(client, count):
+    ids = []
+    for n in range(count):
+        response = await client.post("/api/devices", json={"name": f"r{n}", "device_type": "CORE_ROUTER"})
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def _window(session, device_ids, status_override=Status.DOWN, reason=None, starts_in=0.0, ends_in=3600.0):
+    now = datetime.now(timezone.utc)
+    window = MaintenanceWindow(
+        status_override=status_override, reason=reason,
+        starts_at=now + timedelta(seconds=starts_in), ends_at=now + timedelta(seconds=ends_in),
+    )
+    session.add(window)
+    await session.flush()
+    await session.execute(insert(MaintenanceWindowDevice), [
+        {"window_id": window.id, "device_id": device_id} for device_id in device_ids
+    ])
+    await session.commit()
+    return window.id
+
+
+async def _overrides(session, device_ids):
+    rows = await session.execute(
+        select(Device.id, Device.status_override, Device.override_reason).where(Device.id.in_(device_ids))
+    )
+    return {device_id: (override, reason) for device_id, override, reason in rows}
+
+
+async def _state(session, window_id):
+    return (await session.execute(
+        select(MaintenanceWindow.state).where(MaintenanceWindow.id == window_id)
+    )).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_overlapping_windows(async_session, override_get_session):
+    """Test: The newest covering window wins; devices are cleared when no window covers them"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        d1, d2, d3 = await _devices(client, 3)
+    a = await _window(async_session, [d1, d2], reason="fiber works")
+    b = await _window(async_session, [d2, d3], status_override=Status.UP)
+
+    started = await apply_boundaries(async_session, [a], [])
+    assert started.started == [a] and started.overridden == [d1, d2]
+    await apply_boundaries(async_session, [b], [])
+    assert await _overrides(async_session, [d1, d2, d3]) == {
+        d1: (Status.DOWN, "fiber works"),
+        d2: (Status.UP, f"Maintenance window {b}"),
+        d3: (Status.UP, f"Maintenance window {b}"),
+    }
+
+    ended = await apply_boundaries(async_session, [], [b])
+    assert ended.finished == [b] and ended.cleared == [d3] and ended.overridden == [d2]
+    assert (await _overrides(async_session, [d2]))[d2] == (Status.DOWN, "fiber works")
+
+    ended = await apply_boundaries(async_session, [], [a, b])  # b already FINISHED: ignored
+    assert ended.finished == [a] and ended.cleared == [d1, d2]
+    assert set((await _overrides(async_session, [d1, d2, d3])).values()) == {(None, None)}
+    assert await _state(async_session, a) == MaintenanceState.FINISHED
+
+
+@pytest.mark.asyncio
+async def test_window_starting_and_ending_together_writes_nothing(async_session, override_get_session):
+    """Test: A window whose whole span was missed finishes without touching its devices"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        [device_id] = await _devices(client, 1)
+    window_id = await _window(async_session, [device_id])
+
+    result = await apply_boundaries(async_session, [window_id], [window_id])
+    assert result.started == [] and result.finished == [window_id]
+    assert result.overridden == [] and result.cleared == []
+    assert await _state(async_session, window_id) == MaintenanceState.FINISHED
+
+
+@pytest.mark.asyncio
+async def test_scheduler_applies_and_expires_windows(async_session, override_get_session):
+    """Test: One task applies both boundaries on time and emits one event per batch"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        d1, d2 = await _devices(client, 2)
+    overdue = await _window(async_session, [d1], starts_in=-60)       # started while "down"
+    short = await _window(async_session, [d2], starts_in=0.1, ends_in=0.3)
+
+    with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+        await maintenance_scheduler.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert await _state(async_session, overdue) == MaintenanceState.ACTIVE
+            assert (await _overrides(async_session, [d1]))[d1][0] == Status.DOWN
+
+            await asyncio.sleep(0.4)
+            assert await _state(async_session, short) == MaintenanceState.FINISHED
+            assert (await _overrides(async_session, [d2]))[d2] == (None, None)
+            assert maintenance_scheduler.next_boundary() is not None  # end of `overdue`
+        finally:
+            await maintenance_scheduler.shutdown()
+
+    events = [call.args for call in emit.await_args_list]
+    assert [event for event, _ in events] == ["maintenance:applied"] * 3
+    assert [payload["started"] for _, payload in events] == [[overdue], [short], []]
+    assert events[2][1]["finished"] == [short] and events[2][1]["cleared"] == [d2]
+
+
+@pytest.mark.asyncio
+async def test_maintenance_window_api(async_session, override_get_session):
+    """Test: Create, list and cancel maintenance windows"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        d1, d2 = await _devices(client, 2)
+        now = datetime.now(timezone.utc)
+
+        response = await client.post("/api/maintenance-windows", json={
+            "device_ids": [d2, d1], "reason": "firmware",
+            "starts_at": (now + timedelta(hours=1)).isoformat(), "ends_at": (now + timedelta(hours=2)).isoformat(),
+        })
+        assert response.status_code == 201, response.text
+        window = response.json()
+        assert window["state"] == "SCHEDULED" and window["device_ids"] == [d1, d2]
+        assert window["status_override"] == "DOWN"
+
+        listed = (await client.get("/api/maintenance-windows", params={"state": "SCHEDULED"})).json()
+        assert [w["id"] for w in listed] == [window["id"]]
+        assert (await client.get("/api/maintenance-windows", params={"state": "ACTIVE"})).json() == []
+
+        # Apply the start boundary now, then cancel: the override is cleared immediately
+        await apply_boundaries(async_session, [window["id"]], [])
+        with patch("backend.main.emit_to_all", new=AsyncMock()) as emit:
+            cancelled = await client.delete(f"/api/maintenance-windows/{window['id']}")
+        assert cancelled.json()["state"] == "CANCELLED"
+        assert emit.await_args.args[1]["cancelled"] == [window["id"]]
+        assert emit.await_args.args[1]["cleared"] == [d1, d2]
+        assert (await client.delete(f"/api/maintenance-windows/{window['id']}")).status_code == 409
+        maintenance_scheduler.forget(window["id"])
+
+        past = await client.post("/api/maintenance-windows", json={
+            "device_ids": [d1], "starts_at": (now - timedelta(hours=2)).isoformat(),
+            "ends_at": (now - timedelta(hours=1)).isoformat(),
+        })
+        assert past.status_code == 400
+        missing = await client.post("/api/maintenance-windows", json={
+            "device_ids": [d1, 999], "starts_at": now.isoformat(), "ends_at": (now + timedelta(hours=1)).isoformat(),
+        })
+        assert missing.status_code == 404
+        assert (await client.get("/api/maintenance-windows/999")).status_code == 404
@@ -0,0 +1,113 @@
+"""
+Test Path Finding
+
+Shortest / link-disjoint paths (PathFinder) and GET /api/paths
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+from backend.models.core import DeviceType, Status
+from backend.services.path_finding import PathFinder, PathWeight
+from backend.services.topology_index import DeviceNode, LinkEdge, TopologyIndex
+
+
+def _index(links):
+    """Index from (link id, device a, device b, length_km) tuples; interface ids are derived."""
+    index = TopologyIndex()
+    for device_id in sorted({d for _, a, b, _ in links for d in (a, b)}):
+        index._add_device(DeviceNode(
+            id=device_id, name=f"d{device_id}", device_type=DeviceType.CORE_ROUTER,
+            status=Status.UP, status_override=None, parent_container_id=None, x=0.0, y=0.0,
+        ))
+    for link_id, a, b, length_km in links:
+        index._add_interface(link_id * 10, a)
+        index._add_interface(link_id * 10 + 1, b)
+        index._add_link(LinkEdge(
+            id=link_id, a_interface_id=link_id * 10, b_interface_id=link_id * 10 + 1,
+            status=Status.UP, length_km=length_km,
+        ))
+    index.loaded = True
+    return index
+
+
+def test_shortest_path_by_hops_and_length():
+    """Test: Hop count and length weights pick different routes"""
+    #  1 ─(1 km)─ 2 ─(1 km)─ 3
+    #  └─────────(5 km)──────┘
+    finder = PathFinder(_index([(1, 1, 2, 1.0), (2, 2, 3, 1.0), (3, 1, 3, 5.0)]))
+
+    [by_hops] = finder.find(1, 3)
+    assert by_hops.device_ids == (1, 3)
+    assert by_hops.link_ids == (3,)
+
+    [by_length] = finder.find(1, 3, weight=PathWeight.LENGTH_KM)
+    assert by_length.device_ids == (1, 2, 3)
+    assert by_length.cost == 2.0
+
+
+def test_disjoint_paths_avoid_greedy_trap():
+    """Test: k=2 finds both routes where removing the shortest path would leave none"""
+    # s=1, a=2, b=3, t=4; shortest path 1-2-3-4 blocks any second path
+    finder = PathFinder(_index([
+        (1, 1, 2, 1.0), (2, 2, 3, 1.0), (3, 3, 4, 1.0), (4, 1, 3, 2.0), (5, 2, 4, 2.0),
+    ]))
+
+    paths = finder.find(1, 4, k=2, weight=PathWeight.LENGTH_KM)
+    assert sorted(path.device_ids for path in paths) == [(1, 2, 4), (1, 3, 4)]
+    assert [path.cost for path in paths] == [3.0, 3.0]
+    assert not set(paths[0].link_ids) & set(paths[1].link_ids)
+
+    # Only two disjoint routes exist
+    assert len(finder.find(1, 4, k=3, weight=PathWeight.LENGTH_KM)) == 2
+
+
+def test_results_memoized_per_version():
+    """Test: Repeated queries hit the memo until the topology changes"""
+    index = _index([(1, 1, 2, None), (2, 2, 3, None)])
+    finder = PathFinder(index)
+    first = finder.find(1, 3)
+    assert finder.find(1, 3) is first
+    assert (finder.hits, finder.misses) == (1, 1)
+
+    index.remove_link(2)
+    assert finder.find(1, 3) == []
+    assert finder.misses == 2
+
+    with pytest.raises(KeyError):
+        finder.find(1, 99)
+    with pytest.raises(ValueError):
+        finder.find(1, 1)
+
+
+@pytest.mark.asyncio
+async def test_paths_endpoint(async_session, override_get_session):
+    """Test: GET /api/paths returns device and link sequences"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = {}
+        for name, device_type in [
+            ("gw", "BACKBONE_GATEWAY"), ("core1", "CORE_ROUTER"), ("core2", "CORE_ROUTER"), ("edge", "EDGE_ROUTER"),
+        ]:
+            ids[name] = (await client.post("/api/devices", json={"name": name, "device_type": device_type})).json()["id"]
+        links = {}
+        for a, b in [("gw", "core1"), ("gw", "core2"), ("core1", "edge"), ("core2", "edge")]:
+            response = await client.post("/api/links/create-simple", json={
+                "device_a_id": ids[a], "device_b_id": ids[b], "link_type": "fiber",
+            })
+            links[(a, b)] = response.json()["link"]["id"]
+
+        response = await client.get("/api/paths", params={"from": ids["edge"], "to": ids["gw"], "k": 2})
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["k"] == 2 and data["weight"] == "hops"
+        assert len(data["paths"]) == 2
+        assert {tuple(path["device_ids"][1:-1]) for path in data["paths"]} == {(ids["core1"],), (ids["core2"],)}
+        assert all(path["hops"] == 2 for path in data["paths"])
+
+        await client.delete(f"/api/links/{links[('core1', 'edge')]}")
+        data = (await client.get("/api/paths", params={"from": ids["edge"], "to": ids["gw"], "k": 2})).json()
+        assert [path["device_ids"] for path in data["paths"]] == [[ids["edge"], ids["core2"], ids["gw"]]]
+
+        assert (await client.get("/api/paths", params={"from": ids["edge"], "to": 999})).status_code == 404
+        assert (await client.get("/api/paths", params={"from": ids["edge"], "to": ids["edge"]})).status_code == 400
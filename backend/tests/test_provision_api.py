@@ -174,6 +174,32 @@ async def test_provision_with_validation_bypass(async_session, override_get_sess
         assert data["device"]["name"] == "olt1"
 
 
+@pytest.mark.asyncio
+async def test_provision_reachable_upstream_via_api(async_session, override_get_session):
+    """Test: upstream_validation=reachable rejects an EDGE router without backbone path"""
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+    ) as client:
+        edge = await client.post(
+            "/api/devices/provision",
+            json={"name": "edge1", "device_type": "EDGE_ROUTER", "validate_upstream": False},
+        )
+        
+        response = await client.post(
+            "/api/devices/provision",
+            json={
+                "name": "olt1",
+                "device_type": "OLT",
+                "upstream_validation": "reachable",
+                "upstream_device_id": edge.json()["device"]["id"],
+            },
+        )
+        
+        assert response.status_code == 400
+        assert "no path to a BACKBONE_GATEWAY" in response.json()["detail"]
+
+
 @pytest.mark.asyncio
 async def test_provision_duplicate_name_fails(async_session, override_get_session):
     """Test: Provision device with duplicate name fails"""
@@ -5,9 +5,10 @@ Phase 2.3: Upstream connectivity requirements
 """
 
 import pytest
+from sqlalchemy import select
 
-from backend.models.core import DeviceType
-from backend.services.provisioning_service import ProvisioningError, ProvisioningService
+from backend.models.core import DeviceType, Link, LinkEndpoint
+from backend.services.provisioning_service import ProvisioningError, ProvisioningService, UpstreamValidation
 
 
 # ==========================================
@@ -442,3 +443,79 @@ async def test_multiple_upstreams_of_same_type(async_session):
     assert edge1.id is not None
     assert edge2.id is not None
     assert edge3.id is not None
+
+
+# ==========================================
+# REACHABLE UPSTREAM (actual connectivity)
+# ==========================================
+
+
+async def _connect(session, device_a, device_b):
+    """Patch a cable between the first free interfaces of two provisioned devices."""
+    service = ProvisioningService(session)
+    used = set((await session.execute(select(LinkEndpoint.interface_id))).scalars())
+    if_a = next(i for i in await service.get_device_interfaces(device_a.id) if i.id not in used)
+    if_b = next(i for i in await service.get_device_interfaces(device_b.id) if i.id not in used)
+    session.add(Link(a_interface_id=if_a.id, b_interface_id=if_b.id))
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_reachable_upstream_device(async_session):
+    """Test: REACHABLE mode needs the given upstream to have a path to the backbone"""
+    service = ProvisioningService(async_session)
+    gw = await service.provision_device(name="gw1", device_type=DeviceType.BACKBONE_GATEWAY)
+    core = await service.provision_device(name="core1", device_type=DeviceType.CORE_ROUTER)
+    edge = await service.provision_device(name="edge1", device_type=DeviceType.EDGE_ROUTER)
+    stray = await service.provision_device(name="edge2", device_type=DeviceType.EDGE_ROUTER)
+    await _connect(async_session, gw, core)
+    await _connect(async_session, core, edge)
+    reachable = UpstreamValidation.REACHABLE
+
+    olt = await service.provision_device(
+        name="olt1", device_type=DeviceType.OLT, upstream_validation=reachable, upstream_device_id=edge.id,
+    )
+    assert olt.id is not None
+
+    with pytest.raises(ProvisioningError, match="no path to a BACKBONE_GATEWAY"):
+        await service.provision_device(
+            name="olt2", device_type=DeviceType.OLT, upstream_validation=reachable, upstream_device_id=stray.id,
+        )
+    with pytest.raises(ProvisioningError, match="expected EDGE_ROUTER"):
+        await service.provision_device(
+            name="olt3", device_type=DeviceType.OLT, upstream_validation=reachable, upstream_device_id=core.id,
+        )
+    with pytest.raises(ProvisioningError, match="needs upstream_device_id or parent_container_id"):
+        await service.provision_device(name="olt4", device_type=DeviceType.OLT, upstream_validation=reachable)
+
+    # The existence check alone is satisfied by the stray EDGE router
+    assert (await service.provision_device(name="olt5", device_type=DeviceType.OLT)).id is not None
+
+
+@pytest.mark.asyncio
+async def test_reachable_upstream_in_container(async_session):
+    """Test: REACHABLE mode accepts a connected upstream anywhere inside the parent container"""
+    service = ProvisioningService(async_session)
+    gw = await service.provision_device(name="gw1", device_type=DeviceType.BACKBONE_GATEWAY)
+    site = await service.provision_device(name="site1", device_type=DeviceType.CORE_SITE)
+    pop = await service.provision_device(name="pop1", device_type=DeviceType.POP, parent_container_id=site.id)
+    isolated_pop = await service.provision_device(name="pop2", device_type=DeviceType.POP)
+    edge = await service.provision_device(
+        name="edge1", device_type=DeviceType.EDGE_ROUTER, parent_container_id=pop.id,
+    )
+    await service.provision_device(
+        name="edge2", device_type=DeviceType.EDGE_ROUTER, parent_container_id=isolated_pop.id,
+    )
+    await _connect(async_session, gw, edge)
+    reachable = UpstreamValidation.REACHABLE
+
+    olt = await service.provision_device(
+        name="olt1", device_type=DeviceType.OLT, parent_container_id=site.id, upstream_validation=reachable,
+    )
+    assert olt.id is not None
+
+    with pytest.raises(ProvisioningError, match="no EDGE_ROUTER in container 'pop2'"):
+        await service.provision_device(
+            name="olt2", device_type=DeviceType.OLT, parent_container_id=isolated_pop.id,
+            upstream_validation=reachable,
+        )
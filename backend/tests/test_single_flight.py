@@ -0,0 +1,82 @@
+"""
+Test Single-Flight Request Coalescing
+"""
+
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+from backend.services.single_flight import SingleFlight, read_coalescer
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_execution():
+    """Test: One execution per key while in flight, a new one afterwards"""
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def query():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return b"[]"
+
+    waiters = [asyncio.create_task(flight.run("devices-1", query)) for _ in range(50)]
+    other = asyncio.create_task(flight.run("devices-2", query))
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters, other) == [b"[]"] * 51
+    assert calls == 2
+    assert flight.coalesced == 49
+    assert flight.in_flight() == 0
+
+    await flight.run("devices-1", query)
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_and_cancellation():
+    """Test: Errors reach every waiter; a cancelled waiter leaves the flight running"""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise RuntimeError("db down")
+
+    waiters = [asyncio.create_task(flight.run("k", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    release.clear()
+
+    async def slow():
+        await release.wait()
+        return 42
+
+    leader = asyncio.create_task(flight.run("k", slow))
+    follower = asyncio.create_task(flight.run("k", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await follower == 42
+
+
+@pytest.mark.asyncio
+async def test_list_burst_is_coalesced(async_session, override_get_session):
+    """Test: A burst of identical list requests returns identical bodies"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/api/devices", json={"name": "olt1", "device_type": "OLT"})
+        before = read_coalescer.executions
+        responses = await asyncio.gather(*(client.get("/api/devices") for _ in range(20)))
+
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
+    assert 1 <= read_coalescer.executions - before <= 20
+    assert read_coalescer.in_flight() == 0
@@ -0,0 +1,95 @@
+"""
+Test SLA Engine
+
+compute_availability kernel, month periods and POST /api/sla/compute,
+GET /api/sla/{month}
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+from backend.main import app
+from backend.models.core import DeviceStatusChange, Status
+from backend.services.jobs import JobState, job_manager
+from backend.services.sla import compute_availability, month_period
+
+
+def test_downtime_attributed_to_most_upstream_device():
+    """Test: Overlapping outages are merged and charged to the upstream root cause"""
+    # gw(0) ← olt(1) ← ont A(2), ont B(3); olt DOWN [10, 30), A DOWN [20, 50)
+    rows = [(0, 0.0, False), (1, 0.0, False), (1, 10.0, True), (1, 30.0, False),
+            (2, 0.0, False), (2, 20.0, True), (2, 50.0, False), (3, 0.0, False)]
+    hist_node, hist_t, hist_down = (np.array(column) for column in zip(*rows))
+    measured, downtime, local, cause = compute_availability(
+        100.0, hist_node, hist_t, hist_down,
+        parent=np.array([-1, 0, 1, 1]), upstream_order=np.array([0, 1]), customers=np.array([2, 3]),
+    )
+    assert measured.tolist() == [100.0, 100.0]
+    assert downtime.tolist() == [40.0, 20.0]
+    assert local.tolist() == [20.0, 0.0]
+    assert cause.tolist() == [0.0, 40.0, 20.0, 0.0]
+
+
+def test_month_period():
+    """Test: Months are UTC calendar months; malformed or future months are rejected"""
+    now = datetime(2026, 3, 15, tzinfo=timezone.utc)
+    assert month_period("2025-12", now) == (
+        datetime(2025, 12, 1, tzinfo=timezone.utc), datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    assert month_period("2026-03", now)[1] == now
+    for month in ("2026-13", "march", "2026-04"):
+        with pytest.raises(ValueError):
+            month_period(month, now)
+
+
+@pytest.mark.asyncio
+async def test_sla_report_api(async_session, override_get_session):
+    """Test: The job computes per-device, per-container and root-cause figures"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        ids = {}
+        for name, device_type in [
+            ("pop", "POP"), ("gw", "BACKBONE_GATEWAY"), ("core", "CORE_ROUTER"), ("edge", "EDGE_ROUTER"),
+            ("olt", "OLT"), ("biz1", "BUSINESS_ONT"), ("biz2", "BUSINESS_ONT"),
+        ]:
+            ids[name] = (await client.post("/api/devices", json={"name": name, "device_type": device_type})).json()["id"]
+        for a, b in [("gw", "core"), ("core", "edge"), ("edge", "olt"), ("olt", "biz1"), ("olt", "biz2")]:
+            await client.post("/api/links/create-simple", json={
+                "device_a_id": ids[a], "device_b_id": ids[b], "link_type": "fiber",
+            })
+        for name in ("biz1", "biz2"):
+            await client.patch(f"/api/devices/{ids[name]}/parent", json={"parent_container_id": ids["pop"]})
+
+        # Last month: everything UP, olt down for an hour, biz1 down for 30 minutes on its own
+        start = (datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+                 - timedelta(days=1)).replace(day=1)
+        month = start.strftime("%Y-%m")
+        rows = [(ids[name], start, Status.UP) for name in ("gw", "core", "edge", "olt", "biz1", "biz2")]
+        rows += [
+            (ids["olt"], start + timedelta(hours=2), Status.DOWN), (ids["olt"], start + timedelta(hours=3), Status.UP),
+            (ids["biz1"], start + timedelta(hours=5), Status.DOWN), (ids["biz1"], start + timedelta(hours=5, minutes=30), Status.UP),
+        ]
+        await async_session.execute(insert(DeviceStatusChange), [
+            {"device_id": device_id, "changed_at": changed_at, "status": status} for device_id, changed_at, status in rows
+        ])
+        await async_session.commit()
+
+        assert (await client.get(f"/api/sla/{month}")).status_code == 404
+        assert (await client.post("/api/sla/compute", json={"month": "2999-01"})).status_code == 400
+
+        response = await client.post("/api/sla/compute", json={"month": month, "target": 99.9})
+        assert response.status_code == 202, response.text
+        job = await job_manager.wait(response.json()["job"]["id"])
+        assert job.state == JobState.SUCCEEDED, job.error
+        assert job.result["customers"] == 2
+
+        report = (await client.get(f"/api/sla/{month}")).json()
+        assert report["customers"] == 2 and report["breaches"] == 2
+        [worst, best] = report["worst"]
+        assert (worst["name"], worst["downtime_minutes"], worst["local_downtime_minutes"]) == ("biz1", 90, 30)
+        assert (best["name"], best["downtime_minutes"]) == ("biz2", 60)
+        assert [(c["name"], c["customers"], c["downtime_minutes"]) for c in report["containers"]] == [("pop", 2, 150)]
+        assert [(r["name"], r["customer_minutes"]) for r in report["root_causes"]] == [("olt", 120), ("biz1", 30)]
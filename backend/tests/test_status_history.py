@@ -0,0 +1,102 @@
+"""
+Test Status History
+
+Append-only status transitions, rollups and GET /api/devices/{id}/status-history
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert, select
+
+from backend.main import app
+from backend.models.core import DeviceStatusChange, Status
+from backend.services.status_history import HistoryBucket, rollup
+
+
+def _at(hour, minute=0):
+    return datetime(2026, 3, 2, hour, minute, tzinfo=timezone.utc)
+
+
+def test_rollup_splits_intervals_across_buckets():
+    """Test: Time per status is clipped to the range and split at hour boundaries"""
+    buckets = rollup(
+        Status.DOWN, [(_at(10, 45), Status.UP), (_at(12, 15), Status.DOWN)],
+        _at(10, 30), _at(12, 30), HistoryBucket.HOUR,
+    )
+    assert [bucket.start for bucket in buckets] == [_at(10), _at(11), _at(12)]
+    assert [(bucket.minutes(Status.UP), bucket.minutes(Status.DOWN)) for bucket in buckets] == [
+        (15, 15), (60, 0), (15, 15),
+    ]
+
+    # Before the first record the status is unknown and not counted
+    [day] = rollup(None, [(_at(11), Status.DOWN)], _at(0), _at(12), HistoryBucket.DAY)
+    assert day.start == _at(0) and day.seconds == {Status.DOWN: 3600}
+
+
+@pytest.mark.asyncio
+async def test_override_paths_append_transitions(async_session, override_get_session):
+    """Test: Single and bulk override writes log only effective-status changes"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        device_id = (await client.post("/api/devices", json={"name": "olt-17", "device_type": "OLT"})).json()["id"]
+
+        await client.patch(f"/api/devices/{device_id}/override", json={"status_override": "UP"})
+        await client.patch(f"/api/devices/{device_id}", json={"x": 1.0, "y": 2.0})  # no status change
+        await client.delete(f"/api/devices/{device_id}/override")
+        await client.post("/api/overrides/bulk", json={"device_ids": [device_id], "status_override": "DOWN"})  # already DOWN
+        await client.post("/api/overrides/bulk", json={"device_ids": [device_id], "status_override": "UP"})
+
+        response = await client.get(f"/api/devices/{device_id}/status-history")
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["bucket"] == "hour" and len(data["rollup"]) in (24, 25)
+        assert [t["status"] for t in data["transitions"]] == ["DOWN", "UP", "DOWN", "UP"]
+        assert data["initial_status"] is None
+
+        assert (await client.get("/api/devices/999/status-history")).status_code == 404
+
+        # History outlives the device (bulk delete goes through the database)
+        deleted = await client.delete("/api/devices", params={"ids": str(device_id)})
+        assert deleted.status_code == 200 and (await client.get(f"/api/devices/{device_id}")).status_code == 404
+        remaining = await async_session.execute(
+            select(DeviceStatusChange.status).where(DeviceStatusChange.device_id == device_id)
+        )
+        assert len(remaining.all()) == 4
+
+
+@pytest.mark.asyncio
+async def test_status_history_range_and_rollup(async_session, override_get_session):
+    """Test: A range reads the status at its start plus the transitions inside it"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        device_id = (await client.post("/api/devices", json={"name": "olt-17", "device_type": "OLT"})).json()["id"]
+        await async_session.execute(insert(DeviceStatusChange), [
+            {"device_id": device_id, "changed_at": changed_at, "status": status}
+            for changed_at, status in [
+                (_at(8), Status.UP), (_at(10, 20), Status.DOWN), (_at(10, 50), Status.DEGRADED),
+                (_at(11, 30), Status.UP), (_at(14), Status.DOWN),
+            ]
+        ])
+        await async_session.commit()
+
+        data = (await client.get(f"/api/devices/{device_id}/status-history", params={
+            "start": _at(10).isoformat(), "end": _at(12).isoformat(),
+        })).json()
+        assert data["initial_status"] == "UP"
+        assert [t["status"] for t in data["transitions"]] == ["DOWN", "DEGRADED", "UP"]
+        assert [(r["minutes_up"], r["minutes_degraded"], r["minutes_down"]) for r in data["rollup"]] == [
+            (20, 10, 30), (30, 30, 0),
+        ]
+
+        daily = (await client.get(f"/api/devices/{device_id}/status-history", params={
+            "start": _at(0).isoformat(), "end": (_at(0) + timedelta(days=1)).isoformat(), "bucket": "day",
+        })).json()
+        [day] = daily["rollup"]
+        assert day["minutes_down"] == 30 + (24 - 14) * 60
+
+        assert (await client.get(f"/api/devices/{device_id}/status-history", params={
+            "start": _at(12).isoformat(), "end": _at(10).isoformat(),
+        })).status_code == 400
+        assert (await client.get(f"/api/devices/{device_id}/status-history", params={
+            "start": _at(0).isoformat(), "end": (_at(0) + timedelta(days=365)).isoformat(),
+        })).status_code == 400
@@ -0,0 +1,155 @@
+"""
+Test Topology Aggregation
+
+Level-of-detail view: GET /api/topology/aggregate
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+from backend.models.core import Device, DeviceType, Interface, InterfaceType, Link, Status
+from backend.services.topology_aggregation import AggregationLevel, topology_aggregator
+from backend.services.topology_index import topology_index
+
+
+async def _device(session, name, device_type, status=Status.UP, parent=None):
+    device = Device(name=name, device_type=device_type, status=status, parent_container_id=parent)
+    session.add(device)
+    await session.commit()
+    return device
+
+
+async def _link(session, dev_a, dev_b, status=Status.UP):
+    if_a = Interface(name=f"to-{dev_b.name}", interface_type=InterfaceType.OPTICAL, device_id=dev_a.id)
+    if_b = Interface(name=f"to-{dev_a.name}", interface_type=InterfaceType.OPTICAL, device_id=dev_b.id)
+    session.add(if_a)
+    session.add(if_b)
+    await session.commit()
+    link = Link(a_interface_id=if_a.id, b_interface_id=if_b.id, status=status)
+    session.add(link)
+    await session.commit()
+    return link
+
+
+async def _access_topology(session):
+    """edge ── olt ─┬─ ont1
+                    ├─ ont2 (DOWN)
+                    └─ splitter ── ont3"""
+    edge = await _device(session, "edge1", DeviceType.EDGE_ROUTER)
+    olt = await _device(session, "olt1", DeviceType.OLT)
+    ont1 = await _device(session, "ont1", DeviceType.ONT)
+    ont2 = await _device(session, "ont2", DeviceType.ONT, status=Status.DOWN)
+    splitter = await _device(session, "splitter1", DeviceType.SPLITTER)
+    ont3 = await _device(session, "ont3", DeviceType.ONT)
+    await _link(session, edge, olt)
+    await _link(session, olt, ont1)
+    await _link(session, olt, ont2)
+    await _link(session, olt, splitter)
+    await _link(session, splitter, ont3)
+    return edge, olt, splitter
+
+
+def _by_id(items):
+    return {item["id"]: item for item in items}
+
+
+@pytest.mark.asyncio
+async def test_subtree_level_folds_customers_into_olt(async_session, override_get_session):
+    """Test: Level 1 collapses ONTs (also behind a splitter) into their OLT"""
+    edge, olt, splitter = await _access_topology(async_session)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/topology/aggregate", params={"level": 1})
+
+    assert response.status_code == 200
+    data = response.json()
+    nodes = _by_id(data["nodes"])
+
+    subtree = nodes[f"subtree:{olt.id}"]
+    assert subtree["count"] == 4  # OLT + 3 ONTs
+    assert subtree["status"] == "DOWN"  # worst case of members
+    assert subtree["status_counts"] == {"UP": 3, "DOWN": 1}
+    assert f"device:{edge.id}" in nodes
+    assert f"device:{splitter.id}" in nodes
+
+    bundles = _by_id(data["bundles"])
+    # OLT↔ONT links are internal; edge↔OLT and OLT↔splitter remain
+    assert len(bundles) == 2
+
+
+@pytest.mark.asyncio
+async def test_parallel_links_are_bundled(async_session, override_get_session):
+    """Test: Two links between the same devices become one bundle"""
+    core = await _device(async_session, "core1", DeviceType.CORE_ROUTER)
+    edge = await _device(async_session, "edge1", DeviceType.EDGE_ROUTER)
+    await _link(async_session, core, edge)
+    await _link(async_session, core, edge, status=Status.DEGRADED)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/topology/aggregate", params={"level": 1})
+
+    bundles = response.json()["bundles"]
+    assert len(bundles) == 1
+    assert bundles[0]["count"] == 2
+    assert bundles[0]["status"] == "DEGRADED"
+
+
+@pytest.mark.asyncio
+async def test_container_level_folds_pop_contents(async_session, override_get_session):
+    """Test: Level 2 folds nested containers and follows customers into the OLT's POP"""
+    site = await _device(async_session, "site1", DeviceType.CORE_SITE)
+    pop = await _device(async_session, "pop1", DeviceType.POP, parent=site.id)
+    core = await _device(async_session, "core1", DeviceType.CORE_ROUTER)
+    edge = await _device(async_session, "edge1", DeviceType.EDGE_ROUTER, parent=site.id)
+    olt = await _device(async_session, "olt1", DeviceType.OLT, parent=pop.id)
+    ont = await _device(async_session, "ont1", DeviceType.ONT)
+    await _link(async_session, core, edge)
+    await _link(async_session, edge, olt)
+    await _link(async_session, olt, ont)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/topology/aggregate", params={"zoom": 0.1})
+
+    data = response.json()
+    assert data["level"] == 2
+    nodes = _by_id(data["nodes"])
+    assert set(nodes) == {f"container:{site.id}", f"device:{core.id}"}
+    assert nodes[f"container:{site.id}"]["count"] == 5  # site, pop, edge, olt, ont
+    assert len(data["bundles"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_aggregates_follow_mutations_incrementally(async_session, override_get_session):
+    """Test: API mutations update the precomputed aggregates without a rebuild"""
+    edge, olt, splitter = await _access_topology(async_session)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = (await client.get("/api/topology/aggregate", params={"level": 1})).json()
+
+        # New ONT behind the splitter joins the OLT subtree
+        ont4 = (await client.post("/api/devices", json={"name": "ont4", "device_type": "ONT"})).json()
+        created = await client.post("/api/links/create-simple", json={
+            "device_a_id": splitter.id, "device_b_id": ont4["id"], "link_type": "fiber",
+        })
+        assert created.status_code == 200
+
+        # Overriding the DOWN ONT moves it to the UP tally
+        down = next(n for n in (await client.get("/api/devices")).json() if n["name"] == "ont2")
+        await client.patch(f"/api/devices/{down['id']}/override", json={"status_override": "UP"})
+
+        second = (await client.get("/api/topology/aggregate", params={"level": 1})).json()
+
+    assert second["version"] > first["version"]
+    subtree = _by_id(second["nodes"])[f"subtree:{olt.id}"]
+    assert subtree["count"] == 5
+    # ont2 overridden UP, freshly created ont4 starts DOWN
+    assert subtree["status_counts"] == {"UP": 4, "DOWN": 1}
+
+    # Incremental state must match a from-scratch build
+    incremental = topology_aggregator.snapshot(AggregationLevel.SUBTREE)
+    topology_index.invalidate()
+    await topology_index.ensure_loaded(async_session)
+    rebuilt = topology_aggregator.snapshot(AggregationLevel.SUBTREE)
+    for key in ("nodes", "bundles"):
+        assert sorted(map(str, incremental[key])) == sorted(map(str, rebuilt[key]))
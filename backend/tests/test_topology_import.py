@@ -0,0 +1,128 @@
+"""
+Test Topology Import
+
+Streaming bulk import (JSON Lines, CSV, GraphML) and POST /api/import
+"""
+
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import select
+
+from backend.main import app
+from backend.models.core import Device, Interface, Link
+from backend.services.jobs import job_manager
+from backend.services.topology_import import TopologyImporter
+from backend.services.topology_index import topology_index
+
+
+def _jsonl(records):
+    return "\n".join(json.dumps(r) for r in records) + "\n"
+
+
+RECORDS = [
+    {"kind": "device", "name": "site1", "device_type": "CORE_SITE"},
+    {"kind": "device", "name": "core1", "device_type": "CORE_ROUTER", "parent": "site1"},
+    {"kind": "device", "name": "edge1", "device_type": "EDGE_ROUTER", "parent": "site1"},
+    {"kind": "device", "name": "olt1", "device_type": "OLT", "x": 10, "y": 20},
+    {"kind": "device", "name": "ont1", "device_type": "ONT"},
+    {"kind": "link", "a": "core1", "b": "edge1", "length_km": 1.5},
+    {"kind": "link", "a": "edge1", "b": "olt1"},
+    {"kind": "link", "a": "olt1", "b": "ont1", "status": "DOWN"},
+    # Errors: invalid rule, unknown device, duplicate, non-container parent
+    {"kind": "link", "a": "core1", "b": "ont1"},
+    {"kind": "link", "a": "olt1", "b": "ghost"},
+    {"kind": "device", "name": "olt1", "device_type": "OLT"},
+    {"kind": "device", "name": "ont2", "device_type": "ONT", "parent": "olt1"},
+]
+
+
+@pytest.mark.asyncio
+async def test_jsonl_import_validates_rows_and_batches(async_session, tmp_path):
+    """Test: Valid rows load across small batches; bad rows are reported"""
+    path = tmp_path / "topology.jsonl"
+    path.write_text(_jsonl(RECORDS) + "not json\n")
+
+    progress = []
+
+    async def on_progress(fraction, message=None):
+        progress.append(fraction)
+
+    report = await TopologyImporter(async_session, batch_size=2, progress=on_progress).run(str(path), "jsonl")
+
+    assert report.devices_created == 5
+    assert report.links_created == 3
+    assert report.interfaces_created == 6
+    assert [e["row"] for e in report.errors] == [9, 10, 11, 12, 13]
+    assert "No valid link rule" in report.errors[0]["error"]
+    assert progress[-1] == 1.0
+
+    devices = {d.name: d for d in (await async_session.execute(select(Device))).scalars()}
+    assert devices["core1"].parent_container_id == devices["site1"].id
+    assert (devices["olt1"].x, devices["olt1"].y) == (10.0, 20.0)
+    links = (await async_session.execute(select(Link))).scalars().all()
+    assert sorted(link.status.value for link in links) == ["DOWN", "UP", "UP"]
+
+    # Bulk inserts bypass ORM hooks; the index rebuilds from the database
+    index = await topology_index.ensure_loaded(async_session)
+    assert set(index.neighbors(devices["edge1"].id).values()) == {devices["core1"].id, devices["olt1"].id}
+
+
+@pytest.mark.asyncio
+async def test_csv_and_graphml_imports_resolve_existing_devices(async_session, tmp_path):
+    """Test: CSV and GraphML rows link to devices that already exist"""
+    csv_path = tmp_path / "devices.csv"
+    csv_path.write_text(
+        "kind,name,device_type,parent,a,b,length_km\n"
+        "device,edge1,EDGE_ROUTER,,,,\n"
+        "device,olt1,OLT,,,,\n"
+        "link,,,,edge1,olt1,3.0\n"
+    )
+    report = await TopologyImporter(async_session).run(str(csv_path), "csv")
+    assert (report.devices_created, report.links_created, report.error_count) == (2, 1, 0)
+
+    graphml_path = tmp_path / "access.graphml"
+    graphml_path.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+        '  <key id="d0" for="node" attr.name="device_type" attr.type="string"/>\n'
+        '  <key id="d1" for="edge" attr.name="length_km" attr.type="double"/>\n'
+        '  <graph edgedefault="undirected">\n'
+        '    <node id="ont1"><data key="d0">ONT</data></node>\n'
+        '    <node id="ont2"><data key="d0">ONT</data></node>\n'
+        '    <edge source="olt1" target="ont1"><data key="d1">0.8</data></edge>\n'
+        '    <edge source="olt1" target="ont2"/>\n'
+        '  </graph>\n'
+        '</graphml>\n'
+    )
+    report = await TopologyImporter(async_session).run(str(graphml_path), "graphml")
+    assert (report.devices_created, report.links_created, report.error_count) == (2, 2, 0)
+
+    olt = (await async_session.execute(select(Device).where(Device.name == "olt1"))).scalar_one()
+    ports = (await async_session.execute(
+        select(Interface.name).where(Interface.device_id == olt.id)
+    )).scalars().all()
+    assert sorted(ports) == ["port1", "port2", "port3"]
+
+
+@pytest.mark.asyncio
+async def test_import_endpoint_runs_as_job(async_session, override_get_session):
+    """Test: POST /api/import spools the body and reports through the job"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/api/import", params={"format": "jsonl"}, content=_jsonl(RECORDS[:8]).encode(),
+        )
+        assert response.status_code == 202
+        job = await job_manager.wait(response.json()["job"]["id"])
+
+        assert job.state.value == "SUCCEEDED"
+        assert job.result["devices_created"] == 5
+        assert job.result["links_created"] == 3
+        assert job.result["error_count"] == 0
+
+        devices = (await client.get("/api/devices")).json()
+        assert {d["name"] for d in devices} == {"site1", "core1", "edge1", "olt1", "ont1"}
+
+        response = await client.post("/api/import", params={"format": "xlsx"}, content=b"")
+        assert response.status_code == 422
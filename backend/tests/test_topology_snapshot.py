@@ -0,0 +1,126 @@
+"""
+Test Topology Snapshot
+
+Binary snapshot codecs, GET /api/topology/export and POST /api/topology/import
+"""
+
+import gzip
+from datetime import datetime, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+
+from backend.main import app
+from backend.models.core import DeviceStatusChange, Status
+from backend.services.jobs import job_manager
+from backend.services.topology_snapshot import (
+    SNAPSHOT_MAGIC,
+    decode_column,
+    encode_column,
+    sequence_advance_sql,
+    snapshot_read_options,
+)
+
+
+def test_column_codecs_roundtrip_with_nulls():
+    """Test: Every column kind survives encode/decode, including NULLs"""
+    cases = {
+        "int": [1, None, -5, 2**40],
+        "float": [0.5, None, -1.25, 3.0],
+        "datetime": [datetime(2025, 1, 2, 3, 4, 5, 678901), None, datetime(1999, 12, 31), datetime(2030, 6, 1)],
+        "str": ["olt-1", None, "", "ünïcode"],
+    }
+    for kind, values in cases.items():
+        payload = encode_column(values, kind)
+        assert decode_column(payload, 0, len(payload), len(values), kind) == values
+
+
+def test_export_reads_one_snapshot_on_postgresql():
+    """Test: PostgreSQL exports share one read-only REPEATABLE READ snapshot; SQLite keeps its default"""
+    assert snapshot_read_options("postgresql") == {
+        "isolation_level": "REPEATABLE READ", "postgresql_readonly": True, "postgresql_deferrable": True,
+    }
+    assert snapshot_read_options("sqlite") == {}
+
+
+def test_restore_never_moves_sequences_back():
+    """Test: The PostgreSQL sequence is set past both its current value and the restored ids"""
+    sql = sequence_advance_sql("devices")
+    assert "GREATEST(COALESCE(pg_sequence_last_value(pg_get_serial_sequence('devices', 'id')), 0)" in sql
+    assert "COALESCE((SELECT MAX(id) FROM devices), 0)) + 1, false)" in sql
+
+
+async def _provision(client, name, device_type, parent=None):
+    response = await client.post("/api/devices/provision", json={
+        "name": name, "device_type": device_type, "validate_upstream": False,
+        "parent_container_id": parent,
+    })
+    return response.json()["device"]["id"]
+
+
+@pytest.mark.asyncio
+async def test_export_then_restore_roundtrip(async_session, override_get_session):
+    """Test: Export streams a gzip snapshot; restore brings back the same topology"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        site = await _provision(client, "site1", "CORE_SITE")
+        edge = await _provision(client, "edge1", "EDGE_ROUTER")
+        olt = await _provision(client, "olt1", "OLT", parent=site)
+        # Parent with a higher id than its child
+        late_pop = await _provision(client, "pop-late", "POP")
+        await client.patch(f"/api/devices/{edge}/parent", json={"parent_container_id": late_pop})
+        await client.patch(f"/api/devices/{olt}/override", json={"status_override": "DOWN", "override_reason": "maint"})
+        await client.post("/api/links/create-simple", json={"device_a_id": edge, "device_b_id": olt, "link_type": "fiber"})
+
+        before = {
+            path: (await client.get(f"/api/{path}")).json()
+            for path in ("devices", "interfaces", "links")
+        }
+
+        response = await client.get("/api/topology/export")
+        assert response.status_code == 200
+        assert "attachment" in response.headers["content-disposition"]
+        snapshot = response.content
+        assert gzip.decompress(snapshot).startswith(SNAPSHOT_MAGIC)
+
+        # Change the topology, then restore
+        await client.delete(f"/api/links/{before['links'][0]['id']}")
+        await client.delete(f"/api/devices/{site}")
+        await _provision(client, "extra", "ONT")
+
+        before_restore = datetime.now(timezone.utc).replace(tzinfo=None)
+        response = await client.post("/api/topology/import", content=snapshot)
+        assert response.status_code == 202
+        job = await job_manager.wait(response.json()["job"]["id"])
+        assert job.state.value == "SUCCEEDED", job.error
+        assert job.result == {
+            "devices": len(before["devices"]),
+            "interfaces": len(before["interfaces"]),
+            "links": len(before["links"]),
+        }
+
+        async_session.expunge_all()
+        for path, rows in before.items():
+            assert (await client.get(f"/api/{path}")).json() == rows
+
+        # History survived the delete and the restore, which appended the restored status
+        statuses = await async_session.execute(
+            select(DeviceStatusChange.status).where(DeviceStatusChange.device_id == site)
+            .order_by(DeviceStatusChange.id)
+        )
+        assert [status for (status,) in statuses] == [Status.DOWN, Status.DOWN]
+        restored = (await async_session.execute(
+            select(func.count()).select_from(DeviceStatusChange)
+            .where(DeviceStatusChange.changed_at >= before_restore)
+        )).scalar()
+        assert restored == len(before["devices"])
+
+
+@pytest.mark.asyncio
+async def test_restore_rejects_garbage(async_session, override_get_session):
+    """Test: Non-snapshot uploads are rejected before a job is queued"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/topology/import", content=b"definitely not a snapshot")
+        assert response.status_code == 400
+        response = await client.post("/api/topology/import", content=gzip.compress(b"{}"))
+        assert response.status_code == 400